@@ -9,9 +9,9 @@ sys.path.append(".")  # 현재 디렉토리를 모듈 검색 경로에 추가
 FastAPI를 사용하여 RESTful API를 구현합니다.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks, WebSocket, WebSocketDisconnect, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import uvicorn
 from pydantic import BaseModel
@@ -63,6 +63,16 @@ except ImportError as e:
     
     config = DefaultConfig()
 
+from src.web.response_cache import ResponseCache, etag_matches
+from src.web.executor import BlockingCallExecutor, EventLoopLagMonitor
+from src.web.price_hub import PriceHub
+from src.web.broadcast import Broadcaster
+from src.web.ws_codec import MessageCodec, negotiate_encoding
+from src.utils.resource_sampler import get_resource_sampler, load_export
+from src.utils.metrics import get_metrics_registry, load_exports, merge_families, render_families
+from src.utils.tracing import get_tracer
+from src.utils.profiler import DebugControl
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -124,16 +134,35 @@ def is_port_available(port):
 
 # 웹소켓 연결 관리자 클래스
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, price_fetcher=None):
         self.active_connections: Dict[str, List[WebSocket]] = {
             "price_updates": [],
             "notifications": [],
             "trading_updates": []
         }
         self.connection_status = {}  # 클라이언트 연결 상태 추적
-        self.max_retry_attempts = 3  # 메시지 전송 최대 재시도 횟수
         self.ping_interval = 30  # ping 간격 (초)
         self.heartbeat_interval = 50  # 하트비트 간격 (초)
+        self._websockets = {}  # 클라이언트 ID -> 웹소켓
+        self._codecs = {}  # 클라이언트 ID -> 연결별 메시지 인코더 (?encoding= 으로 협상)
+        
+        # 채널 브로드캐스터 - 한 번 직렬화한 메시지를 클라이언트별 송신 큐로 동시 전송
+        self.broadcaster = Broadcaster(
+            max_queue=getattr(config, 'WS_CLIENT_QUEUE_SIZE', 100),
+            send_timeout=getattr(config, 'WS_SEND_TIMEOUT', 5.0),
+            on_drop=self._drop_client,
+            on_sent=self._mark_sent
+        )
+        
+        # 가격 구독 허브 - 고유 종목당 한 번만 조회하여 구독자 전체에 변경분 전달
+        self.price_hub = PriceHub(
+            fetch_price=price_fetcher,
+            poll_interval=getattr(config, 'WS_PRICE_POLL_INTERVAL', 1.0),
+            fetch_concurrency=getattr(config, 'WS_PRICE_FETCH_CONCURRENCY', 8),
+            send_timeout=getattr(config, 'WS_SEND_TIMEOUT', 5.0),
+            timestamp_func=format_time,
+            on_drop=lambda client_id: self._drop_client(client_id, "price send timeout")
+        )
 
     async def connect(self, websocket: WebSocket, channel: str):
         """
@@ -144,6 +173,10 @@ class ConnectionManager:
             client_id = id(websocket)
             
             if channel in self.active_connections:
+                # 클라이언트가 요청한 인코딩 협상 (기본값: 기존 JSON 형식)
+                encoding = negotiate_encoding(websocket.query_params.get("encoding"))
+                codec = MessageCodec(encoding)
+                
                 self.active_connections[channel].append(websocket)
                 self.connection_status[client_id] = {
                     "channel": channel,
@@ -152,9 +185,15 @@ class ConnectionManager:
                     "last_activity": datetime.datetime.now().isoformat(),
                     "messages_sent": 0,
                     "connection_errors": 0,
-                    "last_ping": datetime.datetime.now()
+                    "last_ping": datetime.datetime.now(),
+                    "encoding": encoding,
+                    "bytes_sent": 0,
+                    "connected_monotonic": time.monotonic()
                 }
-                logger.info(f"새 클라이언트 연결: 채널={channel}, ID={client_id}, IP={websocket.client.host if hasattr(websocket, 'client') else 'unknown'}")
+                self._websockets[client_id] = websocket
+                self._codecs[client_id] = codec
+                self.broadcaster.register(client_id, channel, self._make_sender(websocket), encoding)
+                logger.info(f"새 클라이언트 연결: 채널={channel}, ID={client_id}, 인코딩={encoding}, IP={websocket.client.host if hasattr(websocket, 'client') else 'unknown'}")
         except Exception as e:
             logger.error(f"웹소켓 연결 수락 중 오류 발생: {e}")
             try:
@@ -172,6 +211,13 @@ class ConnectionManager:
             if channel in self.active_connections:
                 if websocket in self.active_connections[channel]:
                     self.active_connections[channel].remove(websocket)
+            
+            # 송신 큐 및 가격 구독 해제
+            self.broadcaster.unregister(client_id)
+            self._websockets.pop(client_id, None)
+            self._codecs.pop(client_id, None)
+            if channel == "price_updates":
+                self.price_hub.unsubscribe(client_id)
                     
             # 연결 상태 정보 제거
             if client_id in self.connection_status:
@@ -181,55 +227,106 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"웹소켓 연결 해제 중 오류 발생: {e}")
 
-    async def broadcast(self, message: dict, channel: str):
+    async def broadcast(self, message: dict, channel: str, coalesce_key: Optional[str] = None):
         """
         특정 채널의 모든 연결된 클라이언트에게 메시지 전송
+        
+        메시지는 한 번만 직렬화되어 클라이언트별 송신 큐에 들어가며,
+        각 클라이언트의 송신 태스크가 동시에 전송합니다.
+        coalesce_key가 같은 대기 메시지는 최신 메시지로 교체됩니다.
         """
         if channel not in self.active_connections:
             logger.warning(f"알 수 없는 채널로 브로드캐스트 시도: {channel}")
             return
-            
-        disconnected_clients = []
         
-        for connection in self.active_connections[channel]:
-            try:
-                client_id = id(connection)
-                # 메시지 전송
-                await connection.send_json(message)
-                
-                # 연결 상태 업데이트
-                if client_id in self.connection_status:
-                    self.connection_status[client_id]["last_activity"] = datetime.datetime.now().isoformat()
-                    self.connection_status[client_id]["messages_sent"] += 1
-            except WebSocketDisconnect:
-                # 연결이 끊어진 클라이언트 목록에 추가
-                disconnected_clients.append(connection)
-            except Exception as e:
-                logger.error(f"웹소켓 메시지 전송 중 오류 발생: {e}, 채널={channel}, 클라이언트ID={id(connection)}")
-                
-                # 연결 오류 카운트 증가
-                if client_id in self.connection_status:
-                    self.connection_status[client_id]["connection_errors"] += 1
-                    
-                    # 최대 재시도 횟수를 초과하면 연결 종료
-                    if self.connection_status[client_id]["connection_errors"] > self.max_retry_attempts:
-                        logger.warning(f"최대 재시도 횟수 초과로 연결 종료: 채널={channel}, 클라이언트ID={client_id}")
-                        try:
-                            await connection.close(code=1011, reason="Too many connection errors")
-                            disconnected_clients.append(connection)
-                        except:
-                            disconnected_clients.append(connection)
+        overflowed = self.broadcaster.publish(channel, message, coalesce_key)
         
-        # 연결이 끊어진 클라이언트 제거
-        for connection in disconnected_clients:
-            self.disconnect(connection, channel)
+        # 송신 큐가 가득 찬(처리 속도가 뒤처진) 클라이언트 연결 종료
+        for client_id in overflowed:
+            logger.warning(f"송신 큐 초과로 연결 종료: 채널={channel}, 클라이언트ID={client_id}")
+            await self.broadcaster.drop(client_id, "queue overflow")
+    
+    async def _drop_client(self, client_id, reason):
+        """
+        느리거나 끊어진 클라이언트 연결 종료 및 추적 중단
+        """
+        websocket = self._websockets.get(client_id)
+        if websocket is None:
+            return
+        
+        status_info = self.connection_status.get(client_id)
+        channel = status_info["channel"] if status_info else None
+        if status_info is not None:
+            status_info["connection_errors"] += 1
+        
+        try:
+            await websocket.close(code=1013, reason=f"Client too slow ({reason})")
+        except Exception:
+            pass
+        
+        if channel is not None:
+            self.disconnect(websocket, channel)
+        else:
+            self._websockets.pop(client_id, None)
+            self._codecs.pop(client_id, None)
+    
+    def _make_sender(self, websocket: WebSocket):
+        """
+        직렬화된 메시지를 텍스트/바이너리 프레임으로 보내고 전송 바이트를 기록하는 함수 생성
+        """
+        client_id = id(websocket)
+        
+        async def send(payload):
+            if isinstance(payload, bytes):
+                await websocket.send_bytes(payload)
+                size = len(payload)
+            else:
+                await websocket.send_text(payload)
+                size = len(payload.encode("utf-8"))
+            status_info = self.connection_status.get(client_id)
+            if status_info is not None:
+                status_info["bytes_sent"] += size
+        
+        return send
+    
+    async def send_message(self, websocket: WebSocket, message: dict):
+        """
+        클라이언트가 협상한 인코딩으로 메시지 전송 (전송 실패 시 예외 발생)
+        """
+        codec = self._codecs.get(id(websocket))
+        if codec is None:
+            await websocket.send_json(message)
+            return
+        await self._make_sender(websocket)(codec.encode(message))
+    
+    def _mark_sent(self, client_id):
+        """브로드캐스트 전송 성공 시 연결 상태 업데이트"""
+        status_info = self.connection_status.get(client_id)
+        if status_info is not None:
+            status_info["last_activity"] = datetime.datetime.now().isoformat()
+            status_info["messages_sent"] += 1
+    
+    async def subscribe_prices(self, websocket: WebSocket, symbols: list):
+        """
+        가격 허브에 클라이언트의 구독 종목 설정 (기존 구독 대체)
+        """
+        client_id = id(websocket)
+        codec = self._codecs.get(client_id)
+        if codec is not None:
+            await self.price_hub.subscribe(client_id, self._make_sender(websocket), symbols, codec=codec)
+        else:
+            await self.price_hub.subscribe(client_id, websocket.send_json, symbols)
+        
+        if client_id in self.connection_status:
+            self.connection_status[client_id]["last_activity"] = datetime.datetime.now().isoformat()
+            self.connection_status[client_id]["subscribed_symbols"] = len(symbols)
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """
         특정 클라이언트에게 개인 메시지 전송
         """
         try:
-            await websocket.send_json(message)
+            await self.send_message(websocket, message)
             
             client_id = id(websocket)
             # 연결 상태 업데이트
@@ -251,7 +348,7 @@ class ConnectionManager:
                 "type": "ping",
                 "timestamp": format_time()
             }
-            await websocket.send_json(ping_message)
+            await self.send_message(websocket, ping_message)
             
             client_id = id(websocket)
             if client_id in self.connection_status:
@@ -271,16 +368,109 @@ class ConnectionManager:
             "by_channel": {
                 channel: len(conns) for channel, conns in self.active_connections.items()
             },
-            "active_clients": len(self.connection_status)
+            "active_clients": len(self.connection_status),
+            "price_hub": self.price_hub.get_stats(),
+            "fanout": self.broadcaster.get_stats(),
+            "bandwidth": self.get_bandwidth_stats()
         }
         return stats
+    
+    def get_bandwidth_stats(self):
+        """
+        채널/인코딩별 전송 바이트 및 클라이언트당 평균 초당 전송 바이트 반환
+        """
+        now = time.monotonic()
+        result = {}
+        for status_info in self.connection_status.values():
+            key = f"{status_info['channel']}:{status_info.get('encoding', 'json')}"
+            entry = result.setdefault(key, {"clients": 0, "bytes_sent": 0, "bytes_per_sec_per_client": 0.0})
+            elapsed = max(now - status_info.get("connected_monotonic", now), 1.0)
+            entry["clients"] += 1
+            entry["bytes_sent"] += status_info.get("bytes_sent", 0)
+            entry["bytes_per_sec_per_client"] += status_info.get("bytes_sent", 0) / elapsed
+        for entry in result.values():
+            entry["bytes_per_sec_per_client"] = round(entry["bytes_per_sec_per_client"] / entry["clients"], 1)
+        return result
+
+# 가격 허브용 시세 조회 함수 (전용 스레드 풀에서 StockData 조회)
+async def fetch_price_snapshot(symbol: str, market: str):
+    """가격 허브 생산자가 종목당 한 번 호출하는 시세 조회 함수"""
+    if stock_data is None:
+        return None
+    current_data = await blocking_executor.run("ws_prices", stock_data.get_latest_data, symbol, market)
+    if current_data is None:
+        return None
+    return {
+        "symbol": symbol,
+        "market": market,
+        "price": current_data.get("Close"),
+        "change": current_data.get("Change", 0),
+        "change_percent": current_data.get("ChangePercent", 0),
+        "volume": current_data.get("Volume", 0)
+    }
 
 # 웹소켓 연결 관리자 인스턴스 생성
-connection_manager = ConnectionManager()
+connection_manager = ConnectionManager(price_fetcher=fetch_price_snapshot)
+
+# GET 엔드포인트 응답 캐시 인스턴스 생성
+response_cache = ResponseCache(
+    default_ttl=getattr(config, 'API_CACHE_DEFAULT_TTL', 5),
+    max_entries=getattr(config, 'API_CACHE_MAX_ENTRIES', 256)
+)
+
+# 증권사/DB/주가 데이터 등 블로킹 호출 전용 스레드 풀 (이벤트 루프 보호)
+blocking_executor = BlockingCallExecutor(
+    max_workers=getattr(config, 'API_BLOCKING_MAX_WORKERS', 8),
+    default_limit=getattr(config, 'API_BLOCKING_DEFAULT_LIMIT', 4)
+)
+# 엔드포인트별 최대 동시 실행 수 - 증권사 API 호출 제한 보호
+blocking_executor.set_limit("portfolio", getattr(config, 'API_CONCURRENCY_PORTFOLIO', 1))
+blocking_executor.set_limit("system_status", getattr(config, 'API_CONCURRENCY_SYSTEM_STATUS', 2))
+blocking_executor.set_limit("stock_list", getattr(config, 'API_CONCURRENCY_STOCK_LIST', 2))
+blocking_executor.set_limit("performance_report", getattr(config, 'API_CONCURRENCY_PERFORMANCE', 2))
+blocking_executor.set_limit("ws_prices", getattr(config, 'API_CONCURRENCY_WS_PRICES', 4))
+blocking_executor.set_limit("debug_trace", 1)
+
+# 이벤트 루프 지연 측정기
+loop_lag_monitor = EventLoopLagMonitor(
+    interval=getattr(config, 'API_LOOP_LAG_INTERVAL', 0.5),
+    warn_threshold=getattr(config, 'API_LOOP_LAG_WARN_THRESHOLD', 0.2)
+)
+
+# API 서버 자원 샘플러 (CPU 사용률 기준점을 미리 잡아 두어 상태 조회 시 기다리지 않음)
+resource_sampler = get_resource_sampler()
+resource_sampler.track('api_server', pid=os.getpid())
+resource_sampler.track('main', pid_file="stock_analysis.pid")
+
+# API 서버 메트릭 (main.py 등 다른 프로세스 메트릭은 /metrics에서 파일로 합침)
+metrics_registry = get_metrics_registry()
+metrics_registry.process = "api_server"
+metrics_registry.gauge("api_event_loop_lag_seconds", "이벤트 루프 지연 (마지막 측정)").set_function(
+    lambda: loop_lag_monitor.last_lag)
+metrics_registry.gauge("api_event_loop_max_lag_seconds", "이벤트 루프 최대 지연").set_function(
+    lambda: loop_lag_monitor.max_lag)
+
+# 트레이서와 프로파일러 제어 (main.py 프로파일러는 제어 파일로 켜고 끔)
+get_tracer(config).process = "api_server"
+debug_control = DebugControl(getattr(config, 'DEBUG_DIR', os.path.join("cache", "debug")), "api_server",
+                             max_duration=getattr(config, 'PROFILER_MAX_DURATION_SECONDS', 600))
 
 # FastAPI 앱 생성
 app = FastAPI(title="주식 트레이딩 시스템 API", version="1.0.0")
 
+@app.on_event("startup")
+async def start_runtime_monitors():
+    """서버 시작 시 이벤트 루프 지연 측정 및 가격 허브 시작"""
+    loop_lag_monitor.start()
+    connection_manager.price_hub.start()
+
+@app.on_event("shutdown")
+async def stop_runtime_monitors():
+    """서버 종료 시 측정 태스크, 가격 허브 및 스레드 풀 정리"""
+    loop_lag_monitor.stop()
+    await connection_manager.price_hub.stop()
+    blocking_executor.shutdown(wait=False)
+
 # JWT 설정
 JWT_SECRET = os.environ.get("JWT_SECRET", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
@@ -387,7 +577,11 @@ async def websocket_price_updates(websocket: WebSocket, token: str):
                 try:
                     data = await websocket.receive_json()
                     
-                    # symbols 필드가 없거나 비어있는 경우 안전하게 처리
+                    # 구독 종목 목록이 없는 메시지(ping/pong 등)는 기존 구독 유지
+                    if not isinstance(data, dict) or "symbols" not in data:
+                        continue
+                    
+                    # symbols 필드가 비어있거나 형식이 잘못된 경우 안전하게 처리
                     symbols = data.get("symbols", [])
                     if not symbols or not isinstance(symbols, list):
                         symbols = []
@@ -396,43 +590,18 @@ async def websocket_price_updates(websocket: WebSocket, token: str):
                     if not markets or not isinstance(markets, list):
                         markets = ["KR"]
 
-                    # 요청된 종목들의 현재가 조회
-                    price_updates = {}
-                    
+                    # 요청된 종목을 가격 허브에 구독 - 시세 조회와 전송은 허브의 생산자 태스크가 담당
+                    requested = []
                     for symbol in symbols:
-                        if not symbol:  # None이나 빈 문자열 체크
+                        if not symbol or not isinstance(symbol, str):  # None이나 빈 문자열 체크
                             continue
                             
                         market = "KR" if len(symbol) == 6 and symbol.isdigit() else "US"
                         if market not in markets:
                             continue
-                        
-                        try:
-                            current_data = stock_data.get_latest_data(symbol, market)
-                            if current_data is not None:
-                                price_updates[symbol] = {
-                                    "symbol": symbol,
-                                    "market": market,
-                                    "price": current_data.get("Close"),
-                                    "change": current_data.get("Change", 0),
-                                    "change_percent": current_data.get("ChangePercent", 0),
-                                    "volume": current_data.get("Volume", 0),
-                                    "timestamp": format_time()
-                                }
-                        except Exception as e:
-                            logger.warning(f"종목 {symbol} 현재가 조회 실패: {e}")
-
-                    # 가격 정보 전송
-                    if price_updates:
-                        try:
-                            await websocket.send_json({
-                                "type": "price_update",
-                                "data": price_updates,
-                                "timestamp": format_time()
-                            })
-                        except Exception as e:
-                            logger.error(f"가격 업데이트 전송 중 오류: {e}")
-                            break
+                        requested.append((symbol, market))
+                    
+                    await connection_manager.subscribe_prices(websocket, requested)
                         
                 except json.JSONDecodeError:
                     logger.warning("잘못된 JSON 형식의 메시지를 받음")
@@ -451,9 +620,6 @@ async def websocket_price_updates(websocket: WebSocket, token: str):
                 except Exception as e:
                     logger.error(f"클라이언트 메시지 수신 중 오류: {e}")
                     break
-                    
-                # 1초 대기
-                await asyncio.sleep(1)
         except WebSocketDisconnect:
             logger.info(f"유저 '{username}'의 가격 업데이트 WebSocket 연결 종료")
         except Exception as e:
@@ -544,7 +710,7 @@ async def websocket_notifications(websocket: WebSocket, token: str):
                 # 하트비트 메시지 전송 (30초마다)
                 if current_time - last_heartbeat_time >= heartbeat_interval:
                     try:
-                        await websocket.send_json({
+                        await connection_manager.send_message(websocket, {
                             "type": "heartbeat",
                             "timestamp": format_time(),
                             "connection_id": id(websocket)
@@ -691,7 +857,7 @@ async def websocket_trading(websocket: WebSocket, token: str):
                 # 하트비트 메시지 전송 (30초마다)
                 if current_time - last_heartbeat_time >= heartbeat_interval:
                     try:
-                        await websocket.send_json({
+                        await connection_manager.send_message(websocket, {
                             "type": "heartbeat",
                             "timestamp": format_time(),
                             "connection_id": id(websocket)
@@ -765,6 +931,9 @@ async def send_notification(message: str, notification_type: str = "info", data:
         logger.error(f"알림 전송 중 오류: {e}")
         return False
 
+# 전송 대기 중 최신 값으로 병합해도 되는 트레이딩 업데이트 유형
+COALESCED_TRADING_UPDATE_TYPES = {"status", "portfolio", "positions", "balance"}
+
 # 트레이딩 업데이트 전송 함수
 async def send_trading_update(update_type: str, data: Any):
     try:
@@ -774,13 +943,47 @@ async def send_trading_update(update_type: str, data: Any):
             "data": data,
             "timestamp": format_time()
         }
-        await connection_manager.broadcast(trading_update, "trading_updates")
+        # 거래 이벤트로 인해 잔고/성과가 바뀌었으므로 관련 응답 캐시 무효화
+        invalidate_trade_caches()
+        # 상태성 업데이트는 아직 전송되지 않은 이전 값을 최신 값으로 교체 (개별 체결 이벤트는 모두 전달)
+        coalesce_key = f"trading_update:{update_type}" if update_type in COALESCED_TRADING_UPDATE_TYPES else None
+        await connection_manager.broadcast(trading_update, "trading_updates", coalesce_key=coalesce_key)
         logger.info(f"트레이딩 업데이트 전송: {update_type}")
         return True
     except Exception as e:
         logger.error(f"트레이딩 업데이트 전송 중 오류: {e}")
         return False
 
+# 거래 이벤트 발생 시 응답 캐시 무효화 함수
+def invalidate_trade_caches():
+    """포트폴리오 및 성과 리포트 응답 캐시 무효화"""
+    removed = response_cache.invalidate("portfolio")
+    removed += response_cache.invalidate("reports:")
+    return removed
+
+def _is_ok_response(value):
+    """정상 응답만 캐시하도록 판별"""
+    return isinstance(value, dict) and value.get("status") == "ok"
+
+async def _cached_blocking_response(request: Request, key: str, build, ttl, task_name: str):
+    """캐시를 먼저 확인하고, 없으면 전용 스레드 풀에서 응답을 생성"""
+    entry = response_cache.peek(key)
+    if entry is None:
+        entry = await blocking_executor.run(
+            task_name, response_cache.get_or_compute, key, build, ttl=ttl, cache_if=_is_ok_response
+        )
+    return _cached_json_response(request, entry)
+
+def _cached_json_response(request: Request, entry):
+    """캐시 항목을 ETag 헤더가 포함된 응답으로 변환 (If-None-Match 일치 시 304)"""
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"private, max-age={entry.max_age()}"
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=entry.value, headers=headers)
+
 # API 라우트 정의 - 루트 경로 핸들러 추가
 @app.get("/")
 def root():
@@ -792,6 +995,7 @@ def root():
         "timestamp": int(time.time() * 1000),
         "endpoints": {
             "system_status": "/api/system/status",
+            "system_resources": "/api/system/resources",
             "login": "/api/login",
             "portfolio": "/api/portfolio",
             "stocks": "/api/stocks/list"
@@ -799,10 +1003,108 @@ def root():
     }
 
 @app.get("/api/system/status")
-def system_status():
+async def system_status():
     """시스템 상세 상태 정보 API"""
+    response = await blocking_executor.run("system_status", _build_system_status)
+    response["runtime"] = get_runtime_stats()
+    return response
+
+def get_runtime_stats():
+    """API 서버 런타임 통계 (이벤트 루프 지연, 스레드 풀, 응답 캐시)"""
+    return {
+        "event_loop": loop_lag_monitor.get_stats(),
+        "blocking_executor": blocking_executor.get_stats(),
+        "response_cache": response_cache.get_stats()
+    }
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus 텍스트 노출 형식 메트릭 (API 서버와 최근 기록된 다른 프로세스 메트릭)"""
+    exports = load_exports(
+        getattr(config, 'METRICS_EXPORT_DIR', os.path.join("cache", "metrics")),
+        max_age=getattr(config, 'METRICS_EXPORT_MAX_AGE_SECONDS', 120),
+        exclude=metrics_registry.process
+    )
+    exports.append((metrics_registry.process, metrics_registry.collect()))
+    return PlainTextResponse(render_families(merge_families(exports)), media_type="text/plain; version=0.0.4")
+
+@app.post("/api/debug/profiler")
+def toggle_profiler(enabled: bool = True, interval_ms: Optional[float] = None, duration_seconds: Optional[float] = None,
+                    process: str = "all"):
+    """
+    샘플링 프로파일러 켜기/끄기 API
+
+    process가 'api_server'면 API 서버만, 'main'이면 트레이딩 프로세스만(제어 파일), 'all'이면 둘 다 적용합니다.
+    트레이딩 프로세스는 DEBUG_CONTROL_POLL_SECONDS 안에 요청을 읽습니다.
+    """
+    interval = (interval_ms or getattr(config, 'PROFILER_INTERVAL_MS', 10)) / 1000
+    if process in ("all", "api_server"):
+        debug_control.apply_local(enabled, interval, duration_seconds)
+    if process in ("all", "main"):
+        debug_control.request(profiler={'enabled': enabled, 'interval': interval, 'duration': duration_seconds})
+    return {"status": "ok", "timestamp": int(time.time() * 1000), "enabled": enabled, "process": process,
+            "api_server": debug_control.profiler.status()}
+
+@app.get("/api/debug/profiler")
+def profiler_report(limit: int = 30):
+    """프로세스별 프로파일러 상태와 상위 함수/구간 (트레이딩 프로세스는 마지막으로 기록한 결과)"""
+    report = {"api_server": {"status": debug_control.profiler.status(), "top": debug_control.profiler.top(limit)}}
+    for process in debug_control.processes():
+        if process == debug_control.process:
+            continue
+        result = debug_control.load_result('profile', process,
+                                           max_age=getattr(config, 'DEBUG_RESULT_MAX_AGE_SECONDS', 3600))
+        if result:
+            result.pop('collapsed', None)
+            report[process] = result
+    return {"status": "ok", "timestamp": int(time.time() * 1000), "processes": report}
+
+@app.get("/api/debug/profiler/collapsed")
+def profiler_collapsed(process: str = "main"):
+    """접힌 스택 형식 프로파일 (flamegraph.pl, speedscope에 바로 입력)"""
+    if process == debug_control.process:
+        lines = debug_control.profiler.collapsed()
+    else:
+        result = debug_control.load_result('profile', process,
+                                           max_age=getattr(config, 'DEBUG_RESULT_MAX_AGE_SECONDS', 3600)) or {}
+        lines = result.get('collapsed', [])
+    return PlainTextResponse("\n".join(lines) + "\n")
+
+@app.get("/api/debug/trace")
+async def debug_trace(wait_seconds: float = 5.0):
+    """
+    Chrome 트레이스 JSON (chrome://tracing, Perfetto에서 열기)
+
+    트레이딩 프로세스에 덤프를 요청하고 wait_seconds(최대 30초)까지 기다린 뒤 API 서버 구간과 합쳐 반환합니다.
+    요청 이후에 기록된 덤프만 합치므로 종료된 프로세스의 이전 덤프는 포함되지 않습니다.
+    """
+    trace = await blocking_executor.run("debug_trace", debug_control.collect_traces, min(max(wait_seconds, 0), 30))
+    return JSONResponse(content=trace)
+
+@app.get("/api/system/resources")
+async def system_resources():
+    """프로세스별 자원 시계열 (RSS, CPU, 스레드, FD)과 누수 의심 알림 API"""
+    return await blocking_executor.run("system_resources", _build_resource_samples)
+
+def _build_resource_samples():
+    """프로세스 모니터가 내보낸 시계열을 반환하고, 없거나 오래됐으면 API 서버가 직접 샘플링"""
+    snapshot = load_export(
+        getattr(config, 'RESOURCE_SAMPLES_PATH', os.path.join("cache", "resource_samples.json")),
+        max_age=getattr(config, 'RESOURCE_SAMPLES_MAX_AGE_SECONDS', 180)
+    )
+    if snapshot is not None:
+        snapshot["source"] = "process_monitor"
+        return snapshot
+    resource_sampler.sample()
+    snapshot = resource_sampler.snapshot(max_points=720)
+    snapshot["source"] = "api_server"
+    return snapshot
+
+def _build_system_status():
+    """시스템 상태 응답 생성"""
     try:
-        cpu_usage = psutil.cpu_percent(interval=0.1)
+        # 직전 호출 이후 평균 CPU 사용률 (측정 구간 동안 기다리지 않음)
+        cpu_usage = psutil.cpu_percent(interval=None)
         memory_usage = psutil.virtual_memory().percent
         disk_usage = psutil.disk_usage('/').percent
         
@@ -876,8 +1178,16 @@ def automation_status():
         return {"status": "error", "message": str(e)}
 
 @app.get("/api/portfolio")
-def get_portfolio():
+async def get_portfolio(request: Request):
     """포트폴리오 정보 조회 API"""
+    return await _cached_blocking_response(
+        request, "portfolio", _build_portfolio_response,
+        ttl=getattr(config, 'API_CACHE_TTL_PORTFOLIO', 5),
+        task_name="portfolio"
+    )
+
+def _build_portfolio_response():
+    """포트폴리오 응답 생성 (증권사 API 호출)"""
     try:
         # 증권사 API가 초기화되어 있는지 확인
         if 'broker' not in globals() or broker is None:
@@ -937,12 +1247,20 @@ def get_portfolio():
         }
 
 @app.get("/api/stocks/list")
-def get_stock_list(market: str = "KR"):
+async def get_stock_list(request: Request, market: str = "KR"):
     """주식 목록 조회 API"""
+    if market not in ["KR", "US"]:
+        raise HTTPException(status_code=400, detail="지원하지 않는 마켓 코드입니다. 'KR' 또는 'US'를 사용하세요.")
+    
+    return await _cached_blocking_response(
+        request, f"stocks:list:{market}", lambda: _build_stock_list_response(market),
+        ttl=getattr(config, 'API_CACHE_TTL_STOCK_LIST', 30),
+        task_name="stock_list"
+    )
+
+def _build_stock_list_response(market):
+    """주식 목록 응답 생성 (추천 종목 캐시 파일 파싱)"""
     try:
-        if market not in ["KR", "US"]:
-            raise HTTPException(status_code=400, detail="지원하지 않는 마켓 코드입니다. 'KR' 또는 'US'를 사용하세요.")
-        
         # Dashboard.js와 정확히 매핑되는 형식의 응답 구성
         stocks = []
         
@@ -1027,15 +1345,23 @@ def get_stock_list(market: str = "KR"):
         }
 
 @app.get("/api/reports/performance")
-def get_performance_report(days: int = 30):
+async def get_performance_report(request: Request, days: int = 30):
     """성과 리포트 조회 API"""
+    # 유효한 기간 검증
+    if days <= 0:
+        raise HTTPException(status_code=400, detail="days 파라미터는 양수여야 합니다.")
+    elif days > 365:
+        raise HTTPException(status_code=400, detail="최대 365일까지만 조회 가능합니다.")
+    
+    return await _cached_blocking_response(
+        request, f"reports:performance:{days}", lambda: _build_performance_report(days),
+        ttl=getattr(config, 'API_CACHE_TTL_PERFORMANCE', 60),
+        task_name="performance_report"
+    )
+
+def _build_performance_report(days):
+    """성과 리포트 응답 생성 (기간별 집계 계산)"""
     try:
-        # 유효한 기간 검증
-        if days <= 0:
-            raise HTTPException(status_code=400, detail="days 파라미터는 양수여야 합니다.")
-        elif days > 365:
-            raise HTTPException(status_code=400, detail="최대 365일까지만 조회 가능합니다.")
-        
         # 시작일과 종료일 계산
         end_date = get_current_time()
         start_date = end_date - datetime.timedelta(days=days)
@@ -1152,6 +1478,17 @@ def get_performance_report(days: int = 30):
             "daily_performance": []
         }
 
+@app.post("/api/cache/invalidate")
+def invalidate_cache(prefix: Optional[str] = None):
+    """응답 캐시 무효화 API (트레이딩 프로세스의 주문 추적기가 체결 반영 시 호출, 캐시 묶음은 prefix로 지정)"""
+    removed = response_cache.invalidate(prefix) if prefix else invalidate_trade_caches()
+    return {
+        "status": "ok",
+        "timestamp": int(time.time() * 1000),
+        "removed": removed,
+        "cache_stats": response_cache.get_stats()
+    }
+
 # 로그인 API 엔드포인트 추가
 @app.post("/api/login", response_model=Token)
 @app.post("/login", response_model=Token)  # /login 경로도 추가 (프론트엔드 호환성)
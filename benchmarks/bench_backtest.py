@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+벡터화 백테스트 엔진 벤치마크
+
+KOSPI 규모(약 950종목 x 10년)의 가상 일봉 데이터로
+지표 계산, 신호 생성, 손절/익절 시뮬레이션 전체 실행 시간을 측정합니다.
+--csv/--parquet 로 실제 데이터 파일을, --db 로 price_cache 데이터를 사용할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_backtest.py --symbols 950 --years 10
+    python benchmarks/bench_backtest.py --db --market KR
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtest.data import PriceMatrix
+from src.backtest.engine import run_backtest
+
+
+def make_synthetic_prices(num_symbols, num_dates, seed=42):
+    """기하 브라운 운동 기반 가상 OHLCV 생성 (일부 종목은 중간 상장)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2015-01-02", periods=num_dates)
+    returns = rng.normal(0.0003, 0.02, size=(num_dates, num_symbols))
+    close = 10000 * np.exp(np.cumsum(returns, axis=0))
+    gap = rng.normal(0, 0.005, size=close.shape)
+    open_ = close * np.exp(-returns + gap)
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, size=close.shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, size=close.shape)))
+    volume = rng.integers(10000, 1000000, size=close.shape).astype(np.float64)
+
+    # 10% 종목은 기간 중간에 상장
+    listing = rng.integers(0, num_dates // 2, size=num_symbols)
+    listing[rng.random(num_symbols) > 0.1] = 0
+    for field in (open_, high, low, close, volume):
+        for col in np.flatnonzero(listing):
+            field[:listing[col], col] = np.nan
+
+    symbols = [f"{i:06d}" for i in range(num_symbols)]
+    return PriceMatrix(dates, symbols, open_, high, low, close, volume, market="KR")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터화 백테스트 벤치마크")
+    parser.add_argument("--symbols", type=int, default=950, help="가상 종목 수")
+    parser.add_argument("--years", type=int, default=10, help="가상 데이터 기간 (년)")
+    parser.add_argument("--csv", help="long 형식 CSV 파일 경로")
+    parser.add_argument("--parquet", help="long 형식 Parquet 파일 경로")
+    parser.add_argument("--db", action="store_true", help="price_cache 테이블 사용")
+    parser.add_argument("--market", default="KR", help="시장 구분 (KR/US)")
+    parser.add_argument("--fill", default="next_open", help="체결 방식 (next_open/close)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.csv or args.parquet:
+        prices = PriceMatrix.from_file(args.csv or args.parquet, market=args.market)
+    elif args.db:
+        import config
+        prices = PriceMatrix.from_database(args.market)
+    else:
+        prices = make_synthetic_prices(args.symbols, args.years * 252)
+    load_time = time.perf_counter() - started
+
+    try:
+        import config
+    except ImportError:
+        config = None
+
+    result = run_backtest(prices, config, fill=args.fill)
+    summary = result.summary()
+
+    print("=" * 60)
+    print("벡터화 백테스트 벤치마크")
+    print("=" * 60)
+    print(f"데이터                   : {prices}")
+    print(f"데이터 로드              : {load_time:.2f}초")
+    print(f"백테스트 실행            : {result.elapsed:.2f}초")
+    print(f"거래 수 / 승률           : {summary['num_trades']:,} / {summary['win_rate']:.1f}%")
+    print(f"총 손익 / 수익률         : {summary['total_pnl']:,.0f} / {summary['total_return_pct']:.2f}%")
+    print(f"최대 낙폭                : {summary['max_drawdown']:,.0f} ({summary['max_drawdown_pct']:.2f}%)")
+    print(f"평균 보유 기간           : {summary['avg_holding_days']:.1f}일")
+    print(f"청산 사유                : {summary['exit_reasons']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+주문 해시키 단계 벤치마크
+
+로컬 HTTP 서버로 한국투자증권 해시키/주문 API를 흉내 내고(요청마다 --latency ms 지연)
+KISAPI.buy_stock의 주문당 지연을 다음 경우로 나누어 측정합니다.
+
+- 기존 방식: 요청마다 새 연결 + 해시키 발급 후 주문 (왕복 2회)
+- 연결 재사용 + 해시키 사용
+- 연결 재사용 + 같은 본문 재시도 (해시키 캐시 적중)
+- 연결 재사용 + 해시키 미사용 (KIS_USE_HASHKEY = False)
+
+사용법:
+    python benchmarks/bench_hashkey.py --orders 50 --latency 20
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.trading.kis_api import KISAPI
+from src.utils.time_utils import get_current_time
+
+
+def make_handler(latency, counters):
+    class KISHandler(BaseHTTPRequestHandler):
+        """해시키/주문 API 모의 서버 (HTTP/1.1 keep-alive)"""
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            if self.path.endswith("/uapi/hashkey"):
+                counters['hashkey'] += 1
+                payload = {"HASH": hashlib.sha256(body).hexdigest()}
+            else:
+                counters['order'] += 1
+                payload = {"rt_cd": "0", "msg1": "주문 전송 완료", "output": {"ODNO": f"{counters['order']:010d}"}}
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return KISHandler
+
+
+def make_api(base_url, workdir, use_hashkey):
+    config = SimpleNamespace(
+        KIS_REAL_TRADING=True, KIS_APP_KEY="bench", KIS_APP_SECRET="bench", KIS_ACCOUNT_NO="00000000",
+        KIS_TOKEN_CACHE_DIR=workdir, LOG_DIRECTORY=workdir, KIS_USE_HASHKEY=use_hashkey
+    )
+    api = KISAPI(config)
+    api.base_url = base_url
+    api.enable_detailed_logging = False
+    # 토큰 발급 없이 주문 경로만 측정
+    api.access_token = "bench-token"
+    api.token_expired_at = get_current_time() + timedelta(days=1)
+    return api
+
+
+def run_case(api, orders, same_body):
+    latencies = []
+    for i in range(orders):
+        quantity = 1 if same_body else i + 1
+        started = time.perf_counter()
+        order_no = api.buy_stock("005930", quantity, price=70000, order_type="limit")
+        latencies.append(time.perf_counter() - started)
+        if not order_no:
+            raise RuntimeError("모의 주문 실패")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문 해시키 단계 벤치마크")
+    parser.add_argument("--orders", type=int, default=50, help="경우별 주문 수")
+    parser.add_argument("--latency", type=float, default=20.0, help="모의 서버 요청당 지연 (ms)")
+    args = parser.parse_args()
+
+    # 주문별 INFO 로그가 측정에 섞이지 않도록 억제
+    logging.disable(logging.INFO)
+    counters = {'hashkey': 0, 'order': 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency / 1000, counters))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    cases = [
+        ("기존 방식 (새 연결, 해시키)", True, False, True),
+        ("연결 재사용 + 해시키", True, False, False),
+        ("연결 재사용 + 같은 본문 재시도", True, True, False),
+        ("연결 재사용 + 해시키 미사용", False, False, False),
+    ]
+
+    print(f"주문 {args.orders}건 x {len(cases)}가지, 모의 서버 지연 {args.latency:g}ms")
+    print(f"{'경우':<28} {'p50':>9} {'p95':>9} {'평균':>9} {'해시키 요청':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, use_hashkey, same_body, legacy in cases:
+            api = make_api(base_url, workdir, use_hashkey)
+            if legacy:
+                # 세션 대신 requests 모듈 함수 사용 (요청마다 새 연결)
+                api.session = requests
+            before = counters['hashkey']
+            latencies = sorted(run_case(api, args.orders, same_body))
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"{name:<28} {statistics.median(latencies) * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms "
+                  f"{statistics.mean(latencies) * 1000:>7.1f}ms {counters['hashkey'] - before:>10}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
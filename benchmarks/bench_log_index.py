@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+로그 검색 인덱스 벤치마크
+
+여러 날짜에 걸친 합성 로그(표준 logging 형식, 예외 traceback 포함)를 만들고
+"지난 일주일 005930 관련 KISAPI 오류" 같은 질의를 다음 두 방식으로 비교합니다.
+
+- 선형 검색: 로그 파일을 처음부터 읽으며 줄마다 조건 확인 (기존 방식)
+- LogIndex: 한 번 인덱싱한 뒤 인덱스로 검색, 덧붙은 로그의 증분 인덱싱 시간도 측정
+
+사용법:
+    python benchmarks/bench_log_index.py --lines 1000000
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.log_index import LogIndex
+
+LOGGERS = ["KISAPI", "RealtimeTrader", "GPTAutoTrader", "StockData", "KakaoSender", "DatabaseManager"]
+LEVELS = ["INFO"] * 12 + ["DEBUG"] * 4 + ["WARNING"] * 3 + ["ERROR"]
+SYMBOLS = ["005930", "000660", "035420", "051910", "005380", "068270", "035720", "105560"]
+
+
+def write_log(path, lines, start, seed=0):
+    """합성 로그 작성 (30초 간격, 오류의 1/4에 traceback)"""
+    rng = random.Random(seed)
+    now = start
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(lines):
+            now += timedelta(seconds=30)
+            name, level, symbol = rng.choice(LOGGERS), rng.choice(LEVELS), rng.choice(SYMBOLS)
+            f.write(f"{now:%Y-%m-%d %H:%M:%S},{i % 1000:03d} - {name} - {level} - "
+                    f"{symbol} 시세 조회 처리 {i}회차, 응답 {rng.randint(10, 900)}ms\n")
+            if level == "ERROR" and i % 4 == 0:
+                f.write("Traceback (most recent call last):\n  File \"kis_api.py\", line 812, in get_stock_price\n"
+                        "requests.exceptions.ReadTimeout: HTTPSConnectionPool read timed out\n")
+    return now
+
+
+def linear_search(path, logger_name, level, symbol, since):
+    """기존 방식: 파일 전체를 줄 단위로 읽으며 조건 확인"""
+    header = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\d{3} - (\S+) - (\w+) - ')
+    since_text = since.strftime('%Y-%m-%d %H:%M:%S')
+    results = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            match = header.match(line)
+            if match and match.group(2) == logger_name and match.group(3) in level \
+                    and match.group(1) >= since_text and symbol in line:
+                results.append(line)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그 검색 인덱스 벤치마크")
+    parser.add_argument("--lines", type=int, default=1000000, help="합성 로그 줄 수")
+    parser.add_argument("--append", type=int, default=10000, help="증분 인덱싱 측정 시 덧붙일 줄 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "stock_analysis.log")
+        start = datetime(2026, 1, 1)
+        end = write_log(path, args.lines, start)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        since = end - timedelta(days=7)
+        print(f"합성 로그 {args.lines:,}줄 ({size_mb:.0f}MB, {start:%Y-%m-%d} ~ {end:%Y-%m-%d})")
+
+        started = time.perf_counter()
+        expected = linear_search(path, "KISAPI", ("ERROR", "CRITICAL"), "005930", since)
+        linear = time.perf_counter() - started
+
+        index = LogIndex(path=os.path.join(workdir, "log_index.db"), sources=[path])
+        started = time.perf_counter()
+        entries = index.update()
+        build = time.perf_counter() - started
+        index_mb = sum(os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir)
+                       if name.startswith("log_index.db")) / 1024 / 1024
+
+        queries = [
+            ("KISAPI ERROR 005930 최근 7일", dict(logger="KISAPI", level="ERROR", symbol="005930", since=since)),
+            ("ERROR 이상 최근 1일 50건", dict(level="ERROR", since=end - timedelta(days=1), limit=50)),
+            ("000660 전체 기간 최신 100건", dict(symbol="000660", limit=100)),
+        ]
+        print(f"{'질의':<30} {'결과':>6} {'시간':>10}")
+        print(f"{'선형 검색 (KISAPI ERROR 005930 7일)':<30} {len(expected):>6} {linear * 1000:>8.0f}ms")
+        for name, query in queries:
+            query.setdefault("limit", 100000)
+            index.search(**query)  # 페이지 캐시 예열
+            started = time.perf_counter()
+            results = index.search(**query)
+            print(f"{name:<30} {len(results):>6} {(time.perf_counter() - started) * 1000:>8.1f}ms")
+
+        first = index.search(logger="KISAPI", level="ERROR", symbol="005930", since=since, limit=100000)
+        assert len(first) == len(expected), (len(first), len(expected))
+
+        write_log(path, args.append, end, seed=1)
+        started = time.perf_counter()
+        added = index.update()
+        incremental = time.perf_counter() - started
+        print(f"전체 인덱싱 {entries:,}개 항목 {build:.1f}초 (인덱스 {index_mb:.0f}MB), "
+              f"증분 인덱싱 {added:,}개 항목 {incremental * 1000:.0f}ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
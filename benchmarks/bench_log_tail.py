@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+로그 tail 벤치마크
+
+기존 log_monitor.tail_logs 방식(주기마다 glob + 파일별 seek/readlines + 줄마다 정규식 컴파일/잠금)과
+LogTailer(덧붙은 바이트만 큰 단위로 읽기 + 미리 컴파일한 필터 + 덩어리마다 한 번 잠금)를 비교합니다.
+
+- 대기 비용: 로그가 늘지 않을 때 한 주기의 비용 (logs/ 디렉토리에 --files개 회전된 파일)
+- 처리량: 큰 로그 파일에 --lines줄이 덧붙었을 때 읽기/필터링 시간
+
+사용법:
+    python benchmarks/bench_log_tail.py --files 500 --lines 200000
+"""
+import argparse
+import glob
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.log_tail import LogTailer
+
+ERROR_PATTERN = r'\b(ERROR|CRITICAL|EXCEPTION)\b'
+LINE = "2026-10-16 10:00:{sec:02d},123 - KISAPI - {level} - 005930 주문 체결 확인 {i}\n"
+
+
+def make_lines(count, start=0):
+    levels = ("INFO", "INFO", "INFO", "WARNING", "ERROR")
+    return "".join(LINE.format(sec=i % 60, level=levels[i % 5], i=i) for i in range(start, start + count))
+
+
+class LegacyTail:
+    """기존 tail_logs 한 주기"""
+
+    def __init__(self, logs_dir):
+        self.logs_dir = logs_dir
+        self.files = {}
+        self.logs = deque(maxlen=1000)
+        self.mutex = threading.Lock()
+
+    def cycle(self):
+        trading_logs = sorted(glob.glob(f'{self.logs_dir}/trading_log_*.log'), key=os.path.getmtime, reverse=True)
+        path = trading_logs[0]
+        info = self.files.get('trading')
+        if not info or info['path'] != path:
+            handle = open(path, 'r')
+            handle.seek(0, os.SEEK_END)
+            info = self.files['trading'] = {'path': path, 'handle': handle, 'position': handle.tell()}
+        handle = info['handle']
+        handle.seek(info['position'])
+        for line in handle.readlines():
+            line = line.strip()
+            if line and re.search(ERROR_PATTERN, line, re.IGNORECASE):
+                with self.mutex:
+                    self.logs.append(f"[TRADING] {line}")
+        info['position'] = handle.tell()
+
+    def close(self):
+        for info in self.files.values():
+            info['handle'].close()
+
+
+class NewTail:
+    def __init__(self, logs_dir, use_inotify):
+        self.logs = deque(maxlen=1000)
+        self.mutex = threading.Lock()
+        self.error_re = re.compile(ERROR_PATTERN, re.IGNORECASE | re.ASCII)
+        self.tailer = LogTailer(self.on_lines, use_inotify=use_inotify)
+        self.tailer.add('trading', f'{logs_dir}/trading_log_*.log')
+
+    def on_lines(self, tag, lines):
+        tagged = ["[TRADING] " + line for line in lines if self.error_re.search(line)]
+        with self.mutex:
+            self.logs.extend(tagged)
+
+    def cycle(self, timeout=0):
+        self.tailer.run_once(timeout)
+
+    def close(self):
+        self.tailer.close()
+
+
+def measure(tail, cycles):
+    started = time.perf_counter()
+    for _ in range(cycles):
+        tail.cycle()
+    return (time.perf_counter() - started) / cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그 tail 벤치마크")
+    parser.add_argument("--files", type=int, default=500, help="logs/ 디렉토리의 회전된 로그 파일 수")
+    parser.add_argument("--lines", type=int, default=200000, help="처리량 측정 시 덧붙일 줄 수")
+    parser.add_argument("--cycles", type=int, default=200, help="대기 비용 측정 주기 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(args.files):
+            with open(os.path.join(workdir, f"trading_log_2026{i:05d}.log"), "w") as f:
+                f.write(make_lines(10))
+        current = os.path.join(workdir, "trading_log_2099.log")
+        with open(current, "w") as f:
+            f.write(make_lines(10000))
+
+        tails = [("기존 방식", lambda: LegacyTail(workdir)),
+                 ("LogTailer (폴링)", lambda: NewTail(workdir, False)),
+                 ("LogTailer (inotify)", lambda: NewTail(workdir, True))]
+
+        print(f"회전된 파일 {args.files}개, 덧붙일 줄 {args.lines:,}개")
+        print(f"{'방식':<22} {'대기 1주기':>12} {'처리량':>16} {'ERROR 줄':>10}")
+        appended = make_lines(args.lines, start=10000)
+        for name, factory in tails:
+            # 각 방식은 현재 파일 끝에서 시작 (앞 방식이 덧붙인 내용은 읽지 않음)
+            tail = factory()
+            tail.cycle()
+            inotify = isinstance(tail, NewTail) and tail.tailer.mode == "inotify"
+            # inotify는 이벤트가 없으면 select에서 잠들어 있으므로 대기 비용을 재지 않음
+            idle = measure(tail, args.cycles) if not inotify else None
+            with open(current, "a") as f:
+                f.write(appended)
+            started = time.perf_counter()
+            # inotify는 이벤트가 올 때까지 대기, 폴링은 sleep 없이 한 주기만
+            tail.cycle(timeout=1.0) if inotify else tail.cycle()
+            elapsed = time.perf_counter() - started
+            rate = len(appended.encode("utf-8")) / elapsed / 1024 / 1024
+            idle_text = f"{idle * 1000:>10.3f}ms" if idle is not None else f"{'(이벤트 대기)':>10}"
+            print(f"{name:<22} {idle_text} {elapsed * 1000:>8.0f}ms {rate:>4.0f}MB/s {len(tail.logs):>10}")
+            tail.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+메트릭 기록 비용 벤치마크
+
+@timed 데코레이터와 히스토그램 observe()의 호출당 비용을 측정하고, 여러 스레드가 동시에 기록할 때
+스레드별 누적 칸 방식과 잠금 하나를 공유하는 방식을 비교합니다. 분위수 정확도는 numpy 결과와 비교합니다.
+
+사용법:
+    python benchmarks/bench_metrics.py --ops 200000 --threads 8
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.metrics import MetricsRegistry, timed
+
+
+class LockedHistogram:
+    """비교용: 잠금 하나를 공유하는 히스토그램"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.counts = {}
+
+    def observe(self, value):
+        with self.lock:
+            self.count += 1
+            self.total += value
+            key = int(value * 1e4)
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+def run_threads(observe, values, threads):
+    chunks = [values[i::threads] for i in range(threads)]
+
+    def work(chunk):
+        for value in chunk:
+            observe(value)
+
+    workers = [threading.Thread(target=work, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메트릭 기록 비용 벤치마크")
+    parser.add_argument("--ops", type=int, default=200000, help="기록 횟수")
+    parser.add_argument("--threads", type=int, default=8, help="동시 기록 스레드 수")
+    args = parser.parse_args()
+
+    registry = MetricsRegistry("bench")
+    rng = random.Random(0)
+    values = [rng.lognormvariate(-4, 1) for _ in range(args.ops)]
+
+    def plain(x):
+        return x
+
+    decorated = timed("bench_call_seconds", "벤치마크 호출", registry=registry)(plain)
+    for name, func in (("함수 호출", plain), ("@timed 함수 호출", decorated)):
+        started = time.perf_counter()
+        for value in values:
+            func(value)
+        print(f"{name:<24} {(time.perf_counter() - started) / args.ops * 1e9:>8.0f}ns/호출")
+
+    histogram = registry.histogram("bench_observe_seconds", "벤치마크 기록")
+    locked = LockedHistogram()
+    for name, observe in (("스레드별 칸 observe", histogram.observe), ("공유 잠금 observe", locked.observe)):
+        elapsed = run_threads(observe, values, args.threads)
+        print(f"{name:<24} {elapsed / args.ops * 1e9:>8.0f}ns/기록 ({args.threads}개 스레드)")
+
+    summary = histogram.summary()
+    expected = np.percentile(values, [50, 95, 99])
+    print(f"기록 수 {summary['count']:,} (기대값 {args.ops:,})")
+    for label, got, want in zip(("p50", "p95", "p99"), (summary['p50'], summary['p95'], summary['p99']), expected):
+        print(f"{label}: HDR {got * 1000:.3f}ms / numpy {want * 1000:.3f}ms (오차 {abs(got / want - 1) * 100:.1f}%)")
+
+    started = time.perf_counter()
+    text = registry.render()
+    print(f"노출 형식 생성 {(time.perf_counter() - started) * 1000:.2f}ms ({len(text.splitlines())}줄)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+가격 팬아웃 허브 벤치마크
+
+가상 WebSocket 클라이언트 1,000개가 겹치는 종목을 구독한 상태에서
+PriceHub가 종목당 한 번만 시세를 조회하고 변경분을 전달하는 성능을 측정합니다.
+기존 방식(클라이언트별 개별 조회)과 업스트림 조회 횟수를 비교합니다.
+--encoding 으로 연결별 인코딩(json/compact/msgpack)에 따른 전송 바이트를 비교할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_price_hub.py --clients 1000 --symbols 200 --ticks 20
+    python benchmarks/bench_price_hub.py --encoding compact
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.price_hub import PriceHub
+from src.web.ws_codec import MessageCodec, negotiate_encoding
+
+
+class SimulatedClient:
+    """가상 WebSocket 클라이언트 (전송 지연 시뮬레이션)"""
+
+    def __init__(self, client_id, send_delay, tick_clock):
+        self.client_id = client_id
+        self.send_delay = send_delay
+        self.tick_clock = tick_clock
+        self.messages = 0
+        self.bytes = 0
+        self.latencies = []
+
+    async def send(self, payload):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.messages += 1
+        self.bytes += len(payload) if isinstance(payload, bytes) else len(payload.encode("utf-8"))
+        # 틱 시작(시세 조회 시작)부터 클라이언트 수신까지의 지연
+        self.latencies.append(time.perf_counter() - self.tick_clock["started"])
+
+
+async def run_benchmark(num_clients, num_symbols, symbols_per_client, ticks, change_ratio, slow_ratio, encoding):
+    rng = random.Random(42)
+    universe = [f"{i:06d}" for i in range(num_symbols)]
+    prices = {symbol: 10000.0 for symbol in universe}
+    upstream_calls = {"count": 0}
+
+    async def fetch_price(symbol, market):
+        upstream_calls["count"] += 1
+        # 일부 종목만 가격이 변한다고 가정
+        if rng.random() < change_ratio:
+            prices[symbol] = round(prices[symbol] * (1 + rng.uniform(-0.01, 0.01)), 0)
+        return {"symbol": symbol, "market": market, "price": prices[symbol],
+                "change": 0, "change_percent": 0, "volume": 0}
+
+    # 현재 틱 시작 시각 (팬아웃 지연 측정용)
+    tick_clock = {"started": time.perf_counter()}
+
+    hub = PriceHub(fetch_price, poll_interval=3600, fetch_concurrency=32, send_timeout=1.0,
+                   timestamp_func=lambda: time.strftime("%Y-%m-%d %H:%M:%S"))
+    encoding = negotiate_encoding(encoding)
+
+    clients = []
+    for i in range(num_clients):
+        delay = 0.05 if rng.random() < slow_ratio else 0
+        client = SimulatedClient(i, delay, tick_clock)
+        clients.append(client)
+        symbols = rng.sample(universe, symbols_per_client)
+        await hub.subscribe(i, client.send, [(symbol, "KR") for symbol in symbols],
+                            codec=MessageCodec(encoding))
+
+    tick_times = []
+    # 구독 직후 초기 스냅샷 전송은 측정에서 제외
+    await hub.poll_once()
+    await asyncio.sleep(0.2)
+    for client in clients:
+        client.latencies.clear()
+        client.bytes = 0
+    upstream_calls["count"] = 0
+    delivered_before = hub.stats["updates_delivered"]
+
+    started = time.perf_counter()
+    for _ in range(ticks):
+        tick_clock["started"] = tick_started = time.perf_counter()
+        await hub.poll_once()
+        tick_times.append(time.perf_counter() - tick_started)
+        # 전송 태스크가 이번 틱의 변경분을 모두 보낼 때까지 대기
+        await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+
+    latencies = [lat for client in clients for lat in client.latencies]
+    total_messages = sum(client.messages for client in clients)
+    total_bytes = sum(client.bytes for client in clients)
+    total_updates = hub.stats["updates_delivered"] - delivered_before
+    naive_calls = num_clients * symbols_per_client * ticks
+    stats = hub.get_stats()
+    await hub.stop()
+
+    print("=" * 60)
+    print("가격 팬아웃 허브 벤치마크")
+    print("=" * 60)
+    print(f"인코딩                   : {encoding}")
+    print(f"클라이언트 수            : {num_clients}")
+    print(f"종목 유니버스 / 클라이언트당 구독: {num_symbols} / {symbols_per_client}")
+    print(f"틱 수                    : {ticks}")
+    print(f"업스트림 조회 (허브)     : {upstream_calls['count']}")
+    print(f"업스트림 조회 (기존 방식): {naive_calls}  ({naive_calls / max(upstream_calls['count'], 1):.1f}배 절감)")
+    print(f"전송 메시지 / 업데이트   : {total_messages} / {total_updates}")
+    print(f"전송 바이트 (전체)       : {total_bytes:,}  (업데이트당 {total_bytes / max(total_updates, 1):.1f}B)")
+    print(f"클라이언트당 초당 바이트 : {total_bytes / num_clients / elapsed:,.1f} B/s")
+    print(f"병합된 업데이트          : {stats['updates_coalesced']}")
+    print(f"해제된 느린 클라이언트   : {stats['clients_dropped']}")
+    print(f"틱 처리 시간 평균        : {statistics.mean(tick_times) * 1000:.2f}ms")
+    if latencies:
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"팬아웃 지연 p50 / p99    : {p50 * 1000:.2f}ms / {p99 * 1000:.2f}ms")
+    print(f"전체 처리량              : {total_messages / elapsed:,.0f} msg/s (틱 간 대기 포함)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PriceHub 팬아웃 벤치마크")
+    parser.add_argument("--clients", type=int, default=1000, help="가상 클라이언트 수")
+    parser.add_argument("--symbols", type=int, default=200, help="종목 유니버스 크기")
+    parser.add_argument("--per-client", type=int, default=10, help="클라이언트당 구독 종목 수")
+    parser.add_argument("--ticks", type=int, default=20, help="시세 조회 횟수")
+    parser.add_argument("--change-ratio", type=float, default=0.3, help="틱마다 가격이 변하는 종목 비율")
+    parser.add_argument("--slow-ratio", type=float, default=0.01, help="느린 클라이언트 비율")
+    parser.add_argument("--encoding", default="json", help="메시지 인코딩 (json/compact/msgpack)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.clients, args.symbols, args.per_client, args.ticks,
+                              args.change_ratio, args.slow_ratio, args.encoding))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+장중 리플레이 하네스 벤치마크
+
+가상 1분봉(일부 종목은 장중 급등)과 기록된 GPT 응답으로 RealtimeTrader와
+GPTAutoTrader를 하루 장 동안 재생하고 사이클 지연 시간, 초당 결정 수,
+실제 시간 대비 재생 배속을 측정합니다.
+--tape 로 기록된 분봉/틱 파일을, --records 로 기록된 GPT 응답(JSON Lines)을 사용할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_replay.py
+    python benchmarks/bench_replay.py --tape data/20250627_1m.csv --records data/20250627_gpt.jsonl
+"""
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtest.data import PriceMatrix
+from src.backtest.replay import RecordedLLM, ReplayHarness, load_tape
+
+# RealtimeTrader 감시 종목과 같은 종목 구성
+SYMBOLS = ['005930', '000660', '035420', '035720', '051910', '207940', '005380', '068270']
+
+
+def make_synthetic_tape(date, symbols, surges, seed=7):
+    """
+    1분봉 가상 데이터 생성 (시각은 봉 종료 시각)
+
+    Args:
+        surges: {종목코드: 급등 시작 분} - 해당 시점부터 10분간 가격/거래량 급증
+    """
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(f"{date} 09:01", f"{date} 15:30", freq="1min")
+    n = len(times)
+    returns = rng.normal(0, 0.0015, size=(n, len(symbols)))
+    volume = rng.integers(1000, 5000, size=(n, len(symbols))).astype(np.float64)
+    for symbol, minute in surges.items():
+        col = symbols.index(symbol)
+        returns[minute:minute + 10, col] += 0.008
+        volume[minute:minute + 10, col] *= 8
+
+    base = rng.uniform(20000, 300000, size=len(symbols))
+    close = base * np.exp(np.cumsum(returns, axis=0))
+    open_ = np.vstack([base, close[:-1]])
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0005, size=close.shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0005, size=close.shape)))
+    return PriceMatrix(times, symbols, open_, high, low, close, volume, market="KR")
+
+
+def make_synthetic_records(date, surges, recommended):
+    """급등 종목 매수 신호와 종목 추천 GPT 응답 기록 생성"""
+    records = []
+    for symbol, minute in surges.items():
+        at = pd.Timestamp(f"{date} 09:00") + pd.Timedelta(minutes=minute)
+        records.append({
+            "method": "analyze_realtime_trading", "symbol": symbol, "time": str(at), "latency": 2.0,
+            "response": {"action": "BUY", "confidence": 0.9, "analysis_summary": "거래량 동반 급등"}
+        })
+    records.append({
+        "method": "recommend_stocks", "symbol": "KR", "latency": 5.0,
+        "response": {"recommended_stocks": [
+            {"symbol": symbol, "name": symbol, "risk_level": 5, "suggested_weight": 20, "target_price": 0}
+            for symbol in recommended
+        ]}
+    })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장중 리플레이 하네스 벤치마크")
+    parser.add_argument("--tape", help="long 형식 분봉/틱 CSV/Parquet 파일 경로")
+    parser.add_argument("--records", help="기록된 GPT 응답 파일 (JSON Lines 또는 JSON 배열)")
+    parser.add_argument("--date", default="2025-06-27", help="가상 데이터 날짜")
+    parser.add_argument("--traders", default="realtime,gpt", help="실행할 트레이더 (realtime,gpt)")
+    parser.add_argument("--scan-interval", type=int, default=None, help="RealtimeTrader 사이클 간격 (초)")
+    parser.add_argument("--verbose", action="store_true", help="트레이더 INFO 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    try:
+        import config
+    except ImportError:
+        config = None
+
+    surges = {'035720': 60, '051910': 200}
+    if args.tape:
+        tape = load_tape(args.tape)
+    else:
+        tape = make_synthetic_tape(args.date, SYMBOLS, surges)
+
+    harness = ReplayHarness(config, tape, traders=args.traders.split(","),
+                            scan_interval_seconds=args.scan_interval)
+    if args.records:
+        harness.llm = RecordedLLM.from_file(args.records, harness.clock)
+    else:
+        for record in make_synthetic_records(args.date, surges, SYMBOLS[-2:]):
+            harness.llm.add(**record)
+
+    result = harness.run()
+    summary = result.summary()
+
+    print("=" * 60)
+    print("장중 리플레이 하네스 벤치마크")
+    print("=" * 60)
+    print(f"데이터                   : {tape}")
+    print(f"사이클 / 오류            : {summary['cycles']:,} / {summary['errors']}")
+    print(f"가상 시간 / 실제 시간    : {summary['simulated_sec']:,.0f}초 / {summary['wall_elapsed_sec']:.2f}초")
+    print(f"재생 배속                : {summary['speedup']:,.0f}x")
+    print(f"결정 수 / 초당 결정      : {summary['decisions']:,} / {summary['decisions_per_sec']:,.0f}")
+    for trader, stats in summary['latency_ms'].items():
+        print(f"사이클 지연 ({trader:8s})   : 평균 {stats['mean']:.2f}ms, p50 {stats['p50']:.2f}ms, "
+              f"p95 {stats['p95']:.2f}ms, 최대 {stats['max']:.2f}ms ({stats['count']}회)")
+    print(f"주문 / 체결              : {summary['orders']} / {summary['fills']}")
+    print(f"GPT 응답 호출            : {summary['llm_calls']}")
+    print(f"실현 손익 / 수익률       : {summary['realized_pnl']:,.0f} / {summary['return_pct']:.3f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+프로세스 자원 샘플링 벤치마크
+
+기존 ProcessMonitor 한 주기(시스템 CPU interval=1 측정 + 새 psutil.Process로 interval=0.5 측정
++ 모든 프로세스의 명령줄 검색)와 ResourceSampler 한 주기(캐시된 핸들로 비차단 샘플링)를 비교합니다.
+
+사용법:
+    python benchmarks/bench_resource_sampler.py --cycles 3
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import psutil
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.resource_sampler import ResourceSampler
+
+
+def legacy_cycle(pid):
+    """기존 방식 한 주기"""
+    psutil.virtual_memory()
+    psutil.cpu_percent(interval=1)
+    psutil.disk_usage('/')
+    process = psutil.Process(pid)
+    process.status()
+    process.memory_percent()
+    process.cpu_percent(interval=0.5)
+    found = []
+    for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'status']):
+        cmdline = proc.info['cmdline']
+        if cmdline and len(cmdline) > 1 and any("main.py" in cmd for cmd in cmdline):
+            found.append(proc)
+    return found
+
+
+def sampler_cycle(sampler):
+    """ResourceSampler 한 주기"""
+    return sampler.sample()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프로세스 자원 샘플링 벤치마크")
+    parser.add_argument("--cycles", type=int, default=3, help="기존 방식 측정 주기 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pid = os.getpid()
+
+    started = time.perf_counter()
+    for _ in range(args.cycles):
+        legacy_cycle(pid)
+    legacy = (time.perf_counter() - started) / args.cycles
+
+    sampler = ResourceSampler()
+    sampler.track('main', pid=pid)
+    cycles = args.cycles * 1000
+    started = time.perf_counter()
+    for _ in range(cycles):
+        sampler_cycle(sampler)
+    new = (time.perf_counter() - started) / cycles
+
+    print(f"호스트 프로세스 {len(psutil.pids())}개")
+    print(f"{'방식':<20} {'1주기':>12}")
+    print(f"{'기존 방식':<20} {legacy * 1000:>10.1f}ms")
+    print(f"{'ResourceSampler':<20} {new * 1000:>10.3f}ms")
+    print(f"링 버퍼 샘플 {len(sampler._targets['main'].samples)}개 (최대 {sampler.capacity}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+트레이싱 기록 비용 벤치마크
+
+트레이싱을 켰을 때와 껐을 때 @traced 함수와 중첩 구간의 호출당 비용을 측정하고,
+버퍼를 Chrome 트레이스 JSON으로 내보내는 시간을 잽니다.
+
+사용법:
+    python benchmarks/bench_tracing.py --ops 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.tracing import get_tracer, traced
+
+
+def main():
+    parser = argparse.ArgumentParser(description="트레이싱 기록 비용 벤치마크")
+    parser.add_argument("--ops", type=int, default=200000, help="호출 횟수")
+    args = parser.parse_args()
+
+    tracer = get_tracer()
+    tracer.process = "bench"
+
+    def plain(x):
+        return x
+
+    decorated = traced("bench.call", "bench")(plain)
+
+    def nested(x):
+        with tracer.span("bench.cycle", "cycle"):
+            with tracer.span("bench.symbol", "symbol", symbol="005930"):
+                return decorated(x)
+
+    for enabled in (False, True):
+        tracer.configure(enabled=enabled)
+        state = "켜짐" if enabled else "꺼짐"
+        for name, func in (("함수 호출", plain), ("@traced 함수 호출", decorated), ("3단계 중첩 구간", nested)):
+            started = time.perf_counter()
+            for i in range(args.ops):
+                func(i)
+            print(f"[{state}] {name:<20} {(time.perf_counter() - started) / args.ops * 1e9:>8.0f}ns/호출")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trace.json")
+        started = time.perf_counter()
+        trace = tracer.dump_chrome_trace(path)
+        print(f"Chrome 트레이스 기록 {(time.perf_counter() - started) * 1000:.1f}ms "
+              f"({len(trace['traceEvents']):,}개 이벤트, 버퍼 {tracer.capacity:,}, {os.path.getsize(path) / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import pandas as pd
 from src.data.stock_data import StockData
 from src.trading.kis_api import KISAPI
 from src.utils.time_utils import get_current_time_str
+from src.utils.log_index import LogIndex
 import config
 
 # 로깅 설정
@@ -117,17 +118,21 @@ def check_system_status():
 
 
 def check_log_file():
-    """로그 파일 확인"""
+    """로그 파일 확인 (로그 인덱스로 최근 메시지와 오류 수 조회)"""
     log_file = 'stock_analysis.log'
     
     if os.path.exists(log_file):
         # 마지막 10개 로그 메시지 출력
         print(f"\n📝 최근 로그 메시지 ({log_file}):")
         try:
-            with open(log_file, 'r') as f:
-                lines = f.readlines()
-                for line in lines[-10:]:
-                    print(f"  {line.strip()}")
+            index = LogIndex(config, sources=[log_file])
+            index.update()
+            for entry in reversed(index.search(limit=10, file=log_file)):
+                print(f"  {entry['message'].splitlines()[0]}")
+            
+            errors = index.count(level='ERROR', since='24h', file=log_file)
+            print(f"\n  최근 24시간 오류: {errors}건 (상세: python log_search.py --level ERROR --since 24h)")
+            index.close()
         except Exception as e:
             print(f"❌ 로그 파일 읽기 오류: {e}")
     else:
@@ -47,6 +47,7 @@ class CloudService:
         self.start_time = datetime.now()
         self.last_resource_check = datetime.now() - timedelta(minutes=10)  # 초기값
         self.own_pid = os.getpid()  # 현재 프로세스의 PID
+        self.resource_sampler = None  # 자원 샘플러 (psutil 설치 확인 후 생성)
         
         # 실행 환경 정보
         self.system_info = {
@@ -332,6 +333,43 @@ class CloudService:
                     
             return False
     
+    def _get_resource_sampler(self):
+        """
+        자원 샘플러 반환 (psutil이 없으면 None)
+        
+        서비스 자신과 직접 실행한 하위 프로세스, PID 파일로 알려진 메인/API 서버 프로세스를 추적합니다.
+        """
+        if self.resource_sampler is None:
+            try:
+                from src.utils.resource_sampler import ResourceSampler
+            except ImportError:
+                return None
+            self.resource_sampler = ResourceSampler()
+            self.resource_sampler.track('cloud_service', pid=self.own_pid)
+            self.resource_sampler.track('main', pid_file="stock_analysis.pid")
+            self.resource_sampler.track('api_server', pid_file="api_server.pid")
+        # 재시작된 하위 프로세스는 새 PID로 갱신
+        for name, process in self.service_processes.items():
+            if process is not None and process.poll() is None:
+                self.resource_sampler.track(name, pid=process.pid)
+        return self.resource_sampler
+    
+    def sample_resources(self):
+        """
+        추적 중인 프로세스 자원 샘플링 (모니터링 루프마다 호출, 잠들지 않음)
+        
+        메인 서비스를 직접 실행하는 모드에서는 프로세스 모니터 대신 API 서버용 시계열 파일도 기록합니다.
+        """
+        sampler = self._get_resource_sampler()
+        if sampler is None:
+            return
+        try:
+            sampler.sample(include_system=False)
+            if 'main_service' in self.service_processes:
+                sampler.export()
+        except Exception as e:
+            logger.error(f"자원 샘플링 중 오류 발생: {e}")
+    
     def check_system_resources(self):
         """
         시스템 리소스 상태 확인 및 기록
@@ -343,8 +381,8 @@ class CloudService:
             memory = psutil.virtual_memory()
             swap = psutil.swap_memory()
             
-            # CPU 사용량
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU 사용량 (직전 확인 이후 평균, 기다리지 않음)
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # 디스크 사용량
             disk = psutil.disk_usage('/')
@@ -355,6 +393,16 @@ class CloudService:
                        f"디스크: {disk.percent}% ({disk.used / (1024**3):.2f}GB/{disk.total / (1024**3):.2f}GB), "
                        f"스왑: {swap.percent}% ({swap.used / (1024**3):.2f}GB/{swap.total / (1024**3):.2f}GB)")
             
+            # 프로세스별 자원 사용량과 누수 의심 추세
+            sampler = self._get_resource_sampler()
+            for name in ('main', 'api_server', 'process_monitor', 'main_service'):
+                sample = sampler.latest(name)
+                if sample:
+                    logger.info(f"{name} 프로세스 자원 - RSS: {sample['rss'] / (1024**2):.0f}MB, CPU: {sample['cpu']}%, "
+                               f"스레드: {sample['threads']}, FD: {sample['fds']}")
+            for alert in sampler.check_alerts():
+                logger.warning(f"자원 누수 의심: {alert['message']}")
+            
         except ImportError:
             logger.warning("psutil 모듈이 설치되지 않았습니다. 시스템 리소스 체크가 불가능합니다.")
         except Exception as e:
@@ -417,7 +465,8 @@ class CloudService:
                         logger.warning(f"메인 서비스 재시작 시도 ({restart_count['main_service']}회)")
                         self.service_processes['main_service'] = self.start_main_service()
                 
-                # 4.3. 시스템 리소스 모니터링 (10분 간격)
+                # 4.3. 프로세스 자원 샘플링 (매 주기) 및 시스템 리소스 모니터링 (10분 간격)
+                self.sample_resources()
                 if (current_time - self.last_resource_check).total_seconds() > 600:
                     self.check_system_resources()
                     self.last_resource_check = current_time
@@ -97,6 +97,16 @@ KAKAO_REFRESH_TOKEN = os.environ.get("KAKAO_REFRESH_TOKEN")  # 카카오 리프
 USE_KAKAO = os.environ.get("USE_KAKAO", "True").lower() == "true"  # 카카오톡 메시지 사용 여부
 KAKAO_MSG_ENABLED = USE_KAKAO  # 코드 일관성을 위해 KAKAO_MSG_ENABLED도 동일하게 설정
 
+# 알림 발송기 설정 (카카오톡/텔레그램 메시지를 백그라운드 이벤트 루프에서 전송)
+NOTIFY_ASYNC = True  # False면 호출 스레드에서 바로 전송 (기존 방식)
+NOTIFY_KAKAO_MIN_INTERVAL = 0.5  # 카카오톡 연속 전송 최소 간격 (초)
+NOTIFY_TELEGRAM_MIN_INTERVAL = 1.0  # 텔레그램 연속 전송 최소 간격 (초, 같은 채팅방 초당 1건 제한)
+NOTIFY_DIGEST_SECONDS = 5  # 매매 신호 메시지를 모아 한 메시지로 합치는 시간 (초, 0이면 합치지 않음)
+NOTIFY_QUEUE_MAX = 1000  # 채널별 대기 메시지 최대 수
+NOTIFY_SHUTDOWN_TIMEOUT = 10  # 종료 시 남은 알림 전송을 기다리는 최대 시간 (초)
+KAKAO_TOKEN_REFRESH_MARGIN_SECONDS = 600  # 카카오톡 액세스 토큰 만료 몇 초 전에 백그라운드 갱신할지
+KAKAO_TOKEN_MIN_REFRESH_SECONDS = 60  # 카카오톡 토큰 갱신 요청 최소 간격 (초, 여러 프로세스 공통)
+
 # 국내 주식 설정
 KR_MARKET_OPEN_TIME = "09:00"  # 한국 시장 개장 시간
 KR_MARKET_CLOSE_TIME = "15:30"  # 한국 시장 폐장 시간
@@ -108,6 +118,10 @@ KR_AFTER_MARKET_CLOSE_TIME = "18:00"  # 시간외 거래 폐장 시간
 KR_AFTER_MARKET_TRADING = True  # 시간외 거래 활성화 여부
 USE_EXTENDED_HOURS = True  # 확장 거래 시간 사용 여부
 
+# 시장 휴장일 추가 설정 (내장 KRX/NYSE 휴장일 표에 없는 임시 공휴일 등, "YYYY-MM-DD" 목록)
+KR_MARKET_HOLIDAYS = [d for d in os.environ.get("KR_MARKET_HOLIDAYS", "").split(",") if d.strip()]
+US_MARKET_HOLIDAYS = [d for d in os.environ.get("US_MARKET_HOLIDAYS", "").split(",") if d.strip()]
+
 # 미국 주식 설정
 US_MARKET_OPEN_TIME = "09:30"  # 미국 시장 개장 시간 (EST)
 US_MARKET_CLOSE_TIME = "16:00"  # 미국 시장 폐장 시간 (EST)
@@ -134,6 +148,13 @@ KIS_VIRTUAL_ACCOUNT_NO = os.environ.get("KIS_VIRTUAL_ACCOUNT_NO")  # 모의투
 # 실전투자 설정
 KIS_REAL_TRADING = True  # 실전투자 모드로 설정 (False = 모의투자, True = 실전투자)
 
+# 접근 토큰 공유 캐시 설정 (여러 프로세스가 토큰 하나를 공유)
+KIS_TOKEN_CACHE_DIR = os.environ.get("KIS_TOKEN_CACHE_DIR", "cache")  # 토큰 캐시 파일 디렉토리
+KIS_TOKEN_REFRESH_MARGIN_SECONDS = 600  # 만료 몇 초 전에 백그라운드에서 미리 갱신할지
+KIS_USE_HASHKEY = True  # 주문 본문 해시키 사용 여부 (KIS 주문 API는 필수가 아니므로 False로 하면 주문당 왕복 1회 절약)
+KIS_HASHKEY_CACHE_SIZE = 256  # 같은 주문 본문 재시도 시 재사용할 해시키 캐시 크기
+KIS_HTTP_POOL_SIZE = 10  # 주문/해시키 요청 HTTP 연결 풀 크기
+
 # 초기 자본금 설정
 INITIAL_CAPITAL = 1000000  # 실전투자 초기 자본금 (100만원)
 
@@ -176,6 +197,33 @@ GPT_STRATEGY = "balanced"  # GPT 전략 (aggressive, balanced, conservative 중
 GPT_USE_DYNAMIC_SELECTION = True  # 동적 종목 선정 사용 여부
 GPT_TRADING_MONITOR_INTERVAL = 10  # GPT 모니터링 주기 (분)
 
+# 작업 스케줄러 분류별 워커 수 (analysis: 종목 분석, trading: 매매 사이클, selection: GPT 종목 선정,
+# report: 리포트/요약 전송, maintenance: 상태 기록) - 지정하지 않은 분류는 1
+SCHEDULER_POOL_SIZES = {"analysis": 1, "trading": 1, "selection": 1, "report": 1, "maintenance": 1}
+
+# 공유 시세 데이터 서비스 설정 (트레이더 스레드 간 중복 조회 합치기)
+MARKET_DATA_TICK_SECONDS = 5  # 현재가/거래량 스냅샷 공유 단위 (초)
+MARKET_DATA_HISTORY_TTL_SECONDS = 60  # 과거 데이터 재사용 시간 (초)
+MARKET_DATA_INFO_TTL_SECONDS = 6 * 60 * 60  # 종목 정보 재사용 시간 (초)
+
+# 종목 마스터 인덱스 설정 (종목명/섹터/업종 조회를 메모리 인덱스에서 처리)
+SYMBOL_MASTER_REFRESH_SECONDS = 600  # 종목 정보 테이블 증분 갱신 간격 (초)
+
+# 공유 포지션 장부 설정 (트레이더 간 보유 종목 공유)
+POSITION_RECONCILE_SECONDS = 60  # 증권사 잔고와 대조하는 최소 간격 (초, 주문 직후에는 즉시 대조)
+
+# 주문 상태 추적 설정 (주문 후 고정 대기 대신 체결 확인 즉시 진행)
+ORDER_POLL_SECONDS = 1.0  # 미체결 주문 일괄 체결 조회 간격 (초)
+ORDER_FILL_TIMEOUT_SECONDS = 10  # 트레이더가 주문 체결을 기다리는 최대 시간 (초)
+ORDER_TRACK_MAX_SECONDS = 8 * 60 * 60  # 미체결 주문 추적 최대 시간 (초, 초과 시 취소로 처리)
+
+# 주문 게이트웨이 설정 (사전 위험 점검 후 제출, 한도는 MAX_AMOUNT_PER_TRADE/MAX_QUANTITY_PER_SYMBOL 사용)
+ORDER_MAX_POSITIONS = 10  # 전체 최대 보유 종목 수
+ORDER_RATE_PER_SECOND = 5  # 증권사 초당 주문 제출 한도
+ORDER_GATEWAY_WORKERS = 2  # 동시 주문 제출 스레드 수
+ORDER_GATEWAY_BATCH_SIZE = 32  # 위험 점검 한 묶음의 최대 주문 수
+ORDER_EXECUTE_TIMEOUT_SECONDS = 30  # 동기 주문 호출이 결과를 기다리는 최대 시간 (초, 초과 시 실패 처리)
+
 # GPT 완전 자율 매매 설정 - 추가
 GPT_FULLY_AUTONOMOUS_MODE = True  # GPT 완전 자율 매매 모드 활성화
 GPT_AUTONOMOUS_TRADING_INTERVAL = 5  # 자율 매매 주기 (분)
@@ -243,6 +291,23 @@ REALTIME_STOP_LOSS_PERCENT = 3.0  # 실시간 트레이딩 손절 기준 (%)
 REALTIME_TAKE_PROFIT_PERCENT = 5.0  # 실시간 트레이딩 익절 기준 (%)
 REALTIME_MAX_HOLDING_MINUTES = 60  # 실시간 트레이딩 최대 보유 시간 (분)
 
+# 백테스트 설정
+BACKTEST_INITIAL_CAPITAL = 100000000  # 백테스트 초기 자본 (원)
+BACKTEST_FEE_RATE = 0.00015  # 매수/매도 수수료율
+BACKTEST_TAX_RATE = 0.0018  # 매도 거래세율
+BACKTEST_SLIPPAGE_PCT = 0.0  # 체결 슬리피지 (%)
+BACKTEST_MAX_HOLDING_DAYS = 0  # 최대 보유 일수 (0: 제한 없음)
+BACKTEST_FILL = "next_open"  # 체결 방식 (next_open: 익일 시가, close: 당일 종가)
+
+# 기술적 지표 최적화 방식 설정 (gpt: GPT 추천, backtest: 과거 데이터 파라미터 탐색)
+TECHNICAL_INDICATOR_OPTIMIZER = os.environ.get("TECHNICAL_INDICATOR_OPTIMIZER", "gpt")
+BACKTEST_OPTIMIZER_METHOD = "bayesian"  # 탐색 방식 (grid, random, bayesian)
+BACKTEST_OPTIMIZER_TRIALS = 200  # 평가할 최대 파라미터 조합 수
+BACKTEST_OPTIMIZER_OBJECTIVE = "sharpe"  # 순위 기준 (sharpe, total_pnl, profit_factor, calmar, win_rate)
+BACKTEST_OPTIMIZER_MIN_TRADES = 30  # 최소 거래 수 (미만 조합은 제외)
+BACKTEST_OPTIMIZER_WORKERS = 0  # 작업자 프로세스 수 (0: CPU 수)
+BACKTEST_OPTIMIZER_LOOKBACK_DAYS = 1095  # 최적화에 사용할 과거 데이터 기간 (일)
+
 # GPT에 의해 추천된 한국 종목 정보 (코드와 이름)
 # GPT_USE_DYNAMIC_SELECTION = True 설정 시 아래 목록은 GPT가 자동 업데이트합니다
 # 주의: KR_STOCK_INFO = [{'code': '005930', 'name': '삼성전자'}, {'code': '035720', 'name': '카카오'}, {'code': '000660', 'name': 'SK하이닉스'}]
@@ -268,6 +333,59 @@ WEB_REALTIME_CHART = True  # 실시간 차트 표시 활성화
 WEB_SHOW_LOGS = True  # 로그 표시 활성화
 WEB_MAX_LOG_ENTRIES = 1000  # 최대 로그 항목 수
 
+# 로그 검색 인덱스 설정 (log_search.py, check_status.py --log)
+LOG_INDEX_PATH = os.path.join("logs", "log_index.db")  # 인덱스 파일 경로
+LOG_INDEX_SOURCES = [  # 인덱스할 로그 파일 (glob 패턴 가능)
+    "stock_analysis.log", "api_server.log", "cloud_service.log", "process_monitor.log",
+    "auto_restart.log", "logs/order_log_*.log"
+]
+LOG_INDEX_UPDATE_SECONDS = 300  # 트레이딩 프로세스의 인덱스 증분 갱신 간격 (초)
+
+# 프로세스 자원 샘플링 설정 (process_monitor.py가 기록, API 서버 /api/system/resources가 읽음)
+RESOURCE_SAMPLES_PATH = os.path.join("cache", "resource_samples.json")  # 자원 시계열 파일 경로
+RESOURCE_SAMPLES_MAX_AGE_SECONDS = 180  # 이보다 오래된 파일이면 API 서버가 직접 샘플링 (초)
+
+# 메트릭 설정 (main.py가 기록, API 서버 /metrics가 자기 메트릭과 합쳐 노출)
+METRICS_EXPORT_DIR = os.path.join("cache", "metrics")  # 프로세스별 메트릭 파일 디렉토리
+METRICS_EXPORT_SECONDS = 15  # 트레이딩 프로세스의 메트릭 파일 기록 간격 (초)
+METRICS_EXPORT_MAX_AGE_SECONDS = 120  # 이보다 오래된 메트릭 파일은 종료된 프로세스로 보고 제외 (초)
+
+# 트레이싱/프로파일러 설정 (API 서버 /api/debug/trace, /api/debug/profiler)
+TRACE_ENABLED = True  # 사이클/종목/외부 호출 구간 기록 여부
+TRACE_BUFFER_SIZE = 20000  # 메모리에 보관할 최대 구간 수
+TRACE_SLOW_CYCLE_SECONDS = 60  # 이보다 느린 매매 사이클은 하위 구간 소요 시간을 경고 로그로 기록 (초)
+DEBUG_DIR = os.path.join("cache", "debug")  # 프로파일러 제어 파일과 트레이스/프로파일 결과 디렉토리
+DEBUG_CONTROL_POLL_SECONDS = 2  # 트레이딩 프로세스의 제어 파일 확인 간격 (초)
+DEBUG_RESULT_MAX_AGE_SECONDS = 3600  # 이보다 오래된 다른 프로세스 프로파일 결과는 종료된 프로세스로 보고 제외 (초)
+PROFILER_INTERVAL_MS = 10  # 샘플링 프로파일러 기본 샘플 간격 (밀리초)
+PROFILER_MAX_DURATION_SECONDS = 600  # 프로파일러 최대 실행 시간 (초, 이후 자동 중지)
+
+# API 서버 응답 캐시 설정
+API_CACHE_DEFAULT_TTL = 5  # 기본 응답 캐시 유효 시간 (초)
+API_CACHE_MAX_ENTRIES = 256  # 최대 캐시 항목 수
+API_CACHE_TTL_PORTFOLIO = 5  # 포트폴리오 응답 캐시 유효 시간 (초) - 증권사 API 호출 제한 보호
+API_CACHE_TTL_STOCK_LIST = 30  # 주식 목록 응답 캐시 유효 시간 (초)
+API_CACHE_TTL_PERFORMANCE = 60  # 성과 리포트 응답 캐시 유효 시간 (초)
+API_CACHE_INVALIDATE_URL = "http://127.0.0.1:8000/api/cache/invalidate"  # 체결 시 트레이딩 프로세스가 호출하는 캐시 무효화 주소 (빈 문자열이면 사용 안 함)
+API_CACHE_INVALIDATE_DEBOUNCE_SECONDS = 0.5  # 잇따른 체결을 한 번의 무효화 요청으로 묶는 시간 (초)
+
+# API 서버 블로킹 호출 스레드 풀 설정
+API_BLOCKING_MAX_WORKERS = 8  # 증권사/DB 호출 전용 스레드 수
+API_BLOCKING_DEFAULT_LIMIT = 4  # 엔드포인트별 기본 최대 동시 실행 수
+API_CONCURRENCY_PORTFOLIO = 1  # 포트폴리오 조회 최대 동시 실행 수 (증권사 API 호출 제한 보호)
+API_CONCURRENCY_SYSTEM_STATUS = 2  # 시스템 상태 조회 최대 동시 실행 수
+API_CONCURRENCY_STOCK_LIST = 2  # 주식 목록 조회 최대 동시 실행 수
+API_CONCURRENCY_PERFORMANCE = 2  # 성과 리포트 조회 최대 동시 실행 수
+API_CONCURRENCY_WS_PRICES = 4  # WebSocket 가격 조회 최대 동시 실행 수
+API_LOOP_LAG_INTERVAL = 0.5  # 이벤트 루프 지연 측정 간격 (초)
+API_LOOP_LAG_WARN_THRESHOLD = 0.2  # 이벤트 루프 지연 경고 기준 (초)
+
+# WebSocket 실시간 가격 허브 설정
+WS_PRICE_POLL_INTERVAL = 1.0  # 구독 종목 시세 조회 주기 (초)
+WS_PRICE_FETCH_CONCURRENCY = 8  # 동시에 조회할 최대 종목 수
+WS_SEND_TIMEOUT = 5.0  # 클라이언트 전송 타임아웃 (초) - 초과 시 느린 클라이언트 연결 종료
+WS_CLIENT_QUEUE_SIZE = 100  # 클라이언트별 브로드캐스트 송신 큐 최대 길이 - 초과 시 연결 종료
+
 # 웹 인터페이스 자동 매매 설정
 WEB_AUTO_TRADING_CONTROLS = True  # 웹에서 자동 매매 제어 활성화
 WEB_STRATEGY_SELECTION = True  # 웹에서 전략 선택 활성화
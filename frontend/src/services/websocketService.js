@@ -12,6 +12,22 @@ const WS_BASE_URL = WS_PORT === '80' ? WS_HOST : `${WS_HOST}:${WS_PORT}`;
 // 헬스 체크 활성화 여부
 const ENABLE_HEALTH_CHECK = process.env.REACT_APP_ENABLE_HEALTH_CHECK === 'true';
 
+// 가격 WebSocket 압축 인코딩 사용 여부 (변경된 필드만 수신)
+const PRICE_WS_ENCODING = process.env.REACT_APP_WS_PRICE_ENCODING === 'compact' ? 'compact' : 'json';
+
+// compact 인코딩 축약 키 -> 원래 키
+const COMPACT_TYPES = {
+  p: 'price_update', n: 'notification', tu: 'trading_update', hb: 'heartbeat',
+  pi: 'ping', ce: 'connection_established', er: 'error'
+};
+const COMPACT_KEYS = {
+  t: 'type', ts: 'timestamp', d: 'data', m: 'message', u: 'update_type',
+  n: 'notification_type', c: 'connection_id', e: 'encoding'
+};
+const COMPACT_PRICE_FIELDS = {
+  mk: 'market', p: 'price', ch: 'change', cp: 'change_percent', v: 'volume'
+};
+
 // 로깅을 위해 설정된 URL 출력
 console.log(`WebSocket 서버 URL: ${WS_BASE_URL}`);
 
@@ -365,7 +381,12 @@ class WebSocketService {
       this.updateConnectionStatus();
       
       // WebSocket URL 생성 - '/ws' 경로 추가
-      const wsUrl = `${WS_BASE_URL}/ws/prices/${this.authToken}`;
+      const wsUrl = PRICE_WS_ENCODING === 'json'
+        ? `${WS_BASE_URL}/ws/prices/${this.authToken}`
+        : `${WS_BASE_URL}/ws/prices/${this.authToken}?encoding=${PRICE_WS_ENCODING}`;
+      
+      // 새 연결은 전체 필드부터 다시 수신하므로 변경분 병합용 캐시 초기화
+      this.priceCache = {};
       
       // WebSocket 인스턴스 생성
       this.priceSocket = new WebSocket(wsUrl);
@@ -694,7 +715,10 @@ class WebSocketService {
    */
   handlePriceMessage(event) {
     try {
-      const data = JSON.parse(event.data);
+      let data = JSON.parse(event.data);
+      if (data.t !== undefined) {
+        data = this.expandCompactPriceMessage(data);
+      }
       
       // 핑/퐁 메시지 처리
       if (data.type === 'ping') {
@@ -711,6 +735,38 @@ class WebSocketService {
     }
   }
   
+  /**
+   * compact 인코딩 메시지를 기존 메시지 형식으로 복원
+   * 가격 변경분(pd)은 종목별 마지막 값에 병합하여 전체 필드를 가진 price_update로 변환
+   * @param {Object} data - compact 인코딩 메시지
+   * @returns {Object} 기존 형식 메시지
+   */
+  expandCompactPriceMessage(data) {
+    const timestamp = new Date(data.ts).toISOString();
+    
+    if (data.t === 'pd') {
+      const updates = {};
+      Object.entries(data.d || {}).forEach(([symbol, fields]) => {
+        const current = this.priceCache[symbol] || { symbol };
+        Object.entries(fields).forEach(([key, value]) => {
+          current[COMPACT_PRICE_FIELDS[key] || key] = value;
+        });
+        current.timestamp = timestamp;
+        this.priceCache[symbol] = current;
+        updates[symbol] = { ...current };
+      });
+      return { type: 'price_update', data: updates, timestamp };
+    }
+    
+    const message = {};
+    Object.entries(data).forEach(([key, value]) => {
+      message[COMPACT_KEYS[key] || key] = value;
+    });
+    message.type = COMPACT_TYPES[message.type] || message.type;
+    message.timestamp = timestamp;
+    return message;
+  }
+  
   /**
    * 가격 업데이트 WebSocket 닫힘 이벤트 핸들러
    * @param {CloseEvent} event - WebSocket 닫힘 이벤트
@@ -11,6 +11,8 @@ import json
 import logging
 from dotenv import load_dotenv
 from src.utils.time_utils import get_current_time
+from src.utils.token_cache import get_token_cache
+from src.trading.kis_api import kis_token_path
 
 # 로깅 설정
 logging.basicConfig(
@@ -105,29 +107,20 @@ def refresh_token(use_real_trading=False):
     if not app_key or not app_secret:
         raise ValueError(f"{mode} API 키가 설정되지 않았습니다.")
     
-    # 기존 토큰 로드
-    token_file = "kis_real_token.json" if use_real_trading else "kis_virtual_token.json"
-    token_data = load_token_from_file(token_file)
+    # 트레이더 프로세스(KISAPI)와 같은 공유 토큰 캐시 사용 - 유효한 토큰이 있으면 발급하지 않음
+    token_file = kis_token_path(app_key, use_real_trading, os.getenv("KIS_TOKEN_CACHE_DIR", "cache"))
     
-    # 토큰 유효성 검사
-    if check_token_validity(token_data):
-        logger.info("기존 토큰이 유효합니다.")
-        return token_data
+    def issue():
+        token_data = get_access_token(app_key, app_secret)
+        return token_data["access_token"], token_data.get("expires_in", 86400)
     
-    # 토큰 갱신
-    logger.info("토큰을 갱신합니다...")
-    try:
-        new_token_data = get_access_token(app_key, app_secret)
-        # 토큰 생성 시간 추가
-        new_token_data["created_at"] = get_current_time().timestamp()  # datetime.datetime.now().timestamp() 대신 time_utils 사용
-        save_token_to_file(new_token_data, token_file)
-        return new_token_data
-    except Exception as e:
-        logger.error(f"토큰 갱신 실패: {e}")
-        if token_data and "access_token" in token_data:
-            logger.warning("이전 토큰을 계속 사용합니다.")
-            return token_data
-        raise
+    token = get_token_cache(token_file, issue).get()
+    return {
+        "access_token": token["access_token"],
+        "expires_in": int(token["expires_at"] - get_current_time().timestamp()),
+        "expires_at": token["expires_at"],
+        "created_at": token["issued_at"]
+    }
 
 def main():
     """메인 함수"""
@@ -20,7 +20,6 @@ API 서버 로그와 트레이딩 로그를 실시간으로 모니터링합니
 import os
 import sys
 import time
-import glob
 import argparse
 import datetime
 import re
@@ -30,8 +29,10 @@ import signal
 import curses
 import logging
 
+from src.utils.log_tail import LogTailer
+
 # 상수 정의
-LOG_REFRESH_INTERVAL = 0.5  # 로그 새로고침 간격 (초)
+LOG_REFRESH_INTERVAL = 0.5  # 변경 대기 최대 시간 (초, inotify를 쓸 수 없으면 폴링 간격)
 MAX_LOG_LINES = 1000        # 메모리에 유지할 최대 로그 라인 수
 DEFAULT_DISPLAY_LINES = 50  # 기본적으로 표시할 로그 라인 수
 
@@ -52,6 +53,13 @@ WARNING_PATTERN = r'\bWARNING\b'
 ERROR_PATTERN = r'\b(ERROR|CRITICAL|EXCEPTION)\b'
 TRADE_PATTERN = r'\b(매수|매도|거래|주문|체결)\b'
 
+# 줄마다 다시 컴파일하지 않도록 미리 컴파일한 패턴 (로그 레벨은 ASCII라 re.ASCII로 한글 줄 검색을 빠르게)
+INFO_RE = re.compile(INFO_PATTERN, re.IGNORECASE | re.ASCII)
+WARNING_RE = re.compile(WARNING_PATTERN, re.IGNORECASE | re.ASCII)
+ERROR_RE = re.compile(ERROR_PATTERN, re.IGNORECASE | re.ASCII)
+TRADE_RE = re.compile(TRADE_PATTERN, re.IGNORECASE)
+TIME_RE = re.compile(r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})')
+
 # 로그 파일 경로
 API_SERVER_LOG = 'api_server.log'
 STOCK_ANALYSIS_LOG = 'stock_analysis.log'
@@ -60,8 +68,8 @@ TRADING_LOGS_DIR = 'logs'
 class LogMonitor:
     def __init__(self, args):
         self.args = args
-        self.logs = deque(maxlen=MAX_LOG_LINES)
-        self.log_files = {}
+        self.logs = deque(maxlen=MAX_LOG_LINES)  # 최근 로그 링 버퍼
+        self.tailer = None
         self.should_exit = False
         self.filter_text = args.filter
         self.error_only = args.error_only
@@ -69,6 +77,7 @@ class LogMonitor:
         self.trade_only = args.trade_only
         self.display_lines = args.lines
         self.mutex = threading.Lock()
+        self._filter_cache = (None, None)  # (필터 텍스트, 컴파일된 패턴)
         self.setup_logging()
 
     def setup_logging(self):
@@ -83,94 +92,37 @@ class LogMonitor:
         )
         self.logger = logging.getLogger('LogMonitor')
 
-    def find_latest_log_files(self):
-        """최신 로그 파일 찾기"""
-        log_files = {}
-        
-        # API 서버 로그
-        if os.path.exists(API_SERVER_LOG) and not self.trade_only:
-            log_files['api'] = API_SERVER_LOG
-            
-        # 스톡 분석 로그
-        if os.path.exists(STOCK_ANALYSIS_LOG) and not self.trade_only:
-            log_files['analysis'] = STOCK_ANALYSIS_LOG
-            
-        # 트레이딩 로그 (최신 파일)
-        if os.path.exists(TRADING_LOGS_DIR) and not self.api_only:
-            # 오더 로그 (최신 파일)
-            order_logs = sorted(glob.glob(f'{TRADING_LOGS_DIR}/order_log_*.log'), key=os.path.getmtime, reverse=True)
-            if order_logs:
-                log_files['order'] = order_logs[0]
-                
-            # 트레이딩 로그 (최신 파일)
-            trading_logs = sorted(glob.glob(f'{TRADING_LOGS_DIR}/trading_log_*.log'), key=os.path.getmtime, reverse=True)
-            if trading_logs:
-                log_files['trading'] = trading_logs[0]
-        
-        return log_files
+    def log_sources(self):
+        """감시할 로그 {타입: 파일 경로 또는 glob 패턴} (트레이딩 로그는 최신 파일 하나를 따라감)"""
+        sources = {}
+        if not self.trade_only:
+            sources['api'] = API_SERVER_LOG
+            sources['analysis'] = STOCK_ANALYSIS_LOG
+        if not self.api_only:
+            sources['order'] = f'{TRADING_LOGS_DIR}/order_log_*.log'
+            sources['trading'] = f'{TRADING_LOGS_DIR}/trading_log_*.log'
+        return sources
+
+    def open_log_files(self):
+        """로그 파일 감시 시작 (현재 파일 끝부터 읽음)"""
+        self.tailer = LogTailer(self.on_new_lines)
+        for log_type, pattern in self.log_sources().items():
+            self.tailer.add(log_type, pattern)
+        self.logger.info(f"로그 파일 감시 방식: {self.tailer.mode}, 대상 {len(self.tailer.files())}개")
+
+    def on_new_lines(self, log_type, lines):
+        """새 로그 줄을 필터링해 링 버퍼에 추가 (잠금은 읽은 덩어리마다 한 번)"""
+        prefix = f"[{log_type.upper()}] "
+        tagged_lines = [prefix + line for line in lines if self.should_display_log(line)]
+        if tagged_lines:
+            with self.mutex:
+                self.logs.extend(tagged_lines)
 
     def tail_logs(self):
-        """로그 파일을 tail하는 스레드 함수"""
+        """로그 파일을 tail하는 스레드 함수 (파일이 바뀔 때만 깨어나 덧붙은 내용만 읽음)"""
         while not self.should_exit:
             try:
-                current_files = self.find_latest_log_files()
-                
-                # 새 로그 파일 추가 및 수정된 기존 로그 파일 처리
-                for log_type, file_path in current_files.items():
-                    file_info = self.log_files.get(log_type)
-                    
-                    # 새 로그 파일이거나 파일이 변경된 경우
-                    if not file_info or file_path != file_info['path']:
-                        # 파일 존재 여부 확인
-                        if not os.path.exists(file_path):
-                            continue
-                            
-                        try:
-                            # 이미 열려있는 파일 핸들 닫기
-                            if file_info and 'handle' in file_info and file_info['handle']:
-                                file_info['handle'].close()
-                                
-                            # 새 파일 열기
-                            file_handle = open(file_path, 'r')
-                            # 파일의 마지막 부분으로 이동 (처음 실행 시 기존 로그는 무시)
-                            file_handle.seek(0, os.SEEK_END)
-                            
-                            self.log_files[log_type] = {
-                                'path': file_path,
-                                'handle': file_handle,
-                                'position': file_handle.tell()
-                            }
-                            
-                            self.logger.info(f"로그 파일 모니터링 시작: {file_path}")
-                        except Exception as e:
-                            self.logger.error(f"로그 파일 열기 실패: {file_path} - {e}")
-                    
-                # 모든 로그 파일에서 새 로그 라인 읽기
-                for log_type, file_info in self.log_files.items():
-                    try:
-                        file_handle = file_info['handle']
-                        file_handle.seek(file_info['position'])
-                        
-                        new_lines = file_handle.readlines()
-                        if new_lines:
-                            for line in new_lines:
-                                line = line.strip()
-                                if line:
-                                    # 필터 적용
-                                    if self.should_display_log(line):
-                                        # 로그 타입 태그 추가
-                                        tagged_line = f"[{log_type.upper()}] {line}"
-                                        with self.mutex:
-                                            self.logs.append(tagged_line)
-                            
-                            # 파일 위치 업데이트
-                            file_info['position'] = file_handle.tell()
-                    except Exception as e:
-                        self.logger.error(f"로그 읽기 실패 ({log_type}): {e}")
-                
-                # 잠시 대기
-                time.sleep(LOG_REFRESH_INTERVAL)
-            
+                self.tailer.run_once(LOG_REFRESH_INTERVAL)
             except Exception as e:
                 self.logger.error(f"로그 모니터링 중 오류 발생: {e}")
                 time.sleep(LOG_REFRESH_INTERVAL * 2)  # 오류 발생 시 더 오래 대기
@@ -178,26 +130,32 @@ class LogMonitor:
     def should_display_log(self, log_line):
         """로그를 표시할지 결정"""
         # 에러 로그만 표시하는 경우
-        if self.error_only and not re.search(ERROR_PATTERN, log_line, re.IGNORECASE):
+        if self.error_only and not ERROR_RE.search(log_line):
             return False
             
         # 필터 텍스트가 있으면 확인
-        if self.filter_text and self.filter_text.lower() not in log_line.lower():
-            return False
+        if self.filter_text:
+            filter_text, filter_re = self._filter_cache
+            if filter_text != self.filter_text:
+                flags = re.IGNORECASE | (re.ASCII if self.filter_text.isascii() else 0)
+                filter_re = re.compile(re.escape(self.filter_text), flags)
+                self._filter_cache = (self.filter_text, filter_re)
+            if not filter_re.search(log_line):
+                return False
             
         return True
     
     def get_log_color(self, log_line):
         """로그 라인의 색상 결정"""
-        if re.search(ERROR_PATTERN, log_line, re.IGNORECASE):
+        if ERROR_RE.search(log_line):
             return COLOR_ERROR
-        elif re.search(WARNING_PATTERN, log_line, re.IGNORECASE):
+        elif WARNING_RE.search(log_line):
             return COLOR_WARNING
-        elif re.search(TRADE_PATTERN, log_line, re.IGNORECASE):
+        elif TRADE_RE.search(log_line):
             return COLOR_TRADE
         elif '[API]' in log_line:
             return COLOR_API
-        elif re.search(INFO_PATTERN, log_line, re.IGNORECASE):
+        elif INFO_RE.search(log_line):
             return COLOR_INFO
         else:
             return COLOR_DEFAULT
@@ -244,7 +202,7 @@ class LogMonitor:
                 if self.trade_only:
                     status_line += "Trade logs only | "
                     
-                file_count = len(self.log_files)
+                file_count = len(self.tailer.files())
                 status_line += f"Monitoring {file_count} log files"
                 
                 stdscr.addstr(0, 0, status_line[:max_x-1], curses.color_pair(COLOR_INFO))
@@ -278,7 +236,7 @@ class LogMonitor:
                         color = self.get_log_color(log)
                         
                         # 시간 부분 추출 및 다른 색상으로 표시
-                        time_match = re.search(r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})', log)
+                        time_match = TIME_RE.search(log)
                         if time_match:
                             time_part = time_match.group(1)
                             time_pos = log.find(time_part)
@@ -371,53 +329,24 @@ class LogMonitor:
         stdscr.timeout(100)  # 타임아웃 복원
     
     def load_initial_logs(self):
-        """초기 실행 시 기존 로그 불러오기"""
+        """초기 실행 시 기존 로그 불러오기 (감시 시작 위치 직전 부분만 읽음)"""
         self.logger.info("초기 로그 파일 로딩 중...")
         
-        # 로그 파일 목록 가져오기
-        log_files = self.find_latest_log_files()
-        
-        for log_type, file_path in log_files.items():
+        for log_type, file_path in self.tailer.files().items():
             try:
-                # 파일이 존재하는지 확인
-                if not os.path.exists(file_path):
-                    continue
-                    
-                # 파일 열기
-                with open(file_path, 'r') as f:
-                    # 파일의 끝 부분으로 이동 (필요한만큼의 라인만 읽기 위해)
-                    f.seek(0, os.SEEK_END)
-                    file_size = f.tell()
-                    
-                    # 대략적으로 필요한 바이트 수 계산 (라인당 평균 100바이트 가정)
-                    bytes_to_read = min(file_size, self.display_lines * 200)
-                    
-                    # 파일 포인터 이동
-                    f.seek(max(0, file_size - bytes_to_read), os.SEEK_SET)
-                    
-                    # 첫 번째 줄은 일부만 읽힐 수 있으므로 무시
-                    if bytes_to_read < file_size:
-                        f.readline()
-                    
-                    # 필요한 줄 수만큼 읽기
-                    lines = f.readlines()
-                    filtered_lines = []
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if line and self.should_display_log(line):
-                            tagged_line = f"[{log_type.upper()}] {line}"
-                            filtered_lines.append(tagged_line)
-                    
-                    # 필요한 줄 수만큼만 가져오기
-                    lines_to_add = filtered_lines[-self.display_lines:] if len(filtered_lines) > self.display_lines else filtered_lines
-                    
-                    # 로그 추가
-                    with self.mutex:
-                        for line in lines_to_add:
-                            self.logs.append(line)
-                            
-                    self.logger.info(f"{log_type} 로그에서 {len(lines_to_add)}줄 로드됨")
+                # 대략적으로 필요한 바이트 수만 읽기 (라인당 평균 200바이트 가정)
+                lines = self.tailer.backlog(log_type, self.display_lines * 200)
+                prefix = f"[{log_type.upper()}] "
+                filtered_lines = [prefix + line for line in lines if self.should_display_log(line)]
+                
+                # 필요한 줄 수만큼만 가져오기
+                lines_to_add = filtered_lines[-self.display_lines:]
+                
+                # 로그 추가
+                with self.mutex:
+                    self.logs.extend(lines_to_add)
+                        
+                self.logger.info(f"{log_type} 로그에서 {len(lines_to_add)}줄 로드됨")
             
             except Exception as e:
                 self.logger.error(f"초기 로그 로딩 중 오류: {file_path} - {e}")
@@ -426,7 +355,8 @@ class LogMonitor:
         """모니터링 시작"""
         self.logger.info("로그 모니터링 시작...")
         
-        # 초기 로그 로드
+        # 로그 파일 감시 시작 후 그 직전까지의 로그 로드 (두 단계 사이의 로그가 빠지지 않음)
+        self.open_log_files()
         self.load_initial_logs()
         
         # 로그 테일링 스레드 시작
@@ -444,12 +374,7 @@ class LogMonitor:
             tail_thread.join(timeout=1.0)
             
             # 파일 핸들 정리
-            for log_type, file_info in self.log_files.items():
-                if 'handle' in file_info and file_info['handle']:
-                    try:
-                        file_info['handle'].close()
-                    except Exception:
-                        pass
+            self.tailer.close()
             
             self.logger.info("로그 모니터링 종료")
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+로그 검색 도구
+
+로그 파일을 처음부터 읽지 않고 로그 인덱스(src/utils/log_index.py)로 지난 로그를 찾습니다.
+검색 전에 로그 파일에 덧붙은 부분만 인덱스에 반영합니다.
+
+사용법: python log_search.py [options]
+옵션:
+  --logger NAME   로거 이름 (예: KISAPI, 'Kakao*')
+  --level LEVEL   최소 로그 레벨 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+  --symbol CODE   종목 코드 (예: 005930)
+  --since TIME    시작 시각 ('2026-10-01', '2026-10-01 09:00', '7d', '12h', '30m')
+  --until TIME    끝 시각 (같은 형식)
+  --text TEXT     메시지에 들어 있어야 할 문자열
+  --limit N       최대 결과 수 (기본값: 50)
+  --count         결과 대신 개수만 표시
+  --no-update     인덱스 갱신 없이 검색
+  --loggers       인덱스에 있는 로거 이름 목록
+
+예) 지난 일주일 005930 관련 KISAPI 오류:
+    python log_search.py --logger KISAPI --level ERROR --symbol 005930 --since 7d
+"""
+import argparse
+import sys
+import time
+
+import config
+from src.utils.log_index import LogIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로그 검색 도구')
+    parser.add_argument('--logger', type=str, default=None, help='로거 이름 (예: KISAPI, \'Kakao*\')')
+    parser.add_argument('--level', type=str, default=None, help='최소 로그 레벨')
+    parser.add_argument('--symbol', type=str, default=None, help='종목 코드')
+    parser.add_argument('--since', type=str, default=None, help='시작 시각 (날짜/시각 또는 7d, 12h, 30m)')
+    parser.add_argument('--until', type=str, default=None, help='끝 시각')
+    parser.add_argument('--text', type=str, default=None, help='메시지에 들어 있어야 할 문자열')
+    parser.add_argument('--limit', type=int, default=50, help='최대 결과 수 (기본값: 50)')
+    parser.add_argument('--oldest-first', action='store_true', help='오래된 항목부터 표시')
+    parser.add_argument('--count', action='store_true', help='결과 대신 개수만 표시')
+    parser.add_argument('--no-update', action='store_true', help='인덱스 갱신 없이 검색')
+    parser.add_argument('--loggers', action='store_true', help='인덱스에 있는 로거 이름 목록')
+
+    args = parser.parse_args()
+
+    index = LogIndex(config)
+    if not args.no_update:
+        started = time.perf_counter()
+        added = index.update()
+        if added:
+            print(f"인덱스 갱신: {added:,}개 항목 ({(time.perf_counter() - started) * 1000:.0f}ms)", file=sys.stderr)
+
+    if args.loggers:
+        for name in index.loggers():
+            print(name)
+        return
+
+    started = time.perf_counter()
+    try:
+        if args.count:
+            count = index.count(logger=args.logger, level=args.level, symbol=args.symbol,
+                                since=args.since, until=args.until)
+            print(count)
+        else:
+            results = index.search(logger=args.logger, level=args.level, symbol=args.symbol, since=args.since,
+                                   until=args.until, text=args.text, limit=args.limit,
+                                   newest_first=not args.oldest_first)
+            for entry in results:
+                print(entry['message'])
+            print(f"{len(results)}건", file=sys.stderr, end=" ")
+    except (KeyError, ValueError) as e:
+        print(f"검색 조건 오류: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"({(time.perf_counter() - started) * 1000:.1f}ms)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,21 @@ import logging
 import sys
 import time
 import json  # json 모듈 추가
-import schedule
 import datetime  # datetime 모듈 추가
 import argparse  # 명령줄 인수 처리를 위한 모듈 추가
 import os  # os 모듈 추가
 import re  # re 모듈 추가
 from src.data.stock_data import StockData
+from src.data.market_data_service import MarketDataService
+from src.data.symbol_master import get_symbol_master
+from src.utils.log_index import get_log_index
+from src.utils.metrics import get_metrics_registry
+from src.utils.tracing import get_tracer
+from src.utils.profiler import DebugControl
 from src.analysis.technical import analyze_signals
 from src.notification.telegram_sender import TelegramSender
 from src.notification.kakao_sender import KakaoSender
+from src.notification.dispatcher import get_notification_dispatcher, REPORT
 from src.trading.kis_api import KISAPI
 from src.trading.auto_trader import AutoTrader
 from src.trading.gpt_auto_trader import GPTAutoTrader  # 새로 추가한 GPTAutoTrader 클래스
@@ -23,6 +29,7 @@ from src.ai_analysis.gemini_analyzer import GeminiAnalyzer  # Gemini 분석기 
 from src.ai_analysis.hybrid_analysis_strategy import HybridAnalysisStrategy  # 하이브리드 분석 전략 추가
 from src.ai_analysis.gpt_trading_strategy import GPTTradingStrategy, SignalType
 from src.ai_analysis.stock_selector import StockSelector
+from src.utils.job_scheduler import JobScheduler, IntervalTrigger, DailyTrigger, SessionTrigger, SKIP, QUEUE, COALESCE
 from src.utils.time_utils import now, format_time, get_korean_datetime_format, is_market_open, get_market_schedule, get_current_time, get_current_time_str, convert_time
 import config
 
@@ -58,6 +65,8 @@ class StockAnalysisSystem:
         """초기화 함수"""
         self.config = config
         self.stock_data = StockData(config)
+        # 트레이더 스레드와 분석 작업이 공유하는 시세 데이터 서비스 (중복 조회 합치기)
+        self.market_data = MarketDataService(self.stock_data, config)
         self.telegram_sender = TelegramSender(config)
         
         # 카카오톡 메시지 전송 초기화
@@ -65,6 +74,7 @@ class StockAnalysisSystem:
         self.kakao_sender = KakaoSender(config) if self.use_kakao else None
         
         self.is_running = False
+        self.scheduler = None  # 작업 스케줄러 (start()에서 생성)
         
         # 자동 매매 기능 초기화
         self.auto_trading_enabled = self.config.AUTO_TRADING_ENABLED
@@ -93,13 +103,14 @@ class StockAnalysisSystem:
         logger.info("AI 주식 분석 시스템 초기화 완료")
     
     # 메시지 전송 함수 (텔레그램, 카카오 통합)
-    def send_notification(self, message_type, data):
+    def send_notification(self, message_type, data, priority=None):
         """
-        알림 메시지 전송 (텔레그램, 카카오톡)
+        알림 메시지 전송 (텔레그램, 카카오톡 - 알림 발송기 큐에 넣고 바로 반환)
         
         Args:
             message_type: 메시지 유형 ('signal', 'status')
             data: 알림 데이터
+            priority: 상태 메시지 발송 우선순위 (None이면 메시지 내용으로 추정, 리포트 구간은 REPORT로 순서 유지)
         """
         # 텔레그램으로 메시지 전송 시도 (텔레그램 활성화된 경우에만)
         if getattr(self.config, 'USE_TELEGRAM', False) and self.telegram_sender and self.telegram_sender.enabled:
@@ -107,7 +118,7 @@ class StockAnalysisSystem:
                 if message_type == 'signal':
                     self.telegram_sender.send_signal_notification(data)
                 elif message_type == 'status':
-                    self.telegram_sender.send_system_status(data)
+                    self.telegram_sender.send_system_status(data, priority)
                 logger.info("텔레그램 메시지 전송 시도")
             except Exception as e:
                 logger.error(f"텔레그램 메시지 전송 실패: {e}")
@@ -118,7 +129,7 @@ class StockAnalysisSystem:
                 if message_type == 'signal':
                     self.kakao_sender.send_signal_notification(data)
                 elif message_type == 'status':
-                    self.kakao_sender.send_system_status(data)
+                    self.kakao_sender.send_system_status(data, priority)
                 logger.info("카카오톡 메시지 전송 시도")
             except Exception as e:
                 logger.error(f"카카오톡 메시지 전송 실패: {e}")
@@ -157,6 +168,7 @@ class StockAnalysisSystem:
                 # 필요한 객체 재생성
                 logger.info("stock_data 객체 초기화")
                 self.stock_data = StockData(self.config)
+                self.market_data = MarketDataService(self.stock_data, self.config)
                 
             if not hasattr(self, 'gpt_trading_strategy') or not self.gpt_trading_strategy:
                 # 필요한 객체 재생성
@@ -172,7 +184,7 @@ class StockAnalysisSystem:
             self.auto_trader = AutoTrader(
                 config=self.config, 
                 broker=self.broker_api,
-                data_provider=self.stock_data,
+                data_provider=self.market_data,
                 strategy_provider=self.gpt_trading_strategy,
                 notifier=notifier
             )
@@ -193,7 +205,7 @@ class StockAnalysisSystem:
                 self.gpt_auto_trader = GPTAutoTrader(
                     config=self.config,
                     broker=self.broker_api,
-                    data_provider=self.stock_data,
+                    data_provider=self.market_data,
                     notifier=notifier
                 )
                 logger.info("GPT 기반 자동 매매 시스템 초기화 완료")
@@ -476,7 +488,7 @@ class StockAnalysisSystem:
         for code in self.config.KR_STOCKS:
             try:
                 # 주식 데이터 가져오기
-                df = self.stock_data.get_korean_stock_data(code)
+                df = self.market_data.get_korean_stock_data(code)
                 
                 if df.empty:
                     logger.warning(f"종목 {code}에 대한 데이터가 없습니다.")
@@ -633,7 +645,7 @@ class StockAnalysisSystem:
         for symbol in self.config.US_STOCKS:
             try:
                 # 주식 데이터 가져오기
-                df = self.stock_data.get_us_stock_data(symbol)
+                df = self.market_data.get_us_stock_data(symbol)
                 
                 if df.empty:
                     logger.warning(f"종목 {symbol}에 대한 데이터가 없습니다.")
@@ -857,8 +869,7 @@ class StockAnalysisSystem:
             
             for part in parts:
                 # 통합 알림 전송 함수 사용
-                self.send_notification('status', part)
-                time.sleep(1)  # API 제한 방지
+                self.send_notification('status', part, priority=REPORT)
         else:
             # 통합 알림 전송 함수 사용
             self.send_notification('status', message)
@@ -1061,17 +1072,12 @@ class StockAnalysisSystem:
             disclaimer_msg = "<i>※ 이 리포트는 자동으로 생성된 정보로, 투자 결정에 참고자료로만 활용하시길 권장드립니다. 투자는 본인의 판단과 책임하에 진행하시기 바랍니다.</i>"
             
             # 메시지를 나눠서 전송 (텔레그램 메시지 길이 제한 때문)
-            self.send_notification('status', account_msg)
-            time.sleep(1)  # API 제한 방지
-            self.send_notification('status', positions_msg)
-            time.sleep(1)
-            self.send_notification('status', trades_msg)
-            time.sleep(1)
-            self.send_notification('status', monthly_msg)
-            time.sleep(1)
-            self.send_notification('status', sector_msg)
-            time.sleep(1)
-            self.send_notification('status', recommendations_msg + disclaimer_msg)
+            self.send_notification('status', account_msg, priority=REPORT)
+            self.send_notification('status', positions_msg, priority=REPORT)
+            self.send_notification('status', trades_msg, priority=REPORT)
+            self.send_notification('status', monthly_msg, priority=REPORT)
+            self.send_notification('status', sector_msg, priority=REPORT)
+            self.send_notification('status', recommendations_msg + disclaimer_msg, priority=REPORT)
             
             logger.info("투자 내역 종합 리포트 전송 완료")
             
@@ -1205,15 +1211,11 @@ class StockAnalysisSystem:
             disclaimer_msg = "<i>※ 이 리포트는 자동으로 생성된 정보로, 투자 결정에 참고자료로만 활용하시길 권장드립니다. 투자는 본인의 판단과 책임하에 진행하시기 바랍니다.</i>"
             
             # 메시지를 나눠서 전송 (텔레그램 메시지 길이 제한 때문)
-            self.send_notification('status', account_msg)
-            time.sleep(1)  # API 제한 방지
-            self.send_notification('status', positions_msg)
-            time.sleep(1)
-            self.send_notification('status', trades_msg)
-            time.sleep(1)
-            self.send_notification('status', sector_msg)
-            time.sleep(1)
-            self.send_notification('status', recommendations_msg + disclaimer_msg)
+            self.send_notification('status', account_msg, priority=REPORT)
+            self.send_notification('status', positions_msg, priority=REPORT)
+            self.send_notification('status', trades_msg, priority=REPORT)
+            self.send_notification('status', sector_msg, priority=REPORT)
+            self.send_notification('status', recommendations_msg + disclaimer_msg, priority=REPORT)
             
             logger.info("한국 시장 투자 내역 종합 리포트 전송 완료")
             
@@ -1331,13 +1333,10 @@ class StockAnalysisSystem:
             disclaimer_msg = "<i>※ 이 리포트는 자동으로 생성된 정보로, 투자 결정에 참고자료로만 활용하시길 권장드립니다. 투자는 본인의 판단과 책임하에 진행하시기 바랍니다.</i>"
             
             # 메시지를 나눠서 전송 (텔레그램 메시지 길이 제한 때문)
-            self.send_notification('status', account_msg)
-            time.sleep(1)  # API 제한 방지
-            self.send_notification('status', positions_msg)
-            time.sleep(1)
-            self.send_notification('status', trades_msg)
-            time.sleep(1)
-            self.send_notification('status', recommendations_msg + disclaimer_msg)
+            self.send_notification('status', account_msg, priority=REPORT)
+            self.send_notification('status', positions_msg, priority=REPORT)
+            self.send_notification('status', trades_msg, priority=REPORT)
+            self.send_notification('status', recommendations_msg + disclaimer_msg, priority=REPORT)
             
             logger.info("미국 시장 투자 내역 종합 리포트 전송 완료")
             
@@ -1357,6 +1356,11 @@ class StockAnalysisSystem:
         # 종목 리스트 체크 및 초기화
         self._initialize_stock_lists()
         
+        # 종목 마스터 인덱스에 최신 종목 리스트 반영
+        symbol_master = get_symbol_master(self.config)
+        symbol_master.update(getattr(self.config, 'KR_STOCK_INFO', []), "KR")
+        symbol_master.update(getattr(self.config, 'US_STOCK_INFO', []), "US")
+        
         # 자동 매매 시스템 시작
         trade_status = "비활성화"
         gpt_trade_status = "비활성화"
@@ -1494,26 +1498,81 @@ class StockAnalysisSystem:
         # 초기 데이터 수집
         self.stock_data.update_all_data()
         
-        # 스케줄 설정
-        # 국내 주식: 30분 간격으로 분석 (장 중에만)
-        schedule.every(30).minutes.do(self.analyze_korean_stocks)
+        # 구독 종목 시세 백그라운드 갱신 시작
+        self.market_data.start()
+        
+        # 스케줄 설정 (작업 분류별 워커 풀에서 실행되어 느린 작업이 다른 작업을 지연시키지 않음)
+        self.scheduler = JobScheduler(pools=getattr(self.config, 'SCHEDULER_POOL_SIZES', None))
+        
+        # 국내 주식: 30분 간격으로 분석 (장 중에만, 휴장일 제외)
+        self.scheduler.add_job("analyze_kr", self.analyze_korean_stocks,
+                               IntervalTrigger(30 * 60, market="KR", config=self.config),
+                               job_class="analysis", overlap=COALESCE)
         
-        # 미국 주식: 30분 간격으로 분석 (장 중에만)
-        schedule.every(30).minutes.do(self.analyze_us_stocks)
+        # 미국 주식: 30분 간격으로 분석 (장 중에만, 휴장일 제외)
+        self.scheduler.add_job("analyze_us", self.analyze_us_stocks,
+                               IntervalTrigger(30 * 60, market="US", config=self.config),
+                               job_class="analysis", overlap=COALESCE)
         
         # 일일 요약: 매일 저녁 6시
-        schedule.every().day.at("18:00").do(self.send_daily_summary)
+        self.scheduler.add_job("daily_summary", self.send_daily_summary, DailyTrigger("18:00"),
+                               job_class="report", overlap=QUEUE)
         
-        # GPT 종목 선정: 매일 오전 8시 30분 (한국 시장 오픈 전)
-        schedule.every().day.at("08:30").do(self.select_stocks_with_gpt)
+        # GPT 종목 선정: 한국 시장 개장 30분 전 (거래일만)
+        self.scheduler.add_job("select_stocks", self.select_stocks_with_gpt,
+                               SessionTrigger("KR", "open", offset_minutes=-30, config=self.config),
+                               job_class="selection", overlap=SKIP)
         
-        # GPT 자동 매매: 30분 간격으로 실행
+        # GPT 자동 매매: 30분 간격으로 실행 (이전 사이클이 끝나지 않았으면 건너뜀)
         gpt_trading_interval = getattr(self.config, 'GPT_TRADING_MONITOR_INTERVAL', 30)
-        schedule.every(gpt_trading_interval).minutes.do(self.run_gpt_trading_cycle)
-        
-        # 투자 내역 종합 리포트: 국내장 마감 직후 (15:40)와 미국장 마감 직후 (06:10) 전송
-        schedule.every().day.at("15:40").do(self.send_investment_report_kr)  # 한국장 마감 직후
-        schedule.every().day.at("06:10").do(self.send_investment_report_us)  # 미국장 마감 직후 (한국시간)
+        self.scheduler.add_job("gpt_trading", self.run_gpt_trading_cycle,
+                               IntervalTrigger(gpt_trading_interval * 60),
+                               job_class="trading", overlap=SKIP)
+        
+        # 투자 내역 종합 리포트: 국내장/미국장 마감 10분 후 (휴장일 제외, 조기 마감 반영)
+        self.scheduler.add_job("report_kr", self.send_investment_report_kr,
+                               SessionTrigger("KR", "close", offset_minutes=10, config=self.config),
+                               job_class="report", overlap=QUEUE)
+        self.scheduler.add_job("report_us", self.send_investment_report_us,
+                               SessionTrigger("US", "close", offset_minutes=10, config=self.config),
+                               job_class="report", overlap=QUEUE)
+        
+        # 강제 시장 열림 설정이 활성화되어 있으면, 1분 간격으로 매매 사이클 실행
+        if getattr(self.config, 'FORCE_MARKET_OPEN', False) and self.auto_trading_enabled:
+            self.scheduler.add_job("forced_trading", self._run_forced_trading_cycle, IntervalTrigger(60),
+                                   job_class="trading", overlap=SKIP)
+        
+        # 종목 마스터 인덱스 증분 갱신 (종목 정보 테이블에서 바뀐 행만)
+        self.scheduler.add_job("symbol_master_refresh", get_symbol_master(self.config).refresh,
+                               IntervalTrigger(getattr(self.config, 'SYMBOL_MASTER_REFRESH_SECONDS', 600)),
+                               job_class="maintenance", overlap=SKIP)
+        
+        # 로그 검색 인덱스 증분 갱신 (로그 파일에 덧붙은 부분만)
+        self.scheduler.add_job("log_index_update", get_log_index(self.config).update,
+                               IntervalTrigger(getattr(self.config, 'LOG_INDEX_UPDATE_SECONDS', 300)),
+                               job_class="maintenance", overlap=SKIP)
+        
+        # 메트릭 파일 기록 (API 서버 /metrics가 합쳐서 노출)
+        self.scheduler.add_job("metrics_export", self._export_metrics,
+                               IntervalTrigger(getattr(self.config, 'METRICS_EXPORT_SECONDS', 15)),
+                               job_class="maintenance", overlap=SKIP)
+        
+        # 프로파일러 켜기/끄기와 트레이스 덤프 요청 확인 (API 서버가 제어 파일에 기록)
+        get_tracer(self.config).process = "main"
+        self.debug_control = DebugControl(getattr(self.config, 'DEBUG_DIR', os.path.join("cache", "debug")), "main",
+                                          max_duration=getattr(self.config, 'PROFILER_MAX_DURATION_SECONDS', 600))
+        self.scheduler.add_job("debug_control", self.debug_control.poll,
+                               IntervalTrigger(getattr(self.config, 'DEBUG_CONTROL_POLL_SECONDS', 2)),
+                               job_class="maintenance", overlap=SKIP)
+        
+        # 작업별 실행 시간/지연 기록 로그와 하위 시스템별 통계 로그: 30분 간격
+        for name, log_stats in (("scheduler_stats", self._log_scheduler_stats),
+                                ("notification_stats", self._log_notification_stats),
+                                ("kakao_token_stats", self._log_kakao_token_stats),
+                                ("market_data_stats", self._log_market_data_stats),
+                                ("order_gateway_stats", self._log_order_gateway_stats),
+                                ("metric_summaries", self._log_metric_summaries)):
+            self.scheduler.add_job(name, log_stats, IntervalTrigger(30 * 60), job_class="maintenance", overlap=SKIP)
         
         # 메인 루프
         try:
@@ -1524,30 +1583,10 @@ class StockAnalysisSystem:
             else:
                 logger.warning("OpenAI API 키가 유효하지 않아 시작 시 종목 선정을 건너뜁니다.")
             
-            # 무한 루프 - 프로그램이 종료되지 않도록 유지
+            # 다음 작업 시각까지 대기하며 실행 - 프로그램이 종료되지 않도록 유지
             logger.info("매매 시스템 메인 루프 시작 (Ctrl+C로 종료)")
-            while self.is_running:
-                schedule.run_pending()
-                
-                # 강제 시장 열림 설정이 활성화되어 있으면, 주기적으로 매매 사이클 실행
-                if hasattr(self.config, 'FORCE_MARKET_OPEN') and self.config.FORCE_MARKET_OPEN and self.auto_trading_enabled:
-                    try:
-                        # 일반 매매 사이클 실행
-                        if self.auto_trader:
-                            self.auto_trader.run_trading_cycle()
-                            logger.info("매매 사이클 실행 완료 (강제 실행 모드)")
-                        
-                        # GPT 자동 매매 사이클 실행
-                        if self.gpt_auto_trader:
-                            self.gpt_auto_trader.run_cycle()
-                            logger.info("GPT 매매 사이클 실행 완료 (강제 실행 모드)")
-                    except Exception as e:
-                        logger.error(f"매매 사이클 실행 중 오류 발생: {e}")
-                
-                # 60초 대기
-                time.sleep(60)
-                logger.info("매매 시스템 실행 중... (1분 간격 체크)")
-                
+            self.scheduler.run(should_continue=lambda: self.is_running)
+            
         except KeyboardInterrupt:
             logger.info("사용자에 의해 시스템 종료")
             self.stop()
@@ -1556,6 +1595,82 @@ class StockAnalysisSystem:
             logger.error(f"시스템 실행 중 오류 발생: {e}")
             self.stop()
     
+    def _run_forced_trading_cycle(self):
+        """강제 실행 모드 매매 사이클 (FORCE_MARKET_OPEN)"""
+        # 일반 매매 사이클 실행
+        if self.auto_trader:
+            self.auto_trader.run_trading_cycle()
+            logger.info("매매 사이클 실행 완료 (강제 실행 모드)")
+        
+        # GPT 자동 매매 사이클 실행
+        if self.gpt_auto_trader:
+            self.gpt_auto_trader.run_cycle()
+            logger.info("GPT 매매 사이클 실행 완료 (강제 실행 모드)")
+    
+    def _export_metrics(self):
+        """메트릭 레지스트리 수집 결과를 API 서버용 파일로 기록"""
+        registry = get_metrics_registry()
+        registry.process = "main"
+        registry.export(getattr(self.config, 'METRICS_EXPORT_DIR', os.path.join("cache", "metrics")))
+    
+    def _log_scheduler_stats(self):
+        """작업별 실행 횟수, 실행 시간, 지연 로그"""
+        for name, stats in self.scheduler.stats().items():
+            if not stats['runs'] and not stats['skipped']:
+                continue
+            logger.info(f"작업 {name}: {stats['runs']}회 실행 (실패 {stats['failures']}, 건너뜀 {stats['skipped']}), "
+                        f"평균 {stats['mean_seconds'] or 0:.1f}초, 최대 {stats['max_seconds']:.1f}초, "
+                        f"최대 지연 {stats['max_lateness']:.1f}초, 다음 실행 {stats['next_run']}")
+    
+    def _log_notification_stats(self):
+        """채널별 알림 발송 통계 로그"""
+        for channel, stats in get_notification_dispatcher(self.config).stats().items():
+            logger.info(f"알림 {channel}: 예약 {stats['queued']}건, 전송 {stats['sent']}건, 실패 {stats['failed']}건, "
+                        f"버림 {stats['dropped']}건, 신호 묶음 {stats['digests']}회({stats['digested']}건), "
+                        f"대기 {stats['pending']}건")
+    
+    def _log_kakao_token_stats(self):
+        """카카오톡 토큰 갱신 통계 로그"""
+        if not (self.kakao_sender and self.kakao_sender.initialized):
+            return
+        token_stats = self.kakao_sender.token_cache.stats
+        logger.info(f"카카오톡 토큰: 상태 {self.kakao_sender.token_state()}, 갱신 {token_stats['issued']}회, "
+                    f"다른 프로세스 토큰 사용 {token_stats['shared']}회, 캐시 적중 {token_stats['hits']}회, "
+                    f"갱신 실패 {token_stats['errors']}회")
+    
+    def _log_market_data_stats(self):
+        """시세 데이터 서비스 중복 제거 통계 로그"""
+        data_stats = self.market_data.stats()['total']
+        logger.info(f"시세 데이터 서비스: 요청 {data_stats['requests']}회, 캐시 적중 {data_stats['hits']}회, "
+                    f"중복 제거 {data_stats['deduplicated']}회, 원본 호출 {data_stats['upstream']}회")
+    
+    def _log_order_gateway_stats(self):
+        """주문 게이트웨이와 해시키 통계 로그"""
+        if not self.auto_trader:
+            return
+        gateway = self.auto_trader.order_gateway
+        latency = gateway.latency_stats()['signal_to_submit']
+        logger.info(f"주문 게이트웨이: 요청 {gateway.stats['requests']}회, 제출 {gateway.stats['submitted']}회, "
+                    f"위험 점검 거부 {gateway.stats['rejected']}회, 신호→제출 p50 {latency['p50'] * 1000:.0f}ms, "
+                    f"p95 {latency['p95'] * 1000:.0f}ms")
+        
+        broker = self.auto_trader.broker
+        if hasattr(broker, 'order_latency_stats'):
+            order_latency = broker.order_latency_stats()
+            hashkey = order_latency['hashkey']
+            logger.info(f"주문 해시키: 발급 {hashkey['count']}회 (p50 {hashkey['p50'] * 1000:.0f}ms), "
+                        f"캐시 재사용 {broker.hashkey_stats['hits']}회, "
+                        f"주문 p50 해시키 사용 {order_latency['order_with_hashkey']['p50'] * 1000:.0f}ms / "
+                        f"미사용 {order_latency['order_without_hashkey']['p50'] * 1000:.0f}ms")
+    
+    def _log_metric_summaries(self):
+        """메트릭 히스토그램 분위수 요약 로그"""
+        for name, children in get_metrics_registry().summaries().items():
+            for labels, summary in children.items():
+                logger.info(f"메트릭 {name}{f'[{labels}]' if labels else ''}: {summary['count']}회, "
+                            f"p50 {summary['p50'] * 1000:.1f}ms, p95 {summary['p95'] * 1000:.1f}ms, "
+                            f"p99 {summary['p99'] * 1000:.1f}ms, 최대 {summary['max'] * 1000:.1f}ms")
+
     def _initialize_stock_lists(self):
         """종목 리스트 초기화 및 확인"""
         # 데이터베이스에서 종목 정보를 불러오기
@@ -1695,6 +1810,11 @@ class StockAnalysisSystem:
             
         self.is_running = False
         
+        # 작업 스케줄러 종료 (실행 중인 작업은 끝까지 실행)
+        if self.scheduler:
+            self.scheduler.shutdown(wait=False)
+        self.market_data.stop()
+        
         # 자동 매매 시스템 종료
         if self.auto_trading_enabled and self.auto_trader and hasattr(self.auto_trader, 'stop_trading_session'):
             self.auto_trader.stop_trading_session()
@@ -1713,6 +1833,9 @@ class StockAnalysisSystem:
             self.send_notification('status', message)
         except Exception as e:
             logger.error(f"종료 메시지 전송 실패: {e}")
+        
+        # 대기 중인 알림을 보내고 알림 발송기 종료
+        get_notification_dispatcher(self.config).stop(timeout=getattr(self.config, 'NOTIFY_SHUTDOWN_TIMEOUT', 10))
     
     def force_select_stocks(self):
         """단타매매와 급등주 감지 모드를 위한 종목 강제 재선정"""
@@ -16,6 +16,8 @@ import argparse
 import psutil
 from datetime import datetime, timedelta
 
+from src.utils.resource_sampler import ResourceSampler
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -53,6 +55,13 @@ class ProcessMonitor:
         self.api_server_pid_file = "api_server.pid"
         self.monitor_api_server = monitor_api_server
         
+        # 대상 프로세스 자원 샘플러 (psutil.Process 핸들을 캐시하고 잠들지 않고 CPU 사용률 계산)
+        self.sampler = ResourceSampler()
+        self.sampler.track('main', pid_file=self.pid_file)
+        if self.monitor_api_server:
+            self.sampler.track('api_server', pid_file=self.api_server_pid_file)
+        self.active_alerts = set()  # 이미 알린 누수 의심 (프로세스, 지표)
+        
         # 스크립트 경로 (상대 경로를 절대 경로로 변환)
         if not os.path.isabs(target_script):
             self.script_path = os.path.join(os.getcwd(), target_script)
@@ -76,11 +85,15 @@ class ProcessMonitor:
             발견된 프로세스 객체 리스트
         """
         target_processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'status']):
+        own_pid = os.getpid()
+        # 이름(/proc/<pid>/stat)으로 파이썬 프로세스만 고른 뒤 명령줄을 읽음
+        for proc in psutil.process_iter(['name']):
             try:
-                cmdline = proc.info['cmdline']
-                # None이 아니고 빈 리스트가 아닌지 확인
-                if cmdline and len(cmdline) > 1:
+                if proc.pid == own_pid or 'python' not in (proc.info['name'] or '').lower():
+                    continue
+                cmdline = proc.cmdline()
+                # 빈 리스트가 아닌지 확인
+                if len(cmdline) > 1:
                     # 명령줄에 스크립트 이름이 포함되어 있는지 확인
                     if any(script_name in cmd for cmd in cmdline):
                         target_processes.append(proc)
@@ -141,25 +154,25 @@ class ProcessMonitor:
             bool: 리소스가 충분하면 True, 부족하면 False
         """
         try:
+            # CPU는 직전 확인 이후 평균 사용률 (1초씩 멈추지 않음)
+            system = self.sampler.sample_system()
+            
             # 메모리 사용량 확인
-            memory = psutil.virtual_memory()
-            if memory.percent >= self.max_memory_percent:
-                logger.warning(f"메모리 사용량이 높습니다: {memory.percent}% (최대 허용: {self.max_memory_percent}%)")
+            if system['memory'] >= self.max_memory_percent:
+                logger.warning(f"메모리 사용량이 높습니다: {system['memory']}% (최대 허용: {self.max_memory_percent}%)")
                 return False
                 
             # CPU 사용량 확인
-            cpu_percent = psutil.cpu_percent(interval=1)
-            if cpu_percent >= self.max_cpu_percent:
-                logger.warning(f"CPU 사용량이 높습니다: {cpu_percent}% (최대 허용: {self.max_cpu_percent}%)")
+            if system['cpu'] >= self.max_cpu_percent:
+                logger.warning(f"CPU 사용량이 높습니다: {system['cpu']}% (최대 허용: {self.max_cpu_percent}%)")
                 return False
                 
             # 디스크 공간 확인
-            disk = psutil.disk_usage('/')
-            if disk.percent >= 90:
-                logger.warning(f"디스크 사용량이 높습니다: {disk.percent}%")
+            if system['disk'] >= 90:
+                logger.warning(f"디스크 사용량이 높습니다: {system['disk']}%")
                 return False
                 
-            logger.info(f"시스템 리소스 정상 - 메모리: {memory.percent}%, CPU: {cpu_percent}%, 디스크: {disk.percent}%")
+            logger.info(f"시스템 리소스 정상 - 메모리: {system['memory']}%, CPU: {system['cpu']}%, 디스크: {system['disk']}%")
             return True
             
         except Exception as e:
@@ -236,31 +249,33 @@ class ProcessMonitor:
             logger.error(f"프로세스 시작 중 오류 발생: {e}")
             return None
 
-    def check_process_health(self, target_pid=None):
+    def check_process_health(self, target_pid=None, name=None):
         """
         특정 프로세스의 상태 확인
         
         Args:
             target_pid: 확인할 프로세스 ID
+            name: 자원 샘플러 대상 이름 (기본값: 'pid:<target_pid>')
             
         Returns:
             bool: 프로세스가 정상이면 True, 그렇지 않으면 False
         """
         try:
-            if target_pid and psutil.pid_exists(target_pid):
-                # 프로세스 객체 가져오기
-                process = psutil.Process(target_pid)
-                
+            # 캐시된 핸들 사용 (PID 재사용은 create_time으로 구분)
+            process = self.sampler.track(name or f"pid:{target_pid}", pid=target_pid) if target_pid else None
+            if process is not None:
                 # 프로세스 상태 확인
-                if process.status() in [psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING]:
-                    # CPU 및 메모리 사용량 확인
-                    memory_info = process.memory_percent()
-                    cpu_percent = process.cpu_percent(interval=0.5)
-                    
-                    logger.info(f"프로세스 {target_pid} 상태: 정상 (CPU: {cpu_percent:.1f}%, 메모리: {memory_info:.1f}%)")
+                status = process.status()
+                if status in [psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING]:
+                    # CPU(직전 확인 이후) 및 메모리 사용량 기록
+                    sample = self.sampler.sample_process(name or f"pid:{target_pid}")
+                    if sample:
+                        memory_percent = sample['rss'] / psutil.virtual_memory().total * 100
+                        logger.info(f"프로세스 {target_pid} 상태: 정상 (CPU: {sample['cpu']:.1f}%, "
+                                    f"메모리: {memory_percent:.1f}%, 스레드: {sample['threads']}, FD: {sample['fds']})")
                     return True
                 else:
-                    logger.warning(f"프로세스 {target_pid} 상태 비정상: {process.status()}")
+                    logger.warning(f"프로세스 {target_pid} 상태 비정상: {status}")
                     return False
             else:
                 logger.warning(f"프로세스 {target_pid}가 실행 중이지 않습니다.")
@@ -273,6 +288,29 @@ class ProcessMonitor:
             logger.error(f"프로세스 상태 확인 중 예상치 못한 오류: {e}")
             return False
 
+    def report_resource_trends(self):
+        """
+        자원 시계열을 API 서버용 파일로 내보내고 누수 의심 추세 기록
+        
+        Returns:
+            list: 누수 의심 알림 목록
+        """
+        try:
+            alerts = self.sampler.check_alerts()
+            current = set()
+            for alert in alerts:
+                key = (alert['process'], alert['metric'])
+                current.add(key)
+                # 같은 추세는 사라졌다 다시 나타날 때만 다시 기록
+                if key not in self.active_alerts:
+                    logger.warning(f"자원 누수 의심: {alert['message']}")
+            self.active_alerts = current
+            self.sampler.export()
+            return alerts
+        except Exception as e:
+            logger.error(f"자원 시계열 내보내기 중 오류 발생: {e}")
+            return []
+
     def kill_process(self, pid):
         """
         프로세스 강제 종료
@@ -367,7 +405,7 @@ class ProcessMonitor:
         # 3. API 서버 상태 확인
         api_server_running = False
         if api_server_pid is not None:
-            api_server_running = self.check_process_health(api_server_pid)
+            api_server_running = self.check_process_health(api_server_pid, 'api_server')
             
         # 4. 필요시 API 서버 재시작
         if not api_server_running and self.auto_restart:
@@ -438,7 +476,7 @@ class ProcessMonitor:
                 # 6. 메인 프로세스 상태 확인
                 process_running = False
                 if target_pid is not None:
-                    process_running = self.check_process_health(target_pid)
+                    process_running = self.check_process_health(target_pid, 'main')
                 
                 # 7. 필요시 메인 프로세스 재시작
                 if not process_running and self.auto_restart:
@@ -455,7 +493,10 @@ class ProcessMonitor:
                     if success:
                         last_restart_time = datetime.now()
                 
-                # 8. 대기
+                # 8. 자원 시계열 내보내기 및 누수 의심 추세 확인
+                self.report_resource_trends()
+
+                # 9. 대기
                 time.sleep(self.check_interval)
                 
             except KeyboardInterrupt:
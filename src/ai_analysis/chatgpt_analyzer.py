@@ -11,6 +11,8 @@ import openai
 from dotenv import load_dotenv
 # datetime 모듈 대신 time_utils 사용
 from ..utils.time_utils import get_current_time, get_current_time_str, format_timestamp
+from ..utils.metrics import timed
+from ..utils.tracing import traced
 
 # 환경 변수 로드 (.env 파일)
 load_dotenv()
@@ -148,6 +150,8 @@ class ChatGPTAnalyzer:
             time.sleep(self.request_interval - elapsed)
         self.last_request_time = time.time()
         
+    @timed('chatgpt_analyze_stock_seconds', 'ChatGPTAnalyzer.analyze_stock 소요 시간 (API 호출 포함)')
+    @traced('chatgpt.analyze_stock', 'llm')
     def analyze_stock(self, df, symbol, analysis_type="general", additional_info=None):
         """
         주식 데이터 분석
@@ -211,6 +215,7 @@ class ChatGPTAnalyzer:
                 "analysis": "분석 중 오류가 발생했습니다."
             }
     
+    @traced('chatgpt.analyze_signals', 'llm')
     def analyze_signals(self, signal_data):
         """
         매매 신호 분석
@@ -301,6 +306,7 @@ class ChatGPTAnalyzer:
         
         return templates.get(analysis_type, templates["general"])
         
+    @traced('chatgpt.generate_daily_report', 'llm')
     def generate_daily_report(self, stock_data_dict, market="KR"):
         """
         일일 종합 리포트 생성
@@ -375,6 +381,7 @@ class ChatGPTAnalyzer:
             logger.error(f"일일 리포트 생성 중 오류 발생: {e}")
             return f"일일 리포트 생성 중 오류가 발생했습니다: {str(e)}"
         
+    @traced('chatgpt.analyze_stop_levels', 'llm')
     def analyze_stop_levels(self, analysis_data):
         """
         개별 종목에 적합한 손절매/익절 수준 분석
@@ -486,6 +493,7 @@ class ChatGPTAnalyzer:
                 "volatility_analysis": "분석 오류"
             }
     
+    @traced('chatgpt.analyze_momentum_stock', 'llm')
     def analyze_momentum_stock(self, symbol, stock_data=None, current_price=None, use_cache=False):
         """
         급등주 분석 및 단타매매 적합성 평가
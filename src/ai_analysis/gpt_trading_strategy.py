@@ -8,6 +8,7 @@ import datetime
 from src.ai_analysis.chatgpt_analyzer import ChatGPTAnalyzer
 # 시간 유틸리티 추가
 from src.utils.time_utils import get_current_time, get_current_time_str, format_timestamp, is_market_open
+from src.utils.tracing import traced
 from enum import Enum
 
 # 로깅 설정
@@ -717,6 +718,7 @@ class GPTTradingStrategy:
             logger.error(f"{symbol} 매매 신호 생성 중 오류 발생: {e}")
             return []
     
+    @traced('gpt_strategy.identify_undervalued_stocks', 'llm')
     def identify_undervalued_stocks(self, df_dict, market="KR", top_n=5):
         """
         여러 종목 중에서 저평가된 종목을 식별
@@ -846,6 +848,7 @@ class GPTTradingStrategy:
         # 점수 기준 정렬 (내림차순) 및 상위 n개 반환
         return sorted(undervalued_stocks, key=lambda x: x[1], reverse=True)[:top_n]
     
+    @traced('gpt_strategy.identify_swing_trading_candidates', 'llm')
     def identify_swing_trading_candidates(self, df_dict, market="KR", top_n=5):
         """
         여러 종목 중에서 스윙 트레이딩에 적합한 종목 식별
@@ -1257,6 +1260,7 @@ class GPTTradingStrategy:
                 "price": current_price
             }
     
+    @traced('gpt_strategy.analyze_realtime_trading', 'llm')
     def analyze_realtime_trading(self, symbol, stock_data, current_price=None, is_holding=False, avg_price=0, name=None):
         """
         실시간 트레이딩을 위한 종목 분석 (디비/캐시 사용 안함)
@@ -1466,6 +1470,7 @@ class GPTTradingStrategy:
                 'timestamp': datetime.datetime.now().isoformat()
             }
     
+    @traced('gpt_strategy.fully_autonomous_decision', 'llm')
     def fully_autonomous_decision(self, market_data, available_cash, current_positions):
         """
         GPT 모델 기반 완전 자율 매매 결정 (디비/캐시 사용 안함)
@@ -12,6 +12,7 @@ import requests
 from typing import Dict, List, Any, Optional, Union
 # 시간 유틸리티 추가
 from src.utils.time_utils import get_current_time, get_current_time_str
+from src.data.symbol_master import get_symbol_master
 
 logger = logging.getLogger('StockAnalysisSystem')
 
@@ -631,6 +632,7 @@ class StockSelector:
                             # 중복 코드 제거 (첫 번째 항목만 유지)
                             kr_codes.remove(stock["code"])
                     
+                    get_symbol_master(self.config).update(self.config.KR_STOCK_INFO, "KR")
                     logger.info(f"한국 추천 종목 {len(self.config.KR_STOCK_INFO)}개 업데이트됨")
             
             # 미국 종목 업데이트
@@ -672,6 +674,7 @@ class StockSelector:
                             # 중복 코드 제거 (첫 번째 항목만 유지)
                             us_codes.remove(stock["code"])
                     
+                    get_symbol_master(self.config).update(self.config.US_STOCK_INFO, "US")
                     logger.info(f"미국 추천 종목 {len(self.config.US_STOCK_INFO)}개 업데이트됨")
             
             # config 파일 경로 설정
@@ -780,6 +783,10 @@ class StockSelector:
         """
         logger.info(f"{market} 시장에 대한 기술적 지표 최적화 시작")
         
+        # GPT 대신 과거 데이터 백테스트로 최적화하도록 설정된 경우
+        if getattr(self.config, 'TECHNICAL_INDICATOR_OPTIMIZER', 'gpt') == 'backtest':
+            return self.optimize_technical_indicators_backtest(market)
+        
         # API 키 유효성 확인
         if not self.is_api_key_valid():
             logger.warning("유효하지 않은 OpenAI API 키로 인해 기본 기술적 지표 설정을 사용합니다.")
@@ -947,6 +954,54 @@ class StockSelector:
             # 오류 발생 시 기본 설정값 반환
             return self._get_default_technical_indicators()
     
+    def optimize_technical_indicators_backtest(self, market: str = "KR") -> Dict[str, Any]:
+        """
+        price_cache 과거 데이터에 대한 파라미터 탐색으로 기술적 지표 설정 최적화
+        
+        Args:
+            market: 시장 코드 ("KR": 한국, "US": 미국)
+            
+        Returns:
+            optimize_technical_indicators와 같은 형식의 딕셔너리
+        """
+        try:
+            from datetime import timedelta
+            from src.backtest.data import PriceMatrix
+            from src.backtest.optimizer import ParameterSweep, save_technical_settings
+            
+            lookback_days = getattr(self.config, 'BACKTEST_OPTIMIZER_LOOKBACK_DAYS', 1095)
+            start_date = (get_current_time() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+            prices = PriceMatrix.from_database(market, start_date=start_date)
+            
+            method = getattr(self.config, 'BACKTEST_OPTIMIZER_METHOD', 'bayesian')
+            sweep = ParameterSweep(
+                prices,
+                self.config,
+                objective=getattr(self.config, 'BACKTEST_OPTIMIZER_OBJECTIVE', 'sharpe'),
+                min_trades=getattr(self.config, 'BACKTEST_OPTIMIZER_MIN_TRADES', 30),
+                max_workers=getattr(self.config, 'BACKTEST_OPTIMIZER_WORKERS', 0) or None,
+                cache_path=os.path.join(self.cache_dir, f'{market.lower()}_technical_sweep_cache.json')
+            )
+            sweep.run(method, trials=getattr(self.config, 'BACKTEST_OPTIMIZER_TRIALS', 200))
+            
+            technical_settings = sweep.to_technical_settings(method)
+            if technical_settings is None:
+                logger.warning("조건을 만족하는 파라미터 조합이 없어 기본 기술적 지표 설정을 사용합니다.")
+                return self._get_default_technical_indicators()
+            
+            # 최적화 결과 캐싱 (GPT 최적화와 같은 파일)
+            cache_file = os.path.join(self.cache_dir, f'{market.lower()}_technical_indicators.json')
+            try:
+                save_technical_settings(technical_settings, cache_file)
+            except Exception as e:
+                logger.error(f"기술적 지표 설정 캐싱 중 오류 발생: {e}")
+            
+            return technical_settings
+            
+        except Exception as e:
+            logger.error(f"백테스트 기반 기술적 지표 최적화 중 오류 발생: {e}")
+            return self._get_default_technical_indicators()
+    
     def _get_default_technical_indicators(self) -> Dict[str, Any]:
         """기본 기술적 지표 설정을 반환합니다."""
         return {
@@ -995,6 +1050,11 @@ class StockSelector:
                     setattr(self.config, key, value)
                     logger.info(f"{key} = {value} 설정 업데이트됨")
             
+            # calculate_indicators/analyze_signals가 읽는 이동평균 별칭도 함께 갱신
+            for key, alias in (("MA_SHORT", "SHORT_TERM_MA"), ("MA_MEDIUM", "MEDIUM_TERM_MA"), ("MA_LONG", "LONG_TERM_MA")):
+                if key in settings and hasattr(self.config, alias):
+                    setattr(self.config, alias, settings[key])
+            
             # config 파일 경로 설정
             config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config.py')
             
@@ -6,9 +6,14 @@ import numpy as np
 import logging
 import ta
 
+from ..utils.metrics import timed
+from ..utils.tracing import traced
+
 # 로깅 설정
 logger = logging.getLogger('Technical')
 
+@timed('calculate_indicators_seconds', '기술적 지표 계산 소요 시간')
+@traced('calculate_indicators', 'pandas')
 def calculate_indicators(df, config):
     """
     기술적 지표 계산
@@ -41,12 +46,12 @@ def calculate_indicators(df, config):
             window=config.LONG_TERM_MA
         ).sma_indicator()
         
-        # MACD 계산
+        # MACD 계산 (기간은 지표 최적화 결과가 반영되는 설정값 사용)
         macd = ta.trend.MACD(
             close=df_copy['Close'],
-            window_slow=26,
-            window_fast=12,
-            window_sign=9
+            window_slow=getattr(config, 'MACD_SLOW', 26),
+            window_fast=getattr(config, 'MACD_FAST', 12),
+            window_sign=getattr(config, 'MACD_SIGNAL', 9)
         )
         df_copy['MACD'] = macd.macd()
         df_copy['MACD_signal'] = macd.macd_signal()
@@ -55,8 +60,8 @@ def calculate_indicators(df, config):
         # 볼린저 밴드 계산
         bollinger = ta.volatility.BollingerBands(
             close=df_copy['Close'],
-            window=20,
-            window_dev=2
+            window=getattr(config, 'BOLLINGER_PERIOD', 20),
+            window_dev=getattr(config, 'BOLLINGER_STD', 2)
         )
         df_copy['BB_high'] = bollinger.bollinger_hband()
         df_copy['BB_mid'] = bollinger.bollinger_mavg()
@@ -0,0 +1,3 @@
+"""
+백테스트 모듈 패키지
+"""
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+백테스트용 주가 데이터 모듈
+
+price_cache 테이블 또는 CSV/Parquet 파일의 종목별 일봉(OHLCV)을
+날짜 x 종목 2차원 배열로 변환하여 전 종목을 한 번에 계산할 수 있게 합니다.
+장중 리플레이용 분봉/틱 데이터도 같은 형식(시각 x 종목)으로 읽습니다.
+"""
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+# 로깅 설정
+logger = logging.getLogger('BacktestData')
+
+# 입력 컬럼 이름 -> 표준 컬럼 이름 (price_cache, pykrx/yfinance 형식 모두 허용)
+COLUMN_ALIASES = {
+    "symbol": "symbol", "code": "symbol", "ticker": "symbol", "종목코드": "symbol",
+    "date": "date", "datetime": "date", "timestamp": "date", "time": "date", "날짜": "date", "시각": "date",
+    "open": "open", "open_price": "open", "시가": "open",
+    "high": "high", "high_price": "high", "고가": "high",
+    "low": "low", "low_price": "low", "저가": "low",
+    "close": "close", "close_price": "close", "종가": "close",
+    # 틱 데이터 (체결가만 있는 경우 종가로 취급)
+    "price": "close", "체결가": "close",
+    "volume": "volume", "거래량": "volume"
+}
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class PriceMatrix:
+    """
+    날짜 x 종목 OHLCV 배열
+
+    각 필드는 (날짜 수, 종목 수) 크기의 float64 배열이며,
+    상장 전/거래 정지 등으로 데이터가 없는 칸은 NaN입니다.
+    """
+
+    def __init__(self, dates, symbols, open, high, low, close, volume, market=None):
+        self.dates = pd.DatetimeIndex(dates)
+        self.symbols = list(symbols)
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.market = market
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __repr__(self):
+        if len(self.dates) == 0:
+            return f"PriceMatrix(dates=0, symbols={len(self.symbols)})"
+        return (f"PriceMatrix(dates={len(self.dates)}, symbols={len(self.symbols)}, "
+                f"{self.dates[0].date()} ~ {self.dates[-1].date()})")
+
+    @classmethod
+    def from_frame(cls, df, market=None):
+        """
+        long 형식 DataFrame(종목, 날짜, OHLCV 행)을 PriceMatrix로 변환
+
+        Args:
+            df: symbol, date, open, high, low, close, volume 컬럼을 가진 DataFrame
+                (price_cache의 open_price 등 컬럼 이름도 허용)
+            market: 시장 구분 (KR/US)
+
+        Returns:
+            PriceMatrix
+        """
+        renamed = {}
+        for column in df.columns:
+            key = COLUMN_ALIASES.get(str(column).strip().lower())
+            if key is not None and key not in renamed.values():
+                renamed[column] = key
+        frame = df.rename(columns=renamed)
+
+        missing = [name for name in ("symbol", "date", "close") if name not in frame.columns]
+        if missing:
+            raise ValueError(f"주가 데이터에 필수 컬럼이 없습니다: {missing}")
+
+        frame = frame.assign(
+            symbol=frame["symbol"].astype(str),
+            date=pd.to_datetime(frame["date"])
+        ).drop_duplicates(subset=["date", "symbol"], keep="last")
+
+        dates = pd.DatetimeIndex(sorted(frame["date"].unique()))
+        symbols = sorted(frame["symbol"].unique())
+
+        arrays = {}
+        for field in PRICE_FIELDS:
+            if field in frame.columns:
+                pivot = frame.pivot(index="date", columns="symbol", values=field)
+                arrays[field] = pivot.reindex(index=dates, columns=symbols).to_numpy(dtype=np.float64)
+            else:
+                arrays[field] = None
+
+        close = arrays["close"]
+        # 시가/고가/저가가 없으면 종가로 대체 (종가 기준 백테스트)
+        for field in ("open", "high", "low"):
+            if arrays[field] is None:
+                arrays[field] = close.copy()
+        if arrays["volume"] is None:
+            arrays["volume"] = np.zeros_like(close)
+
+        logger.info(f"주가 배열 생성: {len(dates)}일 x {len(symbols)}종목")
+        return cls(dates, symbols, arrays["open"], arrays["high"], arrays["low"], close,
+                   arrays["volume"], market=market)
+
+    @classmethod
+    def from_file(cls, path, market=None):
+        """
+        CSV 또는 Parquet 파일에서 일괄 로드
+
+        Args:
+            path: .csv 또는 .parquet 파일 경로 (long 형식)
+            market: 시장 구분 (KR/US)
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext in (".parquet", ".pq"):
+            # pyarrow 또는 fastparquet 필요
+            df = pd.read_parquet(path)
+        elif ext in (".csv", ".gz"):
+            df = pd.read_csv(path, dtype={"symbol": str, "code": str, "ticker": str, "종목코드": str})
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+        return cls.from_frame(df, market=market)
+
+    @classmethod
+    def from_database(cls, market="KR", symbols=None, start_date=None, end_date=None, db_manager=None):
+        """
+        price_cache 테이블에서 한 번의 쿼리로 전 종목 로드
+
+        Args:
+            market: 시장 구분 (KR/US)
+            symbols: 종목 코드 목록 (None이면 해당 시장 전체)
+            start_date: 시작일 (YYYY-MM-DD)
+            end_date: 종료일 (YYYY-MM-DD)
+            db_manager: DatabaseManager 인스턴스 (None이면 싱글톤 사용)
+        """
+        if db_manager is None:
+            from ..database.db_manager import DatabaseManager
+            db_manager = DatabaseManager.get_instance()
+
+        df = db_manager.get_cached_price_data_bulk(market, symbols, start_date, end_date)
+        if df is None or df.empty:
+            raise ValueError(f"price_cache에 {market} 시장 주가 데이터가 없습니다.")
+        return cls.from_frame(df, market=market)
+
+    def select(self, symbols=None, start=None, end=None):
+        """종목/기간 부분 집합 반환 (배열 슬라이스)"""
+        row_mask = np.ones(len(self.dates), dtype=bool)
+        if start is not None:
+            row_mask &= self.dates >= pd.Timestamp(start)
+        if end is not None:
+            row_mask &= self.dates <= pd.Timestamp(end)
+
+        if symbols is None:
+            cols = np.arange(len(self.symbols))
+        else:
+            index = {symbol: i for i, symbol in enumerate(self.symbols)}
+            cols = np.array([index[symbol] for symbol in symbols if symbol in index], dtype=np.intp)
+
+        def take(array):
+            return array[row_mask][:, cols]
+
+        return PriceMatrix(self.dates[row_mask], [self.symbols[i] for i in cols],
+                           take(self.open), take(self.high), take(self.low), take(self.close),
+                           take(self.volume), market=self.market)
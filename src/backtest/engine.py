@@ -0,0 +1,469 @@
+"""
+벡터화 백테스트 엔진 모듈
+
+technical.analyze_signals의 RSI/이동평균 교차/MACD/볼린저 밴드 규칙과
+AutoTrader/RealtimeTrader의 손절/익절/보유기간 청산 규칙을
+전 종목 x 전 기간 배열 연산으로 평가합니다.
+
+- 지표와 매매 신호는 (날짜, 종목) 배열 전체를 한 번에 계산
+- 손절/익절은 진입가에 따라 경로가 달라지므로 날짜 순으로 진행하되,
+  각 날짜에서는 전 종목을 배열 연산으로 처리
+- 종목당 동시에 한 포지션, 진입 시 고정 금액(trade_amount) 매수
+- 진입은 보유 현금(초기 자본 + 청산 대금 - 매수 금액) 안에서만 하며, 현금이 부족한 날은
+  매수 신호 개수가 많은 종목부터 현금이 닿는 만큼만 진입
+"""
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+# 로깅 설정
+logger = logging.getLogger('Backtest')
+
+DEFAULT_RULES = ("rsi", "sma_cross", "macd", "bollinger")
+
+# 시뮬레이션 규칙이 바뀌면 올림 (최적화 결과 파일 캐시 무효화)
+ENGINE_VERSION = 2
+
+# 청산 사유 (RealtimeTrader._manage_existing_positions와 같은 표기)
+EXIT_REASONS = ("손절", "익절", "매도신호", "시간초과", "기간종료")
+EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_SIGNAL, EXIT_TIMEOUT, EXIT_END = range(len(EXIT_REASONS))
+
+FILL_NEXT_OPEN = "next_open"
+FILL_CLOSE = "close"
+
+
+def default_params(config=None):
+    """
+    설정 모듈에서 백테스트 기본 파라미터 구성
+
+    지표 기간은 calculate_indicators/analyze_signals에서 실제로 사용하는 값과 같습니다.
+    """
+    return {
+        # 매매 신호 규칙
+        "rules": DEFAULT_RULES,
+        "rsi_period": getattr(config, 'RSI_PERIOD', 14),
+        "rsi_oversold": getattr(config, 'RSI_OVERSOLD', 30),
+        "rsi_overbought": getattr(config, 'RSI_OVERBOUGHT', 70),
+        "sma_short": getattr(config, 'SHORT_TERM_MA', 5),
+        "sma_long": getattr(config, 'LONG_TERM_MA', 20),
+        "macd_fast": getattr(config, 'MACD_FAST', 12),
+        "macd_slow": getattr(config, 'MACD_SLOW', 26),
+        "macd_signal": getattr(config, 'MACD_SIGNAL', 9),
+        "bb_period": getattr(config, 'BOLLINGER_PERIOD', 20),
+        "bb_std": getattr(config, 'BOLLINGER_STD', 2.0),
+        "min_buy_signals": 1,
+        "min_sell_signals": 1,
+        "use_sell_signals": True,
+        # 청산 규칙
+        "stop_loss_pct": getattr(config, 'STOP_LOSS_PCT', 3),
+        "take_profit_pct": getattr(config, 'TAKE_PROFIT_PCT', 5),
+        "max_holding_days": getattr(config, 'BACKTEST_MAX_HOLDING_DAYS', 0),
+        # 체결/비용
+        "fill": getattr(config, 'BACKTEST_FILL', FILL_NEXT_OPEN),
+        "trade_amount": getattr(config, 'MAX_AMOUNT_PER_TRADE', 1000000),
+        "initial_capital": getattr(config, 'BACKTEST_INITIAL_CAPITAL', 100000000),
+        "fee_rate": getattr(config, 'BACKTEST_FEE_RATE', 0.00015),
+        "tax_rate": getattr(config, 'BACKTEST_TAX_RATE', 0.0018),
+        "slippage_pct": getattr(config, 'BACKTEST_SLIPPAGE_PCT', 0.0)
+    }
+
+
+def _shift(array, periods=1):
+    """행(날짜) 방향으로 밀기 - 앞쪽은 NaN/False로 채움"""
+    shifted = np.empty_like(array)
+    fill = False if array.dtype == bool else np.nan
+    shifted[:periods] = fill
+    shifted[periods:] = array[:-periods]
+    return shifted
+
+
+def compute_primitive(close, kind, window):
+    """
+    지표 기본 배열 계산 (파라미터 최적화 시 창 길이별로 한 번만 계산하여 공유)
+
+    Args:
+        close: (날짜, 종목) 종가 배열
+        kind: "rsi", "sma", "ema", "std" 중 하나
+        window: 기간
+
+    Returns:
+        ndarray: (날짜, 종목) 배열
+    """
+    frame = pd.DataFrame(close)
+    if kind == "rsi":
+        # Wilder 평활 (ta.RSIIndicator처럼 첫 거래일 변화량을 0으로 두어 같은 날부터 값이 나옴)
+        delta = frame.diff().mask(frame.notna().cumsum() == 1, 0.0)
+        ema_up = delta.clip(lower=0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+        ema_down = (-delta.clip(upper=0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - 100 / (1 + ema_up / ema_down)
+        return rsi.where(ema_down != 0, 100.0).where(ema_up.notna()).to_numpy()
+    if kind == "sma":
+        return frame.rolling(window, min_periods=window).mean().to_numpy()
+    if kind == "ema":
+        return frame.ewm(span=window, min_periods=window, adjust=False).mean().to_numpy()
+    if kind == "std":
+        # 볼린저 밴드용 모표준편차
+        return frame.rolling(window, min_periods=window).std(ddof=0).to_numpy()
+    raise ValueError(f"알 수 없는 지표 종류: {kind}")
+
+
+def required_primitives(params):
+    """파라미터 조합에 필요한 지표 기본 배열 목록"""
+    return [
+        ("rsi", params["rsi_period"]),
+        ("sma", params["sma_short"]),
+        ("sma", params["sma_long"]),
+        ("ema", params["macd_fast"]),
+        ("ema", params["macd_slow"]),
+        ("sma", params["bb_period"]),
+        ("std", params["bb_period"])
+    ]
+
+
+def compute_indicators(close, params, source=None):
+    """
+    전 종목 기술적 지표 계산 (ta 라이브러리와 같은 정의)
+
+    Args:
+        close: (날짜, 종목) 종가 배열
+        params: 백테스트 파라미터
+        source: 미리 계산된 기본 배열 조회 함수 (kind, window) -> ndarray (None이면 직접 계산)
+
+    Returns:
+        dict: 지표 이름 -> (날짜, 종목) 배열
+    """
+    if source is None:
+        def source(kind, window):
+            return compute_primitive(close, kind, window)
+
+    macd = source("ema", params["macd_fast"]) - source("ema", params["macd_slow"])
+    macd_signal = pd.DataFrame(macd).ewm(
+        span=params["macd_signal"], min_periods=params["macd_signal"], adjust=False
+    ).mean().to_numpy()
+    bb_mid = source("sma", params["bb_period"])
+    bb_dev = source("std", params["bb_period"])
+
+    return {
+        "RSI": source("rsi", params["rsi_period"]),
+        "SMA_short": source("sma", params["sma_short"]),
+        "SMA_long": source("sma", params["sma_long"]),
+        "MACD": macd,
+        "MACD_signal": macd_signal,
+        "BB_high": bb_mid + params["bb_std"] * bb_dev,
+        "BB_low": bb_mid - params["bb_std"] * bb_dev
+    }
+
+
+def compute_signals(close, params, indicators=None):
+    """
+    analyze_signals 규칙을 전 종목 x 전 기간에 적용하여 매수/매도 신호 개수 계산
+
+    Returns:
+        tuple: (매수 신호 개수 배열, 매도 신호 개수 배열) - (날짜, 종목) int8
+    """
+    if indicators is None:
+        indicators = compute_indicators(close, params)
+    rules = set(params["rules"])
+    buy = np.zeros(close.shape, dtype=np.int8)
+    sell = np.zeros(close.shape, dtype=np.int8)
+
+    with np.errstate(invalid='ignore'):
+        if "rsi" in rules:
+            rsi = indicators["RSI"]
+            buy += rsi < params["rsi_oversold"]
+            sell += rsi > params["rsi_overbought"]
+
+        if "sma_cross" in rules:
+            short, long_ = indicators["SMA_short"], indicators["SMA_long"]
+            prev_short, prev_long = _shift(short), _shift(long_)
+            buy += (prev_short <= prev_long) & (short > long_)
+            sell += (prev_short >= prev_long) & (short < long_)
+
+        if "macd" in rules:
+            macd, signal = indicators["MACD"], indicators["MACD_signal"]
+            prev_macd, prev_signal = _shift(macd), _shift(signal)
+            buy += (prev_macd <= prev_signal) & (macd > signal)
+            sell += (prev_macd >= prev_signal) & (macd < signal)
+
+        if "bollinger" in rules:
+            buy += close < indicators["BB_low"]
+            sell += close > indicators["BB_high"]
+
+    # analyze_signals는 장기 이동평균 기간보다 데이터가 짧으면 신호를 내지 않음
+    warmed_up = np.cumsum(~np.isnan(close), axis=0) >= params["sma_long"]
+    buy[~warmed_up] = 0
+    sell[~warmed_up] = 0
+    return buy, sell
+
+
+class BacktestResult:
+    """백테스트 결과 (거래 목록, 자산 곡선, 요약)"""
+
+    def __init__(self, trades, equity, params, elapsed=0.0):
+        self.trades = trades
+        self.equity = equity
+        self.params = params
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        summary = self.summary()
+        return (f"BacktestResult(trades={summary['num_trades']}, total_pnl={summary['total_pnl']:,.0f}, "
+                f"max_drawdown_pct={summary['max_drawdown_pct']:.2f})")
+
+    def drawdown(self):
+        """자산 곡선의 고점 대비 하락 금액"""
+        return self.equity - self.equity.cummax()
+
+    def summary(self):
+        """성과 요약"""
+        trades = self.trades
+        equity = self.equity
+        initial_capital = self.params["initial_capital"]
+        num_trades = len(trades)
+
+        peak = equity.cummax()
+        drawdown = equity - peak
+        daily_returns = equity.pct_change().dropna()
+        sharpe = 0.0
+        if len(daily_returns) > 1 and daily_returns.std() > 0:
+            sharpe = float(daily_returns.mean() / daily_returns.std() * np.sqrt(252))
+
+        wins = trades[trades["pnl"] > 0] if num_trades else trades
+        losses = trades[trades["pnl"] <= 0] if num_trades else trades
+        gross_loss = -losses["pnl"].sum() if num_trades else 0.0
+
+        return {
+            "num_trades": num_trades,
+            "win_rate": round(len(wins) / num_trades * 100, 2) if num_trades else 0.0,
+            "total_pnl": float(trades["pnl"].sum()) if num_trades else 0.0,
+            "total_return_pct": round((equity.iloc[-1] / initial_capital - 1) * 100, 4) if len(equity) else 0.0,
+            "avg_return_pct": round(float(trades["return_pct"].mean()), 4) if num_trades else 0.0,
+            "avg_holding_days": round(float(trades["holding_days"].mean()), 2) if num_trades else 0.0,
+            "profit_factor": round(float(wins["pnl"].sum() / gross_loss), 4) if gross_loss > 0 else None,
+            "max_drawdown": float(drawdown.min()) if len(equity) else 0.0,
+            "max_drawdown_pct": round(float((drawdown / peak).min() * 100), 4) if len(equity) else 0.0,
+            "sharpe": round(sharpe, 4),
+            "exit_reasons": trades["exit_reason"].value_counts().to_dict() if num_trades else {},
+            "elapsed_sec": round(self.elapsed, 3)
+        }
+
+    def by_symbol(self):
+        """종목별 거래 수/손익"""
+        if self.trades.empty:
+            return pd.DataFrame(columns=["trades", "pnl", "win_rate"])
+        grouped = self.trades.groupby("symbol")
+        return pd.DataFrame({
+            "trades": grouped.size(),
+            "pnl": grouped["pnl"].sum(),
+            "win_rate": grouped["pnl"].apply(lambda pnl: (pnl > 0).mean() * 100)
+        }).sort_values("pnl", ascending=False)
+
+
+class VectorizedBacktester:
+    """
+    기술적 신호 규칙 벡터화 백테스터
+    """
+
+    def __init__(self, prices, config=None, indicator_source=None, **params):
+        """
+        초기화 함수
+
+        Args:
+            prices: PriceMatrix
+            config: 설정 모듈 (기본 파라미터 출처)
+            indicator_source: 미리 계산된 지표 기본 배열 조회 함수 (kind, window) -> ndarray
+            **params: 기본 파라미터 덮어쓰기 (default_params 참고)
+        """
+        self.prices = prices
+        self.indicator_source = indicator_source
+        self.params = default_params(config)
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"알 수 없는 백테스트 파라미터: {sorted(unknown)}")
+        self.params.update(params)
+        if self.params["fill"] not in (FILL_NEXT_OPEN, FILL_CLOSE):
+            raise ValueError(f"지원하지 않는 체결 방식: {self.params['fill']}")
+
+    def run(self):
+        """백테스트 실행"""
+        started_at = time.perf_counter()
+        params = self.params
+        prices = self.prices
+        indicators = compute_indicators(prices.close, params, self.indicator_source)
+        buy, sell = compute_signals(prices.close, params, indicators)
+
+        buy_ok = buy >= params["min_buy_signals"]
+        sell_ok = (sell >= params["min_sell_signals"]) if params["use_sell_signals"] else np.zeros_like(buy_ok)
+
+        trades, equity = self._simulate(buy_ok, sell_ok, buy)
+        elapsed = time.perf_counter() - started_at
+        logger.info(f"백테스트 완료: {prices.shape[0]}일 x {prices.shape[1]}종목, 거래 {len(trades)}건, {elapsed:.2f}초")
+        return BacktestResult(trades, equity, dict(params), elapsed)
+
+    def _simulate(self, buy_ok, sell_ok, buy_strength=None):
+        """
+        날짜 순 체결 시뮬레이션
+
+        Args:
+            buy_ok: (날짜, 종목) 매수 신호 여부
+            sell_ok: (날짜, 종목) 매도 신호 여부
+            buy_strength: (날짜, 종목) 매수 신호 개수 (현금이 부족할 때 진입 우선순위, None이면 종목 순서)
+        """
+        params = self.params
+        prices = self.prices
+        num_dates, num_symbols = prices.shape
+        opens, highs, lows, closes = prices.open, prices.high, prices.low, prices.close
+        # 평가용 종가 (거래 정지일은 직전 종가)
+        marks = pd.DataFrame(closes).ffill().to_numpy()
+
+        stop_loss = params["stop_loss_pct"] / 100 if params["stop_loss_pct"] else None
+        take_profit = params["take_profit_pct"] / 100 if params["take_profit_pct"] else None
+        max_holding = params["max_holding_days"] or 0
+        slippage = params["slippage_pct"] / 100
+        fee_rate, tax_rate = params["fee_rate"], params["tax_rate"]
+        trade_amount = params["trade_amount"]
+        next_open = params["fill"] == FILL_NEXT_OPEN
+
+        in_pos = np.zeros(num_symbols, dtype=bool)
+        entry_price = np.zeros(num_symbols)
+        entry_index = np.zeros(num_symbols, dtype=np.int64)
+        quantity = np.zeros(num_symbols)
+        cash = float(params["initial_capital"])  # 보유 현금 (매수 금액은 진입 시 차감, 청산 대금은 청산 시 가산)
+        equity = np.empty(num_dates)
+        records = []  # (종목 인덱스, 진입일, 청산일, 진입가, 청산가, 수량, 사유) 배열 묶음
+
+        def close_positions(mask, t, price, reason):
+            nonlocal cash
+            idx = np.flatnonzero(mask)
+            if idx.size == 0:
+                return
+            exit_px = price[idx] * (1 - slippage)
+            entry_px = entry_price[idx]
+            qty = quantity[idx]
+            cost = (entry_px + exit_px) * qty * fee_rate + exit_px * qty * tax_rate
+            # 매수 금액은 진입 때 이미 차감했으므로 청산 대금에서 매수/매도 비용만 뺌
+            cash += float((exit_px * qty - cost).sum())
+            records.append((idx, entry_index[idx].copy(), np.full(idx.size, t), entry_px.copy(), exit_px,
+                            qty.copy(), np.full(idx.size, reason, dtype=np.int8)))
+            in_pos[idx] = False
+
+        def open_positions(mask, t, price, strength):
+            nonlocal cash
+            px = price * (1 + slippage)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                qty = np.floor(trade_amount / px)
+            idx = np.flatnonzero(mask & (qty > 0))
+            if idx.size == 0:
+                return
+            # 매수 수수료까지 현금으로 감당할 수 있는 진입만 (신호 개수가 많은 종목 우선, 같으면 종목 순서)
+            if strength is not None:
+                idx = idx[np.argsort(-strength[idx], kind="stable")]
+            required = px[idx] * qty[idx] * (1 + fee_rate)
+            idx = idx[np.cumsum(required) <= cash]
+            if idx.size == 0:
+                return
+            cash -= float((px[idx] * qty[idx]).sum())
+            mask = np.zeros(num_symbols, dtype=bool)
+            mask[idx] = True
+            in_pos[mask] = True
+            entry_price[mask] = px[mask]
+            entry_index[mask] = t
+            quantity[mask] = qty[mask]
+
+        def check_stops(t, held):
+            # 같은 날 손절/익절 가격을 모두 지나면 보수적으로 손절 처리
+            if stop_loss is not None:
+                stop_px = entry_price * (1 - stop_loss)
+                hit = held & (lows[t] <= stop_px)
+                close_positions(hit, t, np.fmin(opens[t], stop_px), EXIT_STOP_LOSS)
+                held = held & ~hit
+            if take_profit is not None:
+                target_px = entry_price * (1 + take_profit)
+                hit = held & (highs[t] >= target_px)
+                close_positions(hit, t, np.fmax(opens[t], target_px), EXIT_TAKE_PROFIT)
+
+        def strength_at(t):
+            return buy_strength[t] if buy_strength is not None else None
+
+        def check_timeout(t):
+            if max_holding > 0:
+                hit = in_pos & (t - entry_index >= max_holding) & ~np.isnan(closes[t])
+                close_positions(hit, t, closes[t], EXIT_TIMEOUT)
+
+        with np.errstate(invalid='ignore'):
+            for t in range(num_dates):
+                tradable_open = ~np.isnan(opens[t])
+                tradable_close = ~np.isnan(closes[t])
+
+                if next_open:
+                    # 전일 종가 기준 신호를 당일 시가에 체결
+                    if t > 0:
+                        exiting = in_pos & sell_ok[t - 1] & tradable_open
+                        close_positions(exiting, t, opens[t], EXIT_SIGNAL)
+                        entering = ~in_pos & buy_ok[t - 1] & tradable_open & ~exiting
+                        open_positions(entering, t, opens[t], strength_at(t - 1))
+                    check_stops(t, in_pos.copy())
+                    check_timeout(t)
+                else:
+                    # 당일 종가 기준 신호를 당일 종가에 체결
+                    check_stops(t, in_pos & (entry_index < t))
+                    check_timeout(t)
+                    exiting = in_pos & sell_ok[t] & tradable_close
+                    close_positions(exiting, t, closes[t], EXIT_SIGNAL)
+                    entering = ~in_pos & buy_ok[t] & tradable_close & ~exiting
+                    open_positions(entering, t, closes[t], strength_at(t))
+
+                holdings = np.nansum(marks[t] * quantity, where=in_pos)
+                equity[t] = cash + holdings
+
+        # 기간 종료 시 보유 포지션은 마지막 평가 가격으로 청산
+        if num_dates:
+            close_positions(in_pos.copy(), num_dates - 1, marks[-1], EXIT_END)
+            equity[-1] = cash
+
+        return self._build_trades(records), pd.Series(equity, index=prices.dates, name="equity")
+
+    def _build_trades(self, records):
+        columns = ["symbol", "entry_date", "exit_date", "entry_price", "exit_price", "quantity",
+                   "pnl", "return_pct", "holding_days", "exit_reason"]
+        if not records:
+            return pd.DataFrame(columns=columns)
+
+        sym, entry_idx, exit_idx, entry_px, exit_px, qty, reason = (np.concatenate(parts) for parts in zip(*records))
+        params = self.params
+        cost = (entry_px + exit_px) * qty * params["fee_rate"] + exit_px * qty * params["tax_rate"]
+        pnl = (exit_px - entry_px) * qty - cost
+        symbols = np.asarray(self.prices.symbols, dtype=object)
+        dates = self.prices.dates
+
+        trades = pd.DataFrame({
+            "symbol": symbols[sym],
+            "entry_date": dates[entry_idx],
+            "exit_date": dates[exit_idx],
+            "entry_price": entry_px,
+            "exit_price": exit_px,
+            "quantity": qty.astype(np.int64),
+            "pnl": pnl,
+            "return_pct": pnl / (entry_px * qty) * 100,
+            "holding_days": exit_idx - entry_idx,
+            "exit_reason": np.asarray(EXIT_REASONS, dtype=object)[reason]
+        }, columns=columns)
+        return trades.sort_values(["exit_date", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def run_backtest(prices, config=None, **params):
+    """
+    벡터화 백테스트 실행 헬퍼
+
+    Args:
+        prices: PriceMatrix
+        config: 설정 모듈
+        **params: 파라미터 덮어쓰기
+
+    Returns:
+        BacktestResult
+    """
+    return VectorizedBacktester(prices, config, **params).run()
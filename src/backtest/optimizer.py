@@ -0,0 +1,475 @@
+"""
+기술적 지표 파라미터 최적화 모듈
+
+StockSelector.optimize_technical_indicators가 GPT에게 묻던 지표 설정
+(RSI_PERIOD, MACD_FAST/SLOW/SIGNAL, BOLLINGER_PERIOD/STD, 이동평균 기간 등)을
+과거 데이터 백테스트로 직접 탐색합니다. 탐색하는 설정은 모두 calculate_indicators가 config에서 읽는 값입니다.
+
+- 탐색 방식: grid(전체 조합), random(무작위 표본), bayesian(TPE 방식 순차 탐색)
+- 프로세스 풀에서 병렬 평가, 주가와 지표 기본 배열은 공유 메모리로 전달 (작업자별 재계산 없음)
+- 파라미터 조합별 평가 결과 캐시 (같은 데이터에 대해서는 파일 캐시 재사용)
+- 결과는 update_config_technical_indicators가 읽는 *_technical_indicators.json 형식
+"""
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .data import PriceMatrix
+from .engine import ENGINE_VERSION, VectorizedBacktester, compute_primitive, default_params, required_primitives
+
+# 로깅 설정
+logger = logging.getLogger('ParameterSweep')
+
+# 설정 키 -> 백테스트 파라미터 이름 (MA_MEDIUM은 매매 규칙에서 사용하지 않아 현재 값 유지)
+SETTING_TO_PARAM = {
+    "RSI_PERIOD": "rsi_period",
+    "RSI_OVERSOLD": "rsi_oversold",
+    "RSI_OVERBOUGHT": "rsi_overbought",
+    "MACD_FAST": "macd_fast",
+    "MACD_SLOW": "macd_slow",
+    "MACD_SIGNAL": "macd_signal",
+    "BOLLINGER_PERIOD": "bb_period",
+    "BOLLINGER_STD": "bb_std",
+    "MA_SHORT": "sma_short",
+    "MA_LONG": "sma_long"
+}
+
+SETTING_KEYS = ("RSI_PERIOD", "RSI_OVERSOLD", "RSI_OVERBOUGHT", "MACD_FAST", "MACD_SLOW", "MACD_SIGNAL",
+                "BOLLINGER_PERIOD", "BOLLINGER_STD", "MA_SHORT", "MA_MEDIUM", "MA_LONG")
+
+# 기본 탐색 공간 (GPT 프롬프트에 제시된 일반적인 범위를 성기게 나눔)
+DEFAULT_SPACE = {
+    "RSI_PERIOD": [9, 14, 20, 25],
+    "RSI_OVERSOLD": [20, 25, 30, 35, 40],
+    "RSI_OVERBOUGHT": [60, 65, 70, 75, 80],
+    "MACD_FAST": [8, 10, 12],
+    "MACD_SLOW": [21, 24, 26, 30],
+    "MACD_SIGNAL": [5, 7, 9, 12],
+    "BOLLINGER_PERIOD": [10, 15, 20, 30],
+    "BOLLINGER_STD": [1.5, 2.0, 2.5, 3.0],
+    "MA_SHORT": [3, 5, 10],
+    "MA_LONG": [50, 60, 120, 200]
+}
+
+OBJECTIVES = ("sharpe", "total_pnl", "profit_factor", "calmar", "win_rate")
+
+# 작업자 프로세스 전역 상태 (공유 메모리 뷰)
+_worker_state = {}
+
+
+def _valid_settings(settings):
+    """서로 모순되는 조합 제외"""
+    return (settings["MACD_FAST"] < settings["MACD_SLOW"]
+            and settings["MA_SHORT"] < settings["MA_LONG"]
+            and settings["RSI_OVERSOLD"] < settings["RSI_OVERBOUGHT"])
+
+
+def settings_key(settings):
+    """파라미터 조합 캐시 키"""
+    return tuple((key, settings[key]) for key in sorted(settings))
+
+
+def score_summary(summary, objective, min_trades):
+    """백테스트 요약을 하나의 점수로 변환 (높을수록 좋음)"""
+    if summary["num_trades"] < min_trades:
+        return float("-inf")
+    if objective == "calmar":
+        drawdown = abs(summary["max_drawdown_pct"])
+        return summary["total_return_pct"] / drawdown if drawdown > 0 else summary["total_return_pct"]
+    value = summary.get(objective)
+    return float(value) if value is not None else float("-inf")
+
+
+# ----------------------------------------------------------------------
+# 공유 메모리
+# ----------------------------------------------------------------------
+class SharedArrayStore:
+    """
+    여러 float64 배열을 하나의 공유 메모리 블록에 담아 작업자 프로세스와 공유
+    """
+
+    def __init__(self, arrays):
+        """
+        Args:
+            arrays: 키 -> 같은 크기의 ndarray
+        """
+        first = next(iter(arrays.values()))
+        self.shape = first.shape
+        item_size = first.size * first.itemsize
+        self.layout = {key: i for i, key in enumerate(arrays)}
+        self.shm = shared_memory.SharedMemory(create=True, size=max(item_size * len(arrays), 1))
+        for key, index in self.layout.items():
+            view = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf, offset=index * item_size)
+            view[:] = arrays[key]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def attach(name, shape, layout):
+        """작업자에서 공유 메모리 블록에 연결하여 키 -> 읽기 전용 배열 뷰 반환"""
+        shm = shared_memory.SharedMemory(name=name)
+        item_size = int(np.prod(shape)) * 8
+        views = {}
+        for key, index in layout.items():
+            view = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=index * item_size)
+            view.flags.writeable = False
+            views[key] = view
+        return shm, views
+
+
+def _init_worker(shm_name, shape, layout, dates, symbols, base_params):
+    shm, views = SharedArrayStore.attach(shm_name, shape, layout)
+    prices = PriceMatrix(dates, symbols, views[("price", "open")], views[("price", "high")],
+                         views[("price", "low")], views[("price", "close")], views[("price", "volume")])
+    _worker_state.update(shm=shm, views=views, prices=prices, base_params=base_params)
+
+
+def _shared_source(kind, window):
+    views = _worker_state["views"]
+    array = views.get((kind, window))
+    if array is None:
+        # 공유되지 않은 기간(탐색 공간 밖)은 작업자에서 직접 계산
+        return compute_primitive(views[("price", "close")], kind, window)
+    return array
+
+
+def _evaluate_in_worker(settings):
+    params = dict(_worker_state["base_params"])
+    for key, name in SETTING_TO_PARAM.items():
+        if key in settings:
+            params[name] = settings[key]
+    result = VectorizedBacktester(_worker_state["prices"], indicator_source=_shared_source, **params).run()
+    summary = result.summary()
+    summary.pop("exit_reasons", None)
+    return settings, summary
+
+
+# ----------------------------------------------------------------------
+# 탐색 방식
+# ----------------------------------------------------------------------
+def grid_candidates(space, limit=None):
+    """전체 조합 (유효한 조합만)"""
+    keys = list(space)
+    count = 0
+    for values in itertools.product(*(space[key] for key in keys)):
+        settings = dict(zip(keys, values))
+        if not _valid_settings(settings):
+            continue
+        yield settings
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+
+def random_candidates(space, rng):
+    """무작위 조합 1개"""
+    while True:
+        settings = {key: rng.choice(values) for key, values in space.items()}
+        if _valid_settings(settings):
+            return settings
+
+
+def tpe_candidate(space, history, rng, gamma=0.25, num_samples=64):
+    """
+    TPE(Tree-structured Parzen Estimator) 방식으로 다음 조합 선택
+
+    평가된 조합을 상위(gamma)/나머지로 나누고, 파라미터 값별 출현 빈도(라플라스 평활)로
+    l(x)/g(x) 비율이 가장 큰 후보를 상위 분포에서 표본 추출하여 고릅니다.
+    """
+    scored = sorted((item for item in history if math.isfinite(item[1])), key=lambda item: item[1], reverse=True)
+    if len(scored) < 4:
+        return random_candidates(space, rng)
+
+    num_good = max(1, int(len(scored) * gamma))
+    good = [settings for settings, _ in scored[:num_good]]
+    bad = [settings for settings, _ in scored[num_good:]]
+
+    def density(group, key):
+        counts = {value: 1.0 for value in space[key]}
+        for settings in group:
+            counts[settings[key]] = counts.get(settings[key], 1.0) + 1
+        total = sum(counts.values())
+        return {value: count / total for value, count in counts.items()}
+
+    good_density = {key: density(good, key) for key in space}
+    bad_density = {key: density(bad, key) for key in space}
+
+    best, best_ratio = None, float("-inf")
+    for _ in range(num_samples):
+        settings = {}
+        for key, probs in good_density.items():
+            values = list(probs)
+            settings[key] = rng.choices(values, weights=[probs[value] for value in values])[0]
+        if not _valid_settings(settings):
+            continue
+        ratio = sum(math.log(good_density[key][settings[key]]) - math.log(bad_density[key][settings[key]])
+                    for key in space)
+        if ratio > best_ratio:
+            best, best_ratio = settings, ratio
+    return best or random_candidates(space, rng)
+
+
+# ----------------------------------------------------------------------
+# 파라미터 탐색
+# ----------------------------------------------------------------------
+class ParameterSweep:
+    """
+    기술적 지표 파라미터 병렬 탐색기
+    """
+
+    def __init__(self, prices, config=None, space=None, objective="sharpe", min_trades=30,
+                 max_workers=None, cache_path=None, **backtest_params):
+        """
+        초기화 함수
+
+        Args:
+            prices: PriceMatrix
+            config: 설정 모듈 (탐색하지 않는 백테스트 파라미터의 기본값)
+            space: 설정 키 -> 후보 값 목록 (기본값: DEFAULT_SPACE)
+            objective: 순위 기준 (sharpe, total_pnl, profit_factor, calmar, win_rate)
+            min_trades: 이보다 거래 수가 적은 조합은 제외
+            max_workers: 작업자 프로세스 수 (기본값: CPU 수)
+            cache_path: 평가 결과 파일 캐시 경로 (None이면 메모리 캐시만 사용)
+            **backtest_params: 고정 백테스트 파라미터 덮어쓰기
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"지원하지 않는 목적 함수: {objective}")
+        self.prices = prices
+        self.config = config
+        self.space = {key: list(values) for key, values in (space or DEFAULT_SPACE).items()}
+        unknown = set(self.space) - set(SETTING_TO_PARAM)
+        if unknown:
+            raise ValueError(f"탐색할 수 없는 설정 키: {sorted(unknown)}")
+        self.objective = objective
+        self.min_trades = min_trades
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.base_params = default_params(config)
+        self.base_params.update(backtest_params)
+
+        self.results = {}  # settings_key -> (settings, summary)
+        self.cache_hits = 0
+        self._fingerprint = self._data_fingerprint()
+        self._load_cache()
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+    def _data_fingerprint(self):
+        """데이터/고정 파라미터가 같을 때만 파일 캐시를 재사용하기 위한 식별자"""
+        digest = hashlib.sha1()
+        digest.update(f"engine-{ENGINE_VERSION}".encode())
+        digest.update(repr(self.prices.shape).encode())
+        digest.update(",".join(self.prices.symbols).encode())
+        if len(self.prices.dates):
+            digest.update(f"{self.prices.dates[0]}{self.prices.dates[-1]}".encode())
+        digest.update(np.nan_to_num(self.prices.close[-1]).tobytes())
+        fixed = {key: value for key, value in self.base_params.items() if key not in SETTING_TO_PARAM.values()}
+        digest.update(json.dumps(fixed, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") != self._fingerprint:
+                return
+            for item in cached.get("results", []):
+                self.results[settings_key(item["settings"])] = (item["settings"], item["summary"])
+            logger.info(f"파라미터 평가 캐시 {len(self.results)}건 로드: {self.cache_path}")
+        except Exception as e:
+            logger.warning(f"파라미터 평가 캐시 로드 실패: {e}")
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "fingerprint": self._fingerprint,
+                    "results": [{"settings": settings, "summary": summary}
+                                for settings, summary in self.results.values()]
+                }, f, ensure_ascii=False, default=str)
+        except Exception as e:
+            logger.warning(f"파라미터 평가 캐시 저장 실패: {e}")
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def _shared_arrays(self):
+        """주가 배열과 탐색 공간에 필요한 지표 기본 배열 계산"""
+        prices = self.prices
+        arrays = {("price", field): getattr(prices, field) for field in ("open", "high", "low", "close", "volume")}
+
+        needed = set()
+        for key, values in self.space.items():
+            for value in values:
+                params = dict(self.base_params)
+                params[SETTING_TO_PARAM[key]] = value
+                needed.update(required_primitives(params))
+        for kind, window in sorted(needed):
+            arrays[(kind, window)] = compute_primitive(prices.close, kind, window)
+        return arrays
+
+    def _score(self, summary):
+        return score_summary(summary, self.objective, self.min_trades)
+
+    def run(self, method="random", trials=100, seed=42, top_n=10):
+        """
+        파라미터 탐색 실행
+
+        Args:
+            method: "grid", "random", "bayesian"
+            trials: 평가할 최대 조합 수 (grid는 None이면 전체)
+            seed: 난수 시드
+            top_n: 결과에 포함할 상위 조합 수
+
+        Returns:
+            list: 점수 순 [(settings, summary, score), ...]
+        """
+        started_at = time.perf_counter()
+        rng = random.Random(seed)
+
+        arrays = self._shared_arrays()
+        store = SharedArrayStore(arrays)
+        logger.info(f"공유 메모리 배열 {len(arrays)}개 ({store.shm.size / 1024 / 1024:.1f}MB), 작업자 {self.max_workers}개")
+
+        history = [(settings, self._score(summary)) for settings, summary in self.results.values()]
+        evaluated = 0
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(store.name, store.shape, store.layout, self.prices.dates, self.prices.symbols, self.base_params)
+            ) as pool:
+                if method == "grid":
+                    candidates = grid_candidates(self.space, trials)
+                    evaluated += self._evaluate_batch(pool, candidates, history)
+                elif method == "random":
+                    candidates = (random_candidates(self.space, rng) for _ in range(trials))
+                    evaluated += self._evaluate_batch(pool, candidates, history)
+                elif method == "bayesian":
+                    # 초기 무작위 탐색 후 작업자 수만큼씩 TPE 후보를 뽑아 병렬 평가
+                    initial = min(trials, max(self.max_workers, 10))
+                    evaluated += self._evaluate_batch(pool, (random_candidates(self.space, rng) for _ in range(initial)), history)
+                    while evaluated < trials:
+                        batch_size = min(self.max_workers, trials - evaluated)
+                        batch = [tpe_candidate(self.space, history, rng) for _ in range(batch_size)]
+                        evaluated += self._evaluate_batch(pool, batch, history)
+                else:
+                    raise ValueError(f"지원하지 않는 탐색 방식: {method}")
+        finally:
+            store.close()
+            self._save_cache()
+
+        ranking = self.ranking(top_n)
+        elapsed = time.perf_counter() - started_at
+        logger.info(f"파라미터 탐색 완료: 방식={method}, 평가 {evaluated}건, 캐시 적중 {self.cache_hits}건, {elapsed:.1f}초")
+        return ranking
+
+    def _evaluate_batch(self, pool, candidates, history):
+        """후보 조합 병렬 평가 (이미 평가한 조합은 캐시 사용)"""
+        futures = []
+        seen = set()
+        count = 0
+        for settings in candidates:
+            key = settings_key(settings)
+            if key in seen:
+                continue
+            seen.add(key)
+            count += 1
+            if key in self.results:
+                self.cache_hits += 1
+                continue
+            futures.append(pool.submit(_evaluate_in_worker, settings))
+
+        for future in as_completed(futures):
+            try:
+                settings, summary = future.result()
+            except Exception as e:
+                logger.warning(f"파라미터 조합 평가 실패: {e}")
+                continue
+            self.results[settings_key(settings)] = (settings, summary)
+            history.append((settings, self._score(summary)))
+        return count
+
+    def ranking(self, top_n=None):
+        """평가된 조합을 점수 순으로 정렬"""
+        ranked = [(settings, summary, self._score(summary)) for settings, summary in self.results.values()]
+        ranked = [item for item in ranked if math.isfinite(item[2])]
+        ranked.sort(key=lambda item: item[2], reverse=True)
+        return ranked[:top_n] if top_n else ranked
+
+    # ------------------------------------------------------------------
+    # 결과 형식
+    # ------------------------------------------------------------------
+    def to_technical_settings(self, method, top_n=10):
+        """
+        최상위 조합을 *_technical_indicators.json 형식으로 변환
+        (StockSelector.update_config_technical_indicators가 그대로 읽을 수 있음)
+        """
+        ranking = self.ranking(top_n)
+        if not ranking:
+            return None
+
+        config = self.config
+        best_settings, best_summary, best_score = ranking[0]
+        recommended = {key: getattr(config, key, None) for key in SETTING_KEYS}
+        recommended.update(best_settings)
+        recommended = {key: value for key, value in recommended.items() if value is not None}
+
+        prices = self.prices
+        period = f"{prices.dates[0].date()} ~ {prices.dates[-1].date()}" if len(prices.dates) else "-"
+        metrics = (f"거래 {best_summary['num_trades']}건, 승률 {best_summary['win_rate']:.1f}%, "
+                   f"수익률 {best_summary['total_return_pct']:.2f}%, 최대 낙폭 {best_summary['max_drawdown_pct']:.2f}%, "
+                   f"샤프 {best_summary['sharpe']:.2f}")
+
+        return {
+            "market_analysis": (f"과거 데이터 백테스트 기반 최적화: {prices.market or ''} {len(prices.symbols)}종목, "
+                                f"{period}, 평가 조합 {len(self.results)}개 ({method}, 기준: {self.objective})").replace("  ", " "),
+            "recommended_settings": recommended,
+            "explanation": {
+                "RSI": f"RSI {recommended.get('RSI_PERIOD')}일, 과매도 {recommended.get('RSI_OVERSOLD')} / 과매수 {recommended.get('RSI_OVERBOUGHT')}",
+                "MACD": f"MACD {recommended.get('MACD_FAST')}/{recommended.get('MACD_SLOW')}/{recommended.get('MACD_SIGNAL')}",
+                "BOLLINGER": f"볼린저밴드 {recommended.get('BOLLINGER_PERIOD')}일, 표준편차 {recommended.get('BOLLINGER_STD')}",
+                "MA": f"이동평균 {recommended.get('MA_SHORT')}/{recommended.get('MA_LONG')}일 교차",
+                "backtest": metrics
+            },
+            "trading_strategy": f"백테스트 상위 조합 기준 ({self.objective} {best_score:.4f}): {metrics}",
+            "optimization": {
+                "method": method,
+                "objective": self.objective,
+                "evaluations": len(self.results),
+                "ranking": [
+                    {"rank": rank, "score": round(score, 6), "settings": settings, "metrics": summary}
+                    for rank, (settings, summary, score) in enumerate(ranking, start=1)
+                ]
+            }
+        }
+
+
+def save_technical_settings(technical_settings, path):
+    """최적화 결과를 *_technical_indicators.json 파일로 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(technical_settings, f, ensure_ascii=False, indent=2, default=str)
+    logger.info(f"최적화된 기술적 지표 설정이 파일({path})에 저장되었습니다.")
@@ -0,0 +1,864 @@
+"""
+장중 리플레이 하네스 모듈
+
+기록된 분봉/틱 데이터와 기록된 GPT 응답으로 RealtimeTrader와 GPTAutoTrader를
+실제 증권사 API, 장 운영 시간, LLM 호출 없이 결정적으로 재생합니다.
+
+- SimulatedClock: 전역 시계로 주입되어 get_current_time/is_market_open을 가상 시각으로,
+  time.sleep을 가상 시간 경과로 대체
+- ReplayDataProvider: 가상 시각까지 기록된 데이터만 보여주는 데이터 제공자
+- ReplayBroker: 기록된 가격으로 즉시 체결하는 BrokerBase 구현
+- RecordedLLM: 기록된 GPT 응답을 돌려주는 GPTTradingStrategy/StockSelector 대체 객체
+- ReplayHarness: 하루 장을 사이클 단위로 재생하며 사이클 지연 시간과 초당 결정 수 측정
+
+기록 데이터의 각 행 시각은 해당 가격이 확정된 시각으로 간주합니다.
+(분봉은 종료 시각 기준으로 기록해야 미래 데이터를 참조하지 않습니다)
+"""
+import bisect
+import contextlib
+import copy
+import datetime
+import json
+import logging
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .data import PriceMatrix
+from ..trading.broker_base import BrokerBase
+from ..utils import time_utils
+from ..utils.clock import set_clock
+
+# 로깅 설정
+logger = logging.getLogger('Replay')
+
+# 리플레이 중 덮어쓰는 설정 (실제 주문/알림/설정 파일 변경 방지)
+REPLAY_CONFIG_OVERRIDES = {
+    "SIMULATION_MODE": False,  # 주문은 ReplayBroker로 전달
+    "FORCE_MARKET_OPEN": False,
+    "GPT_USE_DYNAMIC_SELECTION": False,
+    "GPT_OPTIMIZE_TECHNICAL_INDICATORS": False,
+    "KAKAO_MSG_ENABLED": False,
+    "USE_DATABASE": False,
+    "API_CACHE_INVALIDATE_URL": ""  # 리플레이 체결은 API 서버 캐시와 무관
+}
+
+# 기록이 없을 때 RecordedLLM이 돌려주는 기본 응답
+DEFAULT_LLM_RESPONSES = {
+    "analyze_realtime_trading": {"action": "HOLD", "confidence": 0.0, "analysis_summary": "기록된 응답 없음"},
+    "analyze_momentum_stock": {"action": "HOLD", "confidence": 0.0, "score": 0},
+    "recommend_stocks": {"recommended_stocks": []},
+    "get_day_trading_candidates": [],
+    "fully_autonomous_decision": {"buy_decisions": [], "sell_decisions": []},
+    "optimize_technical_indicators": None
+}
+
+# StockData.get_historical_data와 같은 period -> 일수 변환
+PERIOD_DAYS = {"1d": 1, "5d": 5, "1mo": 30, "3mo": 90, "6mo": 180, "1y": 365}
+
+BAR_AGGREGATION = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+ORDER_FILLED = "체결완료"
+ORDER_REJECTED = "거부"
+
+
+class ReplayConfig:
+    """설정 모듈 래퍼 (리플레이용 값만 덮어쓰고 나머지는 원본 설정 사용)"""
+
+    def __init__(self, config, **overrides):
+        self._config = config
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name):
+        return getattr(self._config, name)
+
+
+class _ClockTimeModule:
+    """time 모듈 대체 객체 (sleep/time만 가상 시각을 사용)"""
+
+    def __init__(self, clock):
+        self._clock = clock
+
+    def sleep(self, seconds):
+        self._clock.sleep(seconds)
+
+    def time(self):
+        return self._clock.timestamp()
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class SimulatedClock:
+    """
+    리플레이용 가상 시계
+
+    clock 모듈의 시계 인터페이스(now, timestamp)를 구현합니다. patch() 안에서는
+    전역 시계로 주입되고, 이미 import된 src 모듈의 time.sleep이 실제로 기다리지 않고
+    이 시계의 시각만 앞당깁니다.
+    """
+
+    def __init__(self, start, timezone=time_utils.KST):
+        self.timezone = timezone
+        self._now = self._localize(start)
+        self.slept = 0.0
+
+    def _localize(self, value):
+        dt = pd.Timestamp(value).to_pydatetime()
+        if dt.tzinfo is None:
+            return self.timezone.localize(dt)
+        return dt.astimezone(self.timezone)
+
+    @property
+    def current(self):
+        """시장 시간대 기준 현재 시각 (tz 포함)"""
+        return self._now
+
+    def naive(self):
+        """시장 시간대 기준 tz 없는 현재 시각 (기록 데이터 비교용)"""
+        return self._now.replace(tzinfo=None)
+
+    def timestamp(self):
+        return self._now.timestamp()
+
+    def set(self, value):
+        self._now = self._localize(value)
+
+    def advance(self, seconds):
+        self._now = self._now + datetime.timedelta(seconds=seconds)
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.advance(seconds)
+
+    def now(self, timezone=None):
+        """해당 시간대의 가상 현재 시각 (timezone이 None이면 tz 없는 시장 시각)"""
+        if timezone is None:
+            return self._now.replace(tzinfo=None)
+        return self._now.astimezone(timezone)
+
+    @contextlib.contextmanager
+    def patch(self, config=None):
+        """
+        가상 시각 적용 컨텍스트
+
+        Args:
+            config: is_market_open에 전달할 설정 (FORCE_MARKET_OPEN 등은 이 설정 기준)
+        """
+        original_market_open = time_utils.is_market_open
+        default_config = config
+
+        def is_market_open(market="KR", config=None):
+            return original_market_open(market, config if config is not None else default_config)
+
+        replacements = {"is_market_open": (original_market_open, is_market_open)}
+        time_module = _ClockTimeModule(self)
+
+        patched = []
+        for name, module in list(sys.modules.items()):
+            if module is None or name == __name__ or not (name == "src" or name.startswith("src.")):
+                continue
+            for attr, (original, replacement) in replacements.items():
+                if getattr(module, attr, None) is original:
+                    setattr(module, attr, replacement)
+                    patched.append((module, attr, original))
+            if getattr(module, "time", None) is time:
+                setattr(module, "time", time_module)
+                patched.append((module, "time", time))
+
+        logger.debug(f"가상 시각 적용: {len(patched)}개 항목")
+        previous_clock = set_clock(self)
+        try:
+            yield self
+        finally:
+            set_clock(previous_clock)
+            for module, attr, original in reversed(patched):
+                setattr(module, attr, original)
+
+
+class ReplayDataProvider:
+    """
+    기록 데이터 제공자 (StockData와 같은 메서드 이름)
+
+    가상 시각 이후의 행은 보이지 않으며, 현재가는 마지막으로 기록된 체결가입니다.
+    """
+
+    def __init__(self, tape, clock, daily=None, names=None, config=None):
+        """
+        Args:
+            tape: 장중 분봉/틱 PriceMatrix (시각 x 종목)
+            clock: SimulatedClock
+            daily: 과거 일봉 PriceMatrix (선택, 없으면 tape를 일봉으로 집계)
+            names: {종목코드: 종목명}
+            config: 설정 모듈 (일봉 기술적 지표 계산용)
+        """
+        self.tape = tape
+        self.clock = clock
+        self.daily = daily
+        self.names = dict(names or {})
+        self.config = config
+        self.calls = 0
+
+        self._times = tape.dates.values
+        self._columns = {symbol: i for i, symbol in enumerate(tape.symbols)}
+        self._last_close = pd.DataFrame(tape.close).ffill().to_numpy()
+        days = tape.dates.normalize().values
+        self._day_start = np.searchsorted(days, days, side="left")
+        self._cum_volume = np.cumsum(np.nan_to_num(tape.volume), axis=0)
+        self._row_key = None
+        self._row = -1
+        self._past_cache = {}
+
+    def _current_row(self):
+        now = self.clock.naive()
+        if now != self._row_key:
+            self._row_key = now
+            self._row = int(np.searchsorted(self._times, np.datetime64(now), side="right")) - 1
+        return self._row
+
+    def _frame(self, col, start, stop):
+        tape = self.tape
+        df = pd.DataFrame({
+            "Open": tape.open[start:stop, col],
+            "High": tape.high[start:stop, col],
+            "Low": tape.low[start:stop, col],
+            "Close": tape.close[start:stop, col],
+            "Volume": tape.volume[start:stop, col]
+        }, index=tape.dates[start:stop])
+        return df.dropna(subset=["Close"])
+
+    def get_current_price(self, symbol, market="KR"):
+        self.calls += 1
+        row, col = self._current_row(), self._columns.get(symbol)
+        if row < 0 or col is None:
+            return 0
+        price = self._last_close[row, col]
+        return 0 if np.isnan(price) else float(price)
+
+    def get_current_volume(self, symbol, market="KR"):
+        """당일 누적 거래량"""
+        self.calls += 1
+        row, col = self._current_row(), self._columns.get(symbol)
+        if row < 0 or col is None:
+            return 0
+        start = self._day_start[row]
+        before = self._cum_volume[start - 1, col] if start > 0 else 0
+        return int(self._cum_volume[row, col] - before)
+
+    def get_historical_data(self, symbol, market="KR", days=90, period=None, interval=None):
+        """
+        과거 데이터 조회
+
+        interval이 분/시간 단위("5m", "1h")이면 당일 기록을 해당 간격으로 집계하고,
+        그 외에는 일봉(기술적 지표 포함)을 반환합니다.
+        """
+        self.calls += 1
+        row, col = self._current_row(), self._columns.get(symbol)
+        if row < 0 or col is None:
+            return None
+
+        if interval and interval[-1] in ("m", "h"):
+            rule = interval[:-1] + ("min" if interval[-1] == "m" else "h")
+            df = self._frame(col, self._day_start[row], row + 1)
+            return self._resample(df, rule)
+
+        if period:
+            days = PERIOD_DAYS.get(period, days)
+        return self._daily_history(symbol, col, row, days)
+
+    def get_stock_data(self, symbol, days=90):
+        self.calls += 1
+        row, col = self._current_row(), self._columns.get(symbol)
+        if row < 0 or col is None:
+            return pd.DataFrame()
+        return self._daily_history(symbol, col, row, days)
+
+    def get_stock_info(self, symbol, market="KR"):
+        return {"symbol": symbol, "name": self.names.get(symbol, symbol), "market": market}
+
+    @staticmethod
+    def _resample(df, rule):
+        if df.empty:
+            return df
+        bars = df.resample(rule, label="right", closed="right").agg(BAR_AGGREGATION)
+        return bars.dropna(subset=["Close"])
+
+    def _past_daily(self, symbol):
+        """리플레이 시작 전 일봉 (daily가 주어진 경우, 종목별 캐시)"""
+        if symbol not in self._past_cache:
+            history = None
+            if self.daily is not None and symbol in self.daily.symbols:
+                past = self.daily.select([symbol], end=self.tape.dates[0].normalize() - pd.Timedelta(days=1))
+                history = pd.DataFrame({
+                    "Open": past.open[:, 0], "High": past.high[:, 0], "Low": past.low[:, 0],
+                    "Close": past.close[:, 0], "Volume": past.volume[:, 0]
+                }, index=past.dates).dropna(subset=["Close"])
+            self._past_cache[symbol] = history
+        return self._past_cache[symbol]
+
+    def _daily_history(self, symbol, col, row, days):
+        intraday = self._frame(col, 0, row + 1)
+        df = intraday.groupby(intraday.index.normalize()).agg(BAR_AGGREGATION)
+        history = self._past_daily(symbol)
+        if history is not None and len(history):
+            df = pd.concat([history, df])
+
+        cutoff = pd.Timestamp(self.clock.naive().date()) - pd.Timedelta(days=days)
+        df = df[df.index >= cutoff]
+
+        if self.config is not None and len(df) > 1:
+            from ..analysis.technical import calculate_indicators
+            df = calculate_indicators(df, self.config)
+        return df
+
+
+class ReplayBroker(BrokerBase):
+    """
+    리플레이용 증권사 API
+
+    주문은 제출 시각의 마지막 기록 가격(슬리피지 반영)으로 즉시 전량 체결됩니다.
+    지정가 주문은 기록 가격이 지정가보다 불리하면 거부됩니다.
+    """
+
+    def __init__(self, config, data_provider, initial_cash=None, fee_rate=None, tax_rate=None, slippage_pct=None):
+        super().__init__(config)
+        self.data_provider = data_provider
+        self.clock = data_provider.clock
+        self.real_trading = False
+        self.account_number = "REPLAY"
+
+        self.initial_cash = float(initial_cash if initial_cash is not None
+                                  else getattr(config, 'BACKTEST_INITIAL_CAPITAL', 100000000))
+        self.fee_rate = fee_rate if fee_rate is not None else getattr(config, 'BACKTEST_FEE_RATE', 0.00015)
+        self.tax_rate = tax_rate if tax_rate is not None else getattr(config, 'BACKTEST_TAX_RATE', 0.0018)
+        self.slippage_pct = slippage_pct if slippage_pct is not None else getattr(config, 'BACKTEST_SLIPPAGE_PCT', 0.0)
+
+        self.cash = self.initial_cash
+        self.realized_pnl = 0.0
+        self.positions = {}  # {symbol: {quantity, avg_price, entry_time}}
+        self.orders = {}  # {order_no: order}
+        self.fills = []
+        self._order_seq = 0
+
+    # 연결 관련 메서드 (리플레이에서는 항상 성공)
+    def connect(self):
+        self.connected = True
+        return True
+
+    def disconnect(self):
+        self.connected = False
+        return True
+
+    def login(self, user_id=None, password=None, cert_password=None):
+        return True
+
+    def get_account_list(self):
+        return [self.account_number]
+
+    def get_trading_mode(self):
+        return "리플레이"
+
+    def get_stock_name(self, symbol):
+        return self.data_provider.names.get(symbol, symbol)
+
+    def get_current_price(self, code):
+        return self.data_provider.get_current_price(code)
+
+    def equity(self):
+        """현금 + 보유 종목 평가금액"""
+        value = self.cash
+        for symbol, position in self.positions.items():
+            price = self.data_provider.get_current_price(symbol) or position["avg_price"]
+            value += position["quantity"] * price
+        return value
+
+    def get_balance(self, account_number=None, force_refresh=False, timestamp=None):
+        total = self.equity()
+        return {
+            "예수금": int(self.cash),
+            "주문가능금액": int(self.cash),
+            "출금가능금액": int(self.cash),
+            "총평가금액": int(total),
+            "총손익": int(total - self.initial_cash)
+        }
+
+    def get_positions(self, account_number=None, force_refresh=False):
+        positions = []
+        for symbol, position in self.positions.items():
+            price = self.data_provider.get_current_price(symbol) or position["avg_price"]
+            name = self.get_stock_name(symbol)
+            positions.append({
+                # KISAPI 응답 형식
+                "종목코드": symbol,
+                "종목명": name,
+                "보유수량": position["quantity"],
+                "평균단가": position["avg_price"],
+                "현재가": price,
+                "평가금액": position["quantity"] * price,
+                # 일반 형식
+                "symbol": symbol,
+                "name": name,
+                "quantity": position["quantity"],
+                "avg_price": position["avg_price"],
+                "current_price": price,
+                "market": "KR",
+                "entry_time": position["entry_time"]
+            })
+        return positions
+
+    def _submit(self, symbol, side, quantity, limit_price=None):
+        """주문 체결 처리 후 주문 정보 반환"""
+        self._order_seq += 1
+        order = {
+            "order_no": f"R{self._order_seq:07d}",
+            "symbol": symbol,
+            "side": side,
+            "quantity": int(quantity),
+            "price": limit_price,
+            "timestamp": self.clock.current.isoformat(),
+            "executed_qty": 0,
+            "executed_price": 0,
+            "status": ORDER_REJECTED,
+            "message": ""
+        }
+        self.orders[order["order_no"]] = order
+
+        recorded = self.data_provider.get_current_price(symbol)
+        quantity = order["quantity"]
+        if not recorded or quantity <= 0:
+            order["message"] = "시세 없음" if not recorded else "주문 수량 오류"
+            return order
+
+        slippage = self.slippage_pct / 100
+        if side == "buy":
+            price = recorded * (1 + slippage)
+            if limit_price and recorded > limit_price:
+                order["message"] = "지정가 미체결"
+                return order
+            if limit_price:
+                price = min(price, limit_price)
+            amount = price * quantity
+            fee = amount * self.fee_rate
+            if amount + fee > self.cash:
+                order["message"] = "주문가능금액 부족"
+                return order
+            self.cash -= amount + fee
+            position = self.positions.get(symbol)
+            if position:
+                total = position["quantity"] + quantity
+                position["avg_price"] = (position["avg_price"] * position["quantity"] + amount) / total
+                position["quantity"] = total
+            else:
+                self.positions[symbol] = {"quantity": quantity, "avg_price": price,
+                                          "entry_time": self.clock.current.isoformat()}
+            pnl = None
+        else:
+            position = self.positions.get(symbol)
+            if not position or position["quantity"] < quantity:
+                order["message"] = "매도 가능 수량 부족"
+                return order
+            price = recorded * (1 - slippage)
+            if limit_price and recorded < limit_price:
+                order["message"] = "지정가 미체결"
+                return order
+            if limit_price:
+                price = max(price, limit_price)
+            amount = price * quantity
+            fee = amount * self.fee_rate + amount * self.tax_rate
+            self.cash += amount - fee
+            pnl = (price - position["avg_price"]) * quantity - fee
+            self.realized_pnl += pnl
+            position["quantity"] -= quantity
+            if position["quantity"] == 0:
+                del self.positions[symbol]
+
+        order.update(executed_qty=quantity, executed_price=price, status=ORDER_FILLED, message="체결")
+        self.fills.append({
+            "timestamp": order["timestamp"],
+            "order_no": order["order_no"],
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "price": price,
+            "fee": fee,
+            "pnl": pnl
+        })
+        return order
+
+    @staticmethod
+    def _limit_price(price, order_type):
+        is_limit = str(order_type).lower() == "limit"
+        return float(price) if is_limit and price else None
+
+    def buy_stock(self, code, quantity, price=0, price_type='limit', account_number=None):
+        order = self._submit(code, "buy", quantity, self._limit_price(price, price_type))
+        return order["order_no"] if order["status"] == ORDER_FILLED else None
+
+    def sell_stock(self, code, quantity, price=0, price_type='limit', account_number=None):
+        order = self._submit(code, "sell", quantity, self._limit_price(price, price_type))
+        return order["order_no"] if order["status"] == ORDER_FILLED else None
+
+    def cancel_order(self, order_number, code=None, quantity=0, price=0, order_type='market', account_number=None):
+        # 모든 주문이 즉시 체결/거부되므로 취소할 미체결 주문이 없음
+        return False
+
+    def get_order_status(self, order_number, account_number=None):
+        order = self.orders.get(order_number)
+        if not order:
+            return {}
+        return {
+            "주문번호": order["order_no"],
+            "종목코드": order["symbol"],
+            "주문수량": order["quantity"],
+            "체결수량": order["executed_qty"],
+            "체결단가": order["executed_price"],
+            "미체결수량": order["quantity"] - order["executed_qty"],
+            "주문상태": order["status"]
+        }
+
+    def get_order_executions(self, account_number=None):
+        """당일 주문 체결 내역 일괄 조회 (주문 추적기용)"""
+        return [self.get_order_status(order_number) for order_number in list(self.orders)]
+
+    def place_order(self, symbol, order_type, quantity, price=None):
+        """RealtimeTrader용 주문 (현재가 기준 시장가 체결)"""
+        order = self._submit(symbol, order_type.lower(), quantity)
+        if order["status"] != ORDER_FILLED:
+            return {"success": False, "order_id": order["order_no"], "error": order["message"]}
+        return {"success": True, "order_id": order["order_no"], "price": order["executed_price"]}
+
+    def _order_result(self, order):
+        # AutoTrader._execute_order는 응답의 status를 주문 상태로 사용
+        success = order["status"] == ORDER_FILLED
+        return {
+            "success": success,
+            "order_no": order["order_no"] if success else "",
+            "status": "EXECUTED" if success else "REJECTED",
+            "executed_price": order["executed_price"],
+            "executed_quantity": order["executed_qty"],
+            "message": order["message"],
+            "error": None if success else order["message"]
+        }
+
+    def buy(self, symbol, quantity, price=0, order_type='MARKET', market='KR'):
+        return self._order_result(self._submit(symbol, "buy", quantity, self._limit_price(price, order_type)))
+
+    def sell(self, symbol, quantity, price=0, order_type='MARKET', market='KR'):
+        return self._order_result(self._submit(symbol, "sell", quantity, self._limit_price(price, order_type)))
+
+
+class RecordedLLM:
+    """
+    기록된 GPT 응답 재생기
+
+    GPTAutoTrader의 gpt_strategy/stock_selector, RealtimeTrader의 gpt_auto_trader 자리에
+    넣어 사용합니다. (메서드, 종목) 별로 가상 시각 이전의 가장 최근 기록을 돌려주고,
+    기록에 latency가 있으면 그만큼 가상 시각을 앞당깁니다.
+    """
+
+    def __init__(self, clock, records=None, defaults=None):
+        self.clock = clock
+        self.defaults = dict(DEFAULT_LLM_RESPONSES)
+        self.defaults.update(defaults or {})
+        self.calls = {}
+        self.momentum_opportunities = []
+        self._records = {}  # {(method, key): ([시각], [(응답, 지연)])}
+        for record in records or []:
+            self.add(**record)
+
+    @classmethod
+    def from_file(cls, path, clock, defaults=None):
+        """JSON 배열 또는 JSON Lines 파일에서 기록 로드"""
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        if text.startswith("["):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        logger.info(f"기록된 LLM 응답 {len(records)}건 로드: {path}")
+        return cls(clock, records, defaults)
+
+    def add(self, method, response, symbol=None, time=None, latency=0.0):
+        """
+        응답 기록 추가
+
+        Args:
+            method: 메서드 이름 (예: analyze_realtime_trading)
+            response: 돌려줄 응답
+            symbol: 종목 코드 또는 시장 구분 (None이면 모든 종목에 적용)
+            time: 응답이 유효해지는 시각 (None이면 처음부터)
+            latency: 호출 시 앞당길 가상 시간 (초)
+        """
+        at = datetime.datetime.min if time is None else self.clock._localize(time).replace(tzinfo=None)
+        times, items = self._records.setdefault((method, symbol), ([], []))
+        index = bisect.bisect_right(times, at)
+        times.insert(index, at)
+        items.insert(index, (response, latency))
+
+    def respond(self, method, symbol=None):
+        """가상 시각 기준 기록 응답 (없으면 기본 응답)"""
+        self.calls[method] = self.calls.get(method, 0) + 1
+        now = self.clock.naive()
+        for key in ((method, symbol), (method, None)):
+            entry = self._records.get(key)
+            if not entry:
+                continue
+            index = bisect.bisect_right(entry[0], now) - 1
+            if index >= 0:
+                response, latency = entry[1][index]
+                if latency:
+                    self.clock.advance(latency)
+                return copy.deepcopy(response)
+        return copy.deepcopy(self.defaults.get(method))
+
+    def analyze_realtime_trading(self, symbol, stock_data=None, current_price=None, is_holding=False, avg_price=0, name=None):
+        result = self.respond("analyze_realtime_trading", symbol) or {}
+        result.setdefault("symbol", symbol)
+        result.setdefault("timestamp", self.clock.current.isoformat())
+        return result
+
+    def get_gpt_insights_for_realtime_trading(self, symbol, stock_data, current_price=None, is_holding=False, avg_price=0):
+        return self.analyze_realtime_trading(symbol, stock_data, current_price, is_holding, avg_price)
+
+    def analyze_momentum_stock(self, symbol, *args, **kwargs):
+        result = self.respond("analyze_momentum_stock", symbol) or {}
+        result.setdefault("symbol", symbol)
+        return result
+
+    def get_day_trading_candidates(self, market="KR", max_count=10, min_score=0, use_cache=True):
+        return (self.respond("get_day_trading_candidates", market) or [])[:max_count]
+
+    def add_momentum_opportunity(self, opportunity):
+        self.momentum_opportunities.append(opportunity)
+
+    def get_momentum_opportunities(self, min_score=0):
+        return [opp for opp in self.momentum_opportunities if opp.get("score", 0) >= min_score]
+
+    def fully_autonomous_decision(self, market_data=None, available_cash=0, current_positions=None):
+        return self.respond("fully_autonomous_decision")
+
+    def optimize_technical_indicators(self, *args, **kwargs):
+        return self.respond("optimize_technical_indicators")
+
+    def is_api_key_valid(self):
+        return True
+
+    def recommend_stocks(self, market="KR", count=5, strategy="balanced"):
+        result = self.respond("recommend_stocks", market) or {"recommended_stocks": []}
+        result["recommended_stocks"] = result.get("recommended_stocks", [])[:count]
+        return result
+
+    def update_config_stocks(self, kr_recommendations=None, us_recommendations=None):
+        # 리플레이에서는 config.py를 수정하지 않음
+        return True
+
+
+class ReplayResult:
+    """리플레이 결과 (사이클별 지연 시간과 체결 내역)"""
+
+    def __init__(self, cycles, broker, llm, wall_elapsed, simulated_seconds):
+        self.cycles = cycles
+        self.broker = broker
+        self.llm = llm
+        self.wall_elapsed = wall_elapsed
+        self.simulated_seconds = simulated_seconds
+
+    def to_frame(self):
+        return pd.DataFrame(self.cycles)
+
+    def latency(self, trader=None):
+        """사이클 지연 시간 통계 (밀리초)"""
+        values = np.array([c["latency_ms"] for c in self.cycles
+                           if trader is None or c["trader"] == trader], dtype=np.float64)
+        if len(values) == 0:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "count": len(values),
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "p99": float(np.percentile(values, 99)),
+            "max": float(values.max())
+        }
+
+    def summary(self):
+        decisions = sum(c["decisions"] for c in self.cycles)
+        wall = self.wall_elapsed
+        equity = self.broker.equity()
+        return {
+            "cycles": len(self.cycles),
+            "decisions": decisions,
+            "decisions_per_sec": decisions / wall if wall > 0 else 0.0,
+            "wall_elapsed_sec": wall,
+            "simulated_sec": self.simulated_seconds,
+            "speedup": self.simulated_seconds / wall if wall > 0 else 0.0,
+            "latency_ms": {trader: self.latency(trader)
+                           for trader in sorted({c["trader"] for c in self.cycles})},
+            "errors": sum(1 for c in self.cycles if c["status"] == "error"),
+            "orders": len(self.broker.orders),
+            "fills": len(self.broker.fills),
+            "llm_calls": dict(self.llm.calls),
+            "realized_pnl": self.broker.realized_pnl,
+            "final_equity": equity,
+            "return_pct": (equity / self.broker.initial_cash - 1) * 100
+        }
+
+
+class ReplayHarness:
+    """
+    하루 장 리플레이 실행기
+
+    RealtimeTrader는 REALTIME_SCAN_INTERVAL_SECONDS마다, GPTAutoTrader.run_cycle은
+    GPT_TRADING_MONITOR_INTERVAL(분)마다 실행합니다. 실제 루프와 같이 다음 사이클은
+    이전 사이클이 끝난 가상 시각(주문 후 sleep 포함) + 간격에 시작합니다.
+    """
+
+    def __init__(self, config, tape, llm=None, daily=None, names=None, traders=("realtime", "gpt"),
+                 scan_interval_seconds=None, gpt_interval_minutes=None, initial_cash=None, **overrides):
+        """
+        Args:
+            config: 설정 모듈
+            tape: 장중 분봉/틱 PriceMatrix
+            llm: RecordedLLM 또는 기록 목록 (None이면 기본 응답만 사용)
+            daily: 과거 일봉 PriceMatrix (선택)
+            names: {종목코드: 종목명}
+            traders: 실행할 트레이더 ("realtime", "gpt")
+            scan_interval_seconds: RealtimeTrader 사이클 간격 (기본: 설정값)
+            gpt_interval_minutes: GPTAutoTrader 사이클 간격 (기본: 설정값)
+            initial_cash: 초기 예수금 (기본: BACKTEST_INITIAL_CAPITAL)
+            **overrides: 리플레이 중 덮어쓸 추가 설정
+        """
+        settings = dict(REPLAY_CONFIG_OVERRIDES)
+        settings.update(overrides)
+        self.config = ReplayConfig(config, **settings)
+        self.tape = tape
+        self.traders = tuple(traders)
+        self.scan_interval = scan_interval_seconds or getattr(self.config, 'REALTIME_SCAN_INTERVAL_SECONDS', 30)
+        self.gpt_interval = (gpt_interval_minutes or getattr(self.config, 'GPT_TRADING_MONITOR_INTERVAL', 30)) * 60
+
+        self.clock = SimulatedClock(tape.dates[0])
+        self.data_provider = ReplayDataProvider(tape, self.clock, daily=daily, names=names, config=config)
+        self.broker = ReplayBroker(self.config, self.data_provider, initial_cash=initial_cash)
+        if isinstance(llm, RecordedLLM):
+            llm.clock = self.clock
+            self.llm = llm
+        else:
+            self.llm = RecordedLLM(self.clock, llm)
+
+        self.realtime_trader = None
+        self.gpt_trader = None
+
+    def _session(self, date):
+        open_str = time_utils.get_config_value('KR_MARKET_OPEN_TIME', time_utils.DEFAULT_KR_MARKET_OPEN_TIME, self.config)
+        close_str = time_utils.get_config_value('KR_MARKET_CLOSE_TIME', time_utils.DEFAULT_KR_MARKET_CLOSE_TIME, self.config)
+        day = pd.Timestamp(date).strftime("%Y-%m-%d")
+        return pd.Timestamp(f"{day} {open_str}"), pd.Timestamp(f"{day} {close_str}")
+
+    def _build_traders(self):
+        from ..trading.realtime_trader import RealtimeTrader
+        from ..trading.gpt_auto_trader import GPTAutoTrader
+
+        if "gpt" in self.traders:
+            gpt = GPTAutoTrader(self.config, self.broker, self.data_provider, None)
+            gpt.stock_selector = self.llm
+            gpt.gpt_strategy = self.llm
+            gpt.use_dynamic_selection = False
+            gpt.optimize_technical_indicators = False
+            # start()는 스레드와 증권사 연결을 시작하므로 실행 상태만 설정
+            gpt.is_running = True
+            self.gpt_trader = gpt
+            realtime = gpt.realtime_trader
+        else:
+            realtime = RealtimeTrader(self.config, self.broker, self.data_provider, None)
+            realtime.set_gpt_auto_trader(self.llm)
+
+        if "realtime" in self.traders:
+            realtime.is_running = True
+            self.realtime_trader = realtime
+
+    def _run_cycle(self, name, trader):
+        sim_start = self.clock.current
+        started = time.perf_counter()
+        try:
+            result = trader.run_cycle() or {}
+            status = result.get("status", "success")
+        except Exception as e:
+            logger.error(f"{name} 사이클 실행 중 오류: {e}")
+            result, status = {}, "error"
+        latency = time.perf_counter() - started
+
+        if name == "realtime":
+            decisions = result.get("evaluated", 0)
+        else:
+            decisions = len(trader.holdings) + sum(len(s) for s in trader.gpt_selections.values())
+        return {
+            "trader": name,
+            "time": sim_start.isoformat(),
+            "latency_ms": latency * 1000,
+            "simulated_ms": (self.clock.current - sim_start).total_seconds() * 1000,
+            "decisions": decisions if status != "skip" else 0,
+            "buys": len(result.get("buy_orders", [])),
+            "sells": len(result.get("sell_orders", [])),
+            "status": status
+        }
+
+    def run(self, date=None, start=None, end=None):
+        """
+        하루 장 재생
+
+        Args:
+            date: 재생할 날짜 (기본: 기록 데이터의 첫 날짜)
+            start: 시작 시각 (기본: 장 시작)
+            end: 종료 시각 (기본: 장 마감)
+
+        Returns:
+            ReplayResult
+        """
+        session_open, session_close = self._session(date or self.tape.dates[0])
+        start = pd.Timestamp(start) if start is not None else session_open
+        end = pd.Timestamp(end) if end is not None else session_close
+        self.clock.set(start)
+        end_time = self.clock._localize(end)
+
+        if self.realtime_trader is None and self.gpt_trader is None:
+            self._build_traders()
+
+        cycles = []
+        next_realtime = next_gpt = self.clock.current
+        wall_started = time.perf_counter()
+        with self.clock.patch(self.config):
+            while True:
+                due = [t for t in (next_realtime if self.realtime_trader else None,
+                                   next_gpt if self.gpt_trader else None) if t is not None]
+                if not due:
+                    break
+                at = min(due)
+                if at > end_time:
+                    break
+                if at > self.clock.current:
+                    self.clock.set(at)
+                realtime_due = self.realtime_trader is not None and next_realtime <= at
+                gpt_due = self.gpt_trader is not None and next_gpt <= at
+                market_open = time_utils.is_market_open("KR")
+
+                # 실제 루프와 같이 장이 닫혀 있으면 사이클을 건너뜀
+                if realtime_due:
+                    if market_open:
+                        cycles.append(self._run_cycle("realtime", self.realtime_trader))
+                    next_realtime = self.clock.current + datetime.timedelta(seconds=self.scan_interval)
+                if gpt_due:
+                    if market_open:
+                        cycles.append(self._run_cycle("gpt", self.gpt_trader))
+                    next_gpt = self.clock.current + datetime.timedelta(seconds=self.gpt_interval)
+        wall_elapsed = time.perf_counter() - wall_started
+
+        simulated = (min(self.clock.current, end_time) - self.clock._localize(start)).total_seconds()
+        logger.info(f"리플레이 완료: 사이클 {len(cycles)}회, 가상 {simulated:,.0f}초 / 실제 {wall_elapsed:.2f}초")
+        return ReplayResult(cycles, self.broker, self.llm, wall_elapsed, simulated)
+
+
+def load_tape(path, market="KR"):
+    """분봉/틱 기록 파일 로드 (long 형식 CSV/Parquet)"""
+    return PriceMatrix.from_file(path, market=market)
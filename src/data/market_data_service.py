@@ -0,0 +1,336 @@
+"""
+공유 시세 데이터 서비스 모듈
+
+RealtimeTrader, GPTAutoTrader(자율 거래/시장 스캔 스레드), AutoTrader, main.py 분석 작업이
+같은 종목의 현재가/과거 데이터/종목 정보를 각자 조회하던 것을 프로세스 안의 단일 서비스로 모읍니다.
+
+- 요청 합치기(single-flight): 같은 인자의 조회가 여러 스레드에서 동시에 들어오면 첫 요청만
+  원본 제공자(StockData 등)를 호출하고 나머지는 그 결과를 기다려 함께 받습니다.
+- 틱 단위 스냅샷: 현재가/거래량은 같은 스캔 틱(MARKET_DATA_TICK_SECONDS) 안에서 모든 스레드가
+  같은 값을 공유하고, 과거 데이터와 종목 정보는 각각의 TTL 동안 재사용합니다.
+- 구독 기반 갱신: subscribe()로 등록된 종목의 현재가를 장중 매 틱 백그라운드에서 미리 조회해
+  트레이더 스레드의 조회가 캐시에서 바로 끝나도록 합니다.
+
+원본 제공자와 같은 메서드 이름으로 호출할 수 있으므로 data_provider 자리에 그대로 넘기면 됩니다.
+"""
+import inspect
+import logging
+import threading
+
+import pandas as pd
+
+from ..utils.clock import get_clock
+from ..utils.market_calendar import get_calendar
+
+# 로거 설정
+logger = logging.getLogger('MarketDataService')
+
+# 캐시 분류
+TICK = "tick"
+HISTORY = "history"
+INFO = "info"
+
+# 요청을 합치고 캐시하는 원본 제공자 메서드 {메서드 이름: 캐시 분류}
+CACHED_METHODS = {
+    "get_current_price": TICK,
+    "get_current_volume": TICK,
+    "get_historical_data": HISTORY,
+    "get_stock_data": HISTORY,
+    "get_korean_stock_data": HISTORY,
+    "get_us_stock_data": HISTORY,
+    "get_stock_info": INFO,
+}
+
+
+class _Flight:
+    """진행 중인 원본 조회 (같은 키의 다른 요청은 완료를 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MarketDataService:
+    """
+    공유 시세 데이터 서비스
+
+    원본 제공자의 메서드를 같은 이름으로 노출하며, CACHED_METHODS에 있는 메서드는
+    인자(기본값 포함)를 정규화한 키로 요청 합치기와 캐시를 적용합니다.
+    """
+
+    def __init__(self, provider, config=None, clock=None):
+        """
+        Args:
+            provider: 원본 데이터 제공자 (StockData 등)
+            config: 설정 모듈
+            clock: 시계 객체 (None이면 clock.get_clock()의 전역 시계)
+        """
+        self.provider = provider
+        self.config = config
+        self.clock = clock
+
+        self.tick_seconds = float(getattr(config, 'MARKET_DATA_TICK_SECONDS', 5))
+        self.ttl = {
+            HISTORY: float(getattr(config, 'MARKET_DATA_HISTORY_TTL_SECONDS', 60)),
+            INFO: float(getattr(config, 'MARKET_DATA_INFO_TTL_SECONDS', 6 * 60 * 60)),
+        }
+        self.max_entries = getattr(config, 'MARKET_DATA_CACHE_MAX_ENTRIES', 4096)
+
+        self._lock = threading.Lock()
+        self._cache = {}  # {키: (만료 epoch, 결과)}
+        self._inflight = {}  # {키: _Flight}
+        self._methods = {}  # {메서드 이름: 래퍼 함수}
+        self._signatures = {}  # {메서드 이름: inspect.Signature 또는 None}
+        self._counters = {}  # {메서드 이름: {requests, hits, deduplicated, upstream, errors}}
+
+        # 구독 {구독자: (시장, 종목 집합)}
+        self._subscriptions = {}
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+        logger.info(f"공유 시세 데이터 서비스 초기화 (틱 {self.tick_seconds:g}초, "
+                    f"과거 데이터 TTL {self.ttl[HISTORY]:g}초, 종목 정보 TTL {self.ttl[INFO]:g}초)")
+
+    def __getattr__(self, name):
+        # 원본 제공자에 없는 메서드는 AttributeError (hasattr 확인을 그대로 유지)
+        provider = self.__dict__.get('provider')
+        attr = getattr(provider, name)
+        if name not in CACHED_METHODS or not callable(attr):
+            return attr
+
+        methods = self.__dict__['_methods']
+        wrapper = methods.get(name)
+        if wrapper is None:
+            def wrapper(*args, **kwargs):
+                return self._call(name, args, kwargs)
+            wrapper.__name__ = name
+            wrapper.__doc__ = getattr(attr, '__doc__', None)
+            methods[name] = wrapper
+        return wrapper
+
+    def _now(self):
+        return (self.clock if self.clock is not None else get_clock()).timestamp()
+
+    def _key(self, name, args, kwargs):
+        """
+        기본값을 채운 인자로 캐시 키 생성 (위치/키워드 인자 차이를 없앰)
+
+        Returns:
+            tuple: (메서드 이름, (인자 이름, 값), ...) - 시그니처를 알 수 없으면 (메서드 이름, None, args, kwargs)
+        """
+        if name not in self._signatures:
+            try:
+                self._signatures[name] = inspect.signature(getattr(self.provider, name))
+            except (TypeError, ValueError):
+                self._signatures[name] = None
+        signature = self._signatures[name]
+        if signature is not None:
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return (name,) + tuple(bound.arguments.items())
+            except TypeError:
+                pass
+        return (name, None, args, tuple(sorted(kwargs.items())))
+
+    def _expiry(self, name, now):
+        kind = CACHED_METHODS[name]
+        if kind == TICK:
+            # 같은 틱 안의 요청은 모두 같은 스냅샷을 공유
+            return (int(now // self.tick_seconds) + 1) * self.tick_seconds
+        return now + self.ttl[kind]
+
+    @staticmethod
+    def _cacheable(result):
+        """조회 실패로 보이는 결과(None, 0, 빈 DataFrame)는 캐시하지 않음"""
+        if result is None:
+            return False
+        if isinstance(result, pd.DataFrame):
+            return not result.empty
+        if isinstance(result, (int, float)):
+            return result != 0
+        return True
+
+    def _count(self, name, field):
+        counters = self._counters.get(name)
+        if counters is None:
+            counters = self._counters[name] = {
+                'requests': 0, 'hits': 0, 'deduplicated': 0, 'upstream': 0, 'errors': 0
+            }
+        counters[field] += 1
+
+    def _call(self, name, args, kwargs):
+        try:
+            key = self._key(name, args, kwargs)
+            hash(key)
+        except TypeError:
+            # 해시할 수 없는 인자는 캐시 없이 바로 호출
+            return getattr(self.provider, name)(*args, **kwargs)
+
+        now = self._now()
+        with self._lock:
+            self._count(name, 'requests')
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._count(name, 'hits')
+                return entry[1]
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self._count(name, 'deduplicated')
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = getattr(self.provider, name)(*args, **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                self._count(name, 'upstream')
+                if flight.error is not None:
+                    self._count(name, 'errors')
+                elif self._cacheable(flight.result):
+                    if len(self._cache) >= self.max_entries:
+                        self._purge(now)
+                    self._cache[key] = (self._expiry(name, self._now()), flight.result)
+            flight.done.set()
+
+    def _purge(self, now):
+        """만료된 캐시 항목 정리 (그래도 가득 차면 전부 비움)"""
+        expired = [key for key, (expires, _) in self._cache.items() if expires <= now]
+        for key in expired:
+            del self._cache[key]
+        if len(self._cache) >= self.max_entries:
+            self._cache.clear()
+
+    def invalidate(self, symbol=None):
+        """캐시 삭제 (symbol을 주면 해당 종목 항목만)"""
+        with self._lock:
+            if symbol is None:
+                self._cache.clear()
+                return
+            for key in [key for key in self._cache if self._key_symbol(key) == symbol]:
+                del self._cache[key]
+
+    @staticmethod
+    def _key_symbol(key):
+        """캐시 키의 첫 번째 인자(종목 코드)"""
+        if len(key) < 2:
+            return None
+        if key[1] is None:
+            args = key[2]
+            return args[0] if args else None
+        return key[1][1]
+
+    def snapshot(self, symbols, market="KR"):
+        """
+        현재 틱의 현재가 스냅샷
+
+        Returns:
+            dict: {종목코드: 현재가}
+        """
+        return {symbol: self.get_current_price(symbol, market) for symbol in symbols}
+
+    def subscribe(self, owner, symbols, market="KR"):
+        """
+        구독 종목 등록/교체 (장중 매 틱 현재가를 미리 갱신)
+
+        Args:
+            owner: 구독자 이름 (같은 이름으로 다시 호출하면 종목 목록 교체)
+            symbols: 종목 코드 목록
+            market: 시장 코드
+        """
+        with self._lock:
+            self._subscriptions[owner] = (market, frozenset(symbols))
+
+    def unsubscribe(self, owner):
+        """구독 해제"""
+        with self._lock:
+            self._subscriptions.pop(owner, None)
+
+    def subscribed_symbols(self):
+        """시장별 구독 종목 합집합 {시장: set}"""
+        with self._lock:
+            result = {}
+            for market, symbols in self._subscriptions.values():
+                result.setdefault(market, set()).update(symbols)
+            return result
+
+    def start(self):
+        """구독 종목 백그라운드 갱신 시작"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return False
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="MarketDataRefresh", daemon=True)
+        self._refresh_thread.start()
+        logger.info("구독 종목 시세 갱신 스레드 시작")
+        return True
+
+    def stop(self):
+        """구독 종목 백그라운드 갱신 중지"""
+        self._stop_event.set()
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            self._refresh_thread.join(timeout=5)
+        self._refresh_thread = None
+
+    def refresh(self):
+        """
+        개장 중인 시장의 구독 종목 현재가를 한 번 갱신
+
+        Returns:
+            int: 갱신한 종목 수
+        """
+        refreshed = 0
+        for market, symbols in self.subscribed_symbols().items():
+            if not get_calendar(market, self.config).is_open():
+                continue
+            for symbol in symbols:
+                try:
+                    self.get_current_price(symbol, market)
+                    refreshed += 1
+                except Exception as e:
+                    logger.warning(f"{symbol}({market}) 구독 시세 갱신 실패: {e}")
+        return refreshed
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"구독 시세 갱신 중 오류 발생: {e}")
+
+            # 다음 틱 시작까지 대기, 구독 시장이 모두 닫혀 있으면 가장 빠른 개장 시각까지 대기
+            now = self._now()
+            wait = (int(now // self.tick_seconds) + 1) * self.tick_seconds - now
+            markets = list(self.subscribed_symbols())
+            if markets:
+                wait = max(wait, min(get_calendar(market, self.config).seconds_until_open() for market in markets))
+            self._stop_event.wait(wait)
+
+    def stats(self):
+        """
+        메서드별 요청/캐시 적중/중복 제거/원본 호출 수
+
+        Returns:
+            dict: {'methods': {메서드: 카운터}, 'total': 합계 카운터, 'cache_entries': 캐시 항목 수}
+        """
+        with self._lock:
+            methods = {name: dict(counters) for name, counters in self._counters.items()}
+            cache_entries = len(self._cache)
+        total = {'requests': 0, 'hits': 0, 'deduplicated': 0, 'upstream': 0, 'errors': 0}
+        for counters in methods.values():
+            for field, value in counters.items():
+                total[field] += value
+        return {'methods': methods, 'total': total, 'cache_entries': cache_entries}
@@ -11,6 +11,8 @@ from ..utils.time_utils import (
     get_date_days_ago, format_timestamp
 )
 from ..database.db_manager import DatabaseManager
+from .symbol_master import get_symbol_master
+from ..utils.tracing import traced
 import datetime
 import logging
 import sys
@@ -205,6 +207,7 @@ class StockData:
             
         logger.info("모든 주식 데이터 업데이트 및 DB 저장 완료")
     
+    @traced('stock_data.get_historical_data', 'market_data')
     def get_historical_data(self, symbol, market="KR", days=90, period=None, interval=None):
         """
         기존 주식 데이터 반환 또는 신규 수집
@@ -367,6 +370,7 @@ class StockData:
             
         return None
     
+    @traced('stock_data.get_current_price', 'market_data')
     def get_current_price(self, symbol, market="KR"):
         """
         현재 주식 가격 조회
@@ -420,6 +424,12 @@ class StockData:
             dict: 종목 정보
         """
         try:
+            # 종목 마스터 인덱스에 있으면 네트워크 조회 없이 반환
+            symbol_master = get_symbol_master(self.config)
+            known = symbol_master.get(symbol, market)
+            if known is not None:
+                return known.to_dict()
+            
             # 기본 정보 구성
             info = {'symbol': symbol, 'market': market}
             
@@ -466,6 +476,10 @@ class StockData:
             # 종목명 설정
             info['name'] = name
             
+            # 종목명을 찾은 경우 다음 조회부터 인덱스에서 반환
+            if name != symbol:
+                symbol_master.put(symbol, name, market, info.get('sector', ''), info.get('industry', ''))
+            
             return info
             
         except Exception as e:
@@ -0,0 +1,236 @@
+"""
+종목 마스터 인덱스 모듈
+
+KakaoSender, RealtimeTrader, AutoTrader, StockData가 종목명/섹터/업종을 찾을 때마다
+config.KR_STOCK_INFO/US_STOCK_INFO 리스트를 순회하거나 증권사/pykrx/yfinance를 호출하던 것을
+프로세스 안의 해시 인덱스 하나로 모읍니다.
+
+- kr_stock_info/us_stock_info 테이블과 설정의 종목 리스트를 한 번 읽어 {(시장, 코드): SymbolInfo},
+  {코드: SymbolInfo}, {종목명: SymbolInfo} 딕셔너리로 보관하므로 조회는 I/O 없이 O(1)입니다.
+- refresh()는 테이블의 updated_at이 마지막으로 읽은 값보다 큰 행만 다시 읽어 반영합니다.
+- 네트워크 조회로 알게 된 종목은 put()으로 추가해 다음 조회부터 인덱스에서 바로 찾습니다.
+
+조회는 잠금 없이 딕셔너리를 읽고, 갱신만 잠금 안에서 새 항목을 넣습니다.
+"""
+import logging
+import threading
+
+# 로거 설정
+logger = logging.getLogger('SymbolMaster')
+
+# 설정 모듈의 시장별 종목 리스트 속성
+CONFIG_LISTS = {"KR": "KR_STOCK_INFO", "US": "US_STOCK_INFO"}
+
+
+class SymbolInfo:
+    """종목 기본 정보 한 건"""
+
+    __slots__ = ("code", "name", "market", "sector", "industry")
+
+    def __init__(self, code, name, market="KR", sector="", industry=""):
+        self.code = code
+        self.name = name or code
+        self.market = market
+        self.sector = sector or ""
+        self.industry = industry or ""
+
+    def to_dict(self):
+        """get_stock_info()와 같은 형식의 딕셔너리"""
+        info = {'symbol': self.code, 'name': self.name, 'market': self.market}
+        if self.sector:
+            info['sector'] = self.sector
+        if self.industry:
+            info['industry'] = self.industry
+        return info
+
+    def __repr__(self):
+        return f"SymbolInfo({self.market}:{self.code} {self.name})"
+
+
+class SymbolMaster:
+    """프로세스 전역 종목 마스터 인덱스"""
+
+    def __init__(self, config=None, db_manager=None):
+        """
+        Args:
+            config: 설정 모듈 (KR_STOCK_INFO/US_STOCK_INFO 리스트)
+            db_manager: DatabaseManager (None이면 테이블을 읽지 않음)
+        """
+        self.config = config
+        self.db_manager = db_manager
+
+        self._lock = threading.Lock()
+        self._entries = {}  # {(시장, 코드): SymbolInfo}
+        self._by_code = {}  # {코드: SymbolInfo} - 시장을 모르는 조회용 (먼저 등록된 시장 우선)
+        self._by_name = {}  # {소문자 종목명: SymbolInfo}
+        self._watermarks = {}  # {시장: 마지막으로 읽은 updated_at}
+        self.stats = {'loads': 0, 'refreshed_rows': 0, 'hits': 0, 'misses': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, symbol):
+        return symbol in self._by_code
+
+    # ------------------------------------------------------------------
+    # 조회 (I/O 없음)
+    # ------------------------------------------------------------------
+    def get(self, symbol, market=None):
+        """종목 정보 (없으면 None)"""
+        if market:
+            info = self._entries.get((market, symbol))
+        else:
+            info = self._by_code.get(symbol)
+        self.stats['hits' if info is not None else 'misses'] += 1
+        return info
+
+    def name(self, symbol, market=None, default=None):
+        """종목명 (없으면 default, default도 없으면 종목 코드)"""
+        info = self.get(symbol, market)
+        if info is not None:
+            return info.name
+        return default if default is not None else symbol
+
+    def sector(self, symbol, market=None, default=""):
+        info = self.get(symbol, market)
+        return info.sector if info is not None and info.sector else default
+
+    def industry(self, symbol, market=None, default=""):
+        info = self.get(symbol, market)
+        return info.industry if info is not None and info.industry else default
+
+    def market(self, symbol, default=None):
+        """종목이 속한 시장 코드"""
+        info = self.get(symbol)
+        return info.market if info is not None else default
+
+    def find_by_name(self, name):
+        """종목명으로 종목 정보 조회 (대소문자 무시)"""
+        return self._by_name.get(str(name).strip().casefold())
+
+    def symbols(self, market=None):
+        """등록된 종목 코드 목록"""
+        return [code for (entry_market, code) in list(self._entries) if market is None or entry_market == market]
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def put(self, code, name, market="KR", sector="", industry=""):
+        """
+        종목 한 건 추가/갱신 (비어 있는 섹터/업종은 기존 값 유지)
+
+        Returns:
+            SymbolInfo: 등록된 항목
+        """
+        if not code:
+            return None
+        with self._lock:
+            return self._put(code, name, market, sector, industry)
+
+    def _put(self, code, name, market, sector, industry):
+        old = self._entries.get((market, code))
+        if old is not None:
+            sector = sector or old.sector
+            industry = industry or old.industry
+            name = name if name and name != code else old.name
+        info = SymbolInfo(code, name, market, sector, industry)
+        self._entries[(market, code)] = info
+
+        current = self._by_code.get(code)
+        if current is None or current.market == market:
+            self._by_code[code] = info
+        if old is not None and old.name != info.name:
+            self._by_name.pop(old.name.casefold(), None)
+        if info.name and info.name != code:
+            self._by_name[info.name.casefold()] = info
+        return info
+
+    def update(self, stocks, market="KR"):
+        """
+        종목 리스트 일괄 반영 ([{'code', 'name', 'sector', 'industry'}, ...])
+
+        Returns:
+            int: 반영한 종목 수
+        """
+        count = 0
+        with self._lock:
+            for stock in stocks or []:
+                if not isinstance(stock, dict) or not stock.get('code'):
+                    continue
+                self._put(stock['code'], stock.get('name'), market,
+                          stock.get('sector', ''), stock.get('industry', ''))
+                count += 1
+        return count
+
+    def load(self):
+        """
+        설정의 종목 리스트와 종목 정보 테이블 전체 읽기
+
+        Returns:
+            int: 인덱스 종목 수
+        """
+        for market, attr in CONFIG_LISTS.items():
+            self.update(getattr(self.config, attr, None), market)
+        self._watermarks.clear()
+        self.refresh()
+        self.stats['loads'] += 1
+        logger.info(f"종목 마스터 인덱스 로드 완료: {len(self)}개 종목")
+        return len(self)
+
+    def refresh(self):
+        """
+        종목 정보 테이블에서 마지막 조회 이후 updated_at이 바뀐 행만 반영
+
+        Returns:
+            int: 반영한 행 수
+        """
+        if self.db_manager is None or not hasattr(self.db_manager, 'get_stock_info_updates'):
+            return 0
+        refreshed = 0
+        for market in CONFIG_LISTS:
+            rows, watermark = self.db_manager.get_stock_info_updates(market, self._watermarks.get(market))
+            if rows:
+                refreshed += self.update(rows, market)
+            if watermark is not None:
+                self._watermarks[market] = watermark
+        if refreshed:
+            self.stats['refreshed_rows'] += refreshed
+            logger.debug(f"종목 마스터 인덱스 증분 갱신: {refreshed}개 행")
+        return refreshed
+
+
+# 프로세스 전역 인덱스
+_master = None
+_master_lock = threading.Lock()
+
+
+def get_symbol_master(config=None):
+    """
+    프로세스 전역 종목 마스터 인덱스 반환 (처음 호출할 때 설정과 DB에서 한 번 로드)
+
+    Args:
+        config: 설정 모듈 (처음 호출할 때만 사용)
+    """
+    global _master
+    if _master is not None:
+        if _master.config is None and config is not None:
+            # 설정 없이 먼저 만들어진 경우 설정의 종목 리스트를 뒤늦게 반영
+            _master.config = config
+            for market, attr in CONFIG_LISTS.items():
+                _master.update(getattr(config, attr, None), market)
+        return _master
+    with _master_lock:
+        if _master is None:
+            try:
+                from ..database.db_manager import DatabaseManager
+                db_manager = DatabaseManager.get_instance(config)
+            except Exception as e:
+                logger.warning(f"종목 정보 DB를 사용할 수 없어 설정의 종목 리스트만 사용합니다: {e}")
+                db_manager = None
+            master = SymbolMaster(config, db_manager)
+            try:
+                master.load()
+            except Exception as e:
+                logger.error(f"종목 마스터 인덱스 로드 실패: {e}")
+            _master = master
+        return _master
@@ -11,6 +11,9 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from threading import Lock
 
+from ..utils.metrics import timed
+from ..utils.tracing import traced
+
 class DatabaseManager:
     _instance = None
     _lock = Lock()
@@ -407,6 +410,8 @@ class DatabaseManager:
         else:
             raise ValueError(f"지원하지 않는 데이터베이스 타입: {self.db_type}")
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'record_trade'})
+    @traced('db.record_trade', 'db')
     def record_trade(self, symbol, market, action, price, quantity, amount, trade_type="market", 
                     strategy="gpt", confidence=None, order_id=None, status="executed", broker="KIS"):
         """거래 내역 기록"""
@@ -510,6 +515,8 @@ class DatabaseManager:
         except Exception as e:
             self.logger.error(f"포트폴리오 업데이트 오류: {e}")
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'update_portfolio'})
+    @traced('db.update_portfolio', 'db')
     def update_portfolio(self, symbol, market, quantity, avg_price, current_price):
         """포트폴리오 정보 업데이트"""
         if not self.use_db:
@@ -558,6 +565,8 @@ class DatabaseManager:
             self.logger.error(f"포트폴리오 업데이트 오류: {e}")
             return False
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'save_gpt_recommendations'})
+    @traced('db.save_gpt_recommendations', 'db')
     def save_gpt_recommendations(self, market, strategy, symbols, rationale, model="gpt-4o"):
         """GPT 종목 추천 저장"""
         if not self.use_db:
@@ -595,6 +604,8 @@ class DatabaseManager:
             self.logger.error(f"GPT 추천 저장 오류: {e}")
             return False
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'log_system_event'})
+    @traced('db.log_system_event', 'db')
     def log_system_event(self, event_type, description, details=None):
         """시스템 이벤트 로깅"""
         if not self.use_db:
@@ -630,6 +641,8 @@ class DatabaseManager:
             self.logger.error(f"시스템 이벤트 로깅 오류: {e}")
             return False
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'cache_price_data'})
+    @traced('db.cache_price_data', 'db')
     def cache_price_data(self, symbol, market, date, open_price, high_price, low_price, close_price, volume):
         """주가 데이터 캐싱"""
         if not self.use_db:
@@ -669,6 +682,7 @@ class DatabaseManager:
             self.logger.error(f"주가 데이터 캐싱 오류: {e}")
             return False
     
+    @traced('db.get_cached_price_data', 'db')
     def get_cached_price_data(self, symbol, market, start_date=None, end_date=None):
         """캐시된 주가 데이터 조회"""
         if not self.use_db:
@@ -701,7 +715,47 @@ class DatabaseManager:
         except Exception as e:
             self.logger.error(f"캐시된 주가 데이터 조회 오류: {e}")
             return None
-    
+
+    @traced('db.get_cached_price_data_bulk', 'db')
+    def get_cached_price_data_bulk(self, market, symbols=None, start_date=None, end_date=None):
+        """여러 종목의 캐시된 주가 데이터를 한 번의 쿼리로 조회 (백테스트용)"""
+        if not self.use_db:
+            return None
+
+        try:
+            conn = self._get_connection()
+
+            query = ("SELECT symbol, date, open_price, high_price, low_price, close_price, volume "
+                     "FROM price_cache WHERE market = ?")
+            params = [market]
+
+            if symbols:
+                query += f" AND symbol IN ({', '.join('?' for _ in symbols)})"
+                params.extend(symbols)
+
+            if start_date:
+                query += " AND date >= ?"
+                params.append(start_date)
+
+            if end_date:
+                query += " AND date <= ?"
+                params.append(end_date)
+
+            query += " ORDER BY date, symbol"
+
+            # MySQL 파라미터 형식으로 변환
+            if self.db_type == 'mysql':
+                query = query.replace('?', '%s')
+
+            df = pd.read_sql_query(query, conn, params=params)
+            conn.close()
+
+            return df
+        except Exception as e:
+            self.logger.error(f"캐시된 주가 데이터 일괄 조회 오류: {e}")
+            return None
+
+    @traced('db.get_trade_history', 'db')
     def get_trade_history(self, symbol=None, market=None, start_date=None, end_date=None, limit=100):
         """거래 이력 조회"""
         if not self.use_db:
@@ -746,6 +800,7 @@ class DatabaseManager:
             self.logger.error(f"거래 이력 조회 오류: {e}")
             return pd.DataFrame()
     
+    @traced('db.get_portfolio', 'db')
     def get_portfolio(self):
         """현재 포트폴리오 조회"""
         if not self.use_db:
@@ -841,6 +896,8 @@ class DatabaseManager:
             self.logger.error(f"시스템 이벤트 로그 조회 오류: {e}")
             return pd.DataFrame()
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'save_trade_performance'})
+    @traced('db.save_trade_performance', 'db')
     def save_trade_performance(self, symbol, market, strategy, start_date, end_date, performance_data):
         """거래 성능 분석 결과 저장"""
         if not self.use_db:
@@ -1050,6 +1107,8 @@ class DatabaseManager:
             self.logger.error(f"전략별 성과 분석 오류: {e}")
             return None
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'save_kr_stock_info'})
+    @traced('db.save_kr_stock_info', 'db')
     def save_kr_stock_info(self, stock_info_list):
         """한국 주식 종목 정보 저장/업데이트"""
         if not self.use_db:
@@ -1141,6 +1200,52 @@ class DatabaseManager:
             self.logger.error(f"한국 주식 종목 정보 조회 오류: {e}")
             return []
     
+    def get_stock_info_updates(self, market="KR", since=None):
+        """
+        종목 정보 증분 조회 (updated_at이 since보다 큰 행만)
+        
+        Args:
+            market: 시장 구분 ('KR' 또는 'US')
+            since: 마지막으로 읽은 updated_at (None이면 전체)
+            
+        Returns:
+            tuple: (종목 정보 딕셔너리 리스트, 이번에 읽은 최대 updated_at - 행이 없으면 since)
+        """
+        if not self.use_db:
+            return [], since
+        
+        table = "us_stock_info" if market == "US" else "kr_stock_info"
+        placeholder = "?" if self.db_type == 'sqlite' else "%s"
+        query = f"SELECT code, name, sector, industry, updated_at FROM {table}"
+        params = ()
+        if since is not None:
+            query += f" WHERE updated_at > {placeholder}"
+            params = (since,)
+        
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            conn.close()
+        except Exception as e:
+            # us_stock_info 테이블이 아직 없는 경우 등
+            self.logger.debug(f"{market} 종목 정보 증분 조회 실패: {e}")
+            return [], since
+        
+        watermark = since
+        stock_info_list = []
+        for row in rows:
+            stock_info_list.append({
+                'code': row[0],
+                'name': row[1],
+                'sector': row[2] if row[2] else '',
+                'industry': row[3] if row[3] else ''
+            })
+            if row[4] is not None and (watermark is None or row[4] > watermark):
+                watermark = row[4]
+        return stock_info_list, watermark
+    
     def init_kr_stock_info(self):
         """한국 주식 종목 정보 초기화 (없는 경우에만 기본 데이터 삽입)"""
         if not self.use_db:
@@ -1208,6 +1313,8 @@ class DatabaseManager:
             self.logger.error(f"한국 주식 종목 정보 초기화 오류: {e}")
             return False
     
+    @timed('db_write_seconds', 'DatabaseManager 쓰기 소요 시간', labels={'operation': 'save_us_stock_info'})
+    @traced('db.save_us_stock_info', 'db')
     def save_us_stock_info(self, stock_info_list):
         """미국 주식 종목 정보 저장/업데이트"""
         if not self.use_db:
@@ -0,0 +1,324 @@
+"""
+비동기 알림 발송 모듈
+
+트레이딩 루프와 main.py 리포트가 KakaoSender/TelegramSender를 직접 호출하면 HTTP 응답과
+분할 메시지 사이의 time.sleep까지 호출 스레드가 기다려야 했습니다. NotificationDispatcher는
+백그라운드 스레드 하나에서 계속 실행되는 asyncio 이벤트 루프로 메시지를 대신 보냅니다.
+
+- 채널(kakao, telegram)마다 우선순위 큐와 최소 전송 간격을 두어 증권사 알림 폭주에도
+  카카오/텔레그램 전송 제한을 지킵니다.
+- 우선순위: CRITICAL(손절/오류) > TRADE(체결) > SIGNAL(신호) > REPORT(리포트/상태).
+  손절 알림은 쌓여 있는 리포트보다 먼저 나갑니다.
+- SIGNAL 메시지는 NOTIFY_DIGEST_SECONDS 동안 모아 한 메시지로 합쳐 보냅니다.
+- 분할 메시지는 부분 목록을 큐 항목 하나로 넣어 묶음에 섞이지 않고 순서대로 이어서 보냅니다.
+- submit()은 큐에 넣고 바로 반환하므로 트레이딩 스레드는 전송을 기다리지 않습니다.
+"""
+import asyncio
+import inspect
+import itertools
+import logging
+import threading
+import time
+
+# 로거 설정
+logger = logging.getLogger('NotificationDispatcher')
+
+# 우선순위 (작을수록 먼저 전송)
+CRITICAL = 0
+TRADE = 1
+SIGNAL = 2
+REPORT = 3
+
+PRIORITY_NAMES = {CRITICAL: "critical", TRADE: "trade", SIGNAL: "signal", REPORT: "report"}
+
+# 메시지 첫 줄 키워드로 우선순위 추정 (호출부가 우선순위를 주지 않은 경우)
+CRITICAL_KEYWORDS = ("손절", "⚠️", "오류", "실패", "🛑", "긴급")
+TRADE_KEYWORDS = ("완료", "체결", "주문")
+SIGNAL_KEYWORDS = ("신호", "시그널", "급등", "감지", "시뮬레이션")
+
+
+def classify(message):
+    """
+    메시지 앞부분으로 우선순위 추정
+
+    Returns:
+        int: CRITICAL/TRADE/SIGNAL/REPORT
+    """
+    head = str(message).lstrip()[:80]
+    if any(keyword in head for keyword in CRITICAL_KEYWORDS):
+        return CRITICAL
+    if any(keyword in head for keyword in TRADE_KEYWORDS):
+        return TRADE
+    if any(keyword in head for keyword in SIGNAL_KEYWORDS):
+        return SIGNAL
+    return REPORT
+
+
+class _Channel:
+    """전송 채널 (우선순위 큐, 전송 간격, 신호 묶음 버퍼)"""
+
+    def __init__(self, name, deliver, min_interval, digest_max_chars):
+        self.name = name
+        self.deliver = deliver
+        self.is_async = inspect.iscoroutinefunction(deliver)
+        self.min_interval = min_interval
+        self.digest_max_chars = digest_max_chars
+        self.queue = None  # 이벤트 루프에서 생성
+        self.worker = None
+        self.digest = []  # 묶음 대기 중인 SIGNAL 메시지
+        self.digest_handle = None
+        self.next_send = 0.0
+        self.stats = {'queued': 0, 'sent': 0, 'failed': 0, 'dropped': 0, 'digests': 0, 'digested': 0}
+
+
+class NotificationDispatcher:
+    """채널별 우선순위 큐와 전송 간격을 가진 백그라운드 알림 발송기"""
+
+    def __init__(self, config=None):
+        """
+        Args:
+            config: 설정 모듈
+        """
+        self.config = config
+        self.digest_seconds = float(getattr(config, 'NOTIFY_DIGEST_SECONDS', 5))
+        self.queue_max = getattr(config, 'NOTIFY_QUEUE_MAX', 1000)
+
+        self._lock = threading.Lock()
+        self._channels = {}  # {채널 이름: _Channel}
+        self._seq = itertools.count()  # 같은 우선순위 안에서 들어온 순서 유지
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    # ------------------------------------------------------------------
+    # 호출 스레드 API
+    # ------------------------------------------------------------------
+    def register(self, name, deliver, min_interval=0.5, digest_max_chars=1800):
+        """
+        전송 채널 등록
+
+        Args:
+            name: 채널 이름 (같은 이름이면 대기 중인 메시지는 유지하고 전송 함수만 교체)
+            deliver: 메시지 한 건 전송 함수 (text) -> bool, 코루틴 함수면 이벤트 루프에서 직접 실행
+            min_interval: 연속 전송 최소 간격 (초)
+            digest_max_chars: 신호 묶음 메시지 최대 길이
+        """
+        with self._lock:
+            channel = self._channels.get(name)
+            if channel is not None:
+                # 같은 채널을 다시 등록하면 큐는 유지하고 전송 함수만 교체
+                channel.deliver = deliver
+                channel.is_async = inspect.iscoroutinefunction(deliver)
+                channel.min_interval = min_interval
+                channel.digest_max_chars = digest_max_chars
+                return channel
+            channel = self._channels[name] = _Channel(name, deliver, min_interval, digest_max_chars)
+        self._call_soon(self._start_channel, channel)
+        return channel
+
+    def submit(self, channel, message, priority=None):
+        """
+        메시지 전송 예약 (바로 반환)
+
+        Args:
+            channel: 채널 이름
+            message: 메시지 텍스트 또는 분할 메시지 부분 목록 (목록은 묶음 없이 순서대로 이어서 전송)
+            priority: CRITICAL/TRADE/SIGNAL/REPORT (None이면 메시지 내용으로 추정, 목록은 첫 부분 기준)
+
+        Returns:
+            bool: 큐에 넣었으면 True
+        """
+        if channel not in self._channels or not message:
+            return False
+        if isinstance(message, (list, tuple)):
+            message = tuple(message) if len(message) > 1 else message[0]
+        if priority is None:
+            priority = classify(message[0] if isinstance(message, tuple) else message)
+        self.start()
+        self._call_soon(self._enqueue, self._channels[channel], priority, message)
+        return True
+
+    def start(self):
+        """이벤트 루프 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="NotificationDispatcher", daemon=True)
+            self._thread.start()
+        self._ready.wait(5)
+        return True
+
+    def flush(self, timeout=30):
+        """
+        묶음 대기 중인 신호를 바로 내보내고 모든 큐가 빌 때까지 대기
+
+        Returns:
+            bool: 시간 안에 모두 전송했으면 True
+        """
+        if self._loop is None or not self._loop.is_running():
+            return True
+        future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            logger.warning(f"알림 큐를 {timeout}초 안에 비우지 못했습니다.")
+            return False
+
+    def stop(self, timeout=10):
+        """남은 메시지를 보내고(최대 timeout초) 이벤트 루프 종료"""
+        self.flush(timeout)
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def stats(self):
+        """채널별 예약/전송/실패/버림/묶음 수와 대기 메시지 수"""
+        with self._lock:
+            channels = list(self._channels.values())
+        return {
+            channel.name: dict(channel.stats, pending=channel.queue.qsize() if channel.queue is not None else 0)
+            for channel in channels
+        }
+
+    # ------------------------------------------------------------------
+    # 이벤트 루프
+    # ------------------------------------------------------------------
+    def _call_soon(self, callback, *args):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(callback, *args)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            self._start_channel(channel)
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            with self._lock:
+                channels = list(self._channels.values())
+            for channel in channels:
+                if channel.worker is not None:
+                    channel.worker.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+            self._loop = None
+            logger.info("알림 발송 이벤트 루프 종료")
+
+    def _start_channel(self, channel):
+        if channel.queue is None:
+            channel.queue = asyncio.PriorityQueue(maxsize=self.queue_max)
+            channel.worker = self._loop.create_task(self._worker(channel))
+
+    def _enqueue(self, channel, priority, message):
+        if channel.queue is None:
+            self._start_channel(channel)
+        if priority == SIGNAL and self.digest_seconds > 0 and not isinstance(message, tuple):
+            channel.digest.append(message)
+            if channel.digest_handle is None:
+                channel.digest_handle = self._loop.call_later(self.digest_seconds, self._flush_digest, channel)
+            return
+        self._put(channel, priority, message)
+
+    def _put(self, channel, priority, message, count=1):
+        try:
+            channel.queue.put_nowait((priority, next(self._seq), message, count))
+            channel.stats['queued'] += count
+        except asyncio.QueueFull:
+            channel.stats['dropped'] += count
+            logger.warning(f"{channel.name} 알림 큐가 가득 차 {PRIORITY_NAMES[priority]} 메시지를 버립니다.")
+
+    def _flush_digest(self, channel):
+        """모인 신호 메시지를 최대 길이 안에서 하나로 합쳐 큐에 넣음"""
+        channel.digest_handle = None
+        messages, channel.digest = channel.digest, []
+        if not messages:
+            return
+        if len(messages) == 1:
+            self._put(channel, SIGNAL, messages[0])
+            return
+
+        separator = "\n\n────────\n\n"
+        batches, batch, length = [], [], 0
+        for message in messages:
+            extra = len(message) + (len(separator) if batch else 0)
+            if batch and length + extra > channel.digest_max_chars:
+                batches.append(batch)
+                batch, length = [], 0
+                extra = len(message)
+            batch.append(message)
+            length += extra
+        batches.append(batch)
+
+        for batch in batches:
+            text = batch[0] if len(batch) == 1 else f"🔔 신호 {len(batch)}건 묶음\n\n" + separator.join(batch)
+            self._put(channel, SIGNAL, text, count=len(batch))
+            channel.stats['digests'] += 1
+            channel.stats['digested'] += len(batch)
+
+    async def _worker(self, channel):
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, _, message, count = await channel.queue.get()
+            try:
+                ok = True
+                # 분할 메시지는 다른 메시지가 끼어들지 않도록 부분을 이어서 전송
+                for part in message if isinstance(message, tuple) else (message,):
+                    wait = channel.next_send - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    if channel.is_async:
+                        sent = await channel.deliver(part)
+                    else:
+                        sent = await loop.run_in_executor(None, channel.deliver, part)
+                    ok = ok and sent is not False
+                    channel.next_send = time.monotonic() + channel.min_interval
+                channel.stats['sent' if ok else 'failed'] += count
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                channel.stats['failed'] += count
+                logger.error(f"{channel.name} 알림 전송 중 오류: {e}")
+            finally:
+                channel.next_send = time.monotonic() + channel.min_interval
+                channel.queue.task_done()
+
+    async def _drain(self):
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            if channel.digest_handle is not None:
+                channel.digest_handle.cancel()
+                self._flush_digest(channel)
+        for channel in channels:
+            if channel.queue is not None:
+                await channel.queue.join()
+
+
+# 프로세스 전역 발송기
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_notification_dispatcher(config=None):
+    """
+    프로세스 전역 알림 발송기 반환 (카카오/텔레그램 전송 객체가 같은 이벤트 루프 사용)
+
+    Args:
+        config: 설정 모듈 (처음 호출할 때만 사용)
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher(config)
+        return _dispatcher
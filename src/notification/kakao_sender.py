@@ -7,14 +7,34 @@ import os
 import json
 import time
 import re
+import tempfile
 from datetime import timedelta, datetime
 
 # time_utils 모듈 import
 from ..utils.time_utils import get_current_time, get_current_time_str, parse_time, get_adjusted_time
+from ..data.symbol_master import get_symbol_master
+from .dispatcher import get_notification_dispatcher, classify
+from ..utils.token_cache import get_token_cache
+from ..utils.time_utils import KST
 
 # 로깅 설정
 logger = logging.getLogger('KakaoSender')
 
+# 토큰 상태
+TOKEN_MISSING = "missing"  # 토큰 없음
+TOKEN_UNKNOWN = "unknown"  # 만료 시각을 모름 (환경 변수/예전 형식 파일의 토큰)
+TOKEN_VALID = "valid"  # 유효
+TOKEN_EXPIRING = "expiring"  # 만료 임박 (백그라운드 갱신 대상)
+TOKEN_EXPIRED = "expired"  # 만료
+
+
+def kakao_token_path(config=None):
+    """프로세스 간 공유 카카오톡 토큰 파일 경로 (CI에서는 저장소 밖 임시 디렉토리)"""
+    if os.environ.get('CI') == 'true':
+        return os.path.join(tempfile.gettempdir(), 'kakao_token.json')
+    default = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'kakao_token.json')
+    return getattr(config, 'KAKAO_TOKEN_FILE', None) or default
+
 class KakaoSender:
     """카카오톡 메시지 전송 클래스"""
     
@@ -31,119 +51,95 @@ class KakaoSender:
         self.token_expire_at = None
         self.initialized = False
         
-        # 토큰 갱신 요청 제한을 위한 변수 추가
-        self.last_token_refresh_attempt = None
-        self.token_refresh_cooldown = 3600  # 1시간 (초 단위)
-        
         # CI 환경인지 확인
         self.is_ci_env = os.environ.get('CI') == 'true'
         
+        # 프로세스 간 공유 토큰 캐시 (만료 시각 기준으로 유효성 판단, 만료 전 백그라운드 갱신)
+        self.token_cache = get_token_cache(
+            kakao_token_path(config), self._issue_token,
+            refresh_margin=getattr(config, 'KAKAO_TOKEN_REFRESH_MARGIN_SECONDS', 600),
+            min_issue_interval=getattr(config, 'KAKAO_TOKEN_MIN_REFRESH_SECONDS', 60),
+            issue_with_previous=True
+        )
+        
+        # 백그라운드 알림 발송기 (호출 스레드는 전송을 기다리지 않음)
+        self.dispatcher = None
+        if getattr(config, 'NOTIFY_ASYNC', True):
+            self.dispatcher = get_notification_dispatcher(config)
+            self.dispatcher.register("kakao", self._deliver_message,
+                                     min_interval=getattr(config, 'NOTIFY_KAKAO_MIN_INTERVAL', 0.5),
+                                     digest_max_chars=1800)
+        
         # 시스템 시작시 토큰 초기화
         self.initialize()
         
     def initialize(self):
-        """카카오톡 API 초기화"""
+        """
+        카카오톡 API 초기화 (공유 토큰 파일 우선, 토큰 확인용 HTTP 요청 없음)
+        
+        Returns:
+            bool: 사용할 수 있는 토큰이 있으면 True
+        """
         try:
             # CI 환경이고, KAKAO_API_KEY가 없으면 비활성화 모드로 설정
             if self.is_ci_env and not os.environ.get('KAKAO_API_KEY'):
                 logger.warning("CI 환경에서 KAKAO_API_KEY가 설정되지 않아 카카오톡 알림은 비활성화됩니다.")
                 return False
             
-            # 환경 변수 우선 확인 (CI/CD 환경용)
-            self.access_token = os.environ.get('KAKAO_ACCESS_TOKEN')
-            self.refresh_token = os.environ.get('KAKAO_REFRESH_TOKEN')
+            # 환경 변수/설정의 토큰은 공유 토큰 파일이 비어 있을 때만 초기값으로 사용
+            access_token = os.environ.get('KAKAO_ACCESS_TOKEN') or getattr(self.config, 'KAKAO_ACCESS_TOKEN', None)
+            refresh_token = os.environ.get('KAKAO_REFRESH_TOKEN') or getattr(self.config, 'KAKAO_REFRESH_TOKEN', None)
+            self._apply_token(self.token_cache.seed(access_token, refresh_token=refresh_token))
             
-            # 환경변수에 없으면 파일에서 토큰 로드
-            if not self.access_token or not self.refresh_token:
-                token_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'kakao_token.json')
-                if os.path.exists(token_file):
-                    try:
-                        with open(token_file, 'r') as f:
-                            token_data = json.load(f)
-                            self.access_token = token_data.get('access_token')
-                            self.refresh_token = token_data.get('refresh_token')
-                            self.token_expire_at = token_data.get('expire_at')
-                            logger.info("카카오톡 토큰 파일에서 로드 완료")
-                    except Exception as e:
-                        logger.error(f"카카오톡 토큰 파일 로드 실패: {e}")
-            
-            # 환경 변수에서 토큰 로드 (파일에서 로드 실패시)
-            if not self.access_token and hasattr(self.config, 'KAKAO_ACCESS_TOKEN'):
-                self.access_token = self.config.KAKAO_ACCESS_TOKEN
-            if not self.refresh_token and hasattr(self.config, 'KAKAO_REFRESH_TOKEN'):
-                self.refresh_token = self.config.KAKAO_REFRESH_TOKEN
-            
-            if not self.access_token or not self.refresh_token:
+            if not self.access_token and not self.refresh_token:
                 if self.is_ci_env:
                     logger.warning("CI 환경에서 카카오톡 토큰이 설정되지 않아 알림은 비활성화됩니다.")
-                    return False
                 else:
                     logger.error("카카오톡 토큰이 설정되지 않았습니다.")
-                    return False
-            
-            # 토큰의 만료 시간 확인
-            if self.token_expire_at:
-                try:
-                    expire_time = parse_time(self.token_expire_at)
-                    current_time = get_current_time()
-                    # 만료된 경우에만 갱신 요청
-                    if current_time >= expire_time:
-                        logger.info("카카오톡 토큰이 만료되었습니다. 갱신을 시도합니다.")
-                        if not self._can_refresh_token():
-                            logger.warning("토큰 갱신 요청 제한 시간(1시간) 내에 있습니다. 토큰 갱신을 건너뜁니다.")
-                        elif not self.refresh_auth_token():
-                            logger.error("토큰 갱신 실패")
-                            return False
-                except Exception as e:
-                    logger.error(f"토큰 만료 시간 확인 중 오류: {e}")
+                return False
             
-            # 토큰 유효성 테스트 (테스트는 반드시 한 번만 실행)
-            token_valid = self.test_token()
-            if token_valid:
-                logger.info("카카오톡 API 초기화 완료")
-                self.initialized = True
-                return True
-            else:
-                # 토큰 테스트 실패 시 갱신 시도 (제한 시간 검사 후)
-                logger.warning("카카오톡 API 토큰이 유효하지 않습니다. 갱신을 시도합니다.")
-                if not self._can_refresh_token():
-                    logger.warning("토큰 갱신 요청 제한 시간(1시간) 내에 있습니다. 갱신을 건너뜁니다.")
-                    return False
-                elif self.refresh_auth_token():
-                    logger.info("카카오톡 API 토큰 갱신 성공")
-                    self.initialized = True
-                    return True
-                else:
-                    if self.is_ci_env:
-                        logger.warning("CI 환경에서 토큰 갱신 실패. 카카오톡 알림은 비활성화됩니다.")
-                    else:
-                        logger.error("카카오톡 API 토큰 갱신 실패")
-                    return False
+            # 만료 시각을 모르거나 만료가 가까운 토큰만 갱신 (다른 프로세스가 갱신했으면 파일의 토큰 사용)
+            self.initialized = self.ensure_token_valid()
+            if self.initialized:
+                self.token_cache.start_refresh()
+                logger.info(f"카카오톡 API 초기화 완료 (토큰 상태: {self.token_state()})")
+            return self.initialized
         except Exception as e:
             logger.error(f"카카오톡 API 초기화 실패: {e}")
             return False
     
-    def _can_refresh_token(self):
+    def _apply_token(self, token):
+        """공유 토큰 기록을 인스턴스 속성에 반영"""
+        if not token:
+            return
+        self.access_token = token.get('access_token') or self.access_token
+        self.refresh_token = token.get('refresh_token') or self.refresh_token
+        expires_at = token.get('expires_at') or 0
+        self.token_expire_at = datetime.fromtimestamp(expires_at, KST).isoformat() if expires_at else None
+    
+    def token_state(self):
         """
-        토큰 갱신 요청이 가능한지 검사 (rate limit 방지)
+        만료 시각 기준 토큰 상태 (HTTP 요청 없음)
         
         Returns:
-            bool: 갱신 요청 가능 여부
+            str: TOKEN_MISSING/TOKEN_UNKNOWN/TOKEN_VALID/TOKEN_EXPIRING/TOKEN_EXPIRED
         """
-        # 최근 갱신 요청 시간이 없으면 가능
-        if self.last_token_refresh_attempt is None:
-            return True
-            
-        # 현재 시간과 최근 갱신 요청 시간의 차이 계산
-        current_time = time.time()
-        time_diff = current_time - self.last_token_refresh_attempt
-        
-        # 제한 시간(cooldown) 이후면 가능
-        return time_diff >= self.token_refresh_cooldown
+        token = self.token_cache.peek()
+        if not token or not token.get('access_token'):
+            return TOKEN_MISSING
+        expires_at = token.get('expires_at') or 0
+        if not expires_at:
+            return TOKEN_UNKNOWN
+        remaining = expires_at - get_current_time().timestamp()
+        if remaining <= 0:
+            return TOKEN_EXPIRED
+        if remaining <= self.token_cache.refresh_margin:
+            return TOKEN_EXPIRING
+        return TOKEN_VALID
     
     def test_token(self):
         """
-        액세스 토큰 유효성 테스트
+        액세스 토큰 유효성 테스트 (진단용, 메시지 전송 경로에서는 호출하지 않음)
         
         Returns:
             bool: 토큰 유효 여부
@@ -164,135 +160,146 @@ class KakaoSender:
             logger.error(f"토큰 테스트 실패: {e}")
             return False
     
-    def save_tokens_to_file(self):
-        """토큰을 파일에 저장"""
+    def _export_tokens_to_github_env(self, access_token, refresh_token):
+        """GitHub Actions에서 실행 중이면 다음 단계가 쓸 수 있도록 환경 변수 파일에 토큰 기록"""
+        if 'GITHUB_ENV' not in os.environ:
+            return
         try:
-            # CI 환경에서는 파일 저장 건너뛰기
-            if self.is_ci_env:
-                logger.info("CI 환경에서는 토큰 파일을 저장하지 않습니다.")
-                return True
-                
-            token_data = {
-                "access_token": self.access_token,
-                "refresh_token": self.refresh_token,
-                "expire_at": get_adjusted_time(adjust_days=29).isoformat(),  # 약 30일 후 만료
-                "updated_at": get_current_time().isoformat()
-            }
-            
-            token_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'kakao_token.json')
-            with open(token_file, 'w') as f:
-                json.dump(token_data, f, indent=2)
-                
-            logger.info("카카오톡 토큰 파일 저장 완료")
-            
-            # GitHub Actions에서 실행 중이면 환경 변수 업데이트
-            if 'GITHUB_ENV' in os.environ:
-                with open(os.environ['GITHUB_ENV'], 'a') as env_file:
-                    env_file.write(f"KAKAO_ACCESS_TOKEN={self.access_token}\n")
-                    env_file.write(f"KAKAO_REFRESH_TOKEN={self.refresh_token}\n")
-                logger.info("GitHub 환경 변수에 토큰 업데이트 완료")
-                
-            return True
+            with open(os.environ['GITHUB_ENV'], 'a') as env_file:
+                env_file.write(f"KAKAO_ACCESS_TOKEN={access_token}\n")
+                env_file.write(f"KAKAO_REFRESH_TOKEN={refresh_token}\n")
+            logger.info("GitHub 환경 변수에 토큰 업데이트 완료")
         except Exception as e:
-            logger.error(f"카카오톡 토큰 파일 저장 실패: {e}")
-            return False
+            logger.error(f"GitHub 환경 변수 토큰 업데이트 실패: {e}")
+    
+    def _issue_token(self, previous):
+        """
+        리프레시 토큰으로 액세스 토큰 발급 (공유 토큰 캐시가 파일 잠금을 잡은 상태에서 호출)
+        
+        Args:
+            previous: 공유 토큰 파일의 최신 기록 (다른 프로세스가 바꾼 리프레시 토큰 포함)
+            
+        Returns:
+            tuple: (access_token, expires_in 초, {refresh_token, refresh_token_expires_at})
+        """
+        previous = previous or {}
+        refresh_token = previous.get('refresh_token') or self.refresh_token
+        
+        # client_id가 없는 경우 환경 변수나 config에서 가져오기
+        client_id = os.environ.get('KAKAO_API_KEY') or getattr(self.config, 'KAKAO_API_KEY', None)
+        if not client_id:
+            raise RuntimeError("KAKAO_API_KEY가 설정되지 않았습니다.")
+        if not refresh_token:
+            raise RuntimeError("카카오톡 리프레시 토큰이 없습니다.")
+        
+        url = "https://kauth.kakao.com/oauth/token"
+        data = {
+            "grant_type": "refresh_token",
+            "client_id": client_id,
+            "refresh_token": refresh_token
+        }
+        
+        response = requests.post(url, data=data, timeout=10)
+        if response.status_code != 200:
+            raise RuntimeError(f"인증 토큰 갱신 실패: {response.text}")
+        
+        token_data = response.json()
+        access_token = token_data["access_token"]
+        
+        # refresh_token은 만료가 가까울 때만 새로 발급되어 응답에 포함됨
+        extra = {
+            'refresh_token': token_data.get("refresh_token") or refresh_token,
+            'refresh_token_expires_at': previous.get('refresh_token_expires_at')
+        }
+        if "refresh_token_expires_in" in token_data:
+            extra['refresh_token_expires_at'] = get_current_time().timestamp() + float(token_data["refresh_token_expires_in"])
+        
+        self._export_tokens_to_github_env(access_token, extra['refresh_token'])
+        logger.info("카카오톡 인증 토큰 갱신 완료")
+        return access_token, token_data.get("expires_in", 6 * 60 * 60), extra
     
     def refresh_auth_token(self):
         """
-        인증 토큰 갱신
+        인증 토큰 강제 갱신 (전송이 401로 거부된 경우, 방금 갱신된 토큰이 있으면 그 토큰 사용)
         
         Returns:
             bool: 토큰 갱신 성공 여부
         """
-        # 갱신 요청 시간 기록 (요청 성공 여부와 무관하게)
-        self.last_token_refresh_attempt = time.time()
-
         try:
-            url = "https://kauth.kakao.com/oauth/token"
-            
-            # client_id가 없는 경우 환경 변수나 config에서 가져오기
-            client_id = os.environ.get('KAKAO_API_KEY')
-            if not client_id and hasattr(self.config, 'KAKAO_API_KEY'):
-                client_id = self.config.KAKAO_API_KEY
-                
-            if not client_id:
-                if self.is_ci_env:
-                    logger.warning("CI 환경에서 KAKAO_API_KEY가 설정되지 않아 토큰 갱신을 건너뜁니다.")
-                    return False
-                else:
-                    logger.error("KAKAO_API_KEY가 설정되지 않았습니다.")
-                    return False
-                
-            data = {
-                "grant_type": "refresh_token",
-                "client_id": client_id,
-                "refresh_token": self.refresh_token
-            }
-            
-            response = requests.post(url, data=data)
-            if response.status_code == 200:
-                token_data = response.json()
-                self.access_token = token_data.get("access_token")
-                
-                # refresh_token은 선택적으로 포함될 수 있음
-                if "refresh_token" in token_data:
-                    self.refresh_token = token_data.get("refresh_token")
-                
-                # 토큰 만료 시간 설정 (약 30일)
-                self.token_expire_at = get_adjusted_time(adjust_days=29).isoformat()
-                    
-                # 토큰을 파일에 저장
-                self.save_tokens_to_file()
-                
-                logger.info("카카오톡 인증 토큰 갱신 완료")
-                return True
-            else:
-                logger.error(f"인증 토큰 갱신 실패: {response.text}")
-                return False
+            self._apply_token(self.token_cache.get(force=True))
+            return True
         except Exception as e:
             logger.error(f"인증 토큰 갱신 중 오류: {e}")
             return False
     
     def ensure_token_valid(self):
-        """토큰이 유효한지 확인하고, 필요시 갱신"""
-        if not self.initialized:
-            return self.initialize()
-        
-        # 토큰 만료 시간 확인 - 실제 만료된 경우에만 갱신 시도
-        if self.token_expire_at:
-            try:
-                expire_time = parse_time(self.token_expire_at)
-                current_time = get_current_time()
-                if current_time >= expire_time:
-                    logger.info("토큰이 만료되었습니다. 갱신을 시도합니다.")
-                    if self._can_refresh_token():
-                        return self.refresh_auth_token()
-                    else:
-                        logger.warning("토큰 갱신 요청 제한 시간 내에 있습니다. 현재 토큰을 계속 사용합니다.")
-                        # 이미 만료되었지만 갱신 요청 제한으로 인해 갱신하지 못할 때는, 
-                        # 기존 토큰으로라도 메시지 전송 시도
-                        return True
-                # 만료되지 않았으면 현재 토큰 사용
+        """
+        토큰 유효성 확인 (만료 시각 기준, 만료가 가깝거나 모를 때만 갱신 요청)
+        
+        Returns:
+            bool: 사용할 토큰이 있으면 True
+        """
+        try:
+            self._apply_token(self.token_cache.get())
+            return bool(self.access_token)
+        except Exception as e:
+            # 갱신 실패 시에도 기존 토큰이 있으면 전송 시도 (401이면 전송 경로에서 한 번 더 갱신)
+            if self.access_token:
+                logger.warning(f"카카오톡 토큰 갱신 실패, 기존 토큰으로 전송을 시도합니다: {e}")
                 return True
-            except Exception as e:
-                logger.error(f"토큰 만료 시간 확인 중 오류: {e}")
-        
-        # 만료 시간 정보가 없으면 토큰 테스트 후 필요시 갱신
-        if not self.test_token():
-            logger.info("토큰 테스트 실패. 갱신을 시도합니다.")
-            if self._can_refresh_token():
-                return self.refresh_auth_token()
-            else:
-                logger.warning("토큰 갱신 요청 제한 시간 내에 있습니다. 갱신을 건너뜁니다.")
-                return False
-        return True
+            logger.error(f"카카오톡 토큰 갱신 실패: {e}")
+            return False
     
-    def send_message(self, message):
+    def send_message(self, message, priority=None):
         """
-        카카오톡으로 메시지 전송
+        카카오톡으로 메시지 전송 (발송기가 있으면 큐에 넣고 바로 반환)
         
         Args:
             message: 전송할 메시지 텍스트
+            priority: 발송 우선순위 (dispatcher.CRITICAL 등, None이면 메시지 내용으로 추정)
+            
+        Returns:
+            bool: 전송 성공 여부 (발송기 사용 시 예약 성공 여부)
+        """
+        # 분할 전 메시지 전체로 우선순위를 한 번만 정해 모든 부분에 같은 우선순위 적용
+        if priority is None:
+            priority = classify(message)
+        
+        # 메시지 길이가 제한을 초과하면 여러 메시지로 분할
+        max_message_length = 1800  # 안전한 길이 제한 (2000자보다 작게 설정)
+        
+        if len(message) > max_message_length:
+            parts = self._split_message(message, max_message_length)
+            parts = [f"[{i+1}/{len(parts)}] {part}" for i, part in enumerate(parts)]
+        else:
+            parts = [message]
+        return self._send_parts(parts, priority)
+    
+    def _send_parts(self, parts, priority=None):
+        """
+        분할된 메시지 전송 (발송기가 부분 목록을 한 항목으로 받아 전송 간격을 지키며 순서대로 보냄)
+        
+        Returns:
+            bool: 전송 성공 여부 (발송기 사용 시 예약 성공 여부)
+        """
+        if self.dispatcher is not None:
+            return self.dispatcher.submit("kakao", parts, priority)
+        
+        success = True
+        for i, part in enumerate(parts):
+            if not self._deliver_message(part):
+                success = False
+            # 연속 메시지 전송 시 약간의 딜레이 추가
+            if i < len(parts) - 1:
+                time.sleep(0.5)
+        return success
+    
+    def _deliver_message(self, message):
+        """
+        카카오톡 메시지 한 건 전송 (토큰 확인 후 전송, 발송기 작업 스레드에서 호출)
+        
+        Args:
+            message: 전송할 메시지 텍스트 (1800자 이하)
             
         Returns:
             bool: 전송 성공 여부
@@ -333,34 +340,15 @@ class KakaoSender:
                 return True
             return False
         
-        # 메시지 길이가 제한을 초과하면 여러 메시지로 분할
-        max_message_length = 1800  # 안전한 길이 제한 (2000자보다 작게 설정)
-        
-        # 메시지를 분할
-        if len(message) > max_message_length:
-            parts = self._split_message(message, max_message_length)
-            success = True
-            
-            # 분할된 메시지 각각을 전송
-            for i, part in enumerate(parts):
-                part_message = f"[{i+1}/{len(parts)}] {part}"
-                if not self._send_single_message(part_message):
-                    success = False
-                # 연속 메시지 전송 시 약간의 딜레이 추가
-                if i < len(parts) - 1:
-                    time.sleep(0.5)
-                    
-            return success
-        else:
-            # 단일 메시지 전송
-            return self._send_single_message(message)
+        return self._send_single_message(message)
             
-    def _send_single_message(self, message):
+    def _send_single_message(self, message, retry_on_auth_error=True):
         """
         단일 카카오톡 메시지 전송 (내부 함수)
         
         Args:
             message: 전송할 메시지 텍스트
+            retry_on_auth_error: 401 응답이면 토큰을 갱신하고 한 번만 다시 전송
             
         Returns:
             bool: 전송 성공 여부
@@ -394,10 +382,10 @@ class KakaoSender:
                 return True
             else:
                 # 토큰 만료일 때 갱신 후 재시도
-                if response.status_code == 401:
+                if response.status_code == 401 and retry_on_auth_error:
                     logger.warning("토큰이 만료되었습니다. 갱신 후 재시도합니다.")
                     if self.refresh_auth_token():
-                        return self._send_single_message(message)  # 재귀적으로 다시 시도
+                        return self._send_single_message(message, retry_on_auth_error=False)
                 logger.error(f"카카오톡 메시지 전송 실패: {response.text}")
                 if self.is_ci_env:
                     logger.info("CI 환경에서 메시지 전송 실패는 무시하고 계속 진행합니다.")
@@ -723,12 +711,13 @@ class KakaoSender:
         # 상세 분석이 필요한 경우 안내 메시지만 전송
         return
     
-    def send_system_status(self, status_message):
+    def send_system_status(self, status_message, priority=None):
         """
         시스템 상태 알림 전송 (정보 알림은 모든 내용 표시)
         
         Args:
             status_message: 상태 메시지
+            priority: 발송 우선순위 (None이면 메시지 내용으로 추정)
         """
         # HTML 태그 제거
         clean_message = self._remove_html_tags(status_message)
@@ -748,30 +737,23 @@ class KakaoSender:
         if "GPT 추천" in clean_message or "종목 리스트 업데이트" in clean_message:
             # GPT 추천 종목 분석과 종목 업데이트 메시지는 전체 내용 표시
             logger.info("GPT 종목 추천 또는 종목 업데이트 메시지 전송 (전체 내용)")
-            return self.send_message(f"{icon} {get_current_time_str(format_str='%m-%d %H:%M')}\n\n{clean_message}")
+            return self.send_message(f"{icon} {get_current_time_str(format_str='%m-%d %H:%M')}\n\n{clean_message}", priority)
         elif "### RSI" in clean_message:
             # RSI 분석 등 기술적 분석 메시지는 핵심만 추출
-            return self._send_technical_analysis(clean_message)
+            return self._send_technical_analysis(clean_message, priority)
         elif len(clean_message) > 1800:
             # 길이 제한에 걸리는 아주 긴 메시지만 분할 전송
             logger.info("매우 긴 메시지 분할 전송")
             parts = self._split_message(clean_message, 1800)
-            success = True
-            
-            for i, part in enumerate(parts):
-                part_with_header = f"{icon} {get_current_time_str(format_str='%m-%d %H:%M')} [{i+1}/{len(parts)}]\n\n{part}"
-                if not self._send_single_message(part_with_header):
-                    success = False
-                # 연속 메시지 전송 시 약간의 딜레이 추가
-                if i < len(parts) - 1:
-                    time.sleep(0.5)
-                    
-            return success
+            header = f"{icon} {get_current_time_str(format_str='%m-%d %H:%M')}"
+            if priority is None:
+                priority = classify(clean_message)
+            return self._send_parts([f"{header} [{i+1}/{len(parts)}]\n\n{part}" for i, part in enumerate(parts)], priority)
         else:
             # 일반 정보 알림 메시지는 전체 내용 표시
-            return self.send_message(f"{icon} {get_current_time_str(format_str='%m-%d %H:%M')}\n\n{clean_message}")
+            return self.send_message(f"{icon} {get_current_time_str(format_str='%m-%d %H:%M')}\n\n{clean_message}", priority)
             
-    def _send_technical_analysis(self, message):
+    def _send_technical_analysis(self, message, priority=None):
         """기술적 분석 메시지에서 핵심 내용만 추출하여 전송
         
         Args:
@@ -824,7 +806,7 @@ class KakaoSender:
         
         # 결과 조합 및 전송
         result_message = '\n'.join(result_parts)
-        return self.send_message(result_message)
+        return self.send_message(result_message, priority)
     
     def send_account_summary(self, stock_balance, account_info):
         """
@@ -952,17 +934,10 @@ class KakaoSender:
         Returns:
             str: 종목 이름 (얻을 수 없는 경우 종목 코드 반환)
         """
-        # 한국 주식 KR_STOCK_INFO에서 종목명 찾기
-        if hasattr(self.config, 'KR_STOCK_INFO'):
-            for stock in self.config.KR_STOCK_INFO:
-                if stock['code'] == symbol:
-                    return stock['name']
-        
-        # 미국 주식 US_STOCK_INFO에서 종목명 찾기
-        if hasattr(self.config, 'US_STOCK_INFO'):
-            for stock in self.config.US_STOCK_INFO:
-                if stock['code'] == symbol:
-                    return stock['name']
+        # 종목 마스터 인덱스에서 종목명 찾기 (KR_STOCK_INFO/US_STOCK_INFO와 종목 정보 테이블)
+        info = get_symbol_master(self.config).get(symbol)
+        if info is not None:
+            return info.name
         
         # config에 종목 이름 매핑이 있는지 확인
         if hasattr(self.config, 'STOCK_NAMES') and symbol in self.config.STOCK_NAMES:
@@ -8,6 +8,7 @@ from telegram import Bot
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
 from ..utils.time_utils import get_current_time, get_current_time_str, format_timestamp
+from .dispatcher import get_notification_dispatcher, classify
 
 # 로깅 설정
 logger = logging.getLogger('TelegramSender')
@@ -26,10 +27,17 @@ class TelegramSender:
         self.bot = None
         self.initialized = False
         self.enabled = getattr(self.config, 'USE_TELEGRAM', False)
+        self.dispatcher = None
         
         # 텔레그램 사용이 설정된 경우에만 초기화 진행
         if self.enabled:
             self.initialize()
+            # 백그라운드 알림 발송기의 이벤트 루프에서 봇 전송 (메시지마다 이벤트 루프를 만들지 않음)
+            if self.bot and getattr(config, 'NOTIFY_ASYNC', True):
+                self.dispatcher = get_notification_dispatcher(config)
+                self.dispatcher.register("telegram", self._deliver_message,
+                                         min_interval=getattr(config, 'NOTIFY_TELEGRAM_MIN_INTERVAL', 1.0),
+                                         digest_max_chars=4000)
         else:
             logger.info("텔레그램 알림 기능이 비활성화되어 있습니다.")
         
@@ -110,16 +118,38 @@ class TelegramSender:
         except Exception as e:
             logger.error(f"텔레그램 메시지 전송 중 예상치 못한 오류: {e}")
     
-    def send_message_sync(self, message):
+    async def _deliver_message(self, message):
         """
-        동기식 메시지 전송 래퍼 함수
+        메시지 한 건 전송 (발송기 이벤트 루프에서 실행)
+        
+        Returns:
+            bool: 전송 성공 여부
+        """
+        try:
+            await self.bot.send_message(
+                chat_id=self.config.TELEGRAM_CHAT_ID,
+                text=message,
+                parse_mode=ParseMode.HTML
+            )
+            return True
+        except Exception as e:
+            logger.error(f"텔레그램 메시지 전송 중 오류: {e}")
+            return False
+    
+    def send_message_sync(self, message, priority=None):
+        """
+        동기식 메시지 전송 래퍼 함수 (발송기가 있으면 큐에 넣고 바로 반환)
         
         Args:
             message: 전송할 메시지 텍스트
+            priority: 발송 우선순위 (dispatcher.CRITICAL 등, None이면 메시지 내용으로 추정)
         """
         # 텔레그램이 비활성화되어 있으면 바로 리턴
         if not self.enabled or not self.bot:
             return True
+        
+        if self.dispatcher is not None:
+            return self.dispatcher.submit("telegram", message, priority)
             
         try:
             # GitHub Actions나 기타 환경에서 안전하게 비동기 함수 실행하기
@@ -221,12 +251,13 @@ class TelegramSender:
         # 동기식으로 메시지 전송
         self.send_message_sync(message)
         
-    def send_system_status(self, status_message):
+    def send_system_status(self, status_message, priority=None):
         """
         시스템 상태 알림 전송
         
         Args:
             status_message: 상태 메시지
+            priority: 발송 우선순위 (None이면 메시지 내용으로 추정)
         """
         # 텔레그램이 비활성화되어 있으면 바로 리턴
         if not self.enabled or not self.bot:
@@ -235,8 +266,12 @@ class TelegramSender:
         current_time = get_current_time_str("%Y-%m-%d %H:%M:%S")
         message = f"<b>📊 시스템 상태</b>\n<b>시간:</b> {current_time}\n\n{status_message}"
         
+        # 우선순위를 주지 않으면 공통 머리말 대신 상태 메시지 내용으로 추정
+        if priority is None:
+            priority = classify(status_message)
+        
         # 동기식으로 메시지 전송
-        self.send_message_sync(message)
+        self.send_message_sync(message, priority)
         
     def send_direct_message(self, message):
         """
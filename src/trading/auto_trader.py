@@ -18,6 +18,12 @@ from src.utils.time_utils import (
     get_current_time, get_current_time_str, is_market_open,
     format_timestamp, get_market_hours, KST, EST, parse_time
 )
+from src.trading.position_book import get_position_book
+from src.trading.order_gateway import get_order_gateway, OrderRequest
+from src.data.symbol_master import get_symbol_master
+from src.trading.order_tracker import (
+    get_order_tracker, SUBMITTED, ACKNOWLEDGED, PARTIAL, FILLED, CANCELLED, REJECTED
+)
 
 # 로깅 설정
 logger = logging.getLogger('AutoTrader')
@@ -35,6 +41,16 @@ def safe_format(value, format_spec=","):
     # 이미 문자열인 경우는 그대로 반환 (포맷팅 시도하지 않음)
     return str(value)
 
+# 주문 추적 상태별 주문상태 문구
+ORDER_STATE_TEXT = {
+    SUBMITTED: "주문전송",
+    ACKNOWLEDGED: "접수완료",
+    FILLED: "체결완료",
+    PARTIAL: "일부체결",
+    CANCELLED: "취소",
+    REJECTED: "거부"
+}
+
 class TradeAction(Enum):
     """매매 동작 정의"""
     BUY = "BUY"
@@ -59,7 +75,7 @@ class OrderStatus(Enum):
 class AutoTrader:
     """자동 매매 실행 클래스"""
     
-    def __init__(self, config, broker, data_provider, strategy_provider, notifier=None):
+    def __init__(self, config, broker, data_provider, strategy_provider, notifier=None, position_book=None):
         """
         초기화 함수
         
@@ -69,6 +85,7 @@ class AutoTrader:
             data_provider: 주가 데이터 제공자
             strategy_provider: 트레이딩 전략 제공자
             notifier: 알림 발송 객체 (선택적)
+            position_book: 공유 포지션 장부 (None이면 브로커에 연결된 공유 장부 사용)
         """
         # 로거 설정
         self.logger = logging.getLogger('AutoTrader')
@@ -78,6 +95,9 @@ class AutoTrader:
         self.data_provider = data_provider
         self.strategy = strategy_provider
         self.notifier = notifier
+        self.position_book = position_book or get_position_book(broker, config)
+        self.order_tracker = get_order_tracker(broker, config)
+        self.order_gateway = get_order_gateway(broker, config, data_provider)
         
         # 설정 값 로드
         self.initial_capital = getattr(config, 'INITIAL_CAPITAL', 10000000)  # 초기 자본금 (기본 1천만원) - 기본값으로 유지
@@ -87,6 +107,7 @@ class AutoTrader:
         self.trade_interval = getattr(config, 'TRADE_INTERVAL_SECONDS', 3600)  # 매매 간격 (기본 1시간)
         self.market_hours = getattr(config, 'MARKET_HOURS', {})  # 시장 운영 시간
         self.simulation_mode = getattr(config, 'SIMULATION_MODE', False)  # 시뮬레이션 모드 (기본값: 실제 거래)
+        self.order_fill_timeout = getattr(config, 'ORDER_FILL_TIMEOUT_SECONDS', 10)  # 주문 체결 최대 대기 시간 (초)
         
         # 포지션 및 주문 이력 관리
         self.positions = {}  # {종목코드: {수량, 평균단가, 현재가치, ...}}
@@ -206,89 +227,28 @@ class AutoTrader:
         # 시간 유틸리티 모듈 사용
         return is_market_open(market)
     
-    def _load_positions(self):
-        """현재 보유 포지션 로드"""
+    def _load_positions(self, force=False):
+        """
+        현재 보유 포지션 로드 (공유 포지션 장부에서 읽음)
+        
+        Args:
+            force: 대조 간격과 관계없이 증권사 잔고와 즉시 대조 (주문 직후)
+        """
         try:
-            # 증권사 API에서 포지션 정보 가져오기
+            # 장부는 POSITION_RECONCILE_SECONDS 간격으로만 증권사와 대조하고, 다른 트레이더와 공유됨
+            self.position_book.reconcile(force=force)
+            positions = self.position_book.as_dicts()
+            
             if not self.simulation_mode:
-                positions_list = self.broker.get_positions()
-                
-                # 포지션 형식 변환 (리스트 -> 딕셔너리)
-                positions = {}
-                for position in positions_list:
-                    # "종목코드" 필드를 찾아서 symbol로 사용
-                    if "종목코드" in position:
-                        symbol = position["종목코드"]
-                        symbol_name = position.get("종목명", symbol)
-                        quantity = position.get("보유수량", 0)
-                        avg_price = position.get("평균단가", 0)
-                        current_price = position.get("현재가", 0)
-                        current_value = position.get("평가금액", 0)
-                        profit_loss = position.get("손익금액", 0)
-                        
-                        # 손익률 계산
-                        profit_loss_pct = 0
-                        if avg_price > 0:
-                            profit_loss_pct = ((current_price / avg_price) - 1) * 100
-                            
-                        # 포지션 데이터 구조 변환
-                        positions[symbol] = {
-                            'symbol': symbol,
-                            'symbol_name': symbol_name,
-                            'quantity': quantity,
-                            'avg_price': avg_price,
-                            'current_price': current_price,
-                            'current_value': current_value,
-                            'profit_loss': profit_loss,
-                            'profit_loss_pct': profit_loss_pct,
-                            'market': 'KR'  # 기본값으로 KR 설정
-                        }
-                
                 self.positions = positions
                 logger.info(f"포지션 로드 완료: {len(self.positions)}개 종목 보유 중")
-            else:
+            elif positions:
                 # 모의 투자 모드에서도 실제 포지션을 불러옵니다
-                try:
-                    positions_list = self.broker.get_positions()
-                    if positions_list:
-                        # 포지션 형식 변환 (리스트 -> 딕셔너리)
-                        positions = {}
-                        for position in positions_list:
-                            # "종목코드" 필드를 찾아서 symbol로 사용
-                            if "종목코드" in position:
-                                symbol = position["종목코드"]
-                                symbol_name = position.get("종목명", symbol)
-                                quantity = position.get("보유수량", 0)
-                                avg_price = position.get("평균단가", 0)
-                                current_price = position.get("현재가", 0)
-                                current_value = position.get("평가금액", 0)
-                                profit_loss = position.get("손익금액", 0)
-                                
-                                # 손익률 계산
-                                profit_loss_pct = 0
-                                if avg_price > 0:
-                                    profit_loss_pct = ((current_price / avg_price) - 1) * 100
-                                    
-                                # 포지션 데이터 구조 변환
-                                positions[symbol] = {
-                                    'symbol': symbol,
-                                    'symbol_name': symbol_name,
-                                    'quantity': quantity,
-                                    'avg_price': avg_price,
-                                    'current_price': current_price,
-                                    'current_value': current_value,
-                                    'profit_loss': profit_loss,
-                                    'profit_loss_pct': profit_loss_pct,
-                                    'market': 'KR'  # 기본값으로 KR 설정
-                                }
-                        
-                        self.positions = positions
-                        logger.info(f"모의 투자 포지션 로드 완료: {len(self.positions)}개 종목 보유 중")
-                    else:
-                        # 포지션 정보를 불러오지 못한 경우 기존 정보 유지
-                        logger.info(f"모의 투자 포지션 정보 없음: {len(self.positions)}개 종목 보유 중으로 유지")
-                except Exception as e:
-                    logger.warning(f"모의 투자 포지션 로드 실패, 기존 상태 유지: {e}")
+                self.positions = positions
+                logger.info(f"모의 투자 포지션 로드 완료: {len(self.positions)}개 종목 보유 중")
+            else:
+                # 포지션 정보를 불러오지 못한 경우 기존 정보 유지
+                logger.info(f"모의 투자 포지션 정보 없음: {len(self.positions)}개 종목 보유 중으로 유지")
             return self.positions
         except Exception as e:
             logger.error(f"포지션 로드 중 오류 발생: {e}")
@@ -405,23 +365,14 @@ class AutoTrader:
         """
         try:
             # 종목 이름 설정
-            stock_name = symbol
-            if hasattr(self.config, 'KR_STOCK_INFO') and market == "KR":
-                for stock in self.config.KR_STOCK_INFO:
-                    if stock['code'] == symbol:
-                        stock_name = stock['name']
-                        break
-            elif hasattr(self.config, 'US_STOCK_INFO') and market == "US":
-                for stock in self.config.US_STOCK_INFO:
-                    if stock['code'] == symbol:
-                        stock_name = stock['name']
-                        break
+            stock_name = get_symbol_master(self.config).name(symbol, market)
                 
             # 디버그 로깅: 종목명 확인
             logger.info(f"주문 실행: 종목명 확인 - 심볼: {symbol}, 종목명: {stock_name}")
             
             # 주문 시작 시간 기록
             order_start_time = time.time()
+            order_signal_time = time.monotonic()  # 신호→제출 지연 측정용
             
             order_info = {
                 "symbol": symbol,
@@ -598,34 +549,13 @@ class AutoTrader:
                 prev_avg_price = 0
                 
                 try:
-                    # 현재 보유 종목 정보 미리 조회
-                    positions = self.broker.get_positions()
-                    # 로그에 positions 내용 확인 추가
-                    logger.info(f"보유 포지션 정보: {json.dumps(positions, ensure_ascii=False, default=str)}")
-                    
-                    # 브로커 API 응답 구조에 따라 처리
-                    if isinstance(positions, dict):
-                        # dict 형태 - KIS API 실전 계좌 등
-                        if symbol in positions:
-                            position_data = positions[symbol]
-                            prev_quantity = position_data.get('quantity', 0)
-                            prev_avg_price = position_data.get('avg_price', 0)
-                            logger.info(f"기존 보유(dict): {symbol} {prev_quantity}주, 평균단가: {safe_format(prev_avg_price)}원")
-                    elif isinstance(positions, list):
-                        # list 형태 - 모의투자 등
-                        for position in positions:
-                            # KISAPI 모의투자 구조 처리
-                            if "pdno" in position and position.get("pdno") == symbol:
-                                prev_quantity = int(position.get("hldg_qty", "0"))
-                                prev_avg_price = float(position.get("pchs_avg_pric", "0"))
-                                logger.info(f"기존 보유(KISAPI): {symbol} {prev_quantity}주, 평균단가: {safe_format(prev_avg_price)}원")
-                                break
-                            # 일반 구조 처리
-                            elif "symbol" in position and position.get("symbol") == symbol:
-                                prev_quantity = position.get("quantity", 0)
-                                prev_avg_price = position.get("avg_price", 0)
-                                logger.info(f"기존 보유(list): {symbol} {prev_quantity}주, 평균단가: {safe_format(prev_avg_price)}원")
-                                break
+                    # 현재 보유 종목 정보 미리 조회 (공유 포지션 장부)
+                    self.position_book.reconcile()
+                    held = self.position_book.get(symbol)
+                    if held is not None:
+                        prev_quantity = held.quantity
+                        prev_avg_price = held.avg_price
+                        logger.info(f"기존 보유: {symbol} {prev_quantity}주, 평균단가: {safe_format(prev_avg_price)}원")
                     
                     # 현재 계좌 잔고
                     account_info = self.broker.get_balance()
@@ -638,11 +568,11 @@ class AutoTrader:
                 # API 호출 정보 기록
                 logger.info(f"증권사 API 호출: {action.value} {symbol}, 수량: {quantity}, 가격: {price}, 주문유형: {order_type.value}")
                 
-                # 주문 실행
-                if action == TradeAction.BUY:
-                    order_result = self.broker.buy(symbol, quantity, price, order_type.value, market)
-                else:
-                    order_result = self.broker.sell(symbol, quantity, price, order_type.value, market)
+                # 주문 실행 (공유 주문 게이트웨이에서 위험 점검 후 제출)
+                order_result = self.order_gateway.execute(OrderRequest(
+                    symbol, action.value, quantity, price, order_type.value, market,
+                    source="AutoTrader", name=stock_name, signal_time=order_signal_time
+                ))
                 
                 # 주문 결과 로깅
                 logger.info(f"증권사 API 주문 응답: {order_result}")
@@ -650,10 +580,11 @@ class AutoTrader:
                 # 주문 결과 업데이트
                 order_info.update(order_result)
                 
-                # 주문 체결 확인을 위한 대기시간 설정 (증가)
-                wait_time = 2.0  # 2초로 증가
-                logger.info(f"주문 체결 확인 대기 중... ({wait_time}초)")
-                time.sleep(wait_time)
+                if order_result.get('risk_rejected'):
+                    logger.warning(f"{stock_name}({symbol}) 주문이 위험 점검에서 거부됨: {order_result.get('error')}")
+                    order_info["status"] = OrderStatus.REJECTED.value
+                    self.order_history.append(order_info)
+                    return order_info
                 
                 # 주문 체결 상태 확인
                 order_no = order_result.get('order_no', '')
@@ -684,16 +615,17 @@ class AutoTrader:
                                 "order_status": '체결완료(모의)'
                             })
                         else:
-                            # 실제 투자에서 상태 조회
-                            logger.info(f"실제 주문상태 조회 시도: 주문번호 {order_no}")
-                            order_status = self.broker.get_order_status(order_no)
-                            logger.info(f"주문 상태 조회 결과: {order_status}")
+                            # 실제 투자에서는 주문 추적기가 체결/취소를 확인하는 즉시 깨어남 (고정 대기 없음)
+                            logger.info(f"주문 체결 대기: 주문번호 {order_no} (최대 {self.order_fill_timeout}초)")
+                            self.order_tracker.track(order_no, symbol, action.value, quantity, price, market)
+                            tracked = self.order_tracker.wait(order_no, self.order_fill_timeout)
+                            logger.info(f"주문 상태 추적 결과: {tracked}")
                             
                             # 상세 로깅: 체결 정보
-                            executed_qty = order_status.get('체결수량', 0)
-                            executed_price = order_status.get('체결단가', None)
-                            remain_qty = order_status.get('미체결수량', quantity)
-                            order_status_text = order_status.get('주문상태', '확인중')
+                            executed_qty = tracked.filled_quantity
+                            executed_price = tracked.avg_fill_price or None
+                            remain_qty = tracked.remaining_quantity
+                            order_status_text = ORDER_STATE_TEXT.get(tracked.state, tracked.state)
                             
                             logger.info(f"체결 정보 상세: 체결수량={executed_qty}, 체결단가={executed_price}, " +
                                         f"미체결수량={remain_qty}, 주문상태={order_status_text}")
@@ -731,61 +663,18 @@ class AutoTrader:
                 
                 # 거래 후 정보 조회
                 try:
-                    # 최소 5초 이상 대기하여 API 캐싱 이슈 방지
-                    wait_time_after_order = 5
-                    logger.info(f"계좌 정보 갱신 대기 중 ({wait_time_after_order}초)...")
-                    time.sleep(wait_time_after_order)
-                    
-                    # 거래 후 잔고 정보 강제 갱신 (여러번 시도)
-                    account_info = None
-                    retry_count = 0
-                    max_retries = 3
-                    
-                    logger.info("계좌 정보 갱신 시작...")
-                    while retry_count < max_retries:
-                        try:
-                            # 캐시를 회피하기 위한 추가 파라미터 사용 (타임스탬프)
-                            timestamp_cache_buster = int(time.time())
-                            logger.info(f"잔고 조회 시도 #{retry_count+1}: 타임스탬프={timestamp_cache_buster}")
-                            account_info = self.broker.get_balance(force_refresh=True, timestamp=timestamp_cache_buster)
-                            balance_after = account_info.get('예수금', 0)
-                            avail_cash_after = account_info.get('주문가능금액', 0)
-                            total_eval = account_info.get('총평가금액', 0)  # 총평가금액 추가
-                            
-                            logger.info(f"잔고 조회 결과: 예수금={balance_after}, 주문가능금액={avail_cash_after}, 총평가금액={total_eval}")
-                            
-                            # 잔고 정보가 갱신되었는지 확인 (예수금 또는 주문가능금액 변화 확인)
-                            if action == TradeAction.BUY:
-                                # 매수: 예수금 또는 주문가능금액 감소 확인
-                                if balance_before > balance_after or \
-                                   (account_info.get('주문가능금액', 0) < account_info.get('주문가능금액', float('inf'))):
-                                    logger.info(f"계좌 잔고 변경 확인: 예수금 {safe_format(balance_before)}원 -> {safe_format(balance_after)}원")
-                                    logger.info(f"주문가능금액: {safe_format(avail_cash_after)}원")
-                                    break
-                            else:  # SELL
-                                # 매도: 예수금 증가 또는 주문가능금액 증가 확인
-                                if balance_before < balance_after or \
-                                   (account_info.get('주문가능금액', 0) > account_info.get('주문가능금액', 0)):
-                                    logger.info(f"계좌 잔고 변경 확인: 예수금 {safe_format(balance_before)}원 -> {safe_format(balance_after)}원")
-                                    logger.info(f"주문가능금액: {safe_format(avail_cash_after)}원")
-                                    break
-                                
-                            # 변경이 감지되지 않으면 재시도
-                            logger.warning(f"계좌 잔고 변경이 감지되지 않음: 예수금 {safe_format(balance_before)}원 -> {safe_format(balance_after)}원")
-                            logger.info(f"주문가능금액: {safe_format(avail_cash_after)}원")
-                            retry_count += 1
-                            retry_delay = 2 * (retry_count + 1)
-                            logger.info(f"잔고 조회 재시도 #{retry_count+1} 대기 중... ({retry_delay}초)")
-                            time.sleep(retry_delay)  # 시도마다 대기 시간 증가
-                        except Exception as e:
-                            logger.error(f"계좌 잔고 조회 재시도 #{retry_count+1} 중 오류: {e}")
-                            retry_count += 1
-                            time.sleep(2)
+                    # 체결 확인 후 잔고 한 번 갱신
+                    account_info = self.broker.get_balance(force_refresh=True)
+                    balance_after = account_info.get('예수금', 0)
+                    avail_cash_after = account_info.get('주문가능금액', 0)
+                    total_eval = account_info.get('총평가금액', 0)  # 총평가금액 추가
+                    logger.info(f"잔고 조회 결과: 예수금={balance_after}, 주문가능금액={avail_cash_after}, 총평가금액={total_eval}")
+                    logger.info(f"계좌 잔고 변경: 예수금 {safe_format(balance_before)}원 -> {safe_format(balance_after)}원")
                     
                     # 포지션 정보 갱신
                     logger.info("포지션 정보 갱신 시도...")
-                    updated_positions = self.broker.get_positions()
-                    logger.info(f"갱신된 포지션 정보: {json.dumps(updated_positions, ensure_ascii=False, default=str)}")
+                    self.position_book.reconcile(force=True)
+                    held = self.position_book.get(symbol)
                     
                     # 처음부터 API 응답 원본 보관 (카카오 알림용)
                     api_response = None
@@ -797,38 +686,12 @@ class AutoTrader:
                     new_avg_price = 0
                     
                     # 포지션 상세 정보 - 종목 정보 찾기
-                    if isinstance(updated_positions, dict):
-                        # 딕셔너리 형태 (KIS API 실전 등)
-                        if symbol in updated_positions:
-                            position_data = updated_positions[symbol]
-                            total_quantity = position_data.get('quantity', 0)
-                            new_avg_price = position_data.get('avg_price', 0)
-                            logger.info(f"거래 후 보유(dict): {symbol} {total_quantity}주, 평균단가: {safe_format(new_avg_price)}원")
-                        else:
-                            logger.info(f"거래 후 {symbol} 보유 없음 (dict)")
-                    elif isinstance(updated_positions, list):
-                        # 리스트 형태 (모의투자 등)
-                        found = False
-                        for position in updated_positions:
-                            # KISAPI 모의투자 구조
-                            if "pdno" in position and position.get("pdno") == symbol:
-                                total_quantity = int(position.get("hldg_qty", "0"))
-                                new_avg_price = float(position.get("pchs_avg_pric", "0"))
-                                logger.info(f"거래 후 보유(KISAPI): {symbol} {total_quantity}주, 평균단가: {safe_format(new_avg_price)}원")
-                                found = True
-                                break
-                            # 일반 구조
-                            elif "symbol" in position and position.get("symbol") == symbol:
-                                total_quantity = position.get("quantity", 0)
-                                new_avg_price = position.get("avg_price", 0)
-                                logger.info(f"거래 후 보유(list): {symbol} {total_quantity}주, 평균단가: {safe_format(new_avg_price)}원")
-                                found = True
-                                break
-                        
-                        if not found:
-                            logger.info(f"거래 후 {symbol} 보유 없음 (list)")
+                    if held is not None:
+                        total_quantity = held.quantity
+                        new_avg_price = held.avg_price
+                        logger.info(f"거래 후 보유: {symbol} {total_quantity}주, 평균단가: {safe_format(new_avg_price)}원")
                     else:
-                        logger.warning(f"알 수 없는 positions 형식: {type(updated_positions)}")
+                        logger.info(f"거래 후 {symbol} 보유 없음")
                     
                     # API 응답에서 직접 보유수량 확인 (가장 정확함)
                     if api_response and "output1" in api_response and isinstance(api_response["output1"], list):
@@ -2040,15 +1903,12 @@ class AutoTrader:
             try:
                 sector_analysis = {}
                 
-                # 설정에서 종목별 섹터 정보 가져오기
-                stock_sectors = {}
-                if hasattr(self.config, 'KR_STOCK_INFO'):
-                    for stock in self.config.KR_STOCK_INFO:
-                        stock_sectors[stock.get('code')] = stock.get('sector', '기타')
+                # 종목 마스터 인덱스에서 종목별 섹터 정보 가져오기
+                symbol_master = get_symbol_master(self.config)
                 
                 # 보유 종목별로 섹터 집계
                 for symbol, position in self.positions.items():
-                    sector = stock_sectors.get(symbol, '기타')
+                    sector = symbol_master.sector(symbol, default='기타')
                     
                     if sector not in sector_analysis:
                         sector_analysis[sector] = {
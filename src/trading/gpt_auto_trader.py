@@ -19,7 +19,10 @@ from src.ai_analysis.stock_selector import StockSelector
 from src.ai_analysis.gpt_trading_strategy import GPTTradingStrategy
 from src.trading.auto_trader import AutoTrader, TradeAction, OrderType
 from src.trading.realtime_trader import RealtimeTrader
-from src.utils.time_utils import get_current_time, get_current_time_str, is_market_open
+from src.trading.position_book import get_position_book
+from src.trading.order_tracker import get_order_tracker
+from src.utils.time_utils import get_current_time, get_current_time_str, is_market_open, wait_for_market_open
+from src.utils.tracing import get_tracer, traced
 
 # 로깅 설정
 logger = logging.getLogger('GPTAutoTrader')
@@ -27,7 +30,7 @@ logger = logging.getLogger('GPTAutoTrader')
 class GPTAutoTrader:
     """GPT 기반 자동 매매 클래스"""
     
-    def __init__(self, config, broker, data_provider, notifier=None):
+    def __init__(self, config, broker, data_provider, notifier=None, position_book=None):
         """
         초기화 함수
         
@@ -36,11 +39,15 @@ class GPTAutoTrader:
             broker: 증권사 API 연동 객체
             data_provider: 주가 데이터 제공자
             notifier: 알림 발송 객체 (선택적)
+            position_book: 공유 포지션 장부 (None이면 브로커에 연결된 공유 장부 사용)
         """
         self.config = config
         self.broker = broker
         self.data_provider = data_provider
         self.notifier = notifier
+        self.position_book = position_book or get_position_book(broker, config)
+        self.order_tracker = get_order_tracker(broker, config)
+        self.order_fill_timeout = getattr(config, 'ORDER_FILL_TIMEOUT_SECONDS', 10)  # 주문 체결 최대 대기 시간 (초)
         
         # GPT 종목 선정기 초기화
         self.stock_selector = StockSelector(config)
@@ -49,10 +56,10 @@ class GPTAutoTrader:
         self.gpt_strategy = GPTTradingStrategy(config)
         
         # AutoTrader 초기화 (실제 매매 실행용)
-        self.auto_trader = AutoTrader(config, broker, data_provider, None, notifier)
+        self.auto_trader = AutoTrader(config, broker, data_provider, None, notifier, position_book=self.position_book)
         
         # RealtimeTrader 초기화 (실시간 매매용) (신규 추가)
-        self.realtime_trader = RealtimeTrader(config, broker, data_provider, notifier)
+        self.realtime_trader = RealtimeTrader(config, broker, data_provider, notifier, position_book=self.position_book)
         
         # 설정값 로드
         self.gpt_trading_enabled = getattr(config, 'GPT_AUTO_TRADING', True)
@@ -72,6 +79,7 @@ class GPTAutoTrader:
         # 완전 자동화 모드 설정 (신규 추가)
         self.fully_autonomous_mode = getattr(config, 'GPT_FULLY_AUTONOMOUS_MODE', True)
         self.autonomous_trading_interval = getattr(config, 'GPT_AUTONOMOUS_TRADING_INTERVAL', 5)  # 분 단위
+        self.trace_slow_cycle_seconds = getattr(config, 'TRACE_SLOW_CYCLE_SECONDS', 60)  # 이보다 느린 사이클은 구간 분해 기록
         self.realtime_market_scan_interval = getattr(config, 'GPT_REALTIME_MARKET_SCAN_INTERVAL', 15)  # 분 단위
         self.autonomous_max_positions = getattr(config, 'GPT_AUTONOMOUS_MAX_POSITIONS', 7)
         self.autonomous_max_trade_amount = getattr(config, 'GPT_AUTONOMOUS_MAX_TRADE_AMOUNT', 1000000)  # 자동 매매 최대 금액
@@ -468,70 +476,71 @@ class GPTAutoTrader:
             try:
                 # 거래 시간인지 확인
                 if not is_market_open("KR"):
-                    logger.info("현재 거래 시간이 아닙니다. 10분 후에 다시 확인합니다.")
-                    for _ in range(10 * 60):  # 10분 대기 (1초 단위로 중단 체크)
-                        if not self.autonomous_thread_running:
-                            break
-                        time.sleep(1)
+                    # 휴장일/주말을 건너뛰고 다음 개장 시각까지 대기 (1초 단위로 중단 체크)
+                    logger.info("현재 거래 시간이 아닙니다. 다음 개장까지 대기합니다.")
+                    wait_for_market_open("KR", should_continue=lambda: self.autonomous_thread_running and self.is_running)
                     continue
                 
-                logger.info("자율 거래 사이클 시작")
+                with get_tracer().span("gpt_auto_trader.autonomous_cycle", "cycle", slow=self.trace_slow_cycle_seconds):
+                    logger.info("자율 거래 사이클 시작")
                 
-                # 현재 보유 포지션 업데이트
-                self._load_current_holdings()
+                    # 현재 보유 포지션 업데이트
+                    self._load_current_holdings()
                 
-                # 계좌 잔고 확인
-                balance_info = self.broker.get_balance()
-                available_cash = balance_info.get('주문가능금액', balance_info.get('예수금', 0))
-                logger.info(f"계좌 잔고: {available_cash:,.0f}원")
+                    # 계좌 잔고 확인
+                    balance_info = self.broker.get_balance()
+                    available_cash = balance_info.get('주문가능금액', balance_info.get('예수금', 0))
+                    logger.info(f"계좌 잔고: {available_cash:,.0f}원")
                 
-                # 시장 데이터 가져오기 (관심종목 + 현재 보유종목)
-                market_data = self._get_market_data()
+                    # 시장 데이터 가져오기 (관심종목 + 현재 보유종목)
+                    market_data = self._get_market_data()
                 
-                # GPT 자율적인 매매 결정
-                decisions = self.gpt_strategy.fully_autonomous_decision(
-                    market_data=market_data,
-                    available_cash=available_cash,
-                    current_positions=self.holdings
-                )
+                    # GPT 자율적인 매매 결정
+                    decisions = self.gpt_strategy.fully_autonomous_decision(
+                        market_data=market_data,
+                        available_cash=available_cash,
+                        current_positions=self.holdings
+                    )
                 
-                # 매도 결정 실행
-                for sell_decision in decisions.get('sell_decisions', []):
-                    symbol = sell_decision.get('symbol')
-                    reason = sell_decision.get('reason', 'GPT 자율 매도 결정')
-                    logger.info(f"자율 매도 결정: {symbol}, 이유: {reason}")
+                    # 매도 결정 실행
+                    for sell_decision in decisions.get('sell_decisions', []):
+                        with get_tracer().span("gpt_auto_trader.autonomous_sell", "symbol", symbol=sell_decision.get('symbol')):
+                            symbol = sell_decision.get('symbol')
+                            reason = sell_decision.get('reason', 'GPT 자율 매도 결정')
+                            logger.info(f"자율 매도 결정: {symbol}, 이유: {reason}")
                     
-                    try:
-                        if self._execute_sell(symbol):
-                            # 매도 성공 시 통계 업데이트
-                            profit_pct = sell_decision.get('profit_loss_pct', 0)
-                            amount = sell_decision.get('quantity', 0) * sell_decision.get('price', 0)
+                            try:
+                                if self._execute_sell(symbol):
+                                    # 매도 성공 시 통계 업데이트
+                                    profit_pct = sell_decision.get('profit_loss_pct', 0)
+                                    amount = sell_decision.get('quantity', 0) * sell_decision.get('price', 0)
                             
-                            if profit_pct > 0:
-                                self.autonomous_stats['winning_trades'] += 1
-                                self.autonomous_stats['total_profit'] += amount * (profit_pct / 100)
-                            else:
-                                self.autonomous_stats['losing_trades'] += 1
-                                self.autonomous_stats['total_loss'] += abs(amount * (profit_pct / 100))
+                                    if profit_pct > 0:
+                                        self.autonomous_stats['winning_trades'] += 1
+                                        self.autonomous_stats['total_profit'] += amount * (profit_pct / 100)
+                                    else:
+                                        self.autonomous_stats['losing_trades'] += 1
+                                        self.autonomous_stats['total_loss'] += abs(amount * (profit_pct / 100))
                                 
-                            self.autonomous_stats['total_trades'] += 1
-                            self.autonomous_stats['last_updated'] = get_current_time()
-                    except Exception as e:
-                        logger.error(f"{symbol} 자율 매도 실행 중 오류: {e}")
-                
-                # 매수 결정 실행
-                for buy_decision in decisions.get('buy_decisions', []):
-                    symbol = buy_decision.get('symbol')
-                    reason = buy_decision.get('reason', 'GPT 자율 매수 결정')
-                    logger.info(f"자율 매수 결정: {symbol}, 이유: {reason}")
+                                    self.autonomous_stats['total_trades'] += 1
+                                    self.autonomous_stats['last_updated'] = get_current_time()
+                            except Exception as e:
+                                logger.error(f"{symbol} 자율 매도 실행 중 오류: {e}")
+                
+                    # 매수 결정 실행
+                    for buy_decision in decisions.get('buy_decisions', []):
+                        with get_tracer().span("gpt_auto_trader.autonomous_buy", "symbol", symbol=buy_decision.get('symbol')):
+                            symbol = buy_decision.get('symbol')
+                            reason = buy_decision.get('reason', 'GPT 자율 매수 결정')
+                            logger.info(f"자율 매수 결정: {symbol}, 이유: {reason}")
                     
-                    try:
-                        if self._execute_buy_decision(buy_decision):
-                            # 매수 성공 시 통계 업데이트
-                            self.autonomous_stats['total_trades'] += 1
-                            self.autonomous_stats['last_updated'] = get_current_time()
-                    except Exception as e:
-                        logger.error(f"{symbol} 자율 매수 실행 중 오류: {e}")
+                            try:
+                                if self._execute_buy_decision(buy_decision):
+                                    # 매수 성공 시 통계 업데이트
+                                    self.autonomous_stats['total_trades'] += 1
+                                    self.autonomous_stats['last_updated'] = get_current_time()
+                            except Exception as e:
+                                logger.error(f"{symbol} 자율 매수 실행 중 오류: {e}")
                 
                 # 다음 사이클까지 대기
                 logger.info(f"자율 거래 사이클 완료. {self.autonomous_trading_interval}분 후에 다시 실행합니다.")
@@ -552,11 +561,9 @@ class GPTAutoTrader:
             try:
                 # 거래 시간인지 확인
                 if not is_market_open("KR"):
-                    logger.info("현재 거래 시간이 아닙니다. 실시간 시장 스캔은 5분 후에 다시 확인합니다.")
-                    for _ in range(5 * 60):  # 5분 대기 (1초 단위로 중단 체크)
-                        if not self.realtime_scan_thread_running:
-                            break
-                        time.sleep(1)
+                    # 휴장일/주말을 건너뛰고 다음 개장 시각까지 대기 (1초 단위로 중단 체크)
+                    logger.info("현재 거래 시간이 아닙니다. 실시간 시장 스캔은 다음 개장까지 대기합니다.")
+                    wait_for_market_open("KR", should_continue=lambda: self.realtime_scan_thread_running and self.is_running)
                     continue
                 
                 logger.info("실시간 시장 스캔 시작")
@@ -719,6 +726,7 @@ class GPTAutoTrader:
             logger.error(f"실시간 시장 스캔 중 오류 발생: {e}")
             return False
     
+    @traced('gpt_auto_trader.market_data', 'internal')
     def _get_market_data(self):
         """시장 데이터 가져오기 (신규 추가)"""
         try:
@@ -832,6 +840,7 @@ class GPTAutoTrader:
               f"총수익 {self.autonomous_stats['total_profit']:,.0f}원, 총손실 {self.autonomous_stats['total_loss']:,.0f}원, "
               f"순이익 {net_profit:,.0f}원 (운영기간: {days}일 {hours}시간)")
               
+    @traced('gpt_auto_trader.select_stocks', 'internal')
     def _select_stocks(self):
         """GPT를 사용하여 주식 선정"""
         try:
@@ -1134,81 +1143,18 @@ class GPTAutoTrader:
                 self.notifier.send_message(f"⚠️ GPT 종목 선정 중 오류 발생: {str(e)}")
             return False
             
-    def _load_current_holdings(self):
-        """현재 보유 중인 종목 정보 로드"""
+    @traced('gpt_auto_trader.load_holdings', 'internal')
+    def _load_current_holdings(self, force=False):
+        """
+        현재 보유 중인 종목 정보 로드 (공유 포지션 장부에서 읽음)
+        
+        Args:
+            force: 대조 간격과 관계없이 증권사 잔고와 즉시 대조 (주문 직후)
+        """
         try:
-            # 증권사 API를 통해 보유 종목 정보 가져오기
-            positions = self.broker.get_positions()
-            self.holdings = {}
-            
-            # positions가 dict인 경우 (key-value 형태)
-            if isinstance(positions, dict):
-                logger.debug("Dict 형태의 positions 처리")
-                for symbol, position in positions.items():
-                    self.holdings[symbol] = {
-                        'symbol': symbol,
-                        'name': position.get('name', symbol),
-                        'quantity': position.get('quantity', 0),
-                        'avg_price': position.get('avg_price', 0),
-                        'current_price': position.get('current_price', 0),
-                        'market': position.get('market', 'KR'),
-                        'entry_time': position.get('entry_time', get_current_time().isoformat())
-                    }
-            # positions가 list인 경우 (항목 리스트 형태)
-            elif isinstance(positions, list):
-                logger.debug("List 형태의 positions 처리")
-                for position in positions:
-                    # KISAPI의 응답 형식 처리 추가
-                    if "종목코드" in position:
-                        # KISAPI 응답 형식 (한글 키)
-                        symbol = position.get("종목코드", "")
-                        if symbol:
-                            # 종목코드 앞에 'A' 추가 (필요시)
-                            if len(symbol) == 6 and symbol.isdigit():
-                                symbol_key = symbol  # 원본 종목코드를 키로 사용
-                            else:
-                                symbol_key = symbol
-                                
-                            self.holdings[symbol_key] = {
-                                'symbol': symbol,
-                                'name': position.get("종목명", symbol),
-                                'quantity': position.get("보유수량", 0),
-                                'avg_price': position.get("평균단가", 0),
-                                'current_price': position.get("현재가", 0),
-                                'market': 'KR',  # 한국투자증권 API는 국내 주식만 제공
-                                'entry_time': get_current_time().isoformat()
-                            }
-                    elif "pdno" in position or "PDNO" in position:
-                        # KISAPI 모의투자 응답 형식 (영문 키)
-                        symbol = position.get("pdno", position.get("PDNO", ""))
-                        if symbol:
-                            self.holdings[symbol] = {
-                                'symbol': symbol,
-                                'name': position.get("prdt_name", position.get("PRDT_NAME", symbol)),
-                                'quantity': int(position.get("hldg_qty", position.get("HLDG_QTY", "0"))),
-                                'avg_price': int(float(position.get("pchs_avg_pric", position.get("PCHS_AVG_PRIC", "0")))),
-                                'current_price': int(float(position.get("prpr", position.get("PRPR", "0")))),
-                                'market': 'KR',
-                                'entry_time': get_current_time().isoformat()
-                            }
-                    else:
-                        # 일반 형식
-                        symbol = position.get('symbol')
-                        if not symbol:  # symbol이 없으면 건너뜀
-                            continue
-                        
-                        self.holdings[symbol] = {
-                            'symbol': symbol,
-                            'name': position.get('name', symbol),
-                            'quantity': position.get('quantity', 0),
-                            'avg_price': position.get('avg_price', 0),
-                            'current_price': position.get('current_price', 0),
-                            'market': position.get('market', 'KR'),
-                            'entry_time': position.get('entry_time', get_current_time().isoformat())
-                        }
-            else:
-                # 예상치 않은 형태
-                logger.warning(f"예상치 않은 positions 형식: {type(positions)}")
+            # 장부는 POSITION_RECONCILE_SECONDS 간격으로만 증권사와 대조하고, 다른 트레이더와 공유됨
+            self.position_book.reconcile(force=force)
+            self.holdings = self.position_book.as_dicts()
                 
             logger.info(f"보유 종목 로드 완료: {len(self.holdings)}개")
             
@@ -1218,12 +1164,20 @@ class GPTAutoTrader:
                     logger.debug(f"보유종목 상세: {symbol}, 이름: {data.get('name')}, "
                                f"수량: {data.get('quantity')}, 평단가: {data.get('avg_price'):,}원")
             
+            # 보유 종목 시세를 공유 데이터 서비스에 구독 (지원하는 제공자인 경우)
+            subscribe = getattr(self.data_provider, 'subscribe', None)
+            if subscribe is not None:
+                for market in ("KR", "US"):
+                    symbols = [symbol for symbol, data in self.holdings.items() if data.get('market', 'KR') == market]
+                    subscribe(f"GPTAutoTrader.holdings.{market}", symbols, market)
+            
             return True
             
         except Exception as e:
             logger.error(f"보유 종목 로드 중 오류 발생: {e}")
             return False
             
+    @traced('gpt_auto_trader.should_buy', 'internal')
     def _should_buy(self, stock_data):
         """
         GPT 추천 종목 매수 여부 결정
@@ -1327,6 +1281,7 @@ class GPTAutoTrader:
             logger.error(f"매수 결정 중 오류 발생: {e}")
             return False
             
+    @traced('gpt_auto_trader.should_sell', 'internal')
     def _should_sell(self, symbol):
         """
         보유 종목 매도 여부 결정
@@ -1412,6 +1367,7 @@ class GPTAutoTrader:
             logger.error(f"매도 결정 중 오류 발생: {e}")
             return False
             
+    @traced('gpt_auto_trader.execute_buy', 'internal')
     def _execute_buy(self, stock_data):
         """
         GPT 추천 종목 매수 실행
@@ -1493,9 +1449,8 @@ class GPTAutoTrader:
                     }
                     self.trade_history.append(trade_record)
                     
-                    # 주문 후 잔고 변화 확인을 위해 지연시간 추가
-                    logger.info(f"주문 체결 후 API 반영 대기 시작...")
-                    time.sleep(10)  # 10초로 증가 - 모의투자 API 반영 시간 고려
+                    # 체결 확인 대기 (주문 추적기가 체결을 확인하는 즉시 반환, 고정 대기 없음)
+                    self.order_tracker.wait(order_result.get('order_no'), self.order_fill_timeout)
                     
                     # 매수 후 계좌 잔고 확인 - 증권사 API 데이터만 사용
                     post_balance_info = self.broker.get_balance()
@@ -1507,7 +1462,7 @@ class GPTAutoTrader:
                     logger.info(f"주문가능금액 변화: -{cash_diff:,.0f}원 (예상: -{expected_total:,.0f}원)")
                     
                     # 보유 종목 업데이트 (증권사 API에서 제공하는 데이터만 사용)
-                    self._load_current_holdings()
+                    self._load_current_holdings(force=True)
                     
                     # 알림 전송
                     if self.notifier:
@@ -1567,6 +1522,7 @@ class GPTAutoTrader:
             logger.error(f"매수 실행 중 오류 발생: {e}")
             return False
             
+    @traced('gpt_auto_trader.execute_sell', 'internal')
     def _execute_sell(self, symbol):
         """
         보유 종목 매도 실행
@@ -1623,7 +1579,7 @@ class GPTAutoTrader:
                 self.trade_history.append(trade_record)
                 
                 # 보유 종목 업데이트
-                self._load_current_holdings()
+                self._load_current_holdings(force=True)
                 
                 return True
             else:
@@ -1700,6 +1656,7 @@ class GPTAutoTrader:
                 'timestamp': datetime.datetime.now().isoformat()
             }
 
+    @traced('gpt_auto_trader.execute_buy_decision', 'internal')
     def _execute_buy_decision(self, buy_decision):
         """
         GPT가 제안한 매수 결정 실행 (신규 추가)
@@ -1782,11 +1739,11 @@ class GPTAutoTrader:
                     }
                     self.trade_history.append(trade_record)
                     
-                    # 주문 후 잔고 변화 확인을 위해 지연시간 추가
-                    time.sleep(2)
+                    # 체결 확인 대기 (주문 추적기가 체결을 확인하는 즉시 반환, 고정 대기 없음)
+                    self.order_tracker.wait(order_result.get('order_no'), self.order_fill_timeout)
                     
                     # 보유 종목 업데이트
-                    self._load_current_holdings()
+                    self._load_current_holdings(force=True)
                     
                     # 알림 전송
                     if self.notifier:
@@ -1930,76 +1887,79 @@ class GPTAutoTrader:
         Returns:
             dict: 사이클 실행 결과 요약
         """
-        logger.info("GPT 매매 사이클 실행 시작")
+        with get_tracer().span("gpt_auto_trader.run_cycle", "cycle", slow=self.trace_slow_cycle_seconds):
+            logger.info("GPT 매매 사이클 실행 시작")
         
-        try:
-            # 자동 매매가 실행 중이 아니면 자동으로 시작
-            if not self.is_running:
-                logger.info("GPT 자동 매매가 실행 중이 아닙니다. 자동으로 시작합니다.")
-                start_success = self.start()
-                if not start_success:
-                    logger.error("GPT 자동 매매 시작 실패")
-                    return {"status": "error", "message": "GPT 자동 매매가 실행 중이 아니고 자동 시작에 실패했습니다."}
-                logger.info("GPT 자동 매매 자동 시작 성공")
-            
-            # 현재 시간에 거래가 가능한지 확인
-            if not self.is_trading_time("KR"):
-                logger.info("현재 거래 시간이 아닙니다.")
-                return {"status": "skip", "message": "현재 거래 시간이 아닙니다."}
-                
-            # 현재 보유 중인 종목 정보 로드
-            self._load_current_holdings()
+            try:
+                # 자동 매매가 실행 중이 아니면 자동으로 시작
+                if not self.is_running:
+                    logger.info("GPT 자동 매매가 실행 중이 아닙니다. 자동으로 시작합니다.")
+                    start_success = self.start()
+                    if not start_success:
+                        logger.error("GPT 자동 매매 시작 실패")
+                        return {"status": "error", "message": "GPT 자동 매매가 실행 중이 아니고 자동 시작에 실패했습니다."}
+                    logger.info("GPT 자동 매매 자동 시작 성공")
+            
+                # 현재 시간에 거래가 가능한지 확인
+                if not self.is_trading_time("KR"):
+                    logger.info("현재 거래 시간이 아닙니다.")
+                    return {"status": "skip", "message": "현재 거래 시간이 아닙니다."}
+                
+                # 현재 보유 중인 종목 정보 로드
+                self._load_current_holdings()
             
-            # 1. 매도 결정 처리
-            sell_results = []
-            for symbol in list(self.holdings.keys()):
-                if self._should_sell(symbol):
-                    logger.info(f"{symbol} 매도 결정")
-                    if self._execute_sell(symbol):
-                        sell_results.append({"symbol": symbol, "status": "success"})
-                    else:
-                        sell_results.append({"symbol": symbol, "status": "fail"})
+                # 1. 매도 결정 처리
+                sell_results = []
+                for symbol in list(self.holdings.keys()):
+                    with get_tracer().span("gpt_auto_trader.sell_check", "symbol", symbol=symbol):
+                        if self._should_sell(symbol):
+                            logger.info(f"{symbol} 매도 결정")
+                            if self._execute_sell(symbol):
+                                sell_results.append({"symbol": symbol, "status": "success"})
+                            else:
+                                sell_results.append({"symbol": symbol, "status": "fail"})
                         
-            # 2. 매수 결정 처리
-            buy_results = []
-            # 추천 종목이 없으면 종목 선정 먼저 실행
-            if not self.gpt_selections['KR'] and not self.gpt_selections['US']:
-                self._select_stocks()
-                
-            for market, selections in self.gpt_selections.items():
-                for stock_data in selections:
-                    if self._should_buy(stock_data):
-                        symbol = stock_data.get('symbol')
-                        logger.info(f"{symbol} 매수 결정")
-                        if self._execute_buy(stock_data):
-                            buy_results.append({"symbol": symbol, "status": "success"})
-                        else:
-                            buy_results.append({"symbol": symbol, "status": "fail"})
-            
-            # 3. 기술적 지표 최적화 검사 (필요시 실행)
-            if self.optimize_technical_indicators:
-                if (self.last_technical_optimization_time is None or 
-                    (get_current_time() - self.last_technical_optimization_time).total_seconds() / 3600 > self.technical_optimization_interval):
-                    logger.info("기술적 지표 최적화 실행")
-                    try:
-                        if hasattr(self.gpt_strategy, 'optimize_technical_indicators'):
-                            self.gpt_strategy.optimize_technical_indicators()
-                        self.last_technical_optimization_time = get_current_time()
-                    except Exception as e:
-                        logger.error(f"기술적 지표 최적화 중 오류 발생: {e}")
-            
-            # 결과 요약
-            summary = {
-                "status": "success",
-                "timestamp": get_current_time_str(),
-                "holdings_count": len(self.holdings),
-                "sell_orders": sell_results,
-                "buy_orders": buy_results
-            }
+                # 2. 매수 결정 처리
+                buy_results = []
+                # 추천 종목이 없으면 종목 선정 먼저 실행
+                if not self.gpt_selections['KR'] and not self.gpt_selections['US']:
+                    self._select_stocks()
+                
+                for market, selections in self.gpt_selections.items():
+                    for stock_data in selections:
+                        with get_tracer().span("gpt_auto_trader.buy_check", "symbol", symbol=stock_data.get('symbol'), market=market):
+                            if self._should_buy(stock_data):
+                                symbol = stock_data.get('symbol')
+                                logger.info(f"{symbol} 매수 결정")
+                                if self._execute_buy(stock_data):
+                                    buy_results.append({"symbol": symbol, "status": "success"})
+                                else:
+                                    buy_results.append({"symbol": symbol, "status": "fail"})
+            
+                # 3. 기술적 지표 최적화 검사 (필요시 실행)
+                if self.optimize_technical_indicators:
+                    if (self.last_technical_optimization_time is None or 
+                        (get_current_time() - self.last_technical_optimization_time).total_seconds() / 3600 > self.technical_optimization_interval):
+                        logger.info("기술적 지표 최적화 실행")
+                        try:
+                            if hasattr(self.gpt_strategy, 'optimize_technical_indicators'):
+                                self.gpt_strategy.optimize_technical_indicators()
+                            self.last_technical_optimization_time = get_current_time()
+                        except Exception as e:
+                            logger.error(f"기술적 지표 최적화 중 오류 발생: {e}")
+            
+                # 결과 요약
+                summary = {
+                    "status": "success",
+                    "timestamp": get_current_time_str(),
+                    "holdings_count": len(self.holdings),
+                    "sell_orders": sell_results,
+                    "buy_orders": buy_results
+                }
             
-            logger.info(f"GPT 매매 사이클 완료: {len(sell_results)}개 매도, {len(buy_results)}개 매수")
-            return summary
+                logger.info(f"GPT 매매 사이클 완료: {len(sell_results)}개 매도, {len(buy_results)}개 매수")
+                return summary
             
-        except Exception as e:
-            logger.error(f"GPT 매매 사이클 실행 중 오류 발생: {e}")
-            return {"status": "error", "message": f"오류 발생: {str(e)}"}
\ No newline at end of file
+            except Exception as e:
+                logger.error(f"GPT 매매 사이클 실행 중 오류 발생: {e}")
+                return {"status": "error", "message": f"오류 발생: {str(e)}"}
\ No newline at end of file
@@ -2,20 +2,30 @@
 한국투자증권 API 연동 모듈
 """
 import logging
+import os
 import time
 import requests
 import json
+import threading
 import traceback  # traceback 모듈 추가
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import hashlib
 import jwt  # PyJWT 라이브러리 필요
 import uuid  # uuid 모듈 추가
 from urllib.parse import urljoin, unquote
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from pathlib import Path  # Path 추가
 from enum import Enum  # Enum 추가
 
 from .broker_base import BrokerBase
+from .order_tracker import get_order_tracker, FILLED
+from ..utils.token_cache import get_token_cache
+from ..utils.metrics import timed
+from ..utils.tracing import traced
 from ..utils.time_utils import get_current_time, get_adjusted_time, KST
 
 # 주문 타입 및 매매 구분 열거형 정의
@@ -33,6 +43,7 @@ logger = logging.getLogger('KISAPI')
 # API 호출 관련 상수
 API_RATE_LIMIT_DELAY = 3.0  # 초당 API 호출 최대 횟수를 고려한 딜레이 (초) - 1초에서 3초로 증가
 LAST_API_CALL_TIMES = {}  # API 종류별 마지막 호출 시간 기록
+ORDER_EXECUTION_MAX_PAGES = 20  # 당일 체결 내역 연속조회 최대 페이지 수 (한 번의 일괄 조회당)
 
 def ensure_api_rate_limit(api_name, is_real_trading=False):
     """
@@ -62,6 +73,11 @@ def ensure_api_rate_limit(api_name, is_real_trading=False):
     # 마지막 호출 시간 갱신
     LAST_API_CALL_TIMES[api_name] = time.time()
 
+def kis_token_path(app_key, real_trading, directory="cache"):
+    """앱키별 공유 토큰 캐시 파일 경로 (앱키 원문 대신 해시 사용)"""
+    digest = hashlib.sha256(str(app_key or "").encode()).hexdigest()[:12]
+    return os.path.join(directory, f"kis_token_{'real' if real_trading else 'virtual'}_{digest}.json")
+
 class KISAPI(BrokerBase):
     """한국투자증권 API 연동 클래스"""
     
@@ -109,6 +125,31 @@ class KISAPI(BrokerBase):
         self.token_expired_at = None
         self.hashkey = None
         
+        # 프로세스 간 공유 토큰 캐시 (앱키별 파일 하나를 main/api_server/check_status 등이 함께 사용)
+        token_path = kis_token_path(self.app_key, self.real_trading, getattr(config, 'KIS_TOKEN_CACHE_DIR', 'cache'))
+        self.token_cache = get_token_cache(
+            token_path, self._issue_token,
+            refresh_margin=getattr(config, 'KIS_TOKEN_REFRESH_MARGIN_SECONDS', 600)
+        )
+        
+        # 주문/해시키 요청용 HTTP 세션 (연결을 재사용해 요청마다 TLS 핸드셰이크를 하지 않음)
+        self.session = requests.Session()
+        pool_size = getattr(config, 'KIS_HTTP_POOL_SIZE', 10)
+        self.session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        
+        # 해시키 설정 (KIS 주문 API는 hashkey 헤더가 필수가 아니므로 끌 수 있음)
+        self.use_hashkey = getattr(config, 'KIS_USE_HASHKEY', True)
+        self._hashkey_cache = OrderedDict()  # {주문 본문 JSON: 해시키} - 같은 본문 재시도 시 재사용
+        self._hashkey_cache_size = getattr(config, 'KIS_HASHKEY_CACHE_SIZE', 256)
+        self._hashkey_lock = threading.Lock()
+        self._hashkey_executor = None
+        self._order_latency = {
+            'hashkey': deque(maxlen=1000),  # 해시키 발급 왕복 시간
+            'order_with_hashkey': deque(maxlen=1000),  # 본문 준비부터 주문 응답까지 (해시키 사용)
+            'order_without_hashkey': deque(maxlen=1000)  # 본문 준비부터 주문 응답까지 (해시키 미사용)
+        }
+        self.hashkey_stats = {'requests': 0, 'hits': 0, 'errors': 0}
+        
         # API 요청 관련 설정
         self.max_api_retries = 3  # API 재시도 최대 횟수
         self.api_retry_delay = 60  # 모의투자 API 장애 시 대기 시간(초)
@@ -138,6 +179,10 @@ class KISAPI(BrokerBase):
             "order_status": {
                 "real": "TTTC8036R",  # 실전투자 정정취소가능주문 조회
                 "virtual": "VTTC8036R"  # 모의투자 정정취소가능주문 조회
+            },
+            "daily_ccld": {
+                "real": "TTTC8001R",  # 실전투자 일별주문체결 조회
+                "virtual": "VTTC8001R"  # 모의투자 일별주문체결 조회
             }
         }
         
@@ -264,7 +309,7 @@ class KISAPI(BrokerBase):
         거래 유형에 따른 TR ID 반환
         
         Args:
-            tr_type: 거래 유형 ('balance', 'buy', 'sell', 'cancel', 'order_status')
+            tr_type: 거래 유형 ('balance', 'buy', 'sell', 'cancel', 'order_status', 'daily_ccld')
             
         Returns:
             str: TR ID
@@ -274,74 +319,83 @@ class KISAPI(BrokerBase):
         
     def connect(self):
         """
-        한국투자증권 API 연결 (토큰 발급)
+        한국투자증권 API 연결 (프로세스 간 공유 토큰 캐시에서 토큰을 가져오고, 없거나 만료가 가까울 때만 발급)
         """
         try:
-            # 토큰 발급 URL
-            url = urljoin(self.base_url, "oauth2/tokenP")
-            
-            # 요청 헤더
-            headers = {
-                "content-type": "application/json"
-            }
-            
-            # 요청 바디
-            body = {
-                "grant_type": "client_credentials",
-                "appkey": self.app_key,
-                "appsecret": self.app_secret
-            }
-            
-            # API 요청 전 로그
-            logger.info(f"한국투자증권 API 토큰 발급 요청 - URL: {url}")
-
-            # 재시도 로직 추가
-            max_retries = 3
-            retry_count = 0
-            retry_delay = 5  # 초 단위 대기 시간
-            
-            while retry_count < max_retries:
-                try:
-                    # 토큰 발급 요청
-                    response = requests.post(url, headers=headers, data=json.dumps(body))
-                    response_data = response.json()
-                    
-                    if response.status_code == 200:
-                        self.access_token = response_data.get('access_token')
-                        expires_in = response_data.get('expires_in', 86400)  # 기본 유효기간: 1일
-                        
-                        # datetime 직접 사용 대신 time_utils 사용
-                        current_time = get_current_time()
-                        self.token_expired_at = current_time + timedelta(seconds=expires_in)
-                        
-                        self.connected = True
-                        logger.info(f"한국투자증권 API 연결 성공. 토큰 만료시간: {self.token_expired_at}")
-                        return True
-                    else:
-                        err_msg = response_data.get('error_description', '')
-                        # 1분에 1회 요청 제한 오류인 경우
-                        if "접근토큰 발급 잠시 후 다시 시도하세요" in err_msg:
-                            retry_count += 1
-                            wait_time = retry_delay * (2 ** retry_count)  # 지수 백오프
-                            logger.warning(f"API 요청 제한 오류. {wait_time}초 후 재시도 ({retry_count}/{max_retries})... 오류: {err_msg}")
-                            time.sleep(wait_time)
-                            continue
-                        else:
-                            logger.error(f"한국투자증권 API 연결 실패: {err_msg}")
-                            return False
-                except Exception as req_err:
-                    retry_count += 1
-                    wait_time = retry_delay * (2 ** retry_count)
-                    logger.error(f"API 요청 중 오류 발생: {req_err}. {wait_time}초 후 재시도 ({retry_count}/{max_retries})...")
-                    time.sleep(wait_time)
-            
-            # 최대 재시도 횟수 초과
-            logger.error(f"최대 재시도 횟수({max_retries})를 초과하여 API 연결에 실패했습니다.")
-            return False
-                
+            self._apply_token(self.token_cache.get())
+            self.connected = True
+            # 만료 전에 백그라운드에서 미리 갱신 (재연결 시 발급 왕복 없음)
+            self.token_cache.start_refresh()
+            logger.info(f"한국투자증권 API 연결 성공. 토큰 만료시간: {self.token_expired_at}")
+            return True
         except Exception as e:
             logger.error(f"한국투자증권 API 연결 실패: {e}")
             return False
+    
+    def _apply_token(self, token):
+        """공유 캐시 토큰을 인스턴스에 반영"""
+        self.access_token = token['access_token']
+        self.token_expired_at = datetime.fromtimestamp(token['expires_at'], KST)
+    
+    def _issue_token(self):
+        """
+        토큰 발급 요청 (공유 토큰 캐시가 다른 프로세스와 겹치지 않도록 잠금을 잡은 상태에서 호출)
+        
+        Returns:
+            tuple: (access_token, expires_in 초)
+            
+        Raises:
+            Exception: 최대 재시도 후에도 발급 실패
+        """
+        # 토큰 발급 URL
+        url = urljoin(self.base_url, "oauth2/tokenP")
+        
+        # 요청 헤더
+        headers = {
+            "content-type": "application/json"
+        }
+        
+        # 요청 바디
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret
+        }
+        
+        # API 요청 전 로그
+        logger.info(f"한국투자증권 API 토큰 발급 요청 - URL: {url}")
+
+        # 재시도 로직 추가
+        max_retries = 3
+        retry_count = 0
+        retry_delay = 5  # 초 단위 대기 시간
+        
+        while retry_count < max_retries:
+            try:
+                # 토큰 발급 요청
+                response = requests.post(url, headers=headers, data=json.dumps(body))
+                response_data = response.json()
+            except Exception as req_err:
+                retry_count += 1
+                wait_time = retry_delay * (2 ** retry_count)
+                logger.error(f"API 요청 중 오류 발생: {req_err}. {wait_time}초 후 재시도 ({retry_count}/{max_retries})...")
+                time.sleep(wait_time)
+                continue
+                
+            if response.status_code == 200:
+                return response_data.get('access_token'), response_data.get('expires_in', 86400)  # 기본 유효기간: 1일
+                
+            err_msg = response_data.get('error_description', '')
+            # 1분에 1회 요청 제한 오류인 경우
+            if "접근토큰 발급 잠시 후 다시 시도하세요" not in err_msg:
+                raise RuntimeError(f"토큰 발급 실패: {err_msg}")
+            retry_count += 1
+            wait_time = retry_delay * (2 ** retry_count)  # 지수 백오프
+            logger.warning(f"API 요청 제한 오류. {wait_time}초 후 재시도 ({retry_count}/{max_retries})... 오류: {err_msg}")
+            time.sleep(wait_time)
+        
+        # 최대 재시도 횟수 초과
+        raise RuntimeError(f"최대 재시도 횟수({max_retries})를 초과하여 토큰 발급에 실패했습니다.")
             
     def disconnect(self):
         """
@@ -361,23 +415,33 @@ class KISAPI(BrokerBase):
         # datetime 직접 사용 대신 time_utils 사용
         current_time = get_current_time()
         
-        # 토큰 만료 10분 전에 재발급
+        # 토큰 만료 10분 전이면 공유 캐시에서 다시 가져옴 (보통 백그라운드 갱신이 이미 새 토큰을 저장해 둠)
         if current_time > self.token_expired_at - timedelta(minutes=10):
-            logger.info("토큰 유효기간이 10분 이내로 남아 재발급합니다.")
+            logger.info("토큰 유효기간이 10분 이내로 남아 공유 캐시에서 갱신합니다.")
             return self.connect()
             
         return True
         
     def _get_hashkey(self, data):
         """
-        해시키 발급
+        해시키 발급 (같은 본문은 캐시된 해시키 재사용)
         
         Args:
             data: 해시키를 발급받을 데이터
             
         Returns:
-            str: 해시키
+            str: 해시키 (실패 시 None)
         """
+        # 해시키는 실제 전송할 본문 문자열 기준이므로 주문 요청과 같은 직렬화 결과를 키로 사용
+        payload = json.dumps(data)
+        with self._hashkey_lock:
+            self.hashkey_stats['requests'] += 1
+            hashkey = self._hashkey_cache.get(payload)
+            if hashkey is not None:
+                self._hashkey_cache.move_to_end(payload)
+                self.hashkey_stats['hits'] += 1
+                return hashkey
+        
         url = urljoin(self.base_url, "uapi/hashkey")
         
         headers = {
@@ -386,13 +450,82 @@ class KISAPI(BrokerBase):
             "appsecret": self.app_secret
         }
         
-        response = requests.post(url, headers=headers, data=json.dumps(data))
+        start_time = time.monotonic()
+        try:
+            response = self.session.post(url, headers=headers, data=payload, timeout=10)
+        except requests.RequestException as e:
+            self.hashkey_stats['errors'] += 1
+            logger.error(f"해시키 발급 요청 중 네트워크 오류: {e}")
+            return None
+        elapsed = time.monotonic() - start_time
         
         if response.status_code == 200:
-            return response.json()["HASH"]
+            hashkey = response.json()["HASH"]
+            with self._hashkey_lock:
+                self._order_latency['hashkey'].append(elapsed)
+                self._hashkey_cache[payload] = hashkey
+                if len(self._hashkey_cache) > self._hashkey_cache_size:
+                    self._hashkey_cache.popitem(last=False)
+            return hashkey
         else:
+            self.hashkey_stats['errors'] += 1
             logger.error(f"해시키 발급 실패: {response.text}")
             return None
+    
+    def _start_hashkey(self, body):
+        """
+        주문 본문의 해시키 발급을 백그라운드에서 시작 (호출자는 그동안 나머지 주문 준비를 진행)
+        
+        Returns:
+            Future: 해시키로 완료 (해시키를 쓰지 않으면 None)
+        """
+        if not self.use_hashkey:
+            return None
+        with self._hashkey_lock:
+            if self._hashkey_executor is None:
+                self._hashkey_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="KISHashkey")
+            executor = self._hashkey_executor
+        return executor.submit(self._get_hashkey, body)
+    
+    def _order_headers(self, tr_id, hashkey_future=None):
+        """
+        주문 API 헤더 생성 (해시키를 쓰면 발급 완료를 기다려 포함)
+        
+        Returns:
+            dict: 헤더 (해시키 발급 실패 시 None)
+        """
+        headers = {
+            "content-type": "application/json",
+            "authorization": f"Bearer {self.access_token}",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+            "tr_id": tr_id,
+            "custtype": "P"
+        }
+        if hashkey_future is not None:
+            hashkey = hashkey_future.result()
+            if not hashkey:
+                return None
+            headers["hashkey"] = hashkey
+        return headers
+    
+    def _record_order_latency(self, started, with_hashkey):
+        """본문 준비부터 주문 응답까지의 지연 기록"""
+        name = 'order_with_hashkey' if with_hashkey else 'order_without_hashkey'
+        with self._hashkey_lock:
+            self._order_latency[name].append(time.monotonic() - started)
+    
+    def order_latency_stats(self):
+        """해시키 발급, 해시키 사용/미사용 주문 지연 통계 (초)"""
+        with self._hashkey_lock:
+            samples = {name: list(values) for name, values in self._order_latency.items()}
+        return {
+            name: {'count': len(values), 'mean': float(np.mean(values)) if values else 0.0,
+                   'p50': float(np.percentile(values, 50)) if values else 0.0,
+                   'p95': float(np.percentile(values, 95)) if values else 0.0,
+                   'max': max(values) if values else 0.0}
+            for name, values in samples.items()
+        }
         
     def login(self, user_id=None, password=None, cert_password=None):
         """
@@ -447,6 +580,8 @@ class KISAPI(BrokerBase):
             logger.error(f"계좌 목록 조회 실패: {e}")
             return []
     
+    @timed('kis_get_balance_seconds', 'KISAPI.get_balance 소요 시간 (캐시 적중 포함)')
+    @traced('kis.get_balance', 'broker')
     def get_balance(self, force_refresh=False, timestamp=None):
         """
         계좌 잔고 조회
@@ -595,6 +730,7 @@ class KISAPI(BrokerBase):
             self.logger.exception(f"계좌 잔고 조회 중 예외 발생: {e}")
             return {"error": str(e)}
     
+    @traced('kis.get_positions', 'broker')
     def get_positions(self, account_number=None, force_refresh=False):
         """
         보유 종목 조회
@@ -806,6 +942,7 @@ class KISAPI(BrokerBase):
             logger.error(traceback.format_exc())
             return []
     
+    @traced('kis.buy_stock', 'broker')
     def buy_stock(self, code, quantity, price=0, order_type='market', account_number=None):
         """
         주식 매수 주문
@@ -824,9 +961,6 @@ class KISAPI(BrokerBase):
             logger.error("API 연결이 되지 않았습니다.")
             return ""
         
-        # API 호출 속도 제한 준수
-        ensure_api_rate_limit("buy_stock", self.real_trading)
-        
         if account_number is None:
             account_number = self.account_number
             
@@ -867,25 +1001,21 @@ class KISAPI(BrokerBase):
                 "ORD_UNPR": str(int(price)) if price > 0 else "0"
             }
             
-            # 해시키 생성
-            hashkey = self._get_hashkey(body)
-            if not hashkey:
-                logger.error("해시키 생성 실패")
-                return ""
+            # 해시키 발급을 먼저 시작하고 API 호출 속도 제한 대기와 겹쳐서 진행
+            prepare_start = time.monotonic()
+            hashkey_future = self._start_hashkey(body)
+            
+            # API 호출 속도 제한 준수
+            ensure_api_rate_limit("buy_stock", self.real_trading)
             
             # TR ID 가져오기
             tr_id = self._get_tr_id("buy")
             
-            # API 헤더
-            headers = {
-                "content-type": "application/json",
-                "authorization": f"Bearer {self.access_token}",
-                "appkey": self.app_key,
-                "appsecret": self.app_secret,
-                "tr_id": tr_id,
-                "custtype": "P",
-                "hashkey": hashkey
-            }
+            # API 헤더 (해시키 발급 완료 대기)
+            headers = self._order_headers(tr_id, hashkey_future)
+            if headers is None:
+                logger.error("해시키 생성 실패")
+                return ""
             
             # API 요청 지연/실패에 대비한 재시도 로직
             retry_count = 0
@@ -895,8 +1025,9 @@ class KISAPI(BrokerBase):
                 try:
                     # 주문 요청
                     start_time = time.time()
-                    response = requests.post(url, headers=headers, data=json.dumps(body), timeout=30)
+                    response = self.session.post(url, headers=headers, data=json.dumps(body), timeout=30)
                     response_time = time.time() - start_time
+                    self._record_order_latency(prepare_start, hashkey_future is not None)
                     
                     response_data = response.json()
                     
@@ -959,6 +1090,7 @@ class KISAPI(BrokerBase):
             logger.error(f"매수 주문 실패: {e}")
             return ""
     
+    @traced('kis.sell_stock', 'broker')
     def sell_stock(self, code, quantity, price=0, order_type='market', account_number=None):
         """
         주식 매도 주문
@@ -977,9 +1109,6 @@ class KISAPI(BrokerBase):
             logger.error("API 연결이 되지 않았습니다.")
             return ""
         
-        # API 호출 속도 제한 준수
-        ensure_api_rate_limit("sell_stock", self.real_trading)
-        
         if account_number is None:
             account_number = self.account_number
             
@@ -1020,25 +1149,21 @@ class KISAPI(BrokerBase):
                 "ORD_UNPR": str(int(price)) if price > 0 else "0"
             }
             
-            # 해시키 생성
-            hashkey = self._get_hashkey(body)
-            if not hashkey:
-                logger.error("해시키 생성 실패")
-                return ""
+            # 해시키 발급을 먼저 시작하고 API 호출 속도 제한 대기와 겹쳐서 진행
+            prepare_start = time.monotonic()
+            hashkey_future = self._start_hashkey(body)
+            
+            # API 호출 속도 제한 준수
+            ensure_api_rate_limit("sell_stock", self.real_trading)
             
             # TR ID 가져오기
             tr_id = self._get_tr_id("sell")
             
-            # API 헤더
-            headers = {
-                "content-type": "application/json",
-                "authorization": f"Bearer {self.access_token}",
-                "appkey": self.app_key,
-                "appsecret": self.app_secret,
-                "tr_id": tr_id,
-                "custtype": "P",
-                "hashkey": hashkey
-            }
+            # API 헤더 (해시키 발급 완료 대기)
+            headers = self._order_headers(tr_id, hashkey_future)
+            if headers is None:
+                logger.error("해시키 생성 실패")
+                return ""
             
             # API 요청 지연/실패에 대비한 재시도 로직
             retry_count = 0
@@ -1048,8 +1173,9 @@ class KISAPI(BrokerBase):
                 try:
                     # 주문 요청
                     start_time = time.time()
-                    response = requests.post(url, headers=headers, data=json.dumps(body), timeout=30)
+                    response = self.session.post(url, headers=headers, data=json.dumps(body), timeout=30)
                     response_time = time.time() - start_time
+                    self._record_order_latency(prepare_start, hashkey_future is not None)
                     
                     response_data = response.json()
                     
@@ -1112,6 +1238,7 @@ class KISAPI(BrokerBase):
             logger.error(f"매도 주문 실패: {e}")
             return ""
     
+    @traced('kis.cancel_order', 'broker')
     def cancel_order(self, order_number, code, quantity=0, price=0, order_type='market', account_number=None):
         """
         주문 취소
@@ -1171,28 +1298,20 @@ class KISAPI(BrokerBase):
                 "QTY_ALL_ORD_YN": "Y" if quantity == 0 else "N"  # 잔량전부주문여부
             }
             
-            # 해시키 생성
-            hashkey = self._get_hashkey(body)
-            if not hashkey:
-                logger.error("해시키 생성 실패")
-                return False
+            # 해시키 발급 (사용하는 경우)
+            hashkey_future = self._start_hashkey(body)
             
             # TR ID 가져오기
             tr_id = self._get_tr_id("cancel")
             
-            # API 헤더
-            headers = {
-                "content-type": "application/json",
-                "authorization": f"Bearer {self.access_token}",
-                "appkey": self.app_key,
-                "appsecret": self.app_secret,
-                "tr_id": tr_id,
-                "custtype": "P",
-                "hashkey": hashkey
-            }
+            # API 헤더 (해시키 발급 완료 대기)
+            headers = self._order_headers(tr_id, hashkey_future)
+            if headers is None:
+                logger.error("해시키 생성 실패")
+                return False
             
             # 취소 요청
-            response = requests.post(url, headers=headers, data=json.dumps(body))
+            response = self.session.post(url, headers=headers, data=json.dumps(body), timeout=30)
             response_data = response.json()
             
             if response.status_code == 200 and response_data.get('rt_cd') == '0':
@@ -1208,6 +1327,7 @@ class KISAPI(BrokerBase):
             logger.error(f"주문 취소 요청 실패: {e}")
             return False
     
+    @traced('kis.get_current_price', 'broker')
     def get_current_price(self, code):
         """
         현재가 조회
@@ -1263,6 +1383,7 @@ class KISAPI(BrokerBase):
             logger.error(f"현재가 조회 실패: {e}")
             return 0
     
+    @traced('kis.get_order_status', 'broker')
     def get_order_status(self, order_number, account_number=None):
         """
         주문 상태 조회
@@ -1389,6 +1510,106 @@ class KISAPI(BrokerBase):
             logger.error(traceback.format_exc())  # 상세 에러 스택트레이스 출력
             return {}
             
+    @traced('kis.get_order_executions', 'broker')
+    def get_order_executions(self, account_number=None):
+        """
+        당일 주문 체결 내역 일괄 조회 (주문 추적기가 미체결 주문 전체를 한 번에 갱신할 때 사용)
+        
+        Args:
+            account_number: 계좌번호 (None인 경우 기본 계좌 사용)
+            
+        Returns:
+            list: 주문별 체결 정보 목록 (get_order_status와 같은 한글 키 + 체결단가/취소여부)
+        """
+        if not self._check_token():
+            logger.error("API 연결이 되지 않았습니다.")
+            return []
+            
+        if account_number is None:
+            account_number = self.account_number
+            
+        if not account_number:
+            logger.error("계좌번호가 설정되지 않았습니다.")
+            return []
+            
+        try:
+            # API 호출 속도 제한 준수
+            ensure_api_rate_limit("get_order_executions", self.real_trading)
+            
+            url = urljoin(self.base_url, "uapi/domestic-stock/v1/trading/inquire-daily-ccld")
+            headers = self._get_headers(self._get_tr_id("daily_ccld"))
+            
+            if len(account_number) >= 10:
+                cano = account_number[:-2]
+                acnt_prdt_cd = account_number[-2:]
+            else:
+                cano = account_number
+                acnt_prdt_cd = self.product_code
+            
+            today = get_current_time().strftime("%Y%m%d")
+            params = {
+                "CANO": cano,
+                "ACNT_PRDT_CD": acnt_prdt_cd,
+                "INQR_STRT_DT": today,
+                "INQR_END_DT": today,
+                "SLL_BUY_DVSN_CD": "00",  # 전체
+                "INQR_DVSN": "00",  # 역순
+                "PDNO": "",
+                "CCLD_DVSN": "00",  # 체결/미체결 전체
+                "ORD_GNO_BRNO": "",
+                "ODNO": "",
+                "INQR_DVSN_3": "00",
+                "INQR_DVSN_1": "",
+                "CTX_AREA_FK100": "",
+                "CTX_AREA_NK100": ""
+            }
+            
+            executions = []
+            # 결과가 한 번에 오지 않으면 응답 헤더 tr_cont가 F/M이므로 연속조회 키로 다음 페이지를 이어서 조회
+            for page in range(ORDER_EXECUTION_MAX_PAGES):
+                if page:
+                    ensure_api_rate_limit("get_order_executions", self.real_trading)
+                response = self.session.get(url, headers=headers, params=params, timeout=10)
+                if response.status_code != 200:
+                    logger.error(f"주문 체결 내역 조회 실패: HTTP {response.status_code} - {response.text}")
+                    return executions
+                    
+                response_data = response.json()
+                if response_data.get('rt_cd') != '0':
+                    logger.error(f"주문 체결 내역 조회 실패: [{response_data.get('rt_cd')}] {response_data.get('msg1')}")
+                    return executions
+                
+                for order in response_data.get('output1', []):
+                    order_quantity = int(order.get('ord_qty', '0') or 0)
+                    executed_quantity = int(order.get('tot_ccld_qty', '0') or 0)
+                    executions.append({
+                        "주문번호": order.get('odno', ''),
+                        "종목코드": order.get('pdno', ''),
+                        "종목명": order.get('prdt_name', ''),
+                        "매매구분": "매도" if order.get('sll_buy_dvsn_cd') == '01' else "매수",
+                        "주문수량": order_quantity,
+                        "체결수량": executed_quantity,
+                        "미체결수량": int(order.get('rmn_qty', '0') or 0),
+                        "주문가격": float(order.get('ord_unpr', '0') or 0),
+                        "체결단가": float(order.get('avg_prvs', '0') or 0),
+                        "취소여부": order.get('cncl_yn', 'N') == 'Y'
+                    })
+                
+                next_key = (response_data.get('ctx_area_nk100') or '').strip()
+                if response.headers.get('tr_cont') not in ('F', 'M') or not next_key:
+                    break
+                params["CTX_AREA_FK100"] = (response_data.get('ctx_area_fk100') or '').strip()
+                params["CTX_AREA_NK100"] = next_key
+                headers["tr_cont"] = "N"
+            else:
+                logger.warning(f"주문 체결 내역이 {ORDER_EXECUTION_MAX_PAGES}페이지를 넘어 나머지는 다음 조회로 미룸")
+            logger.debug(f"주문 체결 내역 조회 성공: {len(executions)}건")
+            return executions
+                
+        except Exception as e:
+            logger.error(f"주문 체결 내역 조회 실패: {e}")
+            return []
+            
     def switch_to_real(self):
         """실전투자로 전환"""
         if self.real_trading:
@@ -1541,25 +1762,14 @@ class KISAPI(BrokerBase):
                     "message": f"매수 주문이 접수되었습니다. (주문번호: {order_number})"
                 }
                 
+                # 체결 확인은 주문 추적기가 백그라운드에서 수행 (wait_for_order_execution으로 대기 가능)
+                get_order_tracker(self, self.config).track(order_number, symbol, "BUY", quantity, price, market)
+                
                 # 계좌 잔고 업데이트
                 account_balance = self.get_balance(force_refresh=True)
                 deposit = account_balance.get('예수금', 0)
                 total_eval = account_balance.get('총평가금액', 0)
                 
-                # 매수 후 보유 상태 확인 - 시간을 두고 API 호출
-                time.sleep(1)
-                new_positions = self.get_positions()
-                new_quantity = 0
-                new_avg_price = 0
-                
-                # 매수 후 보유량과 평단가 확인
-                for pos in new_positions:
-                    if pos.get('종목코드', '').strip() == symbol.strip() or pos.get('종목코드', '').strip() == trade_symbol.strip():
-                        new_quantity = pos.get('quantity', 0)
-                        new_avg_price = pos.get('avg_price', 0)
-                        logger.info(f"매수 후 보유 상태: {symbol}, 수량: {new_quantity}주, 평단가: {new_avg_price:,}원")
-                        break
-                
                 # 카카오톡 메시지 전송
                 try:
                     from src.notification.kakao_sender import KakaoSender
@@ -1608,21 +1818,9 @@ class KISAPI(BrokerBase):
                 except Exception as e:
                     logger.warning(f"카카오톡 알림 전송 중 오류 발생: {e}")
                 
-                # 매매 후 로직 처리 (예: 잔고 업데이트, 포지션 기록 등)
-                try:
-                    # 1. 강제 대기 - API 서버에서 주문 처리 시간 확보
-                    time.sleep(1)
-                    
-                    # 2. 잔고 업데이트 확인
-                    updated_balance = self.get_balance(force_refresh=True)
-                    logger.info(f"매수 후 계좌 잔고: {updated_balance.get('예수금', 0):,}원")
-                    
-                    # 3. ChatGPT 분석기에게 매매 실행 결과 전달 (향후 확장을 위한 자리)
-                    if hasattr(self.config, 'NOTIFY_CHATGPT') and self.config.NOTIFY_CHATGPT:
-                        logger.info(f"ChatGPT에게 매매 실행 결과를 전달합니다: {symbol} 매수 완료")
-                    
-                except Exception as e:
-                    logger.warning(f"매수 후 추가 로직 처리 중 오류 발생: {e}")
+                # ChatGPT 분석기에게 매매 실행 결과 전달 (향후 확장을 위한 자리)
+                if hasattr(self.config, 'NOTIFY_CHATGPT') and self.config.NOTIFY_CHATGPT:
+                    logger.info(f"ChatGPT에게 매매 실행 결과를 전달합니다: {symbol} 매수 완료")
                 
                 return result
             else:
@@ -1745,6 +1943,9 @@ class KISAPI(BrokerBase):
             if order_number:
                 logger.info(f"매도 주문 성공: {symbol}, {quantity}주, 주문번호: {order_number}")
                 
+                # 체결 확인은 주문 추적기가 백그라운드에서 수행 (wait_for_order_execution으로 대기 가능)
+                get_order_tracker(self, self.config).track(order_number, symbol, "SELL", quantity, price, market)
+                
                 # 주문 결과 생성
                 result = {
                     "success": True,
@@ -1797,34 +1998,9 @@ class KISAPI(BrokerBase):
                 except Exception as e:
                     logger.warning(f"카카오톡 알림 전송 중 오류 발생: {e}")
                 
-                # 매매 후 로직 처리 (예: 잔고 업데이트, 포지션 기록 등)
-                try:
-                    # 1. 강제 대기 - API 서버에서 주문 처리 시간 확보
-                    time.sleep(1)
-                    
-                    # 2. 잔고 업데이트 확인
-                    updated_balance = self.get_balance(force_refresh=True)
-                    logger.info(f"매도 후 계좌 잔고: {updated_balance.get('예수금', 0):,}원")
-                    
-                    # 3. 보유 종목 업데이트 확인
-                    positions = self.get_positions()
-                    has_position = False
-                    for pos in positions:
-                        if pos.get('종목코드', '').strip() == symbol.strip():
-                            has_position = True
-                            remaining_qty = pos.get('quantity', 0)
-                            logger.info(f"매도 후 보유 수량: {remaining_qty}주 ({symbol})")
-                            break
-                    
-                    if not has_position:
-                        logger.info(f"매도 완료: {symbol} 종목을 모두 매도했습니다.")
-                    
-                    # 4. ChatGPT 분석기에게 매매 실행 결과 전달 (향후 확장을 위한 자리)
-                    if hasattr(self.config, 'NOTIFY_CHATGPT') and self.config.NOTIFY_CHATGPT:
-                        logger.info(f"ChatGPT에게 매매 실행 결과를 전달합니다: {symbol} 매도 완료")
-                    
-                except Exception as e:
-                    logger.warning(f"매도 후 추가 로직 처리 중 오류 발생: {e}")
+                # ChatGPT 분석기에게 매매 실행 결과 전달 (향후 확장을 위한 자리)
+                if hasattr(self.config, 'NOTIFY_CHATGPT') and self.config.NOTIFY_CHATGPT:
+                    logger.info(f"ChatGPT에게 매매 실행 결과를 전달합니다: {symbol} 매도 완료")
                 
                 return result
             else:
@@ -2102,7 +2278,7 @@ class KISAPI(BrokerBase):
         
     def wait_for_order_execution(self, order_number, timeout=10):
         """
-        주문 체결 대기 및 확인
+        주문 체결 대기 및 확인 (주문 추적기가 체결/취소를 확인하는 즉시 반환)
         
         Args:
             order_number: 주문번호
@@ -2111,41 +2287,19 @@ class KISAPI(BrokerBase):
         Returns:
             dict: 체결 결과 정보
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            # 주문 상태 확인
-            try:
-                order_status = self.get_order_status(order_number)
-                
-                if not order_status:
-                    # 일시적인 조회 실패인 경우 재시도
-                    self.logger.warning(f"주문 상태 조회 실패, 재시도 중... (주문번호: {order_number})")
-                    time.sleep(1)
-                    continue
-                    
-                # 주문 상태에 따라 처리
-                if order_status.get('미체결수량', 0) == 0:
-                    # 전체 체결된 경우
-                    self.logger.info(f"주문 전체 체결 완료: {order_number}")
-                    return {'status': 'FILLED', 'detail': order_status}
-                
-                # 일부만 체결된 경우
-                if order_status.get('체결수량', 0) > 0:
-                    self.logger.info(f"주문 일부 체결: {order_number}, 체결수량: {order_status.get('체결수량')}")
-            except Exception as e:
-                self.logger.error(f"주문 상태 조회 중 예외 발생: {e}")
-                
-            # 대기
-            time.sleep(1)
-            
+        tracker = get_order_tracker(self, self.config)
+        tracker.track(order_number)
+        order = tracker.wait(order_number, timeout)
+        if order is None:
+            return {'status': 'UNKNOWN', 'detail': {}}
+            
+        if order.state == FILLED:
+            self.logger.info(f"주문 전체 체결 완료: {order_number}")
+            return {'status': 'FILLED', 'detail': order.to_dict()}
+        
         # 타임아웃 - 체결 완료되지 않음
-        self.logger.warning(f"주문 체결 대기 타임아웃: {order_number}")
-        try:
-            last_status = self.get_order_status(order_number)
-            return {'status': 'PARTIALLY_FILLED', 'detail': last_status}
-        except Exception as e:
-            self.logger.error(f"타임아웃 후 주문 상태 조회 실패: {e}")
-            return {'status': 'UNKNOWN', 'detail': {'error': str(e)}}
+        self.logger.warning(f"주문 체결 대기 종료: {order_number} ({order.state})")
+        return {'status': order.state if order.done else 'PARTIALLY_FILLED', 'detail': order.to_dict()}
 
     def get_account_balance(self):
         """계좌 잔고 조회 메서드
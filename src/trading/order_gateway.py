@@ -0,0 +1,477 @@
+"""
+주문 게이트웨이 모듈
+
+AutoTrader, RealtimeTrader, GPTAutoTrader가 각자 현금/수량/한도를 확인하고 증권사 API를
+동기 호출하던 주문 경로를 하나의 큐로 모읍니다.
+
+- 사전 위험 점검: 큐에 쌓인 주문을 묶음 단위로 한 번에(pandas 벡터 연산) 점검합니다.
+  1회 최대 금액(MAX_AMOUNT_PER_TRADE), 종목당 최대 보유 수량(MAX_QUANTITY_PER_SYMBOL),
+  주문가능금액, 최대 보유 종목 수(ORDER_MAX_POSITIONS), 매도 가능 수량을 공유 포지션 장부 기준으로
+  확인하며, 같은 묶음 안의 앞선 주문과 아직 체결되지 않은 승인 주문도 함께 반영합니다.
+  매수 금액 예약은 증권사가 주문을 접수할 때까지만 유지합니다 (접수된 주문은 증권사 주문가능금액에서
+  이미 차감됨). 수량 예약은 증권사가 거부하거나 주문 추적기가 종료 상태(체결/취소/거부)를 알릴 때까지
+  유지합니다. 잔고 조회에 실패하면 마지막으로 확인한 주문가능금액을 쓰고, 그것도 없으면 매수를 거부합니다.
+- 동시 제출: 승인된 주문은 작업 스레드 풀에서 증권사 초당 주문 한도(ORDER_RATE_PER_SECOND)
+  안에서 동시에 제출하고, 접수된 주문은 주문 추적기에 등록합니다.
+- 지연 측정: 신호(주문 요청 생성)부터 증권사 제출까지, 그리고 증권사 응답까지의 시간을 기록합니다.
+
+같은 브로커를 쓰는 트레이더는 get_order_gateway(broker)로 같은 게이트웨이를 공유합니다.
+"""
+import logging
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, TimeoutError
+
+import numpy as np
+import pandas as pd
+
+from .order_tracker import get_order_tracker
+from .position_book import get_position_book
+
+# 로거 설정
+logger = logging.getLogger('OrderGateway')
+
+BUY = "BUY"
+SELL = "SELL"
+
+# 위험 점검 거부 사유 (점검 순서대로 첫 번째 위반 사유를 사용)
+RISK_REASONS = (
+    ("invalid_quantity", "주문 수량 오류"),
+    ("sell_exceeds_holding", "매도 가능 수량 부족"),
+    ("max_amount", "1회 최대 주문 금액 초과"),
+    ("max_quantity", "종목당 최대 보유 수량 초과"),
+    ("max_positions", "최대 보유 종목 수 초과"),
+    ("insufficient_cash", "주문가능금액 부족"),
+)
+
+
+class OrderRequest:
+    """게이트웨이에 제출하는 주문 한 건"""
+
+    def __init__(self, symbol, side, quantity, price=None, order_type="MARKET", market="KR",
+                 reference_price=None, source=None, name=None, signal_time=None):
+        """
+        Args:
+            side: "BUY" 또는 "SELL"
+            price: 지정가 (시장가 주문이면 None 또는 0)
+            reference_price: 위험 점검용 기준 가격 (없으면 지정가, 그것도 없으면 현재가 조회)
+            source: 주문을 낸 트레이더 이름 (통계용)
+            signal_time: 신호 발생 시각 (time.monotonic(), 기본값 요청 생성 시각)
+        """
+        self.symbol = symbol
+        self.side = str(side).upper()
+        self.quantity = int(quantity or 0)
+        self.price = price
+        self.order_type = str(order_type).upper()
+        self.market = market
+        self.reference_price = reference_price or price or 0
+        self.source = source
+        self.name = name
+        self.signal_time = signal_time if signal_time is not None else time.monotonic()
+        self.future = Future()
+
+    @property
+    def amount(self):
+        return self.quantity * (self.reference_price or 0)
+
+    def __repr__(self):
+        return f"OrderRequest({self.side} {self.symbol} x {self.quantity}, source={self.source})"
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    return float(np.percentile(np.fromiter(values, dtype=float), pct))
+
+
+class OrderGateway:
+    """주문 큐 + 사전 위험 점검 + 동시 제출"""
+
+    def __init__(self, broker, config=None, data_provider=None, position_book=None, order_tracker=None):
+        """
+        Args:
+            broker: 증권사 API 객체 (buy/sell 사용)
+            config: 설정 모듈
+            data_provider: 기준 가격이 없는 시장가 주문의 현재가 조회용 (선택적)
+            position_book: 공유 포지션 장부 (None이면 브로커에 연결된 공유 장부)
+            order_tracker: 주문 추적기 (None이면 브로커에 연결된 공유 추적기)
+        """
+        self.broker = broker
+        self.config = config
+        self.data_provider = data_provider
+        self.position_book = position_book or get_position_book(broker, config)
+        self.order_tracker = order_tracker or get_order_tracker(broker, config)
+
+        # 위험 한도
+        self.max_amount_per_trade = getattr(config, 'MAX_AMOUNT_PER_TRADE', 1000000)
+        self.max_quantity_per_symbol = getattr(config, 'MAX_QUANTITY_PER_SYMBOL', 100)
+        self.max_positions = getattr(config, 'ORDER_MAX_POSITIONS', 10)
+        self.fee_rate = getattr(config, 'FEE_RATE', 0.00015)
+
+        # 제출 설정
+        self.batch_size = getattr(config, 'ORDER_GATEWAY_BATCH_SIZE', 32)
+        self.rate_per_second = float(getattr(config, 'ORDER_RATE_PER_SECOND', 5))
+        self.workers = getattr(config, 'ORDER_GATEWAY_WORKERS', 2)
+        self.execute_timeout = getattr(config, 'ORDER_EXECUTE_TIMEOUT_SECONDS', 30)
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._next_slot = 0.0  # 다음 제출 가능 시각 (time.monotonic())
+        self._reserved_cash = 0.0  # 승인 후 아직 증권사가 접수하지 않은 매수 금액
+        self._last_cash = None  # 마지막으로 조회에 성공한 주문가능금액
+        self._pending = {}  # {종목코드: 승인 후 아직 종료되지 않은 순매수 수량}
+        self._reservations = {}  # {주문번호: OrderRequest} 접수 후 종료 상태를 기다리는 주문
+        self._stop_event = threading.Event()
+        self._dispatcher = None
+        self._executor = None
+
+        self.stats = {'requests': 0, 'approved': 0, 'rejected': 0, 'submitted': 0, 'failed': 0, 'batches': 0,
+                      'reject_reasons': {}}
+        self._latency = {'signal_to_submit': deque(maxlen=1000), 'broker': deque(maxlen=1000)}
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._dispatcher is not None and self._dispatcher.is_alive():
+                return
+            self._stop_event.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="OrderSubmit")
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="OrderGateway", daemon=True)
+            self._dispatcher.start()
+
+    def submit(self, request):
+        """
+        주문 요청을 큐에 넣음
+
+        Returns:
+            Future: 주문 결과 딕셔너리로 완료 (success, order_no/order_id, error, risk_rejected, latency)
+        """
+        self._ensure_started()
+        with self._lock:
+            self.stats['requests'] += 1
+        self._queue.put(request)
+        return request.future
+
+    def execute(self, request, timeout=None):
+        """
+        주문 요청 제출 후 결과까지 대기 (기존 동기 호출 경로용)
+
+        Args:
+            timeout: 최대 대기 시간 (초, 기본값 ORDER_EXECUTE_TIMEOUT_SECONDS)
+
+        Returns:
+            dict: 주문 결과 (대기 시간이 지나면 실패 결과, 아직 제출 전인 주문은 제출하지 않음)
+        """
+        timeout = self.execute_timeout if timeout is None else timeout
+        future = self.submit(request)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            if future.cancel():
+                logger.warning(f"주문 결과 대기 시간 초과 ({timeout}초), 제출 전 주문 취소: {request}")
+                error = "주문 결과 대기 시간 초과 (미제출)"
+            else:
+                # 이미 증권사에 제출 중인 주문 - 접수되면 주문 추적기가 체결을 장부에 반영
+                logger.error(f"주문 결과 대기 시간 초과 ({timeout}초), 증권사 제출 중: {request}")
+                error = "주문 결과 대기 시간 초과 (제출 중)"
+            with self._lock:
+                self.stats['timeouts'] = self.stats.get('timeouts', 0) + 1
+            return self._result(request, False, error=error)
+
+    def max_buy_quantity(self, symbol, price):
+        """위험 한도 안에서 매수 가능한 최대 수량 (트레이더의 수량 계산용)"""
+        if not price or price <= 0:
+            return 0
+        held = self.position_book.quantity(symbol)
+        with self._lock:
+            held += self._pending.get(symbol, 0)
+        by_amount = int(self.max_amount_per_trade // price)
+        return max(min(by_amount, self.max_quantity_per_symbol - held), 0)
+
+    def _dispatch_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                request = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            batch = [request]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                logger.error(f"주문 묶음 처리 중 오류 발생: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        self._finish(request, self._result(request, False, error=str(e)))
+
+    def _process_batch(self, batch):
+        # 대기 시간 초과로 취소된 주문은 점검/제출하지 않음
+        batch = [request for request in batch if not request.future.cancelled()]
+        if not batch:
+            return
+        for request in batch:
+            if not request.reference_price and self.data_provider is not None:
+                try:
+                    request.reference_price = self.data_provider.get_current_price(request.symbol, request.market) or 0
+                except Exception as e:
+                    logger.warning(f"{request.symbol} 기준 가격 조회 실패, 금액 점검 생략: {e}")
+
+        # 직전 체결이 반영되도록 장부 대조 (대조 간격/무효화 여부에 따라 필요할 때만 증권사 조회)
+        self.position_book.reconcile()
+        reasons = self.check(batch)
+        with self._lock:
+            self.stats['batches'] += 1
+        for request, reason in zip(batch, reasons):
+            if reason is not None:
+                self._reject(request, reason)
+                continue
+            with self._lock:
+                self.stats['approved'] += 1
+                self._reserve(request)
+            self._executor.submit(self._submit_to_broker, request)
+
+    def _reserve(self, request, sign=1, cash=True, quantity=True):
+        """승인 주문의 수량/금액 예약 (sign=-1이면 해제, 잠금 안에서 호출)"""
+        if cash and request.side == BUY:
+            self._reserved_cash = max(self._reserved_cash + sign * request.amount * (1 + self.fee_rate), 0.0)
+        if quantity:
+            signed = request.quantity if request.side == BUY else -request.quantity
+            self._pending[request.symbol] = self._pending.get(request.symbol, 0) + sign * signed
+            if not self._pending[request.symbol]:
+                del self._pending[request.symbol]
+
+    def _release_order(self, order_no):
+        """주문 추적기가 종료 상태를 알리면 수량 예약 해제 (금액 예약은 접수 때 이미 해제)"""
+        with self._lock:
+            request = self._reservations.pop(order_no, None)
+            if request is not None:
+                self._reserve(request, sign=-1, cash=False)
+
+    def open_reservations(self):
+        """접수 후 종료 상태를 기다리는 주문 {주문번호: OrderRequest}"""
+        with self._lock:
+            return dict(self._reservations)
+
+    def _available_cash(self):
+        """증권사 주문가능금액 (조회 실패 시 마지막으로 확인한 금액, 그것도 없으면 0)"""
+        try:
+            balance = self.broker.get_balance() or {}
+            cash = balance.get('주문가능금액', balance.get('예수금', 0))
+            cash = float(str(cash).replace(",", "")) if cash is not None else 0.0
+        except Exception as e:
+            fallback = self._last_cash or 0.0
+            logger.warning(f"주문가능금액 조회 실패, 마지막 확인 금액 {fallback:,.0f}원으로 점검: {e}")
+            return fallback
+        self._last_cash = cash
+        return cash
+
+    def check(self, batch):
+        """
+        주문 묶음 사전 위험 점검
+
+        Returns:
+            list: 주문별 거부 사유 키 (통과하면 None)
+        """
+        if not batch:
+            return []
+        holdings = self.position_book.snapshot()
+        with self._lock:
+            pending = dict(self._pending)
+            reserved = self._reserved_cash
+
+        frame = pd.DataFrame({
+            'symbol': [r.symbol for r in batch],
+            'buy': [r.side == BUY for r in batch],
+            'quantity': [r.quantity for r in batch],
+            'price': [float(r.reference_price or 0) for r in batch],
+        })
+        frame['held'] = frame['symbol'].map(
+            lambda symbol: (holdings[symbol].quantity if symbol in holdings else 0) + pending.get(symbol, 0))
+        frame['amount'] = frame['quantity'] * frame['price']
+        buy = frame['buy'].to_numpy()
+        priced = (frame['price'] > 0).to_numpy()
+        position_count = sum(1 for position in holdings.values() if position.quantity > 0) + \
+            sum(1 for symbol, quantity in pending.items() if quantity > 0 and symbol not in holdings)
+        cash = self._available_cash() - reserved
+        buy_cost = np.where(buy, frame['amount'] * (1 + self.fee_rate), 0.0)
+
+        # 주문 한 건만으로 판단하는 점검
+        reasons = [None] * len(batch)
+        single = {
+            'invalid_quantity': (frame['quantity'] <= 0).to_numpy(),
+            'max_amount': buy & priced & (frame['amount'] > self.max_amount_per_trade).to_numpy(),
+        }
+        for key, _ in reversed(RISK_REASONS):
+            if key in single:
+                for index in np.flatnonzero(single[key]):
+                    reasons[index] = key
+        active = np.array([reason is None for reason in reasons])
+
+        # 앞선 승인 주문을 누적 반영하는 점검 - 위반한 첫 주문을 거부하고 나머지로 다시 계산
+        while active.any():
+            signed = np.where(active, np.where(buy, frame['quantity'], -frame['quantity']), 0)
+            projected = frame['held'].to_numpy() + pd.Series(signed).groupby(frame['symbol']).cumsum().to_numpy()
+            first_buy = ~frame[active & buy].duplicated('symbol').reindex(frame.index, fill_value=False).to_numpy()
+            new_symbol = active & buy & (frame['held'].to_numpy() <= 0) & first_buy
+            cumulative = {
+                'sell_exceeds_holding': active & ~buy & (projected < 0),
+                'max_quantity': active & buy & (projected > self.max_quantity_per_symbol),
+                'max_positions': new_symbol & (position_count + np.cumsum(new_symbol) > self.max_positions),
+                'insufficient_cash': active & buy & priced & (np.cumsum(np.where(active, buy_cost, 0.0)) > cash),
+            }
+            violations = {key: np.flatnonzero(mask) for key, mask in cumulative.items() if mask.any()}
+            if not violations:
+                break
+            index = min(indexes[0] for indexes in violations.values())
+            reasons[index] = next(key for key, _ in RISK_REASONS
+                                  if key in violations and violations[key][0] == index)
+            active[index] = False
+        return reasons
+
+    def _reject(self, request, reason):
+        message = dict(RISK_REASONS).get(reason, reason)
+        with self._lock:
+            self.stats['rejected'] += 1
+            self.stats['reject_reasons'][reason] = self.stats['reject_reasons'].get(reason, 0) + 1
+        logger.warning(f"주문 거부 (위험 점검): {request.side} {request.symbol} x {request.quantity} - {message}")
+        self._finish(request, self._result(request, False, error=message, risk_rejected=True))
+
+    @staticmethod
+    def _finish(request, result):
+        """주문 결과 전달 (그 사이 대기 시간 초과로 취소된 주문이면 무시)"""
+        try:
+            request.future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _wait_rate_slot(self):
+        """초당 주문 한도를 지키도록 제출 시각 배정"""
+        if self.rate_per_second <= 0:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate_per_second
+        if slot > now:
+            self._stop_event.wait(slot - now)
+
+    def _submit_to_broker(self, request):
+        result = None
+        tracked = False  # 접수되어 종료 상태까지 예약을 유지하는 주문
+        try:
+            self._wait_rate_slot()
+            if not request.future.set_running_or_notify_cancel():
+                # 제출 순서를 기다리는 사이 대기 시간 초과로 취소된 주문
+                return
+            submitted = time.monotonic()
+            if request.side == BUY:
+                response = self.broker.buy(request.symbol, request.quantity, request.price, request.order_type, request.market)
+            else:
+                response = self.broker.sell(request.symbol, request.quantity, request.price, request.order_type, request.market)
+            finished = time.monotonic()
+
+            response = response or {}
+            success = bool(response.get('success'))
+            order_no = response.get('order_no') or response.get('order_id') or ''
+            latency = {'signal_to_submit': submitted - request.signal_time, 'broker': finished - submitted}
+            with self._lock:
+                self.stats['submitted' if success else 'failed'] += 1
+                self._latency['signal_to_submit'].append(latency['signal_to_submit'])
+                self._latency['broker'].append(latency['broker'])
+            if success and order_no:
+                order = self.order_tracker.track(order_no, request.symbol, request.side, request.quantity,
+                                                 request.price or request.reference_price, request.market)
+                # 접수된 금액은 증권사 주문가능금액에서 차감되므로 금액 예약은 해제하고,
+                # 수량 예약은 주문이 체결/취소/거부될 때까지 유지 (이미 종료된 주문이면 콜백이 바로 실행)
+                with self._lock:
+                    self._reserve(request, sign=-1, quantity=False)
+                    self._reservations[order_no] = request
+                tracked = True
+                order.future.add_done_callback(lambda _, order_no=order_no: self._release_order(order_no))
+            logger.info(f"주문 제출: {request.side} {request.symbol} x {request.quantity} -> "
+                        f"{'접수' if success else '실패'} {order_no} (신호→제출 {latency['signal_to_submit'] * 1000:.1f}ms, "
+                        f"증권사 {latency['broker'] * 1000:.1f}ms)")
+            result = dict(response)
+            result.update(self._result(request, success, order_no=order_no, error=response.get('error'), latency=latency))
+        except Exception as e:
+            logger.error(f"주문 제출 중 오류 발생: {request} - {e}")
+            with self._lock:
+                self.stats['failed'] += 1
+            result = self._result(request, False, error=str(e))
+        finally:
+            if not tracked:
+                # 증권사 거부/오류이거나 주문번호가 없어 추적할 수 없는 주문은 바로 예약 해제
+                with self._lock:
+                    self._reserve(request, sign=-1)
+            if result is not None:
+                # 추적하는 주문은 주문 추적기가 체결을 장부에 반영하고, 주문번호가 없어 추적할 수 없는
+                # 접수 주문만 장부가 다음 읽기에서 증권사와 대조하도록 표시
+                if result.get('success') and not tracked:
+                    self.position_book.invalidate()
+                self._finish(request, result)
+
+    @staticmethod
+    def _result(request, success, order_no='', error=None, risk_rejected=False, latency=None):
+        return {
+            'success': success,
+            'order_no': order_no,
+            'order_id': order_no,
+            'symbol': request.symbol,
+            'side': request.side,
+            'quantity': request.quantity,
+            'error': error,
+            'message': error or '',
+            'risk_rejected': risk_rejected,
+            'latency': latency or {}
+        }
+
+    def latency_stats(self):
+        """신호→제출, 증권사 응답 지연 통계 (초)"""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._latency.items()}
+        return {
+            name: {'count': len(values), 'mean': float(np.mean(values)) if values else 0.0,
+                   'p50': _percentile(values, 50), 'p95': _percentile(values, 95),
+                   'max': max(values) if values else 0.0}
+            for name, values in samples.items()
+        }
+
+    def shutdown(self, wait=True):
+        """디스패처와 제출 스레드 중지"""
+        self._stop_event.set()
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            self._dispatcher.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        self._dispatcher = None
+        self._executor = None
+
+
+# 브로커별 공유 게이트웨이
+_gateways = weakref.WeakKeyDictionary()
+_gateways_lock = threading.Lock()
+
+
+def get_order_gateway(broker, config=None, data_provider=None):
+    """
+    브로커에 연결된 공유 주문 게이트웨이 반환 (같은 브로커를 쓰는 트레이더는 같은 큐와 위험 한도 사용)
+
+    Args:
+        broker: 증권사 API 객체
+        config: 설정 모듈
+        data_provider: 시장가 주문 기준 가격 조회용 (처음 지정된 제공자를 사용)
+    """
+    with _gateways_lock:
+        gateway = _gateways.get(broker)
+        if gateway is None:
+            gateway = _gateways[broker] = OrderGateway(broker, config, data_provider)
+        elif gateway.data_provider is None:
+            gateway.data_provider = data_provider
+        return gateway
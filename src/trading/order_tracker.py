@@ -0,0 +1,401 @@
+"""
+주문 상태 추적 모듈
+
+주문 직후 트레이더 스레드가 고정 시간 sleep 후 잔고/주문 상태를 반복 조회하던 것을
+주문 생명주기 추적기로 대체합니다.
+
+- 상태 전이: SUBMITTED(주문 전송) -> ACKNOWLEDGED(접수 확인) -> PARTIAL(일부 체결)
+  -> FILLED(전량 체결) / CANCELLED(취소) / REJECTED(거부)
+- 백그라운드 스레드 하나가 미체결 주문 전체를 한 번의 조회(broker.get_order_executions)로
+  갱신합니다. 일괄 조회를 지원하지 않는 증권사는 주문별 get_order_status로 대신합니다.
+- 체결 통보 스트림이 있으면 on_execution()으로 바로 반영할 수 있습니다.
+- 새 체결은 공유 포지션 장부에 반영하고, API 서버에 거래 관련 응답 캐시 무효화를 알립니다.
+- 주문마다 concurrent.futures.Future가 있어 대기하는 스레드는 체결/취소되는 즉시 깨어납니다.
+
+같은 브로커를 쓰는 트레이더는 get_order_tracker(broker)로 같은 추적기를 공유합니다.
+"""
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from ..utils.cache_notifier import get_trade_cache_notifier
+from ..utils.clock import get_clock
+from .position_book import get_position_book
+
+# 로거 설정
+logger = logging.getLogger('OrderTracker')
+
+# 주문 상태
+SUBMITTED = "SUBMITTED"
+ACKNOWLEDGED = "ACKNOWLEDGED"
+PARTIAL = "PARTIAL"
+FILLED = "FILLED"
+CANCELLED = "CANCELLED"
+REJECTED = "REJECTED"
+
+TERMINAL_STATES = (FILLED, CANCELLED, REJECTED)
+
+# 허용되는 상태 전이 (오래된 조회 결과로 상태가 뒤로 가지 않도록 함)
+TRANSITIONS = {
+    SUBMITTED: (ACKNOWLEDGED, PARTIAL, FILLED, CANCELLED, REJECTED),
+    ACKNOWLEDGED: (PARTIAL, FILLED, CANCELLED, REJECTED),
+    PARTIAL: (PARTIAL, FILLED, CANCELLED),
+}
+
+# 체결 조회/통보 응답 필드 이름 (KISAPI 한글 키, KIS 원본 키, 일반 형식)
+ORDER_NO_KEYS = ("주문번호", "odno", "ODNO", "order_no", "order_number")
+SYMBOL_KEYS = ("종목코드", "pdno", "PDNO", "symbol")
+ORDER_QTY_KEYS = ("주문수량", "ord_qty", "quantity")
+FILLED_QTY_KEYS = ("체결수량", "tot_ccld_qty", "executed_qty", "filled_quantity")
+FILL_PRICE_KEYS = ("체결단가", "avg_prvs", "executed_price", "avg_fill_price")
+STATUS_KEYS = ("주문상태", "status")
+CANCELLED_KEYS = ("취소여부", "cncl_yn", "cancelled")
+REJECTED_STATUSES = ("거부", "REJECTED", "rejected")
+
+
+def _first(data, keys, default=None):
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _number(value, cast=float):
+    try:
+        return cast(float(str(value).replace(",", "")))
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+class TrackedOrder:
+    """추적 중인 주문 한 건 (필드는 추적기 잠금 안에서만 갱신)"""
+
+    def __init__(self, order_number, symbol=None, side=None, quantity=0, price=0, market="KR", submitted_at=None):
+        self.order_number = order_number
+        self.symbol = symbol
+        self.side = side
+        self.market = market
+        self.quantity = quantity
+        self.price = price
+        self.state = SUBMITTED
+        self.filled_quantity = 0
+        self.avg_fill_price = 0.0
+        self.reason = None
+        self.submitted_at = submitted_at
+        self.updated_at = submitted_at
+        self.future = Future()  # 종료 상태가 되면 이 주문 객체로 완료
+
+    @property
+    def done(self):
+        return self.state in TERMINAL_STATES
+
+    @property
+    def remaining_quantity(self):
+        return max(self.quantity - self.filled_quantity, 0)
+
+    def to_dict(self):
+        return {
+            'order_number': self.order_number,
+            'symbol': self.symbol,
+            'side': self.side,
+            'market': self.market,
+            'quantity': self.quantity,
+            'price': self.price,
+            'state': self.state,
+            'filled_quantity': self.filled_quantity,
+            'remaining_quantity': self.remaining_quantity,
+            'avg_fill_price': self.avg_fill_price,
+            'reason': self.reason
+        }
+
+    def __repr__(self):
+        return f"TrackedOrder({self.order_number}, {self.symbol}, {self.state}, {self.filled_quantity}/{self.quantity})"
+
+
+class OrderTracker:
+    """주문 생명주기 추적기"""
+
+    def __init__(self, broker, config=None, clock=None):
+        """
+        Args:
+            broker: 증권사 API 객체 (get_order_executions 또는 get_order_status 사용)
+            config: 설정 모듈
+            clock: 시계 객체 (None이면 clock.get_clock()의 전역 시계)
+        """
+        self.broker = broker
+        self.config = config
+        self.clock = clock
+        self.poll_seconds = float(getattr(config, 'ORDER_POLL_SECONDS', 1.0))
+        self.max_track_seconds = float(getattr(config, 'ORDER_TRACK_MAX_SECONDS', 8 * 60 * 60))
+        self.cache_notifier = get_trade_cache_notifier(config)
+
+        self._lock = threading.Lock()
+        self._orders = {}  # {주문번호: TrackedOrder} (종료된 주문 포함)
+        self._open = {}  # {주문번호: TrackedOrder} (미종료 주문)
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.stats = {'tracked': 0, 'polls': 0, 'batched_polls': 0, 'notices': 0,
+                      FILLED: 0, CANCELLED: 0, REJECTED: 0, 'errors': 0}
+
+    def _now(self):
+        return (self.clock if self.clock is not None else get_clock()).timestamp()
+
+    def track(self, order_number, symbol=None, side=None, quantity=0, price=0, market="KR"):
+        """
+        주문 추적 등록 (이미 등록된 주문이면 비어 있는 정보만 보충)
+
+        Returns:
+            TrackedOrder: 주문 객체 (주문번호가 없으면 None)
+        """
+        if not order_number:
+            return None
+        with self._lock:
+            order = self._orders.get(order_number)
+            if order is None:
+                order = TrackedOrder(order_number, symbol, side, int(quantity or 0), price, market, self._now())
+                self._orders[order_number] = order
+                self._open[order_number] = order
+                self.stats['tracked'] += 1
+            else:
+                order.symbol = order.symbol or symbol
+                order.side = order.side or side
+                order.quantity = order.quantity or int(quantity or 0)
+                order.price = order.price or price
+        self._ensure_thread()
+        # 등록 직후 한 번 바로 조회 (시장가 주문은 대부분 즉시 체결)
+        self._wake.set()
+        return order
+
+    def get(self, order_number):
+        with self._lock:
+            return self._orders.get(order_number)
+
+    def open_orders(self):
+        with self._lock:
+            return list(self._open.values())
+
+    def wait(self, order_number, timeout=None):
+        """
+        주문이 종료 상태(체결/취소/거부)가 될 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무기한)
+
+        Returns:
+            TrackedOrder: 주문 객체 (시간 초과면 그 시점 상태, 추적하지 않는 주문이면 None)
+        """
+        order = self.get(order_number)
+        if order is None:
+            return None
+        if not order.done:
+            self._wake.set()
+            try:
+                order.future.result(timeout)
+            except FutureTimeoutError:
+                logger.info(f"주문 {order_number} 대기 시간 초과: {order.state} ({order.filled_quantity}/{order.quantity}주)")
+        return order
+
+    def on_execution(self, record):
+        """
+        체결 통보/조회 결과 한 건 반영 (스트림 소비자가 직접 호출 가능)
+
+        Returns:
+            bool: 추적 중인 주문에 반영했으면 True
+        """
+        order_number = _first(record, ORDER_NO_KEYS)
+        order = self.get(order_number) if order_number else None
+        if order is None:
+            return False
+        with self._lock:
+            self.stats['notices'] += 1
+        self._apply(order, record)
+        return True
+
+    def poll(self):
+        """
+        미체결 주문 전체를 한 번 갱신
+
+        Returns:
+            int: 갱신 후 남은 미체결 주문 수
+        """
+        open_orders = self.open_orders()
+        if not open_orders:
+            return 0
+
+        records = {}
+        get_executions = getattr(self.broker, 'get_order_executions', None)
+        try:
+            if get_executions is not None:
+                # 당일 주문 전체를 한 번에 조회
+                for record in get_executions() or []:
+                    order_number = _first(record, ORDER_NO_KEYS)
+                    if order_number:
+                        records[order_number] = record
+                batched = True
+            else:
+                for order in open_orders:
+                    record = self.broker.get_order_status(order.order_number)
+                    if record:
+                        records[order.order_number] = record
+                batched = False
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            logger.error(f"주문 체결 조회 실패: {e}")
+            return len(open_orders)
+
+        with self._lock:
+            self.stats['polls'] += 1
+            if batched:
+                self.stats['batched_polls'] += 1
+
+        now = self._now()
+        for order in open_orders:
+            record = records.get(order.order_number)
+            if record is not None:
+                self._apply(order, record)
+            elif now - order.submitted_at > self.max_track_seconds:
+                self._transition(order, CANCELLED, reason="추적 시간 초과")
+        self._prune(now)
+        with self._lock:
+            return len(self._open)
+
+    def _apply(self, order, record):
+        """조회/통보 결과로 주문 상태 결정"""
+        quantity = _number(_first(record, ORDER_QTY_KEYS, 0), int) or order.quantity
+        filled = _number(_first(record, FILLED_QTY_KEYS, 0), int)
+        fill_price = _number(_first(record, FILL_PRICE_KEYS, 0))
+        status = str(_first(record, STATUS_KEYS, ""))
+        cancelled = _first(record, CANCELLED_KEYS, False)
+        cancelled = cancelled in (True, "Y", "y") or status in ("취소", CANCELLED)
+
+        if status in REJECTED_STATUSES:
+            state = REJECTED
+        elif quantity and filled >= quantity:
+            state = FILLED
+        elif cancelled:
+            state = CANCELLED
+        elif filled > 0:
+            state = PARTIAL
+        else:
+            state = ACKNOWLEDGED
+
+        with self._lock:
+            if order.done:
+                return
+            order.quantity = order.quantity or quantity
+            order.symbol = order.symbol or _first(record, SYMBOL_KEYS)
+            delta = filled - order.filled_quantity
+        if delta < 0:
+            # 이전 조회보다 체결 수량이 적은 결과는 오래된 응답으로 보고 무시
+            return
+        self._transition(order, state, filled=filled, fill_price=fill_price)
+
+    def _transition(self, order, state, filled=None, fill_price=None, reason=None):
+        with self._lock:
+            if order.done:
+                return False
+            changed = filled is not None and filled != order.filled_quantity
+            if state != order.state and state not in TRANSITIONS.get(order.state, ()):
+                return False
+            if state == order.state and not changed:
+                return False
+            previous_filled, previous_price = order.filled_quantity, order.avg_fill_price
+            if filled is not None:
+                order.filled_quantity = filled
+                if fill_price:
+                    order.avg_fill_price = fill_price
+            previous = order.state
+            order.state = state
+            order.reason = reason or order.reason
+            order.updated_at = self._now()
+            if order.done:
+                self._open.pop(order.order_number, None)
+                self.stats[state] += 1
+
+        logger.info(f"주문 {order.order_number} {order.symbol or ''} {previous} -> {state} "
+                    f"({order.filled_quantity}/{order.quantity}주)")
+        if filled is not None and filled > previous_filled:
+            # 종료 상태 전이로 주문 게이트웨이 예약이 풀리기 전에 장부에 반영
+            self._book_fill(order, filled - previous_filled, previous_filled, previous_price, fill_price)
+            # 잔고/성과가 바뀌었으므로 API 서버(별도 프로세스)의 포트폴리오/리포트 응답 캐시 무효화
+            self.cache_notifier.notify()
+        if order.done:
+            order.future.set_result(order)
+        return True
+
+    def _book_fill(self, order, quantity, previous_filled, previous_price, fill_price):
+        """
+        새 체결 수량을 공유 포지션 장부에 반영
+
+        조회 결과의 체결가는 누적 평균이므로 이번 체결분 가격은 직전 평균과의 차이로 계산합니다.
+        체결가를 알 수 없으면 다음 읽기에서 증권사와 대조하도록 장부만 무효화합니다.
+        """
+        book = get_position_book(self.broker, self.config)
+        price = fill_price
+        if fill_price and previous_filled and previous_price:
+            price = (fill_price * (previous_filled + quantity) - previous_price * previous_filled) / quantity
+            if price <= 0:
+                price = fill_price
+        if not price or not order.symbol or not order.side:
+            book.invalidate()
+            return
+        book.apply_fill(order.symbol, order.side, quantity, price, market=order.market)
+
+    def _prune(self, now):
+        """오래된 종료 주문 정리"""
+        with self._lock:
+            expired = [number for number, order in self._orders.items()
+                       if order.done and now - (order.updated_at or now) > self.max_track_seconds]
+            for number in expired:
+                del self._orders[number]
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._poll_loop, name="OrderTracker", daemon=True)
+            self._thread.start()
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            self._wake.clear()
+            try:
+                remaining = self.poll()
+            except Exception as e:
+                logger.error(f"주문 추적 중 오류 발생: {e}")
+                remaining = len(self.open_orders())
+            # 미체결 주문이 없으면 새 주문이 등록될 때까지 대기
+            self._wake.wait(self.poll_seconds if remaining else None)
+
+    def stop(self):
+        """추적 스레드 중지"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+
+# 브로커별 공유 추적기
+_trackers = weakref.WeakKeyDictionary()
+_trackers_lock = threading.Lock()
+
+
+def get_order_tracker(broker, config=None):
+    """
+    브로커에 연결된 공유 주문 추적기 반환 (같은 브로커를 쓰는 트레이더는 같은 추적기 사용)
+
+    Args:
+        broker: 증권사 API 객체
+        config: 설정 모듈
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(broker)
+        if tracker is None:
+            tracker = _trackers[broker] = OrderTracker(broker, config)
+        return tracker
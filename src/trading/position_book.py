@@ -0,0 +1,337 @@
+"""
+포지션 장부 모듈
+
+RealtimeTrader, GPTAutoTrader, AutoTrader가 각자 broker.get_positions()를 호출해 따로 관리하던
+보유 종목 정보를 하나의 잠금 보호 장부로 모읍니다.
+
+- 주문 추적기가 체결을 확인하면 apply_fill()로 장부를 즉시 갱신합니다.
+- reconcile()은 POSITION_RECONCILE_SECONDS 간격으로만 증권사 잔고와 대조하며, 여러 스레드가
+  동시에 호출해도 증권사 API는 한 번만 호출합니다. 조회 중에 체결이 반영되면 그 조회 결과는 버립니다.
+- 트레이더는 as_dicts()/get()으로 복사본을 읽으므로 다른 스레드의 갱신과 경합하지 않습니다.
+
+같은 브로커를 쓰는 트레이더는 get_position_book(broker)로 같은 장부를 공유합니다.
+"""
+import logging
+import threading
+import weakref
+
+from ..utils.clock import get_clock
+from ..utils.time_utils import get_current_time
+
+# 로거 설정
+logger = logging.getLogger('PositionBook')
+
+# 증권사 응답 형식별 필드 이름 (KIS 한글 키, KIS 모의투자 영문 키, 일반 형식)
+SYMBOL_KEYS = ("종목코드", "pdno", "PDNO", "symbol")
+NAME_KEYS = ("종목명", "prdt_name", "PRDT_NAME", "name", "symbol_name")
+QUANTITY_KEYS = ("보유수량", "hldg_qty", "HLDG_QTY", "quantity")
+AVG_PRICE_KEYS = ("평균단가", "pchs_avg_pric", "PCHS_AVG_PRIC", "avg_price")
+PRICE_KEYS = ("현재가", "prpr", "PRPR", "current_price")
+
+
+def _first(data, keys, default=None):
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _number(value, cast=float):
+    try:
+        return cast(float(str(value).replace(",", "")))
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+class Position:
+    """보유 종목 한 건"""
+
+    __slots__ = ("symbol", "name", "market", "quantity", "avg_price", "current_price", "entry_time")
+
+    def __init__(self, symbol, quantity=0, avg_price=0.0, current_price=0.0, name=None, market="KR",
+                 entry_time=None):
+        self.symbol = symbol
+        self.name = name or symbol
+        self.market = market
+        self.quantity = quantity
+        self.avg_price = avg_price
+        self.current_price = current_price
+        self.entry_time = entry_time
+
+    @property
+    def current_value(self):
+        return self.current_price * self.quantity
+
+    @property
+    def profit_loss(self):
+        return (self.current_price - self.avg_price) * self.quantity
+
+    @property
+    def profit_loss_pct(self):
+        if self.avg_price <= 0:
+            return 0.0
+        return ((self.current_price / self.avg_price) - 1) * 100
+
+    def copy(self):
+        return Position(self.symbol, self.quantity, self.avg_price, self.current_price,
+                        self.name, self.market, self.entry_time)
+
+    def to_dict(self):
+        """트레이더들이 쓰던 포지션 딕셔너리 형식"""
+        return {
+            'symbol': self.symbol,
+            'name': self.name,
+            'symbol_name': self.name,
+            'market': self.market,
+            'quantity': self.quantity,
+            'avg_price': self.avg_price,
+            'current_price': self.current_price,
+            'current_value': self.current_value,
+            'profit_loss': self.profit_loss,
+            'profit_loss_pct': self.profit_loss_pct,
+            'entry_time': self.entry_time
+        }
+
+    def __repr__(self):
+        return f"Position({self.symbol}, {self.quantity}주 @ {self.avg_price:,.0f})"
+
+
+def normalize_positions(raw, default_market="KR"):
+    """
+    증권사 get_positions() 응답을 {종목코드: Position}으로 변환
+
+    리스트(KIS 한글 키/모의투자 영문 키/일반 형식), {종목코드: dict}, {"positions": {...}} 형식을 모두 허용하며
+    보유 수량이 0인 종목은 제외합니다.
+    """
+    if not raw:
+        return {}
+    if isinstance(raw, dict):
+        items = raw.get("positions", raw)
+        if isinstance(items, dict):
+            items = [dict(data, symbol=data.get("symbol", symbol)) for symbol, data in items.items()
+                     if isinstance(data, dict)]
+    else:
+        items = raw
+
+    positions = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        symbol = _first(item, SYMBOL_KEYS)
+        if not symbol:
+            continue
+        quantity = _number(_first(item, QUANTITY_KEYS, 0), int)
+        if quantity <= 0:
+            continue
+        positions[symbol] = Position(
+            symbol,
+            quantity=quantity,
+            avg_price=_number(_first(item, AVG_PRICE_KEYS, 0)),
+            current_price=_number(_first(item, PRICE_KEYS, 0)),
+            name=_first(item, NAME_KEYS, symbol),
+            market=item.get("market", default_market),
+            entry_time=item.get("entry_time")
+        )
+    return positions
+
+
+class PositionBook:
+    """잠금으로 보호되는 공유 포지션 장부"""
+
+    def __init__(self, broker=None, config=None, clock=None):
+        """
+        Args:
+            broker: 증권사 API 객체 (reconcile에서 get_positions 호출)
+            config: 설정 모듈
+            clock: 시계 객체 (None이면 clock.get_clock()의 전역 시계)
+        """
+        self.broker = broker
+        self.config = config
+        self.clock = clock
+        self.reconcile_seconds = getattr(config, 'POSITION_RECONCILE_SECONDS', 60)
+
+        self._lock = threading.RLock()
+        self._reconcile_lock = threading.Lock()
+        self._positions = {}  # {종목코드: Position}
+        self._last_reconcile = None  # 마지막 증권사 대조 시각 (epoch 초)
+        self.version = 0  # 장부가 바뀔 때마다 증가
+        self.stats = {'reconciles': 0, 'reconcile_skipped': 0, 'reconcile_discarded': 0, 'fills': 0, 'mismatches': 0,
+                      'errors': 0}
+
+    def _now(self):
+        return (self.clock if self.clock is not None else get_clock()).timestamp()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._positions)
+
+    def __contains__(self, symbol):
+        with self._lock:
+            return symbol in self._positions
+
+    def symbols(self):
+        with self._lock:
+            return list(self._positions)
+
+    def get(self, symbol):
+        """포지션 복사본 (보유하지 않으면 None)"""
+        with self._lock:
+            position = self._positions.get(symbol)
+            return position.copy() if position is not None else None
+
+    def quantity(self, symbol):
+        with self._lock:
+            position = self._positions.get(symbol)
+            return position.quantity if position is not None else 0
+
+    def snapshot(self):
+        """{종목코드: Position 복사본}"""
+        with self._lock:
+            return {symbol: position.copy() for symbol, position in self._positions.items()}
+
+    def as_dicts(self, market=None):
+        """{종목코드: 포지션 딕셔너리} (market을 주면 해당 시장만)"""
+        with self._lock:
+            return {symbol: position.to_dict() for symbol, position in self._positions.items()
+                    if market is None or position.market == market}
+
+    def apply_fill(self, symbol, side, quantity, price, market="KR", name=None, time=None):
+        """
+        체결 반영 (매수는 평균단가 갱신, 매도는 수량 차감 후 0이면 제거)
+
+        Args:
+            side: "BUY" 또는 "SELL"
+            time: 체결 시각 (신규 포지션의 진입 시각, 기본값 현재 시각)
+
+        Returns:
+            float: 매도 실현 손익 (매수는 0)
+        """
+        if quantity <= 0:
+            return 0.0
+        side = str(side).upper()
+        realized = 0.0
+        with self._lock:
+            position = self._positions.get(symbol)
+            if side in ("BUY", "매수"):
+                if position is None:
+                    entry_time = time or get_current_time().isoformat()
+                    self._positions[symbol] = Position(symbol, quantity, float(price), float(price),
+                                                       name, market, entry_time)
+                else:
+                    total = position.quantity + quantity
+                    position.avg_price = (position.avg_price * position.quantity + price * quantity) / total
+                    position.quantity = total
+                    position.current_price = float(price)
+            elif position is not None:
+                sold = min(quantity, position.quantity)
+                realized = (price - position.avg_price) * sold
+                position.quantity -= sold
+                position.current_price = float(price)
+                if position.quantity <= 0:
+                    del self._positions[symbol]
+            else:
+                logger.warning(f"{symbol} 보유하지 않은 종목의 매도 체결이 들어왔습니다. 다음 대조 때 반영됩니다.")
+            self.version += 1
+            self.stats['fills'] += 1
+        logger.debug(f"체결 반영: {symbol} {side} {quantity}주 @ {price:,.0f}")
+        return realized
+
+    def update_prices(self, prices):
+        """현재가 일괄 갱신 {종목코드: 가격}"""
+        with self._lock:
+            for symbol, price in prices.items():
+                position = self._positions.get(symbol)
+                if position is not None and price:
+                    position.current_price = float(price)
+
+    def invalidate(self):
+        """다음 reconcile() 호출에서 간격과 관계없이 증권사와 대조하도록 표시"""
+        with self._lock:
+            self._last_reconcile = None
+
+    def reconcile(self, force=False):
+        """
+        증권사 잔고와 대조하여 장부 교체 (진입 시각은 기존 장부 값 유지)
+
+        Args:
+            force: 대조 간격과 관계없이 즉시 대조
+
+        조회하는 동안 apply_fill()이 장부를 바꿨으면 조회 결과에 그 체결이 빠졌을 수 있으므로
+        장부를 유지하고 다음 호출에서 다시 대조합니다.
+
+        Returns:
+            bool: 대조를 수행했으면 True (간격 미달/다른 스레드 대조 중/조회 중 체결/실패면 False)
+        """
+        if self.broker is None:
+            return False
+        with self._lock:
+            last = self._last_reconcile
+        if not force and last is not None and self._now() - last < self.reconcile_seconds:
+            self.stats['reconcile_skipped'] += 1
+            return False
+
+        # 다른 스레드가 대조 중이면 그 결과를 사용 (증권사 API 중복 호출 방지)
+        if not self._reconcile_lock.acquire(blocking=False):
+            with self._reconcile_lock:
+                self.stats['reconcile_skipped'] += 1
+                return False
+        try:
+            with self._lock:
+                version = self.version
+            try:
+                broker_positions = normalize_positions(self.broker.get_positions())
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"증권사 포지션 조회 실패, 기존 장부 유지: {e}")
+                return False
+
+            with self._lock:
+                if self.version != version:
+                    # 조회 중 체결 반영 - 증권사 응답이 그 체결 이전일 수 있으므로 버리고 다음 호출에서 재대조
+                    self.stats['reconcile_discarded'] += 1
+                    self._last_reconcile = None
+                    logger.debug("증권사 포지션 조회 중 체결이 반영되어 대조 결과를 버립니다.")
+                    return False
+                for symbol, position in broker_positions.items():
+                    held = self._positions.get(symbol)
+                    if held is not None:
+                        position.entry_time = position.entry_time or held.entry_time
+                        if held.quantity != position.quantity:
+                            self.stats['mismatches'] += 1
+                            logger.info(f"{symbol} 장부 수량 {held.quantity}주 -> 증권사 {position.quantity}주로 보정")
+                    elif position.entry_time is None:
+                        position.entry_time = get_current_time().isoformat()
+                for symbol in set(self._positions) - set(broker_positions):
+                    self.stats['mismatches'] += 1
+                    logger.info(f"{symbol} 증권사 잔고에 없어 장부에서 제거")
+                self._positions = broker_positions
+                self._last_reconcile = self._now()
+                self.version += 1
+                self.stats['reconciles'] += 1
+            logger.debug(f"포지션 장부 대조 완료: {len(broker_positions)}개 종목")
+            return True
+        finally:
+            self._reconcile_lock.release()
+
+
+# 브로커별 공유 장부
+_books = weakref.WeakKeyDictionary()
+_books_lock = threading.Lock()
+
+
+def get_position_book(broker, config=None):
+    """
+    브로커에 연결된 공유 포지션 장부 반환 (같은 브로커를 쓰는 트레이더는 같은 장부 사용)
+
+    Args:
+        broker: 증권사 API 객체 (None이면 공유하지 않는 빈 장부)
+        config: 설정 모듈
+    """
+    if broker is None:
+        return PositionBook(None, config)
+    with _books_lock:
+        book = _books.get(broker)
+        if book is None:
+            book = _books[broker] = PositionBook(broker, config)
+        return book
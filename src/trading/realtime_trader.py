@@ -12,7 +12,13 @@ import threading
 import datetime
 import pandas as pd
 import numpy as np
-from src.utils.time_utils import get_current_time, get_current_time_str, is_market_open
+from src.utils.time_utils import get_current_time, get_current_time_str, is_market_open, wait_for_market_open
+from src.trading.position_book import get_position_book
+from src.trading.order_tracker import get_order_tracker
+from src.trading.order_gateway import get_order_gateway, OrderRequest
+from src.data.symbol_master import get_symbol_master
+from src.utils.metrics import timed
+from src.utils.tracing import get_tracer, traced
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -20,7 +26,7 @@ logger = logging.getLogger(__name__)
 class RealtimeTrader:
     """실시간 트레이딩을 위한 클래스"""
     
-    def __init__(self, config, broker, data_provider, notifier=None):
+    def __init__(self, config, broker, data_provider, notifier=None, position_book=None):
         """
         RealtimeTrader 클래스 초기화
         
@@ -29,17 +35,23 @@ class RealtimeTrader:
             broker: 주문 실행을 위한 브로커 객체
             data_provider: 주가 데이터 제공자
             notifier: 알림 발송 객체 (선택사항)
+            position_book: 공유 포지션 장부 (None이면 브로커에 연결된 공유 장부 사용)
         """
         self.config = config
         self.broker = broker
         self.data_provider = data_provider
         self.notifier = notifier
+        self.position_book = position_book or get_position_book(broker, config)
+        self.order_tracker = get_order_tracker(broker, config)
+        self.order_gateway = get_order_gateway(broker, config, data_provider)
+        self.order_fill_timeout = getattr(config, 'ORDER_FILL_TIMEOUT_SECONDS', 10)  # 주문 체결 최대 대기 시간 (초)
         
         # 실시간 거래 관련 설정
         self.realtime_trading_enabled = getattr(config, 'REALTIME_TRADING_ENABLED', True)
         self.realtime_only_mode = getattr(config, 'REALTIME_ONLY_MODE', True)  # 실시간 전용 모드 사용 여부
         self.simulation_mode = getattr(config, 'SIMULATION_MODE', False)
         self.scan_interval_seconds = getattr(config, 'REALTIME_SCAN_INTERVAL_SECONDS', 30)
+        self.trace_slow_cycle_seconds = getattr(config, 'TRACE_SLOW_CYCLE_SECONDS', 60)  # 이보다 느린 사이클은 구간 분해 기록
         self.price_surge_threshold = getattr(config, 'PRICE_SURGE_THRESHOLD_PERCENT', 3.0)
         self.volume_surge_threshold = getattr(config, 'VOLUME_SURGE_THRESHOLD_PERCENT', 200.0)
         self.min_trade_amount = getattr(config, 'REALTIME_MIN_TRADE_AMOUNT', 500000)
@@ -142,25 +154,14 @@ class RealtimeTrader:
             try:
                 # 거래 시간인지 확인
                 if not is_market_open("KR"):
-                    logger.info("현재 거래 시간이 아닙니다. 5분 후에 다시 확인합니다.")
-                    for _ in range(5 * 60):  # 5분 대기 (1초 단위로 중단 체크)
-                        if not self.is_running:
-                            break
-                        time.sleep(1)
+                    # 휴장일/주말을 건너뛰고 다음 개장 시각까지 대기 (1초 단위로 중단 체크)
+                    logger.info("현재 거래 시간이 아닙니다. 다음 개장까지 대기합니다.")
+                    wait_for_market_open("KR", should_continue=lambda: self.is_running)
                     continue
-                
-                # 1. 현재 포지션 업데이트
-                self._update_positions()
-                
-                # 2. 기존 포지션 관리 (손절, 익절 등)
-                self._manage_existing_positions()
-                
-                # 3. 실시간 시장 스캔으로 급등주 감지
-                self._scan_market_for_surges()
-                
-                # 4. 감지된 종목 분석 및 거래 실행
-                self._analyze_and_trade_surges()
-                
+
+                with get_tracer().span("realtime_trader.cycle", "cycle", slow=self.trace_slow_cycle_seconds):
+                    self.run_cycle()
+
                 # 다음 스캔까지 대기
                 logger.debug(f"실시간 트레이딩 사이클 완료. {self.scan_interval_seconds}초 후에 다시 스캔합니다.")
                 for _ in range(self.scan_interval_seconds):
@@ -171,52 +172,57 @@ class RealtimeTrader:
             except Exception as e:
                 logger.error(f"실시간 트레이딩 루프 중 오류 발생: {e}")
                 time.sleep(60)  # 오류 발생 시 1분 대기
-    
-    def _update_positions(self):
-        """현재 보유 중인 포지션 정보 업데이트"""
+
+    @timed('realtime_trader_cycle_seconds', 'RealtimeTrader 사이클 소요 시간')
+    def run_cycle(self):
+        """
+        실시간 트레이딩 사이클 1회 실행 (거래 시간 확인과 대기는 호출자가 담당)
+
+        Returns:
+            dict: 사이클 실행 결과 요약
+        """
+        trades_before = len(self.trade_history)
+
+        # 1. 현재 포지션 업데이트
+        self._update_positions()
+        evaluated = len(self.current_positions)
+
+        # 2. 기존 포지션 관리 (손절, 익절 등)
+        self._manage_existing_positions()
+
+        # 3. 실시간 시장 스캔으로 급등주 감지
+        watchlist = self._get_watchlist_symbols()
+        evaluated += len(watchlist)
+        self._subscribe_market_data(watchlist)
+        self._scan_market_for_surges()
+
+        # 4. 감지된 종목 분석 및 거래 실행
+        evaluated += len(self.realtime_targets)
+        self._analyze_and_trade_surges()
+
+        new_trades = self.trade_history[trades_before:]
+        return {
+            "status": "success",
+            "timestamp": get_current_time_str(),
+            "positions_count": len(self.current_positions),
+            "targets_count": len(self.realtime_targets),
+            "evaluated": evaluated,
+            "buy_orders": [t['symbol'] for t in new_trades if t.get('action') == 'BUY'],
+            "sell_orders": [t['symbol'] for t in new_trades if t.get('action') == 'SELL']
+        }
+
+    @traced('realtime_trader.update_positions', 'internal')
+    def _update_positions(self, force=False):
+        """
+        현재 보유 중인 포지션 정보 업데이트 (공유 포지션 장부에서 읽음)
+        
+        Args:
+            force: 대조 간격과 관계없이 증권사 잔고와 즉시 대조 (주문 직후)
+        """
         try:
-            positions = self.broker.get_positions() if self.broker else {}
-            
-            # 포지션 정보 형식 변환 및 저장
-            current_positions = {}
-            
-            # 리스트 형식 처리
-            if isinstance(positions, list):
-                for position in positions:
-                    # 종목코드 확인
-                    symbol = position.get("종목코드", position.get("symbol", ""))
-                    if not symbol:
-                        continue
-                        
-                    # 수량 및 평균단가 추출
-                    quantity = int(position.get("보유수량", position.get("quantity", 0)))
-                    avg_price = float(position.get("평균단가", position.get("avg_price", 0)))
-                    
-                    if quantity > 0:
-                        current_positions[symbol] = {
-                            'symbol': symbol,
-                            'name': position.get("종목명", position.get("name", symbol)),
-                            'quantity': quantity,
-                            'avg_price': avg_price,
-                            'current_price': float(position.get("현재가", position.get("current_price", 0))),
-                            'entry_time': position.get("entry_time", self.current_positions.get(symbol, {}).get("entry_time", get_current_time().isoformat()))
-                        }
-            
-            # 딕셔너리 형식 처리
-            elif isinstance(positions, dict) and "positions" in positions:
-                for symbol, position in positions["positions"].items():
-                    quantity = int(position.get("quantity", 0))
-                    if quantity > 0:
-                        current_positions[symbol] = {
-                            'symbol': symbol,
-                            'name': position.get("name", symbol),
-                            'quantity': quantity,
-                            'avg_price': float(position.get("avg_price", 0)),
-                            'current_price': float(position.get("current_price", 0)),
-                            'entry_time': position.get("entry_time", self.current_positions.get(symbol, {}).get("entry_time", get_current_time().isoformat()))
-                        }
-            
-            self.current_positions = current_positions
+            # 장부는 POSITION_RECONCILE_SECONDS 간격으로만 증권사와 대조하고, 다른 트레이더와 공유됨
+            self.position_book.reconcile(force=force)
+            self.current_positions = self.position_book.as_dicts(market="KR")
             logger.debug(f"현재 포지션 업데이트 완료: {len(self.current_positions)}개")
             return True
             
@@ -224,6 +230,7 @@ class RealtimeTrader:
             logger.error(f"포지션 업데이트 중 오류 발생: {e}")
             return False
     
+    @traced('realtime_trader.manage_existing_positions', 'internal')
     def _manage_existing_positions(self):
         """기존 포지션 관리 (손절, 익절, 보유 시간 초과 등)"""
         if not self.current_positions:
@@ -280,6 +287,7 @@ class RealtimeTrader:
         for symbol, reason, profit_pct in positions_to_sell:
             self._execute_sell(symbol, reason, profit_pct)
     
+    @traced('realtime_trader.scan_market_for_surges', 'internal')
     def _scan_market_for_surges(self):
         """시장 스캔을 통해 급등주 감지"""
         try:
@@ -339,6 +347,15 @@ class RealtimeTrader:
             logger.error(f"급등주 스캔 중 오류 발생: {e}")
             return False
     
+    @traced('realtime_trader.subscribe_market_data', 'internal')
+    def _subscribe_market_data(self, watchlist):
+        """감시/보유/대상 종목 시세를 공유 데이터 서비스에 구독 (지원하는 제공자인 경우)"""
+        subscribe = getattr(self.data_provider, 'subscribe', None)
+        if subscribe is None:
+            return
+        symbols = set(watchlist) | set(self.current_positions) | set(self.realtime_targets)
+        subscribe("RealtimeTrader", symbols, "KR")
+    
     def _get_watchlist_symbols(self):
         """감시할 종목 목록 가져오기"""
         # 실제로는 DB나 설정에서 가져와야 함
@@ -346,10 +363,17 @@ class RealtimeTrader:
         return ['005930', '000660', '035420', '035720', '051910', '207940']
     
     def _get_stock_name(self, symbol):
-        """종목 코드로 종목명 조회"""
+        """종목 코드로 종목명 조회 (종목 마스터 인덱스에 없을 때만 증권사 조회)"""
+        master = get_symbol_master(self.config)
+        info = master.get(symbol, "KR")
+        if info is not None:
+            return info.name
         try:
             if hasattr(self.broker, 'get_stock_name'):
-                return self.broker.get_stock_name(symbol) or symbol
+                name = self.broker.get_stock_name(symbol)
+                if name:
+                    master.put(symbol, name, "KR")
+                    return name
         except:
             pass
         return symbol
@@ -428,6 +452,7 @@ class RealtimeTrader:
         except Exception as e:
             logger.error(f"{symbol} 타겟 정보 업데이트 중 오류: {e}")
     
+    @traced('realtime_trader.analyze_and_trade_surges', 'internal')
     def _analyze_and_trade_surges(self):
         """감지된 급등주 분석 및 거래 실행"""
         if not self.realtime_targets:
@@ -437,52 +462,53 @@ class RealtimeTrader:
         targets_to_remove = []
         
         for symbol, data in self.realtime_targets.items():
-            try:
-                # 이미 보유 중인 종목은 건너뜀
-                if symbol in self.current_positions:
-                    continue
+            with get_tracer().span("realtime_trader.symbol", "symbol", symbol=symbol):
+                try:
+                    # 이미 보유 중인 종목은 건너뜀
+                    if symbol in self.current_positions:
+                        continue
                     
-                # 최초 감지 후 일정 시간이 지났는지 확인
-                first_detected = data.get('first_detected')
-                if not first_detected:
-                    continue
+                    # 최초 감지 후 일정 시간이 지났는지 확인
+                    first_detected = data.get('first_detected')
+                    if not first_detected:
+                        continue
                     
-                # 감지 후 너무 오래 지난 종목은 제외 (30분 이상)
-                minutes_since_detection = (now - first_detected).total_seconds() / 60
-                if minutes_since_detection > 30:
-                    targets_to_remove.append(symbol)
-                    logger.info(f"{symbol} 감시 목록에서 제거: 감지 후 {minutes_since_detection:.1f}분 경과")
-                    continue
-                
-                # 현재 가격 확인
-                current_price = self.data_provider.get_current_price(symbol, "KR")
-                if not current_price:
-                    logger.warning(f"{symbol} 현재가를 가져올 수 없습니다.")
-                    continue
-                
-                # GPT 분석 요청 (설정된 경우)
-                gpt_insights = None
-                if self.use_gpt_analysis and self.gpt_auto_trader:
-                    # 히스토리 데이터 조회
-                    stock_data = self.data_provider.get_historical_data(symbol, "KR", period="1d", interval="5m")
-                    if stock_data is not None and len(stock_data) > 0:
-                        # GPT 분석 요청
-                        gpt_insights = self.gpt_auto_trader.get_gpt_insights_for_realtime_trading(
-                            symbol, stock_data, current_price
-                        )
-                
-                # 매매 결정
-                should_buy = self._should_buy_surge(symbol, data, gpt_insights)
-                
-                if should_buy:
-                    # 매수 주문 실행
-                    success = self._execute_buy(symbol, data, gpt_insights)
-                    if success:
-                        # 매수 성공 시 감시 목록에서 제거
+                    # 감지 후 너무 오래 지난 종목은 제외 (30분 이상)
+                    minutes_since_detection = (now - first_detected).total_seconds() / 60
+                    if minutes_since_detection > 30:
                         targets_to_remove.append(symbol)
+                        logger.info(f"{symbol} 감시 목록에서 제거: 감지 후 {minutes_since_detection:.1f}분 경과")
+                        continue
                 
-            except Exception as e:
-                logger.error(f"{symbol} 분석 및 거래 중 오류: {e}")
+                    # 현재 가격 확인
+                    current_price = self.data_provider.get_current_price(symbol, "KR")
+                    if not current_price:
+                        logger.warning(f"{symbol} 현재가를 가져올 수 없습니다.")
+                        continue
+                
+                    # GPT 분석 요청 (설정된 경우)
+                    gpt_insights = None
+                    if self.use_gpt_analysis and self.gpt_auto_trader:
+                        # 히스토리 데이터 조회
+                        stock_data = self.data_provider.get_historical_data(symbol, "KR", period="1d", interval="5m")
+                        if stock_data is not None and len(stock_data) > 0:
+                            # GPT 분석 요청
+                            gpt_insights = self.gpt_auto_trader.get_gpt_insights_for_realtime_trading(
+                                symbol, stock_data, current_price
+                            )
+                
+                    # 매매 결정
+                    should_buy = self._should_buy_surge(symbol, data, gpt_insights)
+                
+                    if should_buy:
+                        # 매수 주문 실행
+                        success = self._execute_buy(symbol, data, gpt_insights)
+                        if success:
+                            # 매수 성공 시 감시 목록에서 제거
+                            targets_to_remove.append(symbol)
+                
+                except Exception as e:
+                    logger.error(f"{symbol} 분석 및 거래 중 오류: {e}")
         
         # 처리 완료된 종목은 감시 목록에서 제거
         for symbol in targets_to_remove:
@@ -549,6 +575,7 @@ class RealtimeTrader:
         Returns:
             bool: 매수 성공 여부
         """
+        signal_time = time.monotonic()  # 신호→제출 지연 측정용
         try:
             # 계좌 잔고 확인
             balance_info = self.broker.get_balance() if self.broker else {"주문가능금액": 0}
@@ -566,8 +593,9 @@ class RealtimeTrader:
             # 투자금액 결정 (최대 투자 금액 이내에서)
             investment_amount = min(self.max_trade_amount, available_cash)
             
-            # 매수 수량 계산
-            quantity = int(investment_amount / current_price)
+            # 매수 수량 계산 (주문 게이트웨이 위험 한도 이내)
+            quantity = min(int(investment_amount / current_price),
+                           self.order_gateway.max_buy_quantity(symbol, current_price))
             
             # 1주 이상인 경우만 거래
             if quantity < 1:
@@ -616,12 +644,11 @@ class RealtimeTrader:
                 return True
             else:
                 # 실제 매수 주문
-                order_result = self.broker.place_order(
-                    symbol=symbol,
-                    order_type="buy",
-                    quantity=quantity,
-                    price=current_price
-                )
+                # 공유 주문 게이트웨이에서 위험 점검 후 시장가로 제출
+                order_result = self.order_gateway.execute(OrderRequest(
+                    symbol, "BUY", quantity, order_type="MARKET", market="KR", reference_price=current_price,
+                    source="RealtimeTrader", name=name, signal_time=signal_time
+                ))
                 
                 if order_result and order_result.get('success'):
                     logger.info(f"{symbol} 실제 매수 주문 완료: 주문번호 {order_result.get('order_id', 'N/A')}")
@@ -641,12 +668,11 @@ class RealtimeTrader:
                     }
                     self.trade_history.append(trade_record)
                     
-                    # API 반영 대기
-                    logger.info("주문 체결 후 API 반영 대기 중...")
-                    time.sleep(5)
+                    # 체결 확인 대기 (주문 추적기가 체결을 확인하는 즉시 반환, 고정 대기 없음)
+                    self.order_tracker.wait(order_result.get('order_id'), self.order_fill_timeout)
                     
-                    # 포지션 업데이트
-                    self._update_positions()
+                    # 포지션 업데이트 (증권사 잔고와 즉시 대조)
+                    self._update_positions(force=True)
                     
                     # 알림 전송
                     if self.notifier:
@@ -675,6 +701,7 @@ class RealtimeTrader:
             reason: 매도 사유 (손절, 익절 등)
             profit_pct: 손익률 (있는 경우)
         """
+        signal_time = time.monotonic()  # 신호→제출 지연 측정용
         try:
             if symbol not in self.current_positions:
                 logger.warning(f"{symbol} 매도 시도 중 오류: 보유하고 있지 않은 종목")
@@ -736,12 +763,11 @@ class RealtimeTrader:
                 return True
             else:
                 # 실제 매도 주문
-                order_result = self.broker.place_order(
-                    symbol=symbol,
-                    order_type="sell",
-                    quantity=quantity,
-                    price=current_price
-                )
+                # 공유 주문 게이트웨이에서 위험 점검 후 시장가로 제출
+                order_result = self.order_gateway.execute(OrderRequest(
+                    symbol, "SELL", quantity, order_type="MARKET", market="KR", reference_price=current_price,
+                    source="RealtimeTrader", name=name, signal_time=signal_time
+                ))
                 
                 if order_result and order_result.get('success'):
                     logger.info(f"{symbol} 실제 매도 주문 완료: 주문번호 {order_result.get('order_id', 'N/A')}")
@@ -762,12 +788,11 @@ class RealtimeTrader:
                     }
                     self.trade_history.append(trade_record)
                     
-                    # API 반영 대기
-                    logger.info("매도 주문 체결 후 API 반영 대기 중...")
-                    time.sleep(5)
+                    # 체결 확인 대기 (주문 추적기가 체결을 확인하는 즉시 반환, 고정 대기 없음)
+                    self.order_tracker.wait(order_result.get('order_id'), self.order_fill_timeout)
                     
-                    # 포지션 업데이트
-                    self._update_positions()
+                    # 포지션 업데이트 (증권사 잔고와 즉시 대조)
+                    self._update_positions(force=True)
                     
                     # 알림 전송
                     if self.notifier:
@@ -0,0 +1,108 @@
+"""
+거래 이벤트 캐시 무효화 알림 모듈
+
+api_server.py는 포트폴리오/성과 리포트 응답을 캐시하지만 주문과 체결은 main.py(트레이딩 프로세스)에서
+일어나므로, 주문 추적기가 체결을 장부에 반영할 때 API 서버의 POST /api/cache/invalidate를 호출해
+거래 관련 캐시를 비웁니다.
+
+- notify()는 요청 표시만 하고 바로 반환하므로 주문 경로를 막지 않습니다. 백그라운드 스레드가
+  API_CACHE_INVALIDATE_DEBOUNCE_SECONDS 안에 몰린 체결을 한 번의 요청으로 묶어 보냅니다.
+- API 서버가 꺼져 있어 요청이 실패해도 디버그 로그만 남깁니다 (캐시는 TTL로 만료됨).
+- API_CACHE_INVALIDATE_URL이 비어 있으면 아무것도 보내지 않습니다.
+"""
+import logging
+import threading
+import time
+
+import requests
+
+# 로거 설정
+logger = logging.getLogger('CacheNotifier')
+
+
+class TradeCacheNotifier:
+    """체결 발생 시 API 서버 응답 캐시 무효화 요청 (묶음 전송)"""
+
+    def __init__(self, url=None, debounce=0.5, timeout=2.0):
+        """
+        Args:
+            url: API 서버 캐시 무효화 주소 (비어 있으면 사용 안 함)
+            debounce: 첫 알림 후 요청을 보내기까지 모으는 시간 (초)
+            timeout: 요청 제한 시간 (초)
+        """
+        self.url = url
+        self.debounce = debounce
+        self.timeout = timeout
+        self._pending = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._session = None
+        self.stats = {'notified': 0, 'sent': 0, 'failed': 0}
+
+    def configure(self, url=None, debounce=None, timeout=None):
+        """설정 변경 (None인 항목은 유지, url은 빈 문자열로 끌 수 있음)"""
+        if url is not None:
+            self.url = url
+        if debounce is not None:
+            self.debounce = debounce
+        if timeout is not None:
+            self.timeout = timeout
+
+    def notify(self):
+        """거래 이벤트 발생 알림 (대기 없이 반환)"""
+        if not self.url:
+            return
+        with self._lock:
+            self.stats['notified'] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="TradeCacheNotifier", daemon=True)
+                self._thread.start()
+        self._pending.set()
+
+    def _run(self):
+        while True:
+            self._pending.wait()
+            # 잇따른 체결(부분 체결, 여러 종목 동시 체결)을 한 번의 요청으로 묶음
+            time.sleep(self.debounce)
+            self._pending.clear()
+            self._send()
+
+    def _send(self):
+        url = self.url
+        if not url:
+            return
+        try:
+            if self._session is None:
+                self._session = requests.Session()
+            response = self._session.post(url, timeout=self.timeout)
+            response.raise_for_status()
+            with self._lock:
+                self.stats['sent'] += 1
+        except Exception as e:
+            with self._lock:
+                self.stats['failed'] += 1
+            logger.debug(f"API 서버 캐시 무효화 요청 실패: {e}")
+
+
+# 프로세스 전역 알림 객체
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_trade_cache_notifier(config=None):
+    """
+    프로세스 전역 캐시 무효화 알림 객체 반환
+
+    Args:
+        config: 설정 모듈 (API_CACHE_INVALIDATE_URL, API_CACHE_INVALIDATE_DEBOUNCE_SECONDS를 적용,
+                이미 생성된 경우에도 적용)
+    """
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = TradeCacheNotifier()
+    if config is not None:
+        _notifier.configure(url=getattr(config, 'API_CACHE_INVALIDATE_URL', '') or '',
+                            debounce=getattr(config, 'API_CACHE_INVALIDATE_DEBOUNCE_SECONDS', 0.5))
+    return _notifier
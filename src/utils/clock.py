@@ -0,0 +1,58 @@
+"""
+시계 모듈
+
+time_utils.get_current_time과 MarketCalendar가 사용하는 현재 시각 공급자입니다.
+리플레이/백테스트에서는 set_clock() 또는 use_clock()으로 가상 시계를 주입하여
+코드 수정 없이 시뮬레이션 시각으로 실행할 수 있습니다.
+
+시계 객체는 다음 두 메서드를 제공해야 합니다.
+- now(timezone): 해당 시간대의 현재 시각 (timezone이 None이면 tz 없는 로컬 시각)
+- timestamp(): 현재 시각의 epoch 초
+"""
+import contextlib
+import datetime
+import time
+
+
+class SystemClock:
+    """시스템 시계 (기본값)"""
+
+    def now(self, timezone=None):
+        return datetime.datetime.now(timezone)
+
+    def timestamp(self):
+        return time.time()
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    """현재 주입된 시계 반환"""
+    return _clock
+
+
+def set_clock(clock):
+    """
+    전역 시계 교체
+
+    Args:
+        clock: 시계 객체 (None이면 시스템 시계로 복원)
+
+    Returns:
+        이전 시계 객체
+    """
+    global _clock
+    previous = _clock
+    _clock = clock if clock is not None else SystemClock()
+    return previous
+
+
+@contextlib.contextmanager
+def use_clock(clock):
+    """with 블록 동안만 시계를 교체"""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -0,0 +1,417 @@
+"""
+작업 스케줄러 모듈
+
+다음 실행 시각 순으로 정렬된 힙에서 기한이 된 작업만 꺼내 작업 분류별 워커 풀에서
+실행합니다. 메인 스레드는 다음 작업 시각까지 정확히 대기하므로 1분 폴링이 필요 없고,
+느린 작업(GPT 종목 선정 등)이 다른 분류의 작업(매매 사이클, 리포트)을 지연시키지 않습니다.
+
+트리거:
+- IntervalTrigger: 일정 간격 실행 (market을 주면 해당 시장 세션 중에만, 장 마감 후에는 다음 개장 시각에 실행)
+- DailyTrigger: 매일 정해진 시각 실행 (market을 주면 해당 시장 거래일에만)
+- SessionTrigger: 시장 세션 개장/마감 기준 실행 (예: 한국장 마감 10분 후)
+
+중복 실행 정책 (이전 실행이 끝나지 않았을 때 다음 실행 시각이 된 경우):
+- skip: 이번 실행을 건너뜀
+- queue: 밀린 실행을 모두 대기열에 넣고 이전 실행이 끝나면 차례로 실행
+- coalesce: 밀린 실행을 하나로 합쳐 이전 실행이 끝난 뒤 한 번만 실행
+
+작업마다 실행 시간과 지연(예정 시각 대비 실제 시작 시각)을 기록합니다.
+"""
+import collections
+import datetime
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .clock import get_clock
+from .market_calendar import get_calendar, REGULAR
+from .time_utils import KST
+
+# 로거 설정
+logger = logging.getLogger('JobScheduler')
+
+# 중복 실행 정책
+SKIP = "skip"
+QUEUE = "queue"
+COALESCE = "coalesce"
+OVERLAP_POLICIES = (SKIP, QUEUE, COALESCE)
+
+# 일일 작업의 다음 실행일 탐색 범위
+MAX_DAILY_SEARCH_DAYS = 30
+
+
+class IntervalTrigger:
+    """일정 간격 트리거"""
+
+    def __init__(self, seconds, market=None, session=REGULAR, config=None):
+        """
+        Args:
+            seconds: 실행 간격 (초)
+            market: 시장 코드 (지정하면 해당 시장 세션 중에만 실행)
+            session: 세션 종류 ("regular", "pre", "after")
+            config: 설정 모듈
+        """
+        if seconds <= 0:
+            raise ValueError(f"실행 간격은 0보다 커야 합니다: {seconds}")
+        self.seconds = float(seconds)
+        self.market = market
+        self.session = session
+        self.calendar = get_calendar(market, config) if market else None
+
+    def next_fire(self, after):
+        candidate = after + self.seconds
+        if self.calendar is None or self.calendar.force_open():
+            return candidate
+        if self.calendar.is_open(candidate, self.session):
+            return candidate
+        # 장이 닫혀 있으면 다음 개장 시각에 바로 실행
+        return self.calendar.next_open(candidate, self.session).timestamp()
+
+    def __repr__(self):
+        market = f", {self.market} {self.session}" if self.market else ""
+        return f"IntervalTrigger({self.seconds:g}s{market})"
+
+
+class DailyTrigger:
+    """매일 정해진 시각 트리거"""
+
+    def __init__(self, at, timezone=KST, market=None, config=None):
+        """
+        Args:
+            at: 실행 시각 ("HH:MM")
+            timezone: 실행 시각의 시간대
+            market: 시장 코드 (지정하면 해당 시장 거래일에만 실행, 시장 시간대 날짜 기준)
+            config: 설정 모듈
+        """
+        self.at = datetime.datetime.strptime(at, "%H:%M").time()
+        self.timezone = timezone
+        self.market = market
+        self.calendar = get_calendar(market, config) if market else None
+
+    def next_fire(self, after):
+        date = datetime.datetime.fromtimestamp(after, self.timezone).date()
+        for _ in range(MAX_DAILY_SEARCH_DAYS):
+            fire = self.timezone.localize(datetime.datetime.combine(date, self.at))
+            date += datetime.timedelta(days=1)
+            if fire.timestamp() <= after:
+                continue
+            if self.calendar is not None:
+                market_date = fire.astimezone(self.calendar.timezone).date()
+                if not self.calendar.is_trading_day(market_date):
+                    continue
+            return fire.timestamp()
+        raise ValueError(f"{MAX_DAILY_SEARCH_DAYS}일 안에 실행할 날짜가 없습니다: {self}")
+
+    def __repr__(self):
+        market = f", {self.market} 거래일" if self.market else ""
+        return f"DailyTrigger({self.at.strftime('%H:%M')} {self.timezone}{market})"
+
+
+class SessionTrigger:
+    """시장 세션 개장/마감 기준 트리거 (휴장일 제외, 조기 마감 반영)"""
+
+    def __init__(self, market, event="open", offset_minutes=0, session=REGULAR, config=None):
+        """
+        Args:
+            market: 시장 코드 ("KR" 또는 "US")
+            event: "open" 또는 "close"
+            offset_minutes: 기준 시각으로부터의 오프셋 (분, 음수면 이전)
+            session: 세션 종류 ("regular", "pre", "after")
+            config: 설정 모듈
+        """
+        if event not in ("open", "close"):
+            raise ValueError(f"지원하지 않는 세션 이벤트입니다: {event}")
+        self.market = market
+        self.event = event
+        self.offset = offset_minutes * 60.0
+        self.session = session
+        self.calendar = get_calendar(market, config)
+
+    def next_fire(self, after):
+        # 기준 시각이 (after - offset) 이후인 가장 가까운 세션 -> 실행 시각은 after 이후
+        reference = after - self.offset
+        if self.event == "open":
+            at = self.calendar.next_open(reference, self.session)
+        else:
+            at = self.calendar.next_close(reference, self.session)
+        return at.timestamp() + self.offset
+
+    def __repr__(self):
+        return f"SessionTrigger({self.market} {self.session} {self.event}{self.offset / 60:+g}m)"
+
+
+class JobStats:
+    """작업 실행 기록 (실행 시간, 지연)"""
+
+    def __init__(self, history=256):
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.max_lateness = 0.0
+        self.last_started = None
+        self.last_duration = None
+        self.last_lateness = None
+        self.last_error = None
+        self.durations = collections.deque(maxlen=history)
+        self.lateness = collections.deque(maxlen=history)
+
+    def record(self, started, duration, lateness, error=None):
+        self.runs += 1
+        self.total_seconds += duration
+        self.max_seconds = max(self.max_seconds, duration)
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.last_started = started
+        self.last_duration = duration
+        self.last_lateness = lateness
+        self.durations.append(duration)
+        self.lateness.append(lateness)
+        if error is not None:
+            self.failures += 1
+            self.last_error = str(error)
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'coalesced': self.coalesced,
+            'mean_seconds': self.total_seconds / self.runs if self.runs else None,
+            'p95_seconds': self._percentile(self.durations, 0.95),
+            'max_seconds': self.max_seconds,
+            'last_duration': self.last_duration,
+            'last_lateness': self.last_lateness,
+            'p95_lateness': self._percentile(self.lateness, 0.95),
+            'max_lateness': self.max_lateness,
+            'last_error': self.last_error
+        }
+
+
+class Job:
+    """스케줄러에 등록된 작업"""
+
+    def __init__(self, name, func, trigger, job_class="default", overlap=SKIP, args=(), kwargs=None):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"지원하지 않는 중복 실행 정책입니다: {overlap}")
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.job_class = job_class
+        self.overlap = overlap
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.next_run = None  # 다음 예정 시각 (epoch 초)
+        self.running = False
+        self.pending = collections.deque()  # 이전 실행이 끝나길 기다리는 예정 시각
+        self.cancelled = False
+        self.stats = JobStats()
+
+    def __repr__(self):
+        return f"Job({self.name}, {self.trigger}, {self.job_class}/{self.overlap})"
+
+
+class JobScheduler:
+    """
+    힙 기반 작업 스케줄러
+
+    run()은 다음 작업 시각까지 대기하다가 기한이 된 작업을 작업 분류(job_class)별
+    ThreadPoolExecutor에 넘깁니다. 같은 작업은 중복 실행 정책에 따라 동시에 한 번만 실행됩니다.
+    """
+
+    def __init__(self, pools=None, clock=None, max_idle_seconds=60.0, lateness_warning_seconds=30.0):
+        """
+        Args:
+            pools: 작업 분류별 워커 수 {job_class: max_workers} (없는 분류는 1)
+            clock: 시계 객체 (None이면 clock.get_clock()의 전역 시계)
+            max_idle_seconds: 최대 연속 대기 시간 (시계 변경 등에 대비한 재확인 간격)
+            lateness_warning_seconds: 이 값보다 늦게 시작한 실행은 경고 로그
+        """
+        self.pool_sizes = dict(pools or {})
+        self.clock = clock
+        self.max_idle_seconds = max_idle_seconds
+        self.lateness_warning_seconds = lateness_warning_seconds
+        self.jobs = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._executors = {}
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+    def _now(self):
+        return (self.clock if self.clock is not None else get_clock()).timestamp()
+
+    def add_job(self, name, func, trigger, job_class="default", overlap=SKIP, args=(), kwargs=None):
+        """
+        작업 등록
+
+        Args:
+            name: 작업 이름 (고유)
+            func: 실행할 함수
+            trigger: IntervalTrigger/DailyTrigger/SessionTrigger
+            job_class: 작업 분류 (분류별 워커 풀에서 실행)
+            overlap: 중복 실행 정책 ("skip", "queue", "coalesce")
+
+        Returns:
+            Job
+        """
+        job = Job(name, func, trigger, job_class, overlap, args, kwargs)
+        with self._lock:
+            if name in self.jobs:
+                raise ValueError(f"이미 등록된 작업입니다: {name}")
+            self.jobs[name] = job
+            self._schedule(job, self._now())
+        logger.info(f"작업 등록: {job}, 다음 실행 {self._format(job.next_run)}")
+        self._wakeup.set()
+        return job
+
+    def remove_job(self, name):
+        """작업 제거 (실행 중인 작업은 끝까지 실행)"""
+        with self._lock:
+            job = self.jobs.pop(name, None)
+            if job is not None:
+                job.cancelled = True
+                job.pending.clear()
+
+    def _schedule(self, job, after):
+        job.next_run = job.trigger.next_fire(after)
+        heapq.heappush(self._heap, (job.next_run, next(self._seq), job))
+
+    def _format(self, ts):
+        if ts is None:
+            return "-"
+        return datetime.datetime.fromtimestamp(ts, KST).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _executor(self, job_class):
+        executor = self._executors.get(job_class)
+        if executor is None:
+            workers = self.pool_sizes.get(job_class, 1)
+            executor = self._executors[job_class] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"job-{job_class}")
+        return executor
+
+    def run_pending(self, now=None):
+        """
+        기한이 된 작업을 워커 풀에 넘김
+
+        Returns:
+            int: 처리한 예정 실행 수 (건너뛴 실행 포함)
+        """
+        now = self._now() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                scheduled, _, job = heapq.heappop(self._heap)
+                if job.cancelled or scheduled != job.next_run:
+                    continue
+                due.append((job, scheduled))
+                # 다음 실행은 현재 시각 이후로 계산 (밀린 실행이 한꺼번에 몰리지 않도록)
+                self._schedule(job, max(scheduled, now))
+            for job, scheduled in due:
+                self._dispatch(job, scheduled)
+        return len(due)
+
+    def _dispatch(self, job, scheduled):
+        if not job.running:
+            job.running = True
+            self._executor(job.job_class).submit(self._execute, job, scheduled)
+            return
+
+        if job.overlap == SKIP:
+            job.stats.skipped += 1
+            logger.warning(f"작업 {job.name} 이전 실행이 끝나지 않아 {self._format(scheduled)} 실행을 건너뜁니다.")
+        elif job.overlap == COALESCE:
+            if job.pending:
+                job.pending[0] = scheduled
+                job.stats.coalesced += 1
+            else:
+                job.pending.append(scheduled)
+        else:
+            job.pending.append(scheduled)
+
+    def _execute(self, job, scheduled):
+        started = self._now()
+        lateness = max(0.0, started - scheduled)
+        if lateness > self.lateness_warning_seconds:
+            logger.warning(f"작업 {job.name} 예정 시각보다 {lateness:.1f}초 늦게 시작합니다.")
+
+        error = None
+        start = time.perf_counter()
+        try:
+            job.func(*job.args, **job.kwargs)
+        except Exception as e:
+            error = e
+            logger.error(f"작업 {job.name} 실행 중 오류 발생: {e}")
+        duration = time.perf_counter() - start
+
+        with self._lock:
+            job.stats.record(started, duration, lateness, error)
+            logger.debug(f"작업 {job.name} 완료: {duration:.2f}초 (지연 {lateness:.2f}초)")
+            if job.pending and not job.cancelled and not self._stopped:
+                self._executor(job.job_class).submit(self._execute, job, job.pending.popleft())
+            else:
+                job.running = False
+
+    def idle_seconds(self, now=None):
+        """다음 예정 작업까지 남은 초 (작업이 없으면 None)"""
+        now = self._now() if now is None else now
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - now)
+
+    def run(self, should_continue=None):
+        """
+        스케줄러 메인 루프 (stop() 또는 should_continue()가 False가 될 때까지 블로킹)
+
+        Args:
+            should_continue: 계속 실행할지 반환하는 함수
+        """
+        logger.info(f"작업 스케줄러 시작: {len(self.jobs)}개 작업")
+        while not self._stopped and (should_continue is None or should_continue()):
+            self.run_pending()
+            idle = self.idle_seconds()
+            timeout = self.max_idle_seconds if idle is None else min(idle, self.max_idle_seconds)
+            if timeout > 0:
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+        logger.info("작업 스케줄러 루프 종료")
+
+    def stop(self):
+        """메인 루프 중단 (shutdown()을 호출해야 워커 스레드가 종료됨)"""
+        self._stopped = True
+        self._wakeup.set()
+
+    def shutdown(self, wait=True):
+        """메인 루프 중단 및 워커 풀 종료"""
+        self.stop()
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+    def stats(self):
+        """작업별 실행 기록 요약 {작업 이름: dict}"""
+        with self._lock:
+            result = {}
+            for name, job in self.jobs.items():
+                summary = job.stats.summary()
+                summary['job_class'] = job.job_class
+                summary['next_run'] = self._format(job.next_run)
+                summary['running'] = job.running
+                summary['pending'] = len(job.pending)
+                result[name] = summary
+            return result
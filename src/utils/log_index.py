@@ -0,0 +1,457 @@
+"""
+로그 검색 인덱스 모듈
+
+지난 로그를 찾으려면 log_monitor/check_status처럼 로그 파일을 처음부터 읽어야 했고, system_events
+테이블에는 일부 이벤트만 남습니다. LogIndex는 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+형식의 로그(와 KISAPI 주문 로그)를 한 번 읽어 SQLite 파일에 시간/로거/레벨/종목 인덱스를 만듭니다.
+
+- 인덱스에는 메시지 본문 대신 (파일, 오프셋, 길이)만 저장하고, 검색 결과의 메시지만 원본 파일에서
+  pread로 읽습니다. 줄바꿈이 들어간 메시지(예외 traceback 등)는 다음 헤더 전까지 한 항목입니다.
+- 파일마다 inode와 마지막으로 읽은 위치를 기억해 update()는 덧붙은 부분만 읽습니다. 파일이 회전되어
+  inode가 바뀌거나 잘려 작아지면 그 파일만 다시 인덱싱합니다.
+- 헤더는 큰 덩어리의 바이트에 미리 컴파일한 정규식을 한 번에 적용해 찾고, 종목 코드(6자리 숫자)는
+  숫자만 남긴 바이트에서 찾습니다.
+
+예) 지난 일주일 005930 관련 KISAPI 오류:
+    LogIndex(config).search(logger="KISAPI", level="ERROR", symbol="005930", since="7d")
+"""
+import calendar
+import fnmatch
+import glob
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+# 로거 설정
+logger = logging.getLogger('LogIndex')
+
+# 기본 인덱스 대상 (프로세스별 로그 파일과 logs/ 디렉토리의 주문 로그)
+DEFAULT_SOURCES = [
+    'stock_analysis.log', 'api_server.log', 'cloud_service.log', 'process_monitor.log',
+    'auto_restart.log', 'logs/order_log_*.log'
+]
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+_LEVEL_BYTES = {name.encode(): value for name, value in LEVELS.items()}
+_ORDER_SUCCESS = '성공'.encode('utf-8')
+
+# 주문 로그(KISAPI._log_order) 항목의 로거 이름
+ORDER_LOGGER = 'OrderLog'
+
+# 로그 항목 헤더: 표준 logging 형식 또는 주문 로그 형식
+ENTRY_RE = re.compile(
+    rb'^(?:(?P<stamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(?P<ms>\d{3}) - (?P<logger>[^\n]+?) - '
+    rb'(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) - '
+    rb'|\[(?P<ostamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] \[[^\]\n]*\] \[[^\]\n]*\] '
+    rb'(?P<result>' + _ORDER_SUCCESS + rb'|' + '실패'.encode('utf-8') + rb'))',
+    re.MULTILINE
+)
+# 국내 종목 코드는 앞뒤가 숫자가 아닌 6자리 숫자 (인덱스에는 정수로 저장)
+# 정규식 대신 숫자 외 바이트를 공백으로 바꾼 뒤 split()으로 숫자 덩어리를 찾는 편이 몇 배 빠름
+SYMBOL_LENGTH = 6
+_DIGITS_ONLY = bytes(c if 0x30 <= c <= 0x39 else 0x20 for c in range(256))
+RELATIVE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([smhdw])$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE, inode INTEGER, offset INTEGER, last_entry INTEGER
+);
+CREATE TABLE IF NOT EXISTS loggers (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY, ts INTEGER, file_id INTEGER, offset INTEGER, length INTEGER,
+    logger_id INTEGER, level INTEGER
+);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+CREATE INDEX IF NOT EXISTS entries_logger_ts ON entries (logger_id, ts);
+CREATE INDEX IF NOT EXISTS entries_level_ts ON entries (level, ts);
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol INTEGER, ts INTEGER, entry_id INTEGER, PRIMARY KEY (symbol, ts, entry_id)
+) WITHOUT ROWID;
+"""
+
+
+def to_timestamp(value, now=None):
+    """
+    검색 시각을 인덱스 시각(로그에 찍힌 로컬 시각을 UTC처럼 환산한 epoch ms)으로 변환
+
+    Args:
+        value: datetime, 'YYYY-MM-DD[ HH:MM[:SS]]', 상대 시간('30m', '12h', '7d', '2w') 또는 None
+        now: 상대 시간 기준 (None이면 현재 로컬 시각)
+
+    Returns:
+        int: epoch ms (value가 None이면 None)
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        match = RELATIVE_RE.match(text)
+        if match:
+            amount, unit = float(match.group(1)), match.group(2)
+            seconds = amount * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}[unit]
+            value = (now or datetime.now()) - timedelta(seconds=seconds)
+        else:
+            for format_str in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+                try:
+                    value = datetime.strptime(text, format_str)
+                    break
+                except ValueError:
+                    continue
+            else:
+                raise ValueError(f"시각 형식을 해석할 수 없습니다: {value}")
+    if value.tzinfo is not None:
+        # 로그 시각은 프로세스의 로컬 시각
+        value = value.astimezone().replace(tzinfo=None)
+    return calendar.timegm(value.timetuple()) * 1000 + value.microsecond // 1000
+
+
+def format_timestamp(ts):
+    """인덱스 시각을 로그와 같은 'YYYY-MM-DD HH:MM:SS,mmm' 문자열로"""
+    value = datetime(1970, 1, 1) + timedelta(milliseconds=ts)
+    return value.strftime('%Y-%m-%d %H:%M:%S') + f",{ts % 1000:03d}"
+
+
+class LogIndex:
+    """로그 파일의 시간/로거/레벨/종목 인덱스"""
+
+    def __init__(self, config=None, path=None, sources=None, chunk_size=8 * 1024 * 1024):
+        """
+        Args:
+            config: 설정 모듈 (LOG_INDEX_PATH, LOG_INDEX_SOURCES)
+            path: 인덱스 파일 경로 (None이면 설정값)
+            sources: 인덱스할 파일 경로/glob 패턴 리스트 (None이면 설정값)
+            chunk_size: 인덱싱 시 한 번에 읽을 바이트 수
+        """
+        self.path = path or getattr(config, 'LOG_INDEX_PATH', os.path.join('logs', 'log_index.db'))
+        self.sources = sources or getattr(config, 'LOG_INDEX_SOURCES', DEFAULT_SOURCES)
+        self.chunk_size = chunk_size
+
+        self._lock = threading.Lock()
+        self._loggers = {}  # {로거 이름: id}
+        self._logger_bytes = {}  # {로거 이름 바이트: id} - 인덱싱 중 디코딩 생략
+        self._days = {}  # {b'YYYY-MM-DD': 그날 0시 epoch ms}
+        self._clock_ms = {}  # {b'HH:MM:SS': 0시부터 ms} - 최대 86400개
+        self.stats = {'updates': 0, 'bytes': 0, 'entries': 0, 'reindexed_files': 0, 'searches': 0}
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._loggers = dict(self._conn.execute("SELECT name, id FROM loggers"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 인덱싱
+    # ------------------------------------------------------------------
+    def source_files(self):
+        """인덱스 대상 파일 목록"""
+        files = []
+        for pattern in self.sources:
+            if glob.has_magic(pattern):
+                files.extend(sorted(glob.glob(pattern)))
+            elif os.path.exists(pattern):
+                files.append(pattern)
+        return [os.path.abspath(path) for path in files]
+
+    def update(self):
+        """
+        대상 파일의 덧붙은 부분만 인덱싱
+
+        Returns:
+            int: 새로 인덱싱한 항목 수
+        """
+        added = 0
+        with self._lock:
+            for path in self.source_files():
+                try:
+                    added += self._update_file(path)
+                except OSError as e:
+                    logger.warning(f"로그 인덱싱 실패: {path} - {e}")
+            self.stats['updates'] += 1
+        if added:
+            logger.debug(f"로그 인덱스 갱신: {added}개 항목")
+        return added
+
+    def _update_file(self, path):
+        stat = os.stat(path)
+        row = self._conn.execute(
+            "SELECT id, inode, offset, last_entry FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            file_id = self._conn.execute(
+                "INSERT INTO files (path, inode, offset, last_entry) VALUES (?, ?, 0, NULL)",
+                (path, stat.st_ino)).lastrowid
+            offset, last_entry = 0, None
+        else:
+            file_id, inode, offset, last_entry = row
+            if inode != stat.st_ino or stat.st_size < offset:
+                # 회전(다른 파일로 교체) 또는 잘림: 이 파일만 처음부터 다시
+                self._reset_file(file_id, stat.st_ino)
+                offset, last_entry = 0, None
+                self.stats['reindexed_files'] += 1
+        if stat.st_size == offset:
+            self._conn.commit()
+            return 0
+
+        added = 0
+        with open(path, 'rb') as f:
+            while offset < stat.st_size:
+                data = os.pread(f.fileno(), min(self.chunk_size, stat.st_size - offset), offset)
+                if not data:
+                    break
+                # 마지막 줄이 아직 쓰이는 중일 수 있으므로 완성된 줄까지만
+                cut = data.rfind(b"\n")
+                if cut < 0:
+                    if len(data) < self.chunk_size:
+                        break
+                    cut = len(data) - 1
+                data = data[:cut + 1]
+                count, last_entry = self._index_chunk(file_id, offset, data, last_entry)
+                added += count
+                offset += len(data)
+                self.stats['bytes'] += len(data)
+                self._conn.execute("UPDATE files SET offset = ?, last_entry = ? WHERE id = ?",
+                                   (offset, last_entry, file_id))
+                self._conn.commit()
+        self.stats['entries'] += added
+        return added
+
+    def _reset_file(self, file_id, inode):
+        self._conn.execute("DELETE FROM symbols WHERE entry_id IN (SELECT id FROM entries WHERE file_id = ?)",
+                           (file_id,))
+        self._conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+        self._conn.execute("UPDATE files SET inode = ?, offset = 0, last_entry = NULL WHERE id = ?",
+                           (inode, file_id))
+
+    def _logger_id(self, raw_name):
+        logger_id = self._logger_bytes.get(raw_name)
+        if logger_id is None:
+            name = raw_name.decode('utf-8', errors='replace')
+            self._conn.execute("INSERT OR IGNORE INTO loggers (name) VALUES (?)", (name,))
+            logger_id = self._conn.execute("SELECT id FROM loggers WHERE name = ?", (name,)).fetchone()[0]
+            self._loggers[name] = self._logger_bytes[raw_name] = logger_id
+        return logger_id
+
+    def _second(self, stamp):
+        """b'YYYY-MM-DD HH:MM:SS' -> epoch ms (날짜와 시각을 따로 캐시)"""
+        day = self._days.get(stamp[:10])
+        if day is None:
+            day = self._days[stamp[:10]] = calendar.timegm(
+                (int(stamp[:4]), int(stamp[5:7]), int(stamp[8:10]), 0, 0, 0)) * 1000
+        clock = self._clock_ms.get(stamp[11:19])
+        if clock is None:
+            clock = self._clock_ms[stamp[11:19]] = (
+                int(stamp[11:13]) * 3600 + int(stamp[14:16]) * 60 + int(stamp[17:19])) * 1000
+        return day + clock
+
+    def _index_chunk(self, file_id, base_offset, data, last_entry):
+        """
+        완성된 줄로 끝나는 덩어리 하나 인덱싱
+
+        Returns:
+            tuple: (새 항목 수, 파일의 마지막 항목 id)
+        """
+        cursor = self._conn.cursor()
+        headers = list(ENTRY_RE.finditer(data))
+        starts = [match.start() for match in headers]
+        first_start = starts[0] if starts else len(data)
+
+        # 첫 헤더 앞부분은 이전 덩어리 마지막 항목의 이어지는 줄
+        if first_start and last_entry is not None:
+            cursor.execute("UPDATE entries SET length = length + ? WHERE id = ?", (first_start, last_entry))
+
+        next_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0] + 1
+        digits = data.translate(_DIGITS_ONLY)
+        entries, symbols = [], set()
+        if first_start and last_entry is not None:
+            codes = {int(run) for run in digits[:first_start].split() if len(run) == SYMBOL_LENGTH}
+            if codes:
+                row = cursor.execute("SELECT ts FROM entries WHERE id = ?", (last_entry,)).fetchone()
+                symbols.update((code, row[0] if row else 0, last_entry) for code in codes)
+
+        for i, match in enumerate(headers):
+            stamp = match.group('stamp')
+            if stamp is not None:
+                ts = self._second(stamp) + int(match.group('ms'))
+                logger_id = self._logger_id(match.group('logger'))
+                level = _LEVEL_BYTES[match.group('level')]
+            else:
+                ts = self._second(match.group('ostamp'))
+                logger_id = self._logger_id(ORDER_LOGGER.encode())
+                level = LEVELS['INFO'] if match.group('result') == _ORDER_SUCCESS else LEVELS['ERROR']
+            entry_id = next_id + i
+            end = starts[i + 1] if i + 1 < len(starts) else len(data)
+            entries.append((entry_id, ts, file_id, base_offset + starts[i], end - starts[i], logger_id, level))
+            # 헤더의 날짜/시각에는 6자리 숫자가 없으므로 메시지 부분만
+            for run in digits[match.end():end].split():
+                if len(run) == SYMBOL_LENGTH:
+                    symbols.add((int(run), ts, entry_id))
+
+        if entries:
+            cursor.executemany("INSERT INTO entries (id, ts, file_id, offset, length, logger_id, level) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?)", entries)
+            last_entry = entries[-1][0]
+        if symbols:
+            cursor.executemany("INSERT OR IGNORE INTO symbols (symbol, ts, entry_id) VALUES (?, ?, ?)", symbols)
+        return len(entries), last_entry
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def _where(self, logger, level, symbol, since, until, file=None):
+        """
+        검색 조건 SQL 구성
+
+        Returns:
+            tuple: (FROM 절, 시각 컬럼, WHERE 절, 인자) - 로거가 인덱스에 없으면 None
+        """
+        clauses, params = [], []
+        table, ts_column = "entries e", "e.ts"
+        if symbol:
+            # 종목 조건이 있으면 (종목, 시각) 기본 키로 후보를 좁힘
+            if not str(symbol).isdigit():
+                return None
+            table, ts_column = "symbols s JOIN entries e ON e.id = s.entry_id", "s.ts"
+            clauses.append("s.symbol = ?")
+            params.append(int(symbol))
+        since_ts, until_ts = to_timestamp(since), to_timestamp(until)
+        if since_ts is not None:
+            clauses.append(f"{ts_column} >= ?")
+            params.append(since_ts)
+        if until_ts is not None:
+            clauses.append(f"{ts_column} <= ?")
+            params.append(until_ts)
+        if level:
+            clauses.append("e.level >= ?")
+            params.append(level if isinstance(level, int) else LEVELS[str(level).upper()])
+        if logger:
+            ids = self._logger_ids(logger)
+            if not ids:
+                return None
+            clauses.append(f"e.logger_id IN ({','.join('?' * len(ids))})")
+            params.extend(ids)
+        if file:
+            clauses.append("e.file_id = (SELECT id FROM files WHERE path = ?)")
+            params.append(os.path.abspath(file))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return table, ts_column, where, params
+
+    def _logger_ids(self, pattern):
+        """로거 이름('*' 패턴 가능)에 해당하는 id 목록 (다른 프로세스가 추가한 로거도 반영)"""
+        for attempt in range(2):
+            if '*' in pattern:
+                ids = [logger_id for name, logger_id in self._loggers.items() if fnmatch.fnmatchcase(name, pattern)]
+            else:
+                ids = [self._loggers[pattern]] if pattern in self._loggers else []
+            if ids or attempt:
+                return ids
+            with self._lock:
+                self._loggers = dict(self._conn.execute("SELECT name, id FROM loggers"))
+        return []
+
+    def search(self, logger=None, level=None, symbol=None, since=None, until=None, text=None,
+               limit=100, newest_first=True, file=None):
+        """
+        로그 항목 검색 (인덱스로 후보를 찾고 결과 메시지만 원본 파일에서 읽음)
+
+        Args:
+            logger: 로거 이름 (예: 'KISAPI', '*'가 들어가면 패턴)
+            level: 최소 레벨 ('WARNING'이면 WARNING/ERROR/CRITICAL)
+            symbol: 종목 코드
+            since: 시작 시각 (datetime, 'YYYY-MM-DD[ HH:MM[:SS]]', '7d' 등)
+            until: 끝 시각 (같은 형식)
+            text: 메시지에 들어 있어야 할 문자열 (대소문자 무시)
+            limit: 최대 결과 수
+            newest_first: True면 최신 항목부터
+            file: 이 로그 파일의 항목만
+
+        Returns:
+            list: [{'time', 'logger', 'level', 'message', 'file', 'offset'}, ...]
+        """
+        self.stats['searches'] += 1
+        condition = self._where(logger, level, symbol, since, until, file)
+        if condition is None:
+            return []
+        table, ts_column, where, params = condition
+        order = "DESC" if newest_first else "ASC"
+        sql = (f"SELECT e.ts, e.file_id, e.offset, e.length, e.logger_id, e.level FROM {table} "
+               f"{where} ORDER BY {ts_column} {order}, e.id {order}")
+        if not text:
+            sql += f" LIMIT {int(limit)}"
+
+        needle = text.casefold() if text else None
+        logger_names = {logger_id: name for name, logger_id in self._loggers.items()}
+        results, handles = [], {}
+        try:
+            with self._lock:
+                files = dict(self._conn.execute("SELECT id, path FROM files"))
+                for ts, file_id, offset, length, logger_id, level in self._conn.execute(sql, params):
+                    message = self._read_entry(handles, files.get(file_id), offset, length)
+                    if needle and needle not in message.casefold():
+                        continue
+                    results.append({
+                        'time': format_timestamp(ts),
+                        'logger': logger_names.get(logger_id, ''),
+                        'level': LEVEL_NAMES.get(level, str(level)),
+                        'message': message,
+                        'file': files.get(file_id),
+                        'offset': offset
+                    })
+                    if len(results) >= limit:
+                        break
+        finally:
+            for handle in handles.values():
+                os.close(handle)
+        return results
+
+    def count(self, logger=None, level=None, symbol=None, since=None, until=None, file=None):
+        """조건에 맞는 항목 수 (원본 파일을 읽지 않음)"""
+        condition = self._where(logger, level, symbol, since, until, file)
+        if condition is None:
+            return 0
+        table, _, where, params = condition
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table} {where}", params).fetchone()[0]
+
+    def loggers(self):
+        """인덱스에 있는 로거 이름 목록"""
+        return sorted(self._loggers)
+
+    @staticmethod
+    def _read_entry(handles, path, offset, length):
+        if path is None:
+            return ""
+        handle = handles.get(path)
+        if handle is None:
+            try:
+                handle = handles[path] = os.open(path, os.O_RDONLY)
+            except OSError:
+                return ""
+        return os.pread(handle, length, offset).decode('utf-8', errors='replace').rstrip()
+
+
+# 프로세스 전역 인덱스
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_log_index(config=None):
+    """
+    프로세스 전역 로그 인덱스 반환
+
+    Args:
+        config: 설정 모듈 (처음 호출할 때만 사용)
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LogIndex(config)
+        return _index
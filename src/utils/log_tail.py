@@ -0,0 +1,334 @@
+"""
+로그 파일 tail 모듈
+
+log_monitor.py는 0.5초마다 logs/ 디렉토리를 glob으로 다시 훑고, 모든 파일을 seek한 뒤 readlines()로
+읽었습니다. LogTailer는 파일에 덧붙은 바이트만 큰 단위로 읽어 줄 단위로 넘깁니다.
+
+- Linux에서는 inotify(ctypes로 libc 직접 호출, 추가 패키지 없음)로 로그 디렉토리를 감시해 파일이
+  바뀌었을 때만 깨어납니다. inotify를 쓸 수 없으면 파일 stat만 비교하는 폴링으로 동작합니다.
+- 감시 대상은 고정 경로('api_server.log') 또는 glob 패턴('logs/trading_log_*.log', 최신 파일 하나)입니다.
+  로그 회전은 디렉토리의 생성/이동 이벤트(폴링 모드는 디렉토리 mtime)로 알아채므로 매번 디렉토리를
+  다시 훑지 않고, 회전 전 파일에 남은 내용도 끝까지 읽은 뒤 새 파일로 넘어갑니다.
+- 파일이 잘려 작아지면(copytruncate) 처음부터 다시 읽습니다.
+"""
+import ctypes
+import ctypes.util
+import fnmatch
+import glob
+import logging
+import os
+import select
+import struct
+import time
+
+# 로거 설정
+logger = logging.getLogger('LogTailer')
+
+# inotify 상수 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class _Inotify:
+    """libc inotify 최소 래퍼 (디렉토리 감시)"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name or not hasattr(os, "pread"):
+            raise OSError("inotify를 사용할 수 없는 환경입니다.")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("libc에 inotify가 없습니다.")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+
+    def add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {directory}")
+        return wd
+
+    def read_events(self, timeout):
+        """
+        이벤트 대기 후 읽기
+
+        Returns:
+            list: [(wd, mask, name), ...] (timeout 동안 없으면 빈 리스트)
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+            if len(data) < 64 * 1024:
+                break
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class _Source:
+    """감시 대상 하나 (고정 경로 또는 glob 패턴의 최신 파일)"""
+
+    def __init__(self, tag, pattern):
+        self.tag = tag
+        self.pattern = os.path.abspath(pattern)
+        self.is_glob = glob.has_magic(pattern)
+        self.directory = os.path.dirname(self.pattern)
+        self.path = None
+        self.fd = None
+        self.inode = None
+        self.offset = 0
+        self.remainder = b""
+        self.dir_mtime = None
+
+
+class LogTailer:
+    """덧붙은 바이트만 읽어 콜백으로 넘기는 로그 파일 tail"""
+
+    def __init__(self, on_lines, chunk_size=1024 * 1024, use_inotify=True):
+        """
+        Args:
+            on_lines: 새 줄 콜백 (tag, [줄, ...]) - 한 번에 최대 chunk_size 바이트 분량
+            chunk_size: 한 번에 읽을 바이트 수
+            use_inotify: False면 항상 폴링
+        """
+        self.on_lines = on_lines
+        self.chunk_size = chunk_size
+        self._sources = {}  # {tag: _Source}
+        self._watches = {}  # {wd: 디렉토리}
+        self._inotify = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify를 사용할 수 없어 폴링으로 로그를 감시합니다: {e}")
+        self.stats = {'events': 0, 'reads': 0, 'bytes': 0, 'lines': 0, 'rotations': 0, 'truncations': 0}
+
+    @property
+    def mode(self):
+        return "inotify" if self._inotify is not None else "poll"
+
+    def add(self, tag, pattern, from_end=True):
+        """
+        감시 대상 추가
+
+        Args:
+            tag: 콜백에 넘길 이름
+            pattern: 파일 경로 또는 glob 패턴 (최신 수정 파일 하나를 따라감)
+            from_end: True면 현재 파일 끝부터 읽음 (기존 내용은 backlog()로)
+        """
+        source = _Source(tag, pattern)
+        self._sources[tag] = source
+        self._open(source, self._latest(source), from_end)
+        if os.path.isdir(source.directory):
+            source.dir_mtime = os.stat(source.directory).st_mtime_ns
+            if self._inotify is not None and source.directory not in self._watches.values():
+                try:
+                    self._watches[self._inotify.add_watch(source.directory)] = source.directory
+                except OSError as e:
+                    logger.warning(f"디렉토리 감시 실패, 이 대상은 폴링합니다: {e}")
+        return source.path
+
+    def files(self):
+        """감시 중인 파일 {tag: 경로}"""
+        return {tag: source.path for tag, source in self._sources.items() if source.path}
+
+    def backlog(self, tag, max_bytes):
+        """
+        현재 읽기 위치 직전 최대 max_bytes 바이트의 줄 (첫 줄이 잘렸으면 버림)
+
+        Returns:
+            list: 줄 리스트
+        """
+        source = self._sources.get(tag)
+        if source is None or source.fd is None or source.offset == 0:
+            return []
+        start = max(0, source.offset - max_bytes)
+        data = os.pread(source.fd, source.offset - start, start)
+        if start > 0:
+            data = data[data.find(b"\n") + 1:] if b"\n" in data else b""
+        return [line for line in map(str.strip, data.decode("utf-8", errors="replace").split("\n")) if line]
+
+    def run_once(self, timeout):
+        """
+        변경을 최대 timeout초 기다린 뒤 덧붙은 내용을 읽어 콜백 호출
+
+        Returns:
+            int: 이번에 넘긴 줄 수
+        """
+        lines_before = self.stats['lines']
+        if self._inotify is not None and self._watches:
+            events = self._inotify.read_events(timeout)
+            self.stats['events'] += len(events)
+            for wd, mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    # 이벤트가 넘쳐 일부를 잃었으면 모든 대상을 stat으로 확인
+                    for source in self._sources.values():
+                        self._poll(source, check_directory=True)
+                    continue
+                directory = self._watches.get(wd)
+                if directory is not None and name:
+                    self._handle_event(directory, name, mask)
+            # 감시하지 못한 디렉토리(아직 없는 logs/ 등)의 대상은 폴링
+            for source in self._sources.values():
+                if source.directory not in self._watches.values():
+                    self._poll(source, check_directory=True)
+        else:
+            time.sleep(timeout)
+            for source in self._sources.values():
+                self._poll(source, check_directory=True)
+        return self.stats['lines'] - lines_before
+
+    def close(self):
+        for source in self._sources.values():
+            self._close(source)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches.clear()
+
+    # ------------------------------------------------------------------
+    # 내부
+    # ------------------------------------------------------------------
+    def _latest(self, source):
+        if not source.is_glob:
+            return source.pattern if os.path.exists(source.pattern) else None
+        candidates = glob.glob(source.pattern)
+        if not candidates:
+            return None
+        try:
+            return max(candidates, key=os.path.getmtime)
+        except OSError:
+            return None
+
+    def _open(self, source, path, from_end):
+        if path is None:
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            logger.error(f"로그 파일 열기 실패: {path} - {e}")
+            return
+        stat = os.fstat(fd)
+        source.path, source.fd, source.inode = path, fd, stat.st_ino
+        source.offset = stat.st_size if from_end else 0
+        source.remainder = b""
+        logger.info(f"로그 파일 감시 시작: {path}")
+
+    def _close(self, source):
+        if source.fd is not None:
+            try:
+                os.close(source.fd)
+            except OSError:
+                pass
+        source.fd = None
+
+    def _switch(self, source, path):
+        """회전: 이전 파일에 남은 내용을 끝까지 읽고 새 파일 처음부터 읽기"""
+        if source.fd is not None:
+            self._read(source)
+            if source.remainder:
+                self._emit(source, source.remainder)
+            self._close(source)
+        self.stats['rotations'] += 1
+        self._open(source, path, from_end=False)
+        self._read(source)
+
+    def _handle_event(self, directory, name, mask):
+        path = os.path.join(directory, name)
+        for source in self._sources.values():
+            if source.directory != directory:
+                continue
+            if mask & (IN_CREATE | IN_MOVED_TO) and fnmatch.fnmatchcase(path, source.pattern):
+                if path != source.path or not source.is_glob:
+                    # glob 대상은 새로 생긴 파일이 최신 파일, 고정 경로는 같은 이름으로 다시 생긴 파일
+                    self._switch(source, path)
+                continue
+            if path != source.path:
+                continue
+            if mask & IN_MODIFY:
+                self._read(source)
+            elif mask & (IN_MOVED_FROM | IN_DELETE):
+                # 이름이 바뀌거나 지워져도 열린 핸들로 남은 내용을 읽음 (새 파일은 생성 이벤트로 전환)
+                self._read(source)
+
+    def _poll(self, source, check_directory=False):
+        if check_directory and source.is_glob and os.path.isdir(source.directory):
+            # 디렉토리 mtime이 바뀐 경우(파일 생성/이름 변경)에만 glob
+            mtime = os.stat(source.directory).st_mtime_ns
+            if mtime != source.dir_mtime:
+                source.dir_mtime = mtime
+                latest = self._latest(source)
+                if latest is not None and latest != source.path:
+                    self._switch(source, latest)
+                    return
+        if not source.is_glob:
+            try:
+                inode = os.stat(source.pattern).st_ino
+            except FileNotFoundError:
+                inode = None
+            if inode is not None and inode != source.inode:
+                self._switch(source, source.pattern)
+                return
+        if source.fd is not None:
+            self._read(source)
+
+    def _read(self, source):
+        if source.fd is None:
+            return
+        size = os.fstat(source.fd).st_size
+        if size < source.offset:
+            # copytruncate 방식 회전
+            self.stats['truncations'] += 1
+            source.offset, source.remainder = 0, b""
+        while source.offset < size:
+            data = os.pread(source.fd, min(self.chunk_size, size - source.offset), source.offset)
+            if not data:
+                break
+            source.offset += len(data)
+            self.stats['reads'] += 1
+            self.stats['bytes'] += len(data)
+            data = source.remainder + data
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                source.remainder = data
+                if len(data) > self.chunk_size:
+                    # 줄바꿈 없이 너무 긴 내용은 한 줄로 내보냄
+                    source.remainder = b""
+                    self._emit(source, data)
+                continue
+            source.remainder = data[cut + 1:]
+            self._emit(source, data[:cut])
+
+    def _emit(self, source, data):
+        """완성된 줄 덩어리를 한 번에 디코딩해 콜백 호출"""
+        text = data.decode("utf-8", errors="replace")
+        lines = [line for line in map(str.strip, text.split("\n")) if line]
+        if lines:
+            self.stats['lines'] += len(lines)
+            self.on_lines(source.tag, lines)
@@ -0,0 +1,376 @@
+"""
+시장 캘린더 모듈
+
+시장별 세션(정규장, 프리마켓, 시간외 거래) 시작/종료 시각을 날짜마다 한 번만
+계산(epoch 초)해 두고 개장 여부를 정수 비교로 판단합니다. KRX/NYSE 휴장일과
+조기 마감/개장 지연일(market_holidays)을 반영하며, 다음 개장/마감 시각도 날짜 단위
+캐시에서 바로 구하므로 트레이딩 루프가 폴링 대신 다음 세션까지 정확히 대기할 수 있습니다.
+시계를 주입할 수 있어 리플레이/백테스트의 가상 시각에서도 같은 코드로 동작합니다.
+
+time_utils.is_market_open/get_market_schedule은 get_calendar()로 얻은
+캐시된 캘린더를 사용합니다.
+"""
+import datetime
+import logging
+import threading
+import time
+
+from .clock import get_clock
+from .market_holidays import MARKET_HOLIDAYS, MARKET_SPECIAL_SESSIONS
+from .time_utils import (
+    KST, EST, get_config_value,
+    DEFAULT_KR_MARKET_OPEN_TIME, DEFAULT_KR_MARKET_CLOSE_TIME,
+    DEFAULT_US_MARKET_OPEN_TIME, DEFAULT_US_MARKET_CLOSE_TIME
+)
+
+# 로거 설정
+logger = logging.getLogger('MarketCalendar')
+
+# 세션 종류
+REGULAR = "regular"
+PRE_MARKET = "pre"
+AFTER_MARKET = "after"
+
+# 세션별 설정 이름 접두사와 기본 시간 {세션: {시장: (개장, 마감)}}
+SESSION_SETTINGS = {
+    REGULAR: ("MARKET", {
+        "KR": (DEFAULT_KR_MARKET_OPEN_TIME, DEFAULT_KR_MARKET_CLOSE_TIME),
+        "US": (DEFAULT_US_MARKET_OPEN_TIME, DEFAULT_US_MARKET_CLOSE_TIME)
+    }),
+    PRE_MARKET: ("PRE_MARKET", {"KR": ("08:30", "08:40"), "US": ("04:00", "09:30")}),
+    AFTER_MARKET: ("AFTER_MARKET", {"KR": ("16:00", "18:00"), "US": ("16:00", "20:00")}),
+}
+
+# 다음 거래일 탐색 범위 (설/추석 연휴 + 주말보다 충분히 길게)
+MAX_CLOSED_DAYS = 15
+
+
+def _parse_time(value):
+    """"HH:MM" 문자열을 datetime.time으로 변환"""
+    return datetime.datetime.strptime(str(value).strip(), "%H:%M").time()
+
+
+def _parse_date(value):
+    """"YYYY-MM-DD" 문자열(또는 date)을 datetime.date로 변환"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+
+
+class MarketCalendar:
+    """
+    시장 캘린더
+
+    날짜별 세션(개장/마감 epoch 초)을 캐시하고, 현재 날짜의 경계와 다음 거래일 세션도
+    함께 보관하여 같은 날 안에서의 is_open()/next_open()/next_close() 호출은
+    float 비교 몇 번으로 끝납니다.
+    """
+
+    def __init__(self, market="KR", config=None, clock=None):
+        """
+        Args:
+            market: 시장 코드 ("KR" 또는 "US")
+            config: 설정 모듈 (None이면 전역 config 또는 환경 변수)
+            clock: 시계 객체 (None이면 clock.get_clock()의 전역 시계)
+        """
+        self.market = market
+        self.config = config
+        self.clock = clock
+        self.timezone = KST if market == "KR" else EST
+
+        # 세션별 기본 운영 시간 {세션: (개장 time, 마감 time)}
+        self.hours = {}
+        for kind, (prefix, defaults) in SESSION_SETTINGS.items():
+            open_default, close_default = defaults.get(market, defaults["US"])
+            open_str = get_config_value(f'{market}_{prefix}_OPEN_TIME', open_default, config)
+            close_str = get_config_value(f'{market}_{prefix}_CLOSE_TIME', close_default, config)
+            self.hours[kind] = (_parse_time(open_str), _parse_time(close_str))
+        self.open_time, self.close_time = self.hours[REGULAR]
+
+        # 휴장일 (내장 표 + 설정의 추가 휴장일)
+        tables = MARKET_HOLIDAYS.get(market, {})
+        self.holiday_years = set(tables)
+        self.holidays = {_parse_date(day) for days in tables.values() for day in days}
+        extra = get_config_value(f'{market}_MARKET_HOLIDAYS', None, config)
+        if isinstance(extra, str):
+            extra = [day for day in extra.split(",") if day.strip()]
+        for day in extra or []:
+            self.holidays.add(_parse_date(day))
+
+        # 특수 운영일 {date: (개장 time, 마감 time)}
+        self.special_sessions = {
+            _parse_date(day): (_parse_time(open_str), _parse_time(close_str))
+            for day, (open_str, close_str) in MARKET_SPECIAL_SESSIONS.get(market, {}).items()
+        }
+
+        self._sessions = {}  # {date: {세션: (개장 epoch, 마감 epoch)} 또는 None(휴장)}
+        self._warned_years = set()
+        # 마지막으로 조회한 날짜 (00:00 epoch, 다음 날 00:00 epoch, 그 날짜의 세션, 다음 거래일의 세션)
+        # 여러 스레드가 읽으므로 튜플 하나로 통째로 교체
+        self._loaded_day = (0.0, 0.0, None, None)
+        self._load_lock = threading.Lock()
+
+    def _get_clock(self):
+        return self.clock if self.clock is not None else get_clock()
+
+    def now(self):
+        """시장 시간대 기준 현재 시각"""
+        return self._get_clock().now(self.timezone)
+
+    def force_open(self):
+        """FORCE_MARKET_OPEN 설정 (실행 중 변경될 수 있어 매번 확인)"""
+        force_open = get_config_value('FORCE_MARKET_OPEN', False, self.config)
+        if isinstance(force_open, str):
+            return force_open.lower() == "true"
+        return bool(force_open)
+
+    def _localize(self, date, value):
+        return self.timezone.localize(datetime.datetime.combine(date, value))
+
+    def is_holiday(self, date):
+        """휴장일(주말 포함) 여부"""
+        date = _parse_date(date)
+        if date.weekday() >= 5:
+            return True
+        if date.year not in self.holiday_years and date.year not in self._warned_years:
+            self._warned_years.add(date.year)
+            logger.warning(f"{self.market} 시장 {date.year}년 휴장일 정보가 없습니다. 주말만 휴장으로 처리합니다.")
+        return date in self.holidays
+
+    def is_trading_day(self, date):
+        """거래일 여부"""
+        return not self.is_holiday(date)
+
+    def sessions(self, date):
+        """
+        특정 날짜의 전체 세션
+
+        조기 마감/개장 지연일에는 프리마켓은 개장 시각 변화만큼,
+        시간외 거래는 마감 시각 변화만큼 함께 이동합니다.
+
+        Returns:
+            dict: {세션: (개장 epoch 초, 마감 epoch 초)}, 휴장일이면 None
+        """
+        try:
+            return self._sessions[date]
+        except KeyError:
+            pass
+
+        if self.is_holiday(date):
+            sessions = None
+        else:
+            regular_open, regular_close = self.hours[REGULAR]
+            special_open, special_close = self.special_sessions.get(date, self.hours[REGULAR])
+            open_shift = self._localize(date, special_open) - self._localize(date, regular_open)
+            close_shift = self._localize(date, special_close) - self._localize(date, regular_close)
+            shifts = {REGULAR: None, PRE_MARKET: open_shift, AFTER_MARKET: close_shift}
+
+            sessions = {}
+            for kind, (open_t, close_t) in self.hours.items():
+                if kind == REGULAR:
+                    start, end = self._localize(date, special_open), self._localize(date, special_close)
+                else:
+                    start = self._localize(date, open_t) + shifts[kind]
+                    end = self._localize(date, close_t) + shifts[kind]
+                sessions[kind] = (int(start.timestamp()), int(end.timestamp()))
+        self._sessions[date] = sessions
+        return sessions
+
+    def session(self, date, kind=REGULAR):
+        """
+        특정 날짜의 세션
+
+        Returns:
+            tuple: (개장 epoch 초, 마감 epoch 초), 휴장일이면 None
+        """
+        sessions = self.sessions(date)
+        return sessions[kind] if sessions is not None else None
+
+    def next_trading_day(self, date):
+        """date 다음 거래일"""
+        for offset in range(1, MAX_CLOSED_DAYS + 1):
+            candidate = date + datetime.timedelta(days=offset)
+            if self.sessions(candidate) is not None:
+                return candidate
+        raise ValueError(f"{self.market} 시장 {date} 이후 {MAX_CLOSED_DAYS}일 안에 거래일이 없습니다.")
+
+    def _load_day(self, ts):
+        """ts가 속한 날짜 캐시 갱신 (날짜가 바뀔 때 여러 스레드가 동시에 와도 한 번만 계산)"""
+        with self._load_lock:
+            day = self._loaded_day
+            if day[0] <= ts < day[1]:
+                return day
+            date = datetime.datetime.fromtimestamp(ts, self.timezone).date()
+            day = (self._localize(date, datetime.time()).timestamp(),
+                   self._localize(date + datetime.timedelta(days=1), datetime.time()).timestamp(),
+                   self.sessions(date),
+                   self.sessions(self.next_trading_day(date)))
+            self._loaded_day = day
+            return day
+
+    def _timestamp(self, now):
+        if now is None:
+            return self._get_clock().timestamp()
+        if isinstance(now, datetime.datetime):
+            if now.tzinfo is None:
+                now = self.timezone.localize(now)
+            return now.timestamp()
+        return float(now)
+
+    def _day(self, ts):
+        """ts가 속한 날짜의 세션과 다음 거래일 세션"""
+        day = self._loaded_day
+        if not day[0] <= ts < day[1]:
+            day = self._load_day(ts)
+        return day[2], day[3]
+
+    def is_open(self, now=None, session=REGULAR):
+        """
+        세션 개장 여부
+
+        Args:
+            now: 확인할 시각 (datetime 또는 epoch 초, None이면 시계의 현재 시각)
+            session: 세션 종류 ("regular", "pre", "after")
+        """
+        if self.force_open():
+            return True
+
+        ts = self._timestamp(now)
+        today = self._day(ts)[0]
+        if today is None:
+            return False
+        start, end = today[session]
+        return start <= ts <= end
+
+    def _next_open_ts(self, ts, session):
+        today, following = self._day(ts)
+        if today is not None and ts < today[session][0]:
+            return today[session][0]
+        return following[session][0]
+
+    def _next_close_ts(self, ts, session):
+        today, following = self._day(ts)
+        if today is not None and ts < today[session][1]:
+            return today[session][1]
+        return following[session][1]
+
+    def next_open(self, now=None, session=REGULAR):
+        """
+        now 이후 가장 가까운 세션 개장 시각 (현재 개장 중이면 다음 거래일 개장)
+
+        Returns:
+            datetime: 시장 시간대 기준 개장 시각
+        """
+        ts = self._next_open_ts(self._timestamp(now), session)
+        return datetime.datetime.fromtimestamp(ts, self.timezone)
+
+    def next_close(self, now=None, session=REGULAR):
+        """
+        now 이후 가장 가까운 세션 마감 시각
+
+        Returns:
+            datetime: 시장 시간대 기준 마감 시각
+        """
+        ts = self._next_close_ts(self._timestamp(now), session)
+        return datetime.datetime.fromtimestamp(ts, self.timezone)
+
+    def seconds_until_open(self, now=None, session=REGULAR):
+        """다음 개장까지 남은 초 (개장 중이거나 강제 개장이면 0)"""
+        if self.is_open(now, session):
+            return 0.0
+        ts = self._timestamp(now)
+        return max(0.0, self._next_open_ts(ts, session) - ts)
+
+    def sleep_until_open(self, should_continue=None, session=REGULAR, poll_seconds=1.0):
+        """
+        다음 세션 개장까지 대기
+
+        poll_seconds 단위로 나누어 자면서 중단 요청과 FORCE_MARKET_OPEN 변경을 확인합니다.
+
+        Args:
+            should_continue: 계속 대기할지 반환하는 함수 (False면 즉시 반환)
+            session: 세션 종류
+            poll_seconds: 중단 확인 간격 (초)
+
+        Returns:
+            bool: 세션이 열렸으면 True, 중단되었으면 False
+        """
+        clock = self._get_clock()
+        now = clock.timestamp()
+        if self.is_open(now, session):
+            return True
+
+        target = self._next_open_ts(now, session)
+        opens_at = datetime.datetime.fromtimestamp(target, self.timezone)
+        logger.info(f"{self.market} 시장 {session} 세션 개장({opens_at.strftime('%Y-%m-%d %H:%M %Z')})까지 "
+                    f"{(target - now) / 60:,.0f}분 대기합니다.")
+
+        while True:
+            if should_continue is not None and not should_continue():
+                return False
+            if self.force_open():
+                return True
+            remaining = target - clock.timestamp()
+            if remaining <= 0:
+                return True
+            time.sleep(min(poll_seconds, remaining))
+
+    def schedule(self, date=None):
+        """
+        get_market_schedule 형식의 하루 시장 스케줄
+
+        Args:
+            date: 날짜 (기본값: 오늘)
+        """
+        if date is None:
+            date = self.now().date()
+        else:
+            date = _parse_date(date)
+
+        sessions = self.sessions(date)
+        is_open = sessions is not None or self.force_open()
+        if sessions is not None:
+            open_time, close_time = (datetime.datetime.fromtimestamp(ts, self.timezone)
+                                     for ts in sessions[REGULAR])
+        elif is_open:
+            open_time, close_time = self._localize(date, self.open_time), self._localize(date, self.close_time)
+        else:
+            open_time = close_time = None
+        return {
+            'date': date,
+            'is_open': is_open,
+            'is_weekend': date.weekday() >= 5,
+            'is_holiday': sessions is None,
+            'is_special_session': date in self.special_sessions,
+            'open_time': open_time,
+            'close_time': close_time,
+            'market': self.market,
+            'timezone': self.timezone
+        }
+
+
+# (시장, 설정) 별 캘린더 캐시
+_calendars = {}
+
+
+def get_calendar(market="KR", config=None):
+    """
+    캐시된 시장 캘린더 반환
+
+    Args:
+        market: 시장 코드 ("KR" 또는 "US")
+        config: 설정 모듈 (None이면 전역 config 또는 환경 변수)
+    """
+    key = (market, config)
+    calendar = _calendars.get(key)
+    if calendar is None:
+        calendar = _calendars[key] = MarketCalendar(market, config)
+    return calendar
+
+
+def reset_calendars():
+    """캘린더 캐시 초기화 (장 운영 시간/휴장일 설정을 바꾼 경우 호출)"""
+    _calendars.clear()
+    logger.debug("시장 캘린더 캐시 초기화")
@@ -0,0 +1,86 @@
+"""
+거래소 휴장일 데이터
+
+KRX(한국거래소)와 NYSE(뉴욕증권거래소)의 연도별 휴장일과 특수 운영일(조기 마감,
+개장 지연)을 보관합니다. 주말은 포함하지 않습니다.
+
+- 표에 없는 연도는 주말만 휴장으로 처리되므로 매년 거래소 공지에 맞춰 추가해야 합니다.
+- 임시 공휴일 등 표에 반영되지 않은 휴장일은 config의 KR_MARKET_HOLIDAYS /
+  US_MARKET_HOLIDAYS ("YYYY-MM-DD" 목록)로 보충할 수 있습니다.
+"""
+
+# KRX 휴장일 (설/추석 연휴, 대체공휴일, 선거일, 근로자의 날, 연말 휴장일 포함)
+KRX_HOLIDAYS = {
+    2024: [
+        "2024-01-01", "2024-02-09", "2024-02-12", "2024-03-01", "2024-04-10",
+        "2024-05-01", "2024-05-06", "2024-05-15", "2024-06-06", "2024-08-15",
+        "2024-09-16", "2024-09-17", "2024-09-18", "2024-10-01", "2024-10-03",
+        "2024-10-09", "2024-12-25", "2024-12-31",
+    ],
+    2025: [
+        "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30",
+        "2025-03-03", "2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03",
+        "2025-06-06", "2025-08-15", "2025-10-03", "2025-10-06", "2025-10-07",
+        "2025-10-08", "2025-10-09", "2025-12-25", "2025-12-31",
+    ],
+    2026: [
+        "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02",
+        "2026-05-01", "2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17",
+        "2026-09-24", "2026-09-25", "2026-10-05", "2026-10-09", "2026-12-25",
+        "2026-12-31",
+    ],
+    2027: [
+        "2027-01-01", "2027-02-08", "2027-02-09", "2027-03-01", "2027-05-05",
+        "2027-05-13", "2027-08-16", "2027-09-14", "2027-09-15", "2027-09-16",
+        "2027-10-04", "2027-10-11", "2027-12-27", "2027-12-31",
+    ],
+}
+
+# KRX 특수 운영일 {날짜: (개장, 마감)} - 연초 첫 거래일과 수능일은 1시간 늦게 개장
+KRX_SPECIAL_SESSIONS = {
+    "2024-01-02": ("10:00", "15:30"),
+    "2024-11-14": ("10:00", "16:30"),
+    "2025-01-02": ("10:00", "15:30"),
+    "2025-11-13": ("10:00", "16:30"),
+    "2026-01-02": ("10:00", "15:30"),
+    "2026-11-19": ("10:00", "16:30"),
+    "2027-01-04": ("10:00", "15:30"),
+}
+
+# NYSE 휴장일 (관측일 기준)
+NYSE_HOLIDAYS = {
+    2024: [
+        "2024-01-01", "2024-01-15", "2024-02-19", "2024-03-29", "2024-05-27",
+        "2024-06-19", "2024-07-04", "2024-09-02", "2024-11-28", "2024-12-25",
+    ],
+    2025: [
+        "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18",
+        "2025-05-26", "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27",
+        "2025-12-25",
+    ],
+    2026: [
+        "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25",
+        "2026-06-19", "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+    ],
+    2027: [
+        "2027-01-01", "2027-01-18", "2027-02-15", "2027-03-26", "2027-05-31",
+        "2027-06-18", "2027-07-05", "2027-09-06", "2027-11-25", "2027-12-24",
+    ],
+}
+
+# NYSE 조기 마감일 {날짜: (개장, 마감)} - 13:00 마감
+NYSE_SPECIAL_SESSIONS = {
+    "2024-07-03": ("09:30", "13:00"),
+    "2024-11-29": ("09:30", "13:00"),
+    "2024-12-24": ("09:30", "13:00"),
+    "2025-07-03": ("09:30", "13:00"),
+    "2025-11-28": ("09:30", "13:00"),
+    "2025-12-24": ("09:30", "13:00"),
+    "2026-11-27": ("09:30", "13:00"),
+    "2026-12-24": ("09:30", "13:00"),
+    "2027-11-26": ("09:30", "13:00"),
+}
+
+# 시장 코드별 데이터
+MARKET_HOLIDAYS = {"KR": KRX_HOLIDAYS, "US": NYSE_HOLIDAYS}
+MARKET_SPECIAL_SESSIONS = {"KR": KRX_SPECIAL_SESSIONS, "US": NYSE_SPECIAL_SESSIONS}
@@ -0,0 +1,605 @@
+"""
+프로세스 내 메트릭 레지스트리 모듈
+
+KISAPI.get_balance, calculate_indicators, ChatGPTAnalyzer.analyze_stock, DatabaseManager 쓰기,
+RealtimeTrader 사이클처럼 자주 호출되는 경로의 소요 시간을 프로파일러 없이 확인하기 위한 카운터/게이지/
+히스토그램입니다.
+
+- 카운터와 히스토그램은 스레드마다 자기 누적 칸(shard)에만 쓰므로 기록할 때 잠금을 잡지 않습니다.
+  수집(collect) 시 모든 칸을 합치고, 종료된 스레드의 칸은 한 칸으로 접어 둡니다.
+- 히스토그램은 HDR 방식의 로그-선형 버킷(2의 거듭제곱 구간마다 32칸, 상대 오차 약 3%)에 개수를 세므로
+  미리 경계를 정하지 않아도 p50/p99를 구할 수 있고, 노출 형식의 le 버킷은 수집 시 계산합니다.
+- main.py와 api_server.py는 별도 프로세스이므로 각 프로세스가 export()로 수집 결과를 파일에 기록하고
+  API 서버의 /metrics가 자기 메트릭과 합쳐 Prometheus 텍스트 노출 형식으로 내보냅니다.
+
+사용 예:
+    @timed('kis_get_balance_seconds', '잔고 조회 소요 시간')
+    def get_balance(self, ...):
+        ...
+"""
+import functools
+import glob
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# 로거 설정
+logger = logging.getLogger('Metrics')
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+# 노출 형식 기본 le 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# HDR 버킷: 해상도 단위 정수값을 2의 거듭제곱 구간마다 2**SUB_BUCKET_BITS칸으로 나눔
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = _SUB_BUCKETS * 2
+
+
+def _bucket_index(units):
+    """정수값의 HDR 버킷 번호"""
+    shift = units.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return units
+    return (shift << SUB_BUCKET_BITS) + (units >> shift)
+
+
+def _bucket_bounds(index):
+    """HDR 버킷 번호의 (하한, 폭) 정수값"""
+    if index < _LINEAR_LIMIT:
+        return index, 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    return (index - (shift << SUB_BUCKET_BITS)) << shift, 1 << shift
+
+
+class _Shards:
+    """스레드별 누적 칸 목록 (기록은 자기 칸에만, 합산은 수집 시)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []  # [(스레드, 칸)]
+        self._retired = []  # 종료된 스레드 칸을 접어 둔 칸 목록 (최대 1개)
+
+    def get(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = self._factory()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def collect(self, fold):
+        """
+        모든 칸 목록 반환
+
+        Args:
+            fold: fold(대상 칸, 종료된 칸) - 종료된 스레드 칸을 보관 칸에 합치는 함수
+        """
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    # 종료된 스레드는 더 쓰지 않으므로 잠금 없이 합쳐도 안전
+                    if not self._retired:
+                        self._retired.append(self._factory())
+                    fold(self._retired[0], shard)
+            self._shards = alive
+            return [shard for _, shard in alive] + self._retired
+
+
+class _CounterChild:
+    """레이블 값 하나의 카운터"""
+
+    def __init__(self):
+        self._shards = _Shards(lambda: [0])
+
+    def inc(self, amount=1):
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다")
+        self._shards.get()[0] += amount
+
+    def value(self):
+        return sum(shard[0] for shard in self._shards.collect(_fold_counter))
+
+
+def _fold_counter(target, shard):
+    target[0] += shard[0]
+
+
+class _GaugeChild:
+    """레이블 값 하나의 게이지 (마지막 값, 또는 수집 시 호출할 함수)"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = float(value)
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """수집 시 function()의 반환값을 게이지 값으로 사용"""
+        self._function = function
+
+    def value(self):
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception as e:
+                logger.debug(f"게이지 함수 호출 실패: {e}")
+                return math.nan
+        return self._value
+
+
+class _HistogramChild:
+    """레이블 값 하나의 HDR 히스토그램"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, resolution=1e-6):
+        self.buckets = tuple(sorted(buckets))
+        self.resolution = resolution
+        self._scale = 1 / resolution
+        # 칸: [개수, 합계, {버킷 번호: 개수}]
+        self._shards = _Shards(lambda: [0, 0.0, {}])
+        self._local = self._shards._local
+
+    def observe(self, value):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shards.get()
+        # _bucket_index()를 인라인 (호출 경로 비용 절감)
+        units = int(value * self._scale) if value > 0 else 0
+        shift = units.bit_length() - SUB_BUCKET_BITS - 1
+        index = units if shift <= 0 else (shift << SUB_BUCKET_BITS) + (units >> shift)
+        shard[0] += 1
+        shard[1] += value
+        counts = shard[2]
+        counts[index] = counts.get(index, 0) + 1
+
+    def time(self):
+        """with 문으로 블록 소요 시간 기록"""
+        return _Timer(self.observe)
+
+    def merged(self):
+        """(개수, 합계, {버킷 번호: 개수}) - 모든 스레드 합산"""
+        count, total, merged = 0, 0.0, {}
+        for shard in self._shards.collect(_fold_histogram):
+            count += shard[0]
+            total += shard[1]
+            for index, n in shard[2].copy().items():
+                merged[index] = merged.get(index, 0) + n
+        return count, total, merged
+
+    def _value_of(self, index):
+        low, width = _bucket_bounds(index)
+        return (low + width / 2) * self.resolution
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)):
+        """분위수 (버킷 중앙값, 관측이 없으면 0)"""
+        count, _, merged = self.merged()
+        return self._quantiles(count, merged, qs)
+
+    def _quantiles(self, count, merged, qs):
+        result = {}
+        if not count:
+            return {q: 0.0 for q in qs}
+        ordered = sorted(merged.items())
+        for q in qs:
+            rank, seen = q * count, 0
+            for index, n in ordered:
+                seen += n
+                if seen >= rank:
+                    result[q] = self._value_of(index)
+                    break
+            else:
+                result[q] = self._value_of(ordered[-1][0])
+        return result
+
+    def summary(self):
+        """개수, 합계, 평균, p50/p95/p99, 최댓값 (초)"""
+        count, total, merged = self.merged()
+        quantiles = self._quantiles(count, merged, (0.5, 0.95, 0.99))
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0,
+            'p50': quantiles[0.5],
+            'p95': quantiles[0.95],
+            'p99': quantiles[0.99],
+            'max': self._value_of(max(merged)) if merged else 0.0
+        }
+
+    def cumulative(self):
+        """(개수, 합계, [(le, 누적 개수), ...]) - 노출 형식 le 버킷"""
+        count, total, merged = self.merged()
+        cumulative, seen = [], 0
+        ordered = sorted(merged.items())
+        position = 0
+        for le in self.buckets:
+            while position < len(ordered) and self._value_of(ordered[position][0]) <= le:
+                seen += ordered[position][1]
+                position += 1
+            cumulative.append((le, seen))
+        return count, total, cumulative
+
+
+def _fold_histogram(target, shard):
+    target[0] += shard[0]
+    target[1] += shard[1]
+    counts = target[2]
+    for index, n in shard[2].items():
+        counts[index] = counts.get(index, 0) + n
+
+
+class _Timer:
+    """소요 시간 측정 컨텍스트"""
+
+    def __init__(self, observe):
+        self._observe = observe
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._observe(time.perf_counter() - self._started)
+
+
+class _Metric:
+    """메트릭 패밀리 (레이블 값 조합마다 자식 하나)"""
+
+    kind = None
+
+    def __init__(self, name, documentation="", labelnames=(), **options):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._options = options
+        self._children = {}
+        self._lock = threading.Lock()
+        self._default = None if self.labelnames else self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **labels):
+        """레이블 값에 해당하는 자식 메트릭 (처음이면 생성)"""
+        if labels:
+            values = tuple(str(labels[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} 레이블 수 불일치: {self.labelnames} / {values}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def samples(self):
+        """[(샘플 이름, {레이블}, 값), ...]"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = COUNTER
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def value(self):
+        return self._default.value()
+
+    def samples(self):
+        return [(self.name, dict(zip(self.labelnames, values)), child.value()) for values, child in self._items()]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+
+    kind = GAUGE
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+    def set_function(self, function):
+        self._default.set_function(function)
+
+    def value(self):
+        return self._default.value()
+
+    def samples(self):
+        return [(self.name, dict(zip(self.labelnames, values)), child.value()) for values, child in self._items()]
+
+
+class Histogram(_Metric):
+    """소요 시간 등 분포 히스토그램"""
+
+    kind = HISTOGRAM
+
+    def _new_child(self):
+        return _HistogramChild(**self._options)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def summary(self):
+        return self._default.summary()
+
+    def samples(self):
+        samples = []
+        for values, child in self._items():
+            labels = dict(zip(self.labelnames, values))
+            count, total, cumulative = child.cumulative()
+            for le, seen in cumulative:
+                samples.append((self.name + "_bucket", dict(labels, le=_format_value(le)), seen))
+            samples.append((self.name + "_bucket", dict(labels, le="+Inf"), count))
+            samples.append((self.name + "_sum", labels, total))
+            samples.append((self.name + "_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """프로세스 내 메트릭 모음"""
+
+    def __init__(self, process=None):
+        """
+        Args:
+            process: export() 시 붙일 프로세스 이름 (기본값: 실행 스크립트 이름)
+        """
+        self.process = process or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **options):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, documentation, labelnames, **options)
+                    return metric
+        if not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"메트릭 {name}이 다른 종류/레이블로 이미 등록되어 있습니다")
+        return metric
+
+    def counter(self, name, documentation="", labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation="", labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation="", labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def collect(self):
+        """
+        모든 메트릭 수집
+
+        Returns:
+            list: [{'name', 'type', 'help', 'samples': [[샘플 이름, {레이블}, 값], ...]}, ...]
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return [{'name': metric.name, 'type': metric.kind, 'help': metric.documentation,
+                 'samples': [list(sample) for sample in metric.samples()]} for metric in metrics]
+
+    def summaries(self):
+        """히스토그램별 요약 {이름: {레이블 값 문자열: summary()}} (로그용)"""
+        with self._lock:
+            histograms = [metric for metric in self._metrics.values() if isinstance(metric, Histogram)]
+        result = {}
+        for metric in histograms:
+            for values, child in metric._items():
+                summary = child.summary()
+                if summary['count']:
+                    result.setdefault(metric.name, {})[",".join(values)] = summary
+        return result
+
+    def render(self):
+        """이 프로세스 메트릭의 텍스트 노출 형식"""
+        return render_families(self.collect())
+
+    def export(self, directory):
+        """
+        수집 결과를 {directory}/{process}.json에 원자적으로 기록 (API 서버 /metrics가 합침)
+
+        Returns:
+            str: 기록한 파일 경로
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.process}.json")
+        fd, tmp_path = tempfile.mkstemp(prefix=".metrics-", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({'process': self.process, 'updated_at': time.time(), 'families': self.collect()}, f,
+                          separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+
+def load_exports(directory, max_age=None, exclude=None):
+    """
+    다른 프로세스가 export()한 수집 결과 읽기
+
+    Args:
+        directory: 내보내기 디렉토리
+        max_age: 이 시간(초)보다 오래된 파일은 제외 (종료된 프로세스)
+        exclude: 제외할 프로세스 이름
+
+    Returns:
+        list: [(프로세스 이름, 패밀리 목록), ...]
+    """
+    exports = []
+    now = time.time()
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get('process') == exclude:
+            continue
+        if max_age is not None and now - data.get('updated_at', 0) > max_age:
+            continue
+        exports.append((data.get('process', os.path.splitext(os.path.basename(path))[0]), data.get('families', [])))
+    return exports
+
+
+def merge_families(exports):
+    """
+    프로세스별 패밀리 목록을 이름별로 합치고 샘플에 process 레이블 추가
+
+    Args:
+        exports: [(프로세스 이름, 패밀리 목록), ...]
+    """
+    merged = {}
+    for process, families in exports:
+        for family in families:
+            target = merged.get(family['name'])
+            if target is None:
+                target = merged[family['name']] = {'name': family['name'], 'type': family['type'],
+                                                   'help': family['help'], 'samples': []}
+            elif target['type'] != family['type']:
+                logger.warning(f"메트릭 {family['name']} 종류 불일치 ({process}): {family['type']}")
+                continue
+            for name, labels, value in family['samples']:
+                target['samples'].append([name, dict(labels, process=process), value])
+    return [merged[name] for name in sorted(merged)]
+
+
+def render_families(families):
+    """패밀리 목록을 Prometheus 텍스트 노출 형식으로 변환"""
+    lines = []
+    for family in families:
+        if family['help']:
+            lines.append(f"# HELP {family['name']} {_escape_help(family['help'])}")
+        lines.append(f"# TYPE {family['name']} {family['type']}")
+        for name, labels, value in family['samples']:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape_label(value_)}"' for key, value_ in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_value(value):
+    if isinstance(value, str):
+        return value
+    if value != value:
+        return "NaN"
+    if value in (math.inf, -math.inf):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(text):
+    return str(text).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def timed(name, documentation="", labels=None, registry=None):
+    """
+    함수 소요 시간을 히스토그램에, 예외 수를 카운터에 기록하는 데코레이터
+
+    Args:
+        name: 히스토그램 이름 (예: 'kis_get_balance_seconds')
+        documentation: 설명
+        labels: 고정 레이블 {이름: 값} (같은 히스토그램을 여러 함수가 나눠 쓸 때)
+        registry: 메트릭 레지스트리 (기본값: 프로세스 전역 레지스트리)
+    """
+    labels = labels or {}
+    errors_name = (name[:-len("_seconds")] if name.endswith("_seconds") else name) + "_exceptions_total"
+
+    def decorator(func):
+        target = registry or get_metrics_registry()
+        labelnames = tuple(labels)
+        histogram = target.histogram(name, documentation, labelnames).labels(**labels)
+        errors = target.counter(errors_name, f"{documentation} 중 발생한 예외 수".strip(), labelnames).labels(**labels)
+        observe, perf_counter = histogram.observe, time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                observe(perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+# 프로세스 전역 레지스트리
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry():
+    """프로세스 전역 메트릭 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
@@ -0,0 +1,382 @@
+"""
+샘플링 프로파일러 모듈
+
+운영 중 느린 매매 사이클의 원인을 찾기 위해 켜고 끌 수 있는 통계적 프로파일러입니다.
+
+- 켜면 백그라운드 스레드 하나가 interval마다 sys._current_frames()로 모든 스레드의 스택을 찍어
+  (구간 경로 + 코드 객체 튜플) 별로 개수를 셉니다. 스택 앞에는 트레이서의 현재 구간 이름을 붙이므로
+  "gpt_auto_trader.cycle;symbol;kis.get_balance;..."처럼 어느 사이클/종목에서 걸린 시간인지 보입니다.
+- 꺼져 있을 때는 스레드도, 추적 훅(sys.setprofile)도 없으므로 비용이 없습니다.
+- collapsed()는 flamegraph.pl/speedscope가 읽는 접힌 스택 형식, top()은 함수별 자체/누적 샘플 비율입니다.
+
+main.py와 api_server.py는 별도 프로세스이므로 DebugControl이 제어 파일로 요청을 전달합니다.
+API 서버가 request()로 제어 파일을 쓰면 main.py의 스케줄러 작업이 poll()로 읽어 프로파일러를 켜고 끄며,
+트레이스 덤프 요청이 있으면 Chrome 트레이스와 프로파일 결과를 출력 디렉토리에 기록합니다.
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from .tracing import get_tracer, merge_chrome_traces
+
+# 로거 설정
+logger = logging.getLogger('Profiler')
+
+
+class SamplingProfiler:
+    """스레드 스택을 주기적으로 찍는 통계적 프로파일러"""
+
+    def __init__(self, tracer=None, max_depth=64):
+        """
+        Args:
+            tracer: 스택 앞에 붙일 구간 경로를 제공하는 트레이서 (기본값: 프로세스 전역 트레이서)
+            max_depth: 스택당 최대 프레임 수 (가장 안쪽부터)
+        """
+        self.tracer = tracer or get_tracer()
+        self.max_depth = max_depth
+        self.interval = 0.01
+        self._counts = Counter()  # {(구간 경로, 코드 객체 튜플): 샘플 수}
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.started_at = None
+        self.stopped_at = None
+        self.deadline = None
+        self.samples = 0
+        self.sample_seconds = 0.0  # 스택 수집에 쓴 시간 (오버헤드)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval=0.01, duration=None, reset=True):
+        """
+        프로파일링 시작
+
+        Args:
+            interval: 샘플 간격 (초)
+            duration: 이 시간(초) 후 자동 중지 (None이면 stop()까지)
+            reset: 이전 결과 삭제 여부
+        """
+        with self._lock:
+            if self.running:
+                self.deadline = time.time() + duration if duration else None
+                return False
+            if reset:
+                self._counts = Counter()
+                self.samples = 0
+                self.sample_seconds = 0.0
+            self.interval = max(interval, 0.001)
+            self.deadline = time.time() + duration if duration else None
+            self.started_at, self.stopped_at = time.time(), None
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+            self._thread.start()
+        logger.info(f"샘플링 프로파일러 시작: 간격 {self.interval * 1000:.0f}ms"
+                    + (f", {duration:.0f}초 후 자동 중지" if duration else ""))
+        return True
+
+    def stop(self):
+        """프로파일링 중지 (결과는 유지)"""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return False
+            self._stop_event.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=5)
+        with self._lock:
+            self._thread = None
+            self.stopped_at = time.time()
+        logger.info(f"샘플링 프로파일러 중지: 샘플 {self.samples}회, 수집 비용 {self.sample_seconds:.2f}초")
+        return True
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            if self.deadline is not None and time.time() >= self.deadline:
+                self._stop_event.set()
+                self.stopped_at = time.time()
+                logger.info(f"샘플링 프로파일러 자동 중지: 샘플 {self.samples}회")
+                break
+            started = time.perf_counter()
+            self._sample(own)
+            self.sample_seconds += time.perf_counter() - started
+
+    def _sample(self, own):
+        counts = self._counts
+        active_path = self.tracer.active_path
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            codes = []
+            while frame is not None and len(codes) < self.max_depth:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.reverse()
+            counts[(active_path(ident), tuple(codes))] += 1
+        self.samples += 1
+
+    @staticmethod
+    def _label(code):
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+    def collapsed(self, include_idle=False):
+        """
+        접힌 스택 형식 ("프레임;프레임;... 샘플수" 줄 목록)
+
+        Args:
+            include_idle: 구간 밖에서 잠든 스레드(대기 루프 등)도 포함할지 여부
+        """
+        lines = []
+        for (path, codes), count in sorted(self._counts.copy().items(), key=lambda item: -item[1]):
+            if not include_idle and not path and codes and codes[-1].co_name in _IDLE_FUNCTIONS:
+                continue
+            frames = [f"[{name}]" for name in path] + [self._label(code) for code in codes]
+            lines.append(f"{';'.join(frames)} {count}")
+        return lines
+
+    def top(self, limit=30, include_idle=False):
+        """
+        함수별 자체(가장 안쪽 프레임)/누적 샘플 수와 구간별 샘플 수
+
+        Returns:
+            dict: {'functions': [{'function', 'self', 'total', 'self_pct', 'total_pct'}, ...],
+                   'spans': [{'span', 'samples', 'pct'}, ...], 'samples': 전체 스택 샘플 수}
+        """
+        self_counts, total_counts, span_counts = Counter(), Counter(), Counter()
+        total = 0
+        for (path, codes), count in self._counts.copy().items():
+            if not codes:
+                continue
+            if not include_idle and not path and codes[-1].co_name in _IDLE_FUNCTIONS:
+                continue
+            total += count
+            self_counts[codes[-1]] += count
+            for code in set(codes):
+                total_counts[code] += count
+            for depth in range(len(path)):
+                span_counts[";".join(path[:depth + 1])] += count
+        total = max(total, 1)
+        functions = [{'function': self._label(code), 'self': self_counts[code], 'total': total_counts[code],
+                      'self_pct': round(self_counts[code] / total * 100, 1),
+                      'total_pct': round(total_counts[code] / total * 100, 1)}
+                     for code, _ in self_counts.most_common(limit)]
+        spans = [{'span': span, 'samples': count, 'pct': round(count / total * 100, 1)}
+                 for span, count in span_counts.most_common(limit)]
+        return {'functions': functions, 'spans': spans, 'samples': total}
+
+    def status(self):
+        return {
+            'running': self.running,
+            'interval_ms': round(self.interval * 1000, 1),
+            'started_at': self.started_at,
+            'stopped_at': self.stopped_at,
+            'deadline': self.deadline,
+            'samples': self.samples,
+            'overhead_seconds': round(self.sample_seconds, 3)
+        }
+
+    def report(self, limit=30):
+        """상태 + 상위 함수 + 접힌 스택 (export용)"""
+        return {'status': self.status(), 'top': self.top(limit), 'collapsed': self.collapsed()}
+
+
+# 구간 밖에서 이 함수가 가장 안쪽 파이썬 프레임이면 잠든 스레드로 보고 기본 보고에서 제외
+# (time.sleep 같은 C 함수는 프레임이 없으므로 그 호출자가 가장 안쪽으로 보임)
+_IDLE_FUNCTIONS = {'wait', 'select', '_wait_for_tstate_lock', 'accept'}
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".debug-", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class DebugControl:
+    """제어 파일로 다른 프로세스의 프로파일러와 트레이스 덤프를 제어"""
+
+    def __init__(self, directory, process, profiler=None, tracer=None, max_duration=600):
+        """
+        Args:
+            directory: 제어 파일(control.json)과 결과 파일({process}.trace.json, {process}.profile.json) 디렉토리
+            process: 이 프로세스 이름
+            profiler: 제어할 프로파일러 (기본값: 프로세스 전역 프로파일러)
+            tracer: 덤프할 트레이서 (기본값: 프로세스 전역 트레이서)
+            max_duration: 프로파일링 최대 시간 (초, 꺼 두는 것을 잊어도 자동 중지)
+        """
+        self.directory = directory
+        self.process = process
+        self.profiler = profiler or get_profiler()
+        self.tracer = tracer or get_tracer()
+        self.max_duration = max_duration
+        self.control_path = os.path.join(directory, "control.json")
+        self._control_mtime = None
+        self._applied_profiler_at = None
+        self._dumped_trace_at = None
+        self._exported_samples = None
+
+    def trace_path(self, process=None):
+        return os.path.join(self.directory, f"{process or self.process}.trace.json")
+
+    def profile_path(self, process=None):
+        return os.path.join(self.directory, f"{process or self.process}.profile.json")
+
+    # ------------------------------------------------------------------
+    # 요청 쪽 (API 서버)
+    # ------------------------------------------------------------------
+    def request(self, profiler=None, trace_dump=False):
+        """
+        제어 파일에 요청 기록
+
+        Args:
+            profiler: {'enabled': bool, 'interval': 초, 'duration': 초} 또는 None
+            trace_dump: 트레이스 덤프 요청 여부
+
+        Returns:
+            float: 요청 시각
+        """
+        control = _read_json(self.control_path) or {}
+        requested_at = time.time()
+        if profiler is not None:
+            duration = min(profiler.get('duration') or self.max_duration, self.max_duration)
+            control['profiler'] = {'enabled': bool(profiler.get('enabled')),
+                                   'interval': profiler.get('interval', 0.01),
+                                   'duration': duration, 'requested_at': requested_at}
+        if trace_dump:
+            control['trace_dump_requested_at'] = requested_at
+        _write_json(self.control_path, control)
+        return requested_at
+
+    def apply_local(self, enabled, interval=0.01, duration=None):
+        """이 프로세스의 프로파일러를 바로 켜고 끔"""
+        if enabled:
+            self.profiler.start(interval=interval, duration=min(duration or self.max_duration, self.max_duration))
+        else:
+            self.profiler.stop()
+
+    def load_result(self, kind, process, max_age=None, since=None):
+        """
+        다른 프로세스가 기록한 결과 (kind: 'trace' 또는 'profile')
+
+        Args:
+            max_age: 이보다 오래 전에 기록된 결과는 종료된 프로세스의 결과로 보고 None (초)
+            since: 이 시각(epoch 초) 이전에 기록된 결과는 None (요청보다 먼저 기록된 이전 결과 제외)
+        """
+        path = self.trace_path(process) if kind == 'trace' else self.profile_path(process)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        if max_age is not None and time.time() - mtime > max_age:
+            return None
+        if since is not None and mtime < since:
+            return None
+        return _read_json(path)
+
+    def collect_traces(self, wait_seconds=5.0, wait_for=("main",)):
+        """
+        다른 프로세스에 트레이스 덤프를 요청하고 이 프로세스 구간과 합침 (블로킹, 스레드 풀에서 호출)
+
+        Args:
+            wait_seconds: wait_for 프로세스가 덤프를 기록할 때까지 최대 대기 시간 (초)
+            wait_for: 덤프를 기다릴 프로세스 이름 목록
+
+        Returns:
+            dict: 합친 Chrome 트레이스 (요청 이후에 기록된 다른 프로세스 덤프만 포함)
+        """
+        requested_at = self.request(trace_dump=True)
+        deadline = time.time() + max(wait_seconds, 0)
+        waiting = [self.trace_path(process) for process in wait_for if process != self.process]
+        while waiting and time.time() < deadline:
+            waiting = [path for path in waiting if not os.path.exists(path) or os.path.getmtime(path) < requested_at]
+            if waiting:
+                time.sleep(0.2)
+        traces = [self.tracer.dump_chrome_trace()]
+        for process in self.processes():
+            if process != self.process:
+                traces.append(self.load_result('trace', process, since=requested_at))
+        return merge_chrome_traces(traces)
+
+    def processes(self):
+        """결과 파일을 기록한 프로세스 이름 목록"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted({name.split(".")[0] for name in names if name.endswith((".trace.json", ".profile.json"))})
+
+    # ------------------------------------------------------------------
+    # 처리 쪽 (main.py 스케줄러 작업)
+    # ------------------------------------------------------------------
+    def poll(self):
+        """
+        제어 파일이 바뀌었으면 요청을 적용하고, 프로파일 결과를 기록
+
+        Returns:
+            bool: 요청을 새로 적용했는지 여부
+        """
+        applied = False
+        try:
+            mtime = os.stat(self.control_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime != self._control_mtime:
+            self._control_mtime = mtime
+            control = _read_json(self.control_path) or {}
+            profiler = control.get('profiler')
+            if profiler and profiler.get('requested_at') != self._applied_profiler_at:
+                self._applied_profiler_at = profiler.get('requested_at')
+                # 요청 후 지난 시간만큼 프로파일링 시간을 줄임 (늦게 읽은 오래된 요청이 계속 켜 두지 않도록)
+                remaining = profiler.get('duration', self.max_duration) - (time.time() - profiler['requested_at'])
+                if profiler.get('enabled') and remaining > 0:
+                    self.apply_local(True, profiler.get('interval', 0.01), remaining)
+                else:
+                    self.apply_local(False)
+                applied = True
+            requested_at = control.get('trace_dump_requested_at')
+            if requested_at and requested_at != self._dumped_trace_at:
+                self._dumped_trace_at = requested_at
+                self.tracer.dump_chrome_trace(self.trace_path())
+                applied = True
+        # 프로파일러가 돌고 있거나 방금 멈췄으면 결과 기록 (샘플이 늘었을 때만)
+        if self.profiler.samples and self.profiler.samples != self._exported_samples:
+            self._exported_samples = self.profiler.samples
+            _write_json(self.profile_path(), dict(self.profiler.report(), process=self.process,
+                                                  updated_at=time.time()))
+        return applied
+
+
+# 프로세스 전역 프로파일러
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler():
+    """프로세스 전역 샘플링 프로파일러 반환"""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler()
+        return _profiler
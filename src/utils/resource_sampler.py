@@ -0,0 +1,381 @@
+"""
+프로세스 자원 샘플링 모듈
+
+ProcessMonitor.check_system_resources는 psutil.cpu_percent(interval=1)로 확인할 때마다 1초씩
+멈췄고, check_process_health는 매번 새 psutil.Process를 만들어 cpu_percent(interval=0.5)로 다시
+기다렸습니다. CloudService도 같은 일을 반복했습니다. ResourceSampler는 다음처럼 동작합니다.
+
+- 대상 프로세스의 psutil.Process 핸들을 캐시해 두고 cpu_percent(interval=None)로 직전 샘플 이후의
+  CPU 사용률을 바로 얻습니다. 시스템 CPU도 같은 방식이라 샘플링 중 잠드는 일이 없습니다.
+- PID 파일은 수정 시각이 바뀔 때만 다시 읽고, 핸들은 create_time으로 PID 재사용을 구분합니다.
+- 프로세스별 (시각, RSS, CPU, 스레드 수, 열린 FD 수)를 고정 크기 링 버퍼에 쌓고, 최근 구간의
+  선형 추세로 메모리/FD/스레드 누수 의심 알림을 만듭니다.
+- export()는 시계열을 열 단위 JSON으로 임시 파일에 쓴 뒤 os.replace로 교체하므로, 다른 프로세스
+  (API 서버)가 잠금 없이 읽을 수 있습니다.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+import psutil
+
+# 로거 설정
+logger = logging.getLogger('ResourceSampler')
+
+# 기본 내보내기 경로 (ProcessMonitor/CloudService가 쓰고 API 서버가 읽음)
+DEFAULT_EXPORT_PATH = os.path.join("cache", "resource_samples.json")
+
+# 샘플 열 이름 (링 버퍼 튜플 순서)
+FIELDS = ("t", "rss", "cpu", "threads", "fds")
+SYSTEM_FIELDS = ("t", "cpu", "memory", "swap", "disk")
+
+# 누수 의심 기준 (시간당 증가량)
+DEFAULT_LEAK_THRESHOLDS = {'rss': 50 * 1024 * 1024, 'fds': 20, 'threads': 10}
+
+
+class _Target:
+    """추적 대상 프로세스 하나"""
+
+    def __init__(self, name, capacity, pid_file=None):
+        self.name = name
+        self.pid_file = pid_file
+        self.pid_file_mtime = None
+        self.pid = None
+        self.process = None
+        self.create_time = None
+        self.samples = deque(maxlen=capacity)
+        self.last_error = None
+
+
+class ResourceSampler:
+    """캐시한 프로세스 핸들로 비차단 샘플링하는 자원 시계열 수집기"""
+
+    def __init__(self, capacity=8640, trend_window=3600, leak_thresholds=None, export_path=DEFAULT_EXPORT_PATH,
+                 disk_path='/'):
+        """
+        Args:
+            capacity: 프로세스별 보관 샘플 수 (10초 간격이면 8640개 = 24시간)
+            trend_window: 추세 계산 구간 (초)
+            leak_thresholds: 누수 의심 기준 {'rss': 바이트/시간, 'fds': 개/시간, 'threads': 개/시간}
+            export_path: export() 기본 경로
+            disk_path: 디스크 사용률을 확인할 경로
+        """
+        self.capacity = capacity
+        self.trend_window = trend_window
+        self.leak_thresholds = dict(DEFAULT_LEAK_THRESHOLDS, **(leak_thresholds or {}))
+        self.export_path = export_path
+        self.disk_path = disk_path
+
+        self._lock = threading.Lock()
+        self._targets = {}  # {이름: _Target}
+        self.system_samples = deque(maxlen=capacity)
+        self.stats = {'samples': 0, 'handles_created': 0, 'exports': 0}
+        # 첫 호출은 기준점만 잡고 0을 반환하므로 미리 호출
+        psutil.cpu_percent(interval=None)
+
+    # ------------------------------------------------------------------
+    # 대상 관리
+    # ------------------------------------------------------------------
+    def track(self, name, pid=None, pid_file=None):
+        """
+        추적 대상 등록 또는 PID 갱신
+
+        Args:
+            name: 대상 이름 (예: 'main', 'api_server')
+            pid: 프로세스 ID
+            pid_file: PID 파일 경로 (수정 시각이 바뀔 때만 다시 읽음)
+
+        Returns:
+            psutil.Process 또는 None: 캐시된 핸들
+        """
+        with self._lock:
+            target = self._targets.get(name)
+            if target is None:
+                target = self._targets[name] = _Target(name, self.capacity, pid_file)
+            elif pid_file is not None:
+                target.pid_file = pid_file
+            if pid is not None:
+                self._attach(target, pid)
+            return self._resolve(target)
+
+    def untrack(self, name):
+        with self._lock:
+            self._targets.pop(name, None)
+
+    def handle(self, name):
+        """대상의 캐시된 psutil.Process 핸들 (살아 있지 않으면 None)"""
+        with self._lock:
+            target = self._targets.get(name)
+            return self._resolve(target) if target is not None else None
+
+    def _attach(self, target, pid):
+        if target.process is not None and target.pid == pid:
+            return
+        try:
+            process = psutil.Process(pid)
+            create_time = process.create_time()
+            process.cpu_percent(interval=None)  # CPU 사용률 기준점
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+            target.pid, target.process, target.last_error = pid, None, str(e)
+            return
+        target.pid, target.process, target.create_time = pid, process, create_time
+        self.stats['handles_created'] += 1
+
+    def _resolve(self, target):
+        """PID 파일 변경과 PID 재사용을 확인한 핸들"""
+        if target.pid_file:
+            try:
+                mtime = os.stat(target.pid_file).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != target.pid_file_mtime:
+                target.pid_file_mtime = mtime
+                pid = None
+                if mtime is not None:
+                    try:
+                        with open(target.pid_file, 'r') as f:
+                            pid = int(f.read().strip())
+                    except (OSError, ValueError):
+                        pid = None
+                if pid is None:
+                    target.pid, target.process = None, None
+                else:
+                    self._attach(target, pid)
+        process = target.process
+        if process is None:
+            return None
+        try:
+            if not process.is_running():
+                # is_running()은 create_time까지 비교하므로 같은 PID를 재사용한 다른 프로세스도 걸러냄
+                target.process = None
+                return None
+        except psutil.Error:
+            target.process = None
+            return None
+        return process
+
+    # ------------------------------------------------------------------
+    # 샘플링
+    # ------------------------------------------------------------------
+    def sample(self, include_system=True):
+        """
+        모든 대상과 시스템 자원을 한 번 샘플링 (잠들지 않음)
+
+        Returns:
+            dict: {'processes': {이름: 샘플 dict 또는 None}, 'system': 샘플 dict}
+        """
+        now = time.time()
+        with self._lock:
+            targets = list(self._targets.values())
+        result = {'processes': {}}
+        for target in targets:
+            result['processes'][target.name] = self._sample_target(target, now)
+        if include_system:
+            result['system'] = self.sample_system(now)
+        self.stats['samples'] += 1
+        return result
+
+    def sample_process(self, name):
+        """대상 하나만 샘플링 (없거나 종료됐으면 None)"""
+        with self._lock:
+            target = self._targets.get(name)
+        return self._sample_target(target, time.time()) if target is not None else None
+
+    def _sample_target(self, target, now):
+        with self._lock:
+            process = self._resolve(target)
+        if process is None:
+            return None
+        try:
+            with process.oneshot():
+                rss = process.memory_info().rss
+                cpu = process.cpu_percent(interval=None)
+                threads = process.num_threads()
+                fds = process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+        except (psutil.NoSuchProcess, psutil.ZombieProcess) as e:
+            target.process, target.last_error = None, str(e)
+            return None
+        except psutil.AccessDenied as e:
+            target.last_error = str(e)
+            return None
+        row = (round(now, 1), rss, round(cpu, 1), threads, fds)
+        target.samples.append(row)
+        return dict(zip(FIELDS, row), pid=target.pid)
+
+    def sample_system(self, now=None):
+        """시스템 CPU(직전 호출 이후)/메모리/스왑/디스크 사용률"""
+        row = (
+            round(now or time.time(), 1),
+            psutil.cpu_percent(interval=None),
+            psutil.virtual_memory().percent,
+            psutil.swap_memory().percent,
+            psutil.disk_usage(self.disk_path).percent
+        )
+        self.system_samples.append(row)
+        return dict(zip(SYSTEM_FIELDS, row))
+
+    def latest(self, name):
+        """대상의 마지막 샘플 (없으면 None)"""
+        target = self._targets.get(name)
+        if target is None or not target.samples:
+            return None
+        return dict(zip(FIELDS, target.samples[-1]), pid=target.pid)
+
+    # ------------------------------------------------------------------
+    # 추세/알림
+    # ------------------------------------------------------------------
+    def trend(self, name, field='rss', window=None):
+        """
+        최근 구간의 시간당 증가량 (최소제곱 기울기)
+
+        Returns:
+            float 또는 None: 시간당 증가량 (샘플이 부족하면 None)
+        """
+        target = self._targets.get(name)
+        if target is None:
+            return None
+        return _slope_per_hour(list(target.samples), FIELDS.index(field), window or self.trend_window)
+
+    def check_alerts(self):
+        """
+        누수 의심 알림 (구간의 80% 이상을 채운 대상만)
+
+        Returns:
+            list: [{'process', 'pid', 'metric', 'per_hour', 'current', 'message'}, ...]
+        """
+        alerts = []
+        with self._lock:
+            targets = list(self._targets.values())
+        for target in targets:
+            samples = list(target.samples)
+            if len(samples) < 3 or samples[-1][0] - samples[0][0] < self.trend_window * 0.8:
+                continue
+            for metric, threshold in self.leak_thresholds.items():
+                slope = _slope_per_hour(samples, FIELDS.index(metric), self.trend_window)
+                if slope is None or slope < threshold:
+                    continue
+                current = samples[-1][FIELDS.index(metric)]
+                if metric == 'rss':
+                    message = (f"{target.name}(PID {target.pid}) 메모리 증가 추세: 시간당 {slope / 1024 / 1024:.1f}MB "
+                               f"(현재 {current / 1024 / 1024:.0f}MB)")
+                else:
+                    message = f"{target.name}(PID {target.pid}) {metric} 증가 추세: 시간당 {slope:.1f}개 (현재 {current}개)"
+                alerts.append({'process': target.name, 'pid': target.pid, 'metric': metric,
+                               'per_hour': round(slope, 1), 'current': current, 'message': message})
+        return alerts
+
+    # ------------------------------------------------------------------
+    # 내보내기
+    # ------------------------------------------------------------------
+    def snapshot(self, max_points=None):
+        """
+        열 단위 시계열 스냅샷
+
+        Args:
+            max_points: 프로세스별 최대 샘플 수 (None이면 전체, 많으면 간격을 두고 추림)
+        """
+        with self._lock:
+            targets = list(self._targets.values())
+        processes = {}
+        for target in targets:
+            samples = _downsample(list(target.samples), max_points)
+            processes[target.name] = {
+                'pid': target.pid,
+                'alive': target.process is not None,
+                'series': {field: [row[i] for row in samples] for i, field in enumerate(FIELDS)}
+            }
+        system = _downsample(list(self.system_samples), max_points)
+        return {
+            'updated_at': round(time.time(), 1),
+            'processes': processes,
+            'system': {field: [row[i] for row in system] for i, field in enumerate(SYSTEM_FIELDS)},
+            'alerts': self.check_alerts()
+        }
+
+    def export(self, path=None, max_points=720):
+        """스냅샷을 원자적으로 파일에 기록"""
+        path = path or self.export_path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".resources-", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.snapshot(max_points), f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.stats['exports'] += 1
+        return path
+
+
+def load_export(path=DEFAULT_EXPORT_PATH, max_age=None):
+    """
+    export()가 쓴 스냅샷 읽기
+
+    Args:
+        path: 스냅샷 파일 경로
+        max_age: 이 시간(초)보다 오래된 스냅샷이면 None
+
+    Returns:
+        dict 또는 None
+    """
+    try:
+        with open(path, "r") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if max_age is not None and time.time() - snapshot.get('updated_at', 0) > max_age:
+        return None
+    return snapshot
+
+
+def _slope_per_hour(samples, column, window):
+    """최근 window초 샘플의 최소제곱 기울기 (시간당)"""
+    if not samples:
+        return None
+    start = samples[-1][0] - window
+    points = [(row[0], row[column]) for row in samples if row[0] >= start]
+    if len(points) < 3:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    if var_t <= 0:
+        return None
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return cov / var_t * 3600
+
+
+def _downsample(samples, max_points):
+    if not max_points or len(samples) <= max_points:
+        return samples
+    step = len(samples) / max_points
+    picked = [samples[int(i * step)] for i in range(max_points - 1)]
+    picked.append(samples[-1])
+    return picked
+
+
+# 프로세스 전역 샘플러
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler(**kwargs):
+    """
+    프로세스 전역 자원 샘플러 반환
+
+    Args:
+        **kwargs: ResourceSampler 인자 (처음 생성할 때만 사용)
+    """
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = ResourceSampler(**kwargs)
+        return _sampler
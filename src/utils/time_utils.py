@@ -11,6 +11,8 @@ import os
 import pytz
 import logging
 
+from .clock import get_clock
+
 # 로거 설정
 logger = logging.getLogger('TimeUtils')
 
@@ -125,53 +127,8 @@ def get_market_schedule(date=None, market="KR", config=None):
     Returns:
         dict: 시장 스케줄 정보
     """
-    if date is None:
-        date = get_current_time(KST if market == "KR" else EST).date()
-    elif isinstance(date, datetime.datetime):
-        date = date.date()
-        
-    # 요일 확인 (0=월요일, 6=일요일)
-    weekday = date.weekday()
-    is_weekend = weekday >= 5
-    
-    # 시장 기본 정보 및 설정 가져오기
-    if market == "KR":
-        timezone = KST
-        open_time_str = get_config_value('KR_MARKET_OPEN_TIME', DEFAULT_KR_MARKET_OPEN_TIME, config)
-        close_time_str = get_config_value('KR_MARKET_CLOSE_TIME', DEFAULT_KR_MARKET_CLOSE_TIME, config)
-    else:  # "US"
-        timezone = EST
-        open_time_str = get_config_value('US_MARKET_OPEN_TIME', DEFAULT_US_MARKET_OPEN_TIME, config)
-        close_time_str = get_config_value('US_MARKET_CLOSE_TIME', DEFAULT_US_MARKET_CLOSE_TIME, config)
-    
-    # 개장/마감 시간 생성
-    open_time = datetime.datetime.strptime(f"{date.strftime('%Y-%m-%d')} {open_time_str}", "%Y-%m-%d %H:%M")
-    close_time = datetime.datetime.strptime(f"{date.strftime('%Y-%m-%d')} {close_time_str}", "%Y-%m-%d %H:%M")
-    
-    # 시간대 정보 추가
-    open_time = timezone.localize(open_time)
-    close_time = timezone.localize(close_time)
-    
-    # 개장 여부 결정
-    is_open = not is_weekend
-    
-    # 강제 개장 설정 확인
-    force_open = get_config_value('FORCE_MARKET_OPEN', False, config)
-    if isinstance(force_open, str):
-        force_open = force_open.lower() == "true"
-    
-    if force_open:
-        is_open = True
-    
-    return {
-        'date': date,
-        'is_open': is_open,
-        'is_weekend': is_weekend,
-        'open_time': open_time if is_open else None,
-        'close_time': close_time if is_open else None,
-        'market': market,
-        'timezone': timezone
-    }
+    from .market_calendar import get_calendar
+    return get_calendar(market, config).schedule(date)
 
 def get_current_time(timezone=KST, tz=None):
     """
@@ -196,7 +153,8 @@ def get_current_time(timezone=KST, tz=None):
             # 알 수 없는 시간대일 경우 기본 KST 사용
             timezone = KST
             
-    return datetime.datetime.now(timezone)
+    # 주입된 시계 사용 (기본: 시스템 시계, 리플레이/백테스트: 가상 시계)
+    return get_clock().now(timezone)
 
 def get_current_time_str(timezone=KST, format_str='%Y-%m-%d %H:%M:%S'):
     """
@@ -296,57 +254,9 @@ def is_market_open(market="KR", config=None):
     Returns:
         bool: 시장 개장 여부
     """
-    # 시스템 로컬 시간 로깅 (디버깅용)
-    system_now = datetime.datetime.now()
-    logger.debug(f"시스템 로컬 시간: {system_now}")
-    
-    # 강제 개장 설정 확인
-    force_open = get_config_value('FORCE_MARKET_OPEN', False, config)
-    if isinstance(force_open, str):
-        force_open = force_open.lower() == "true"
-    
-    if force_open:
-        logger.info(f"FORCE_MARKET_OPEN이 활성화되어 있습니다. 시장({market})을 강제로 열린 상태로 간주합니다.")
-        return True
-        
-    # 시간대 설정
-    timezone = KST if market == "KR" else EST
-    
-    # 현재 시간을 해당 시장의 시간대로 가져옴
-    now = get_current_time(timezone)
-    today = now.strftime("%Y-%m-%d")
-    weekday = now.weekday()  # 0=월요일, 6=일요일
-    
-    # 로깅 추가 - 시간대 정보 확인
-    logger.debug(f"{market} 시장 확인: 현재 시간({timezone}): {now}, 요일: {weekday}")
-    
-    # 주말 확인
-    if weekday >= 5:  # 토, 일
-        logger.debug(f"{market} 시장 확인: 주말({weekday})이므로 시장 닫힘")
-        return False
-    
-    # 시장별 운영 시간 확인
-    if market == "KR":
-        start_time = get_config_value('KR_MARKET_OPEN_TIME', DEFAULT_KR_MARKET_OPEN_TIME, config)
-        end_time = get_config_value('KR_MARKET_CLOSE_TIME', DEFAULT_KR_MARKET_CLOSE_TIME, config)
-    else:
-        start_time = get_config_value('US_MARKET_OPEN_TIME', DEFAULT_US_MARKET_OPEN_TIME, config)
-        end_time = get_config_value('US_MARKET_CLOSE_TIME', DEFAULT_US_MARKET_CLOSE_TIME, config)
-    
-    # 시간 변환
-    start_dt = datetime.datetime.strptime(f"{today} {start_time}", "%Y-%m-%d %H:%M")
-    end_dt = datetime.datetime.strptime(f"{today} {end_time}", "%Y-%m-%d %H:%M")
-    
-    # 시간대 정보 추가
-    start_dt = timezone.localize(start_dt)
-    end_dt = timezone.localize(end_dt)
-    
-    # 디버깅을 위한 추가 로깅
-    logger.debug(f"{market} 시장 시간: {start_dt} ~ {end_dt}")
-    logger.debug(f"{market} 시장 개장 여부 확인 결과: {start_dt <= now <= end_dt}")
-    
-    # 시장 개장 시간인지 확인 (시간대 정보를 유지한 채 비교)
-    return start_dt <= now <= end_dt
+    # 날짜별 개장/마감 시각을 캐시한 캘린더로 판단 (강제 개장 설정은 매번 확인)
+    from .market_calendar import get_calendar
+    return get_calendar(market, config).is_open()
 
 def format_timestamp(timestamp, format_str='%Y-%m-%d %H:%M:%S', timezone=KST):
     """
@@ -505,50 +415,79 @@ def is_after_market_open(market="KR", config=None):
         bool: 시간외 거래 개장 여부
     """
     # 시간외 거래 활성화 여부 확인
-    if market == "KR":
-        after_market_enabled = get_config_value('KR_AFTER_MARKET_ENABLED', False, config)
-        after_market_trading = get_config_value('KR_AFTER_MARKET_TRADING', False, config)
-    else:  # US 시장
-        after_market_enabled = get_config_value('US_AFTER_MARKET_ENABLED', False, config)
-        after_market_trading = get_config_value('US_AFTER_MARKET_TRADING', False, config)
+    after_market_enabled = get_config_value(f'{market}_AFTER_MARKET_ENABLED', False, config)
+    after_market_trading = get_config_value(f'{market}_AFTER_MARKET_TRADING', False, config)
     
     # 시간외 거래가 비활성화된 경우 즉시 False 반환
     if not after_market_enabled or not after_market_trading:
         return False
-        
-    # 강제 개장 설정 확인
-    force_open = get_config_value('FORCE_MARKET_OPEN', False, config)
-    if isinstance(force_open, str):
-        force_open = force_open.lower() == "true"
     
-    if force_open:
-        return True
-        
-    now = get_current_time(KST if market == "KR" else EST)
-    today = now.strftime("%Y-%m-%d")
-    weekday = now.weekday()  # 0=월요일, 6=일요일
+    # 휴장일/조기 마감을 반영한 캘린더로 판단 (강제 개장 설정은 캘린더에서 확인)
+    from .market_calendar import get_calendar, AFTER_MARKET
+    return get_calendar(market, config).is_open(session=AFTER_MARKET)
+
+def is_pre_market_open(market="US", config=None):
+    """
+    프리 마켓(장전 거래)이 현재 열려 있는지 확인
     
-    # 주말 확인
-    if weekday >= 5:  # 토, 일
+    Args:
+        market: 시장 코드 ("KR" 또는 "US")
+        config: 설정 모듈 (기본값: None, 전역 config 또는 환경 변수 사용)
+        
+    Returns:
+        bool: 프리 마켓 개장 여부
+    """
+    if not get_config_value(f'{market}_PRE_MARKET_ENABLED', False, config):
         return False
     
-    # 시장별 시간외 거래 시간 확인
-    if market == "KR":
-        start_time = get_config_value('KR_AFTER_MARKET_OPEN_TIME', "16:00", config)
-        end_time = get_config_value('KR_AFTER_MARKET_CLOSE_TIME', "18:00", config)
-    else:
-        start_time = get_config_value('US_AFTER_MARKET_OPEN_TIME', "16:00", config)
-        end_time = get_config_value('US_AFTER_MARKET_CLOSE_TIME', "20:00", config)
+    from .market_calendar import get_calendar, PRE_MARKET
+    return get_calendar(market, config).is_open(session=PRE_MARKET)
+
+def get_next_market_open(market="KR", config=None, session="regular"):
+    """
+    다음 개장 시각 반환 (휴장일 반영, 현재 개장 중이면 다음 거래일 개장)
     
-    # 시간 변환
-    start_dt = datetime.datetime.strptime(f"{today} {start_time}", "%Y-%m-%d %H:%M")
-    end_dt = datetime.datetime.strptime(f"{today} {end_time}", "%Y-%m-%d %H:%M")
+    Args:
+        market: 시장 코드 ("KR" 또는 "US")
+        config: 설정 모듈
+        session: 세션 종류 ("regular", "pre", "after")
+        
+    Returns:
+        datetime: 시장 시간대 기준 개장 시각
+    """
+    from .market_calendar import get_calendar
+    return get_calendar(market, config).next_open(session=session)
+
+def get_next_market_close(market="KR", config=None, session="regular"):
+    """
+    다음 마감 시각 반환 (휴장일/조기 마감 반영)
     
-    # 현재 시간에서 시간/분만 추출
-    current_time = now.replace(tzinfo=None)
+    Args:
+        market: 시장 코드 ("KR" 또는 "US")
+        config: 설정 모듈
+        session: 세션 종류 ("regular", "pre", "after")
+        
+    Returns:
+        datetime: 시장 시간대 기준 마감 시각
+    """
+    from .market_calendar import get_calendar
+    return get_calendar(market, config).next_close(session=session)
+
+def wait_for_market_open(market="KR", config=None, should_continue=None, session="regular"):
+    """
+    다음 개장 시각까지 대기 (휴장일/주말은 건너뛰고 정확히 개장 시각에 깨어남)
     
-    # 시간외 거래 시간인지 확인
-    return start_dt <= current_time <= end_dt
+    Args:
+        market: 시장 코드 ("KR" 또는 "US")
+        config: 설정 모듈
+        should_continue: 계속 대기할지 반환하는 함수 (False면 즉시 반환)
+        session: 세션 종류 ("regular", "pre", "after")
+        
+    Returns:
+        bool: 개장했으면 True, 중단되었으면 False
+    """
+    from .market_calendar import get_calendar
+    return get_calendar(market, config).sleep_until_open(should_continue, session=session)
 
 def is_trading_time(market="KR", config=None, include_after_hours=True):
     """
@@ -577,7 +516,8 @@ def is_trading_time(market="KR", config=None, include_after_hours=True):
     # 시간외 거래 확인 (설정 활성화 & 포함 옵션 활성화시)
     if include_after_hours:
         use_extended_hours = get_config_value('USE_EXTENDED_HOURS', False, config)
-        if use_extended_hours and is_after_market_open(market, config):
+        if use_extended_hours and (is_after_market_open(market, config) or
+                                   is_pre_market_open(market, config)):
             return True
     
     return False
\ No newline at end of file
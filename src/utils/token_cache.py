@@ -0,0 +1,278 @@
+"""
+프로세스 간 공유 토큰 캐시 모듈
+
+main.py, api_server.py, check_status.py와 자동 재시작된 프로세스가 각자 접근 토큰을 발급받던 것을
+파일 하나로 공유합니다. 한국투자증권은 토큰 발급을 1분에 1회 정도로 제한하므로 여러 프로세스가
+동시에 발급을 요청하면 재시도 대기가 생깁니다.
+
+- 토큰 파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로 읽는 쪽은 잠금 없이 항상 완전한 내용을 봅니다.
+- 발급은 별도 잠금 파일(.lock)에 배타적 잠금을 건 프로세스 하나만 수행하고, 잠금을 얻은 뒤 파일을
+  다시 읽어 다른 프로세스가 이미 갱신했으면 그 토큰을 사용합니다.
+- start_refresh()로 만료 refresh_margin 초 전에 백그라운드에서 미리 갱신하므로 시작/재연결 시
+  토큰 발급 왕복과 발급 제한 재시도 대기가 생기지 않습니다.
+
+카카오톡처럼 리프레시 토큰으로 갱신하는 경우 발급 함수가 추가 필드(refresh_token 등)를 함께 반환하면
+토큰 파일에 같이 저장하고, issue_with_previous=True면 발급 함수에 파일의 최신 기록을 넘깁니다.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .clock import get_clock
+
+# 로거 설정
+logger = logging.getLogger('TokenCache')
+
+
+class _FileLock:
+    """프로세스 간 배타적 파일 잠금"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class TokenCache:
+    """파일 잠금으로 보호되는 프로세스 간 공유 토큰 캐시"""
+
+    def __init__(self, path, issue, refresh_margin=600, min_issue_interval=60, clock=None,
+                 issue_with_previous=False):
+        """
+        Args:
+            path: 토큰 파일 경로
+            issue: 새 토큰 발급 함수 () -> (access_token, expires_in 초[, 추가 필드 dict]) - 실패 시 예외
+            refresh_margin: 만료 몇 초 전부터 갱신 대상으로 볼지
+            min_issue_interval: 토큰 발급 최소 간격 (초, 증권사 발급 제한)
+            clock: 시계 객체 (None이면 clock.get_clock()의 전역 시계)
+            issue_with_previous: True면 발급 함수에 파일의 최신 토큰 기록(없으면 None)을 인자로 전달
+        """
+        self.path = path
+        self.issue = issue
+        self.issue_with_previous = issue_with_previous
+        self.refresh_margin = refresh_margin
+        self.min_issue_interval = min_issue_interval
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._token = None  # 마지막으로 읽은 토큰 {access_token, expires_at, issued_at}
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+        self.stats = {'hits': 0, 'issued': 0, 'shared': 0, 'errors': 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _now(self):
+        return (self.clock if self.clock is not None else get_clock()).timestamp()
+
+    def _fresh(self, token, now=None):
+        now = self._now() if now is None else now
+        return bool(token and token.get('access_token')) and now < token.get('expires_at', 0) - self.refresh_margin
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                token = json.load(f)
+            return token if isinstance(token, dict) else None
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, token):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".token-", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(token, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, force=False):
+        """
+        유효한 토큰 반환 (파일 캐시 우선, 만료가 가까우면 한 프로세스만 발급)
+
+        Args:
+            force: 캐시가 유효해도 새로 발급 (증권사가 토큰을 거부한 경우)
+
+        Returns:
+            dict: {access_token, expires_at(epoch 초), issued_at(epoch 초)}
+        """
+        with self._lock:
+            if not force:
+                if self._fresh(self._token):
+                    self.stats['hits'] += 1
+                    return dict(self._token)
+                token = self._read()
+                if self._fresh(token):
+                    self._token = token
+                    self.stats['shared'] += 1
+                    return dict(token)
+            stale = self._token
+
+            with _FileLock(self.path + ".lock"):
+                # 잠금을 기다리는 동안 다른 프로세스가 갱신했을 수 있으므로 다시 확인
+                token = self._read()
+                now = self._now()
+                if token and token.get('access_token') != (stale or {}).get('access_token') and self._fresh(token, now):
+                    self._token = token
+                    self.stats['shared'] += 1
+                    return dict(token)
+                if not force and self._fresh(token, now):
+                    self._token = token
+                    self.stats['shared'] += 1
+                    return dict(token)
+                if token and now - token.get('issued_at', 0) < self.min_issue_interval and now < token.get('expires_at', 0):
+                    # 방금 발급된 토큰은 재발급 제한에 걸리므로 만료 전까지 그대로 사용
+                    self._token = token
+                    return dict(token)
+
+                try:
+                    issued = self.issue(token) if self.issue_with_previous else self.issue()
+                except Exception:
+                    self.stats['errors'] += 1
+                    if token and token.get('access_token') and now < token.get('expires_at', 0):
+                        logger.warning("토큰 발급 실패, 만료 전인 기존 토큰을 계속 사용합니다.")
+                        self._token = token
+                        return dict(token)
+                    raise
+                access_token, expires_in = issued[0], issued[1]
+                now = self._now()
+                extra = issued[2] if len(issued) > 2 and issued[2] else {}
+                token = dict(extra, access_token=access_token, expires_at=now + float(expires_in), issued_at=now)
+                self._write(token)
+                self._token = token
+                self.stats['issued'] += 1
+                logger.info(f"접근 토큰 발급 및 공유 캐시 저장 ({self.path}, 유효 {float(expires_in) / 3600:.1f}시간)")
+                return dict(token)
+
+    def seed(self, access_token, expires_at=0, **extra):
+        """
+        토큰 파일이 비어 있을 때만 외부에서 받은 토큰 기록 (환경 변수/설정의 초기 토큰)
+
+        Args:
+            access_token: 접근 토큰
+            expires_at: 만료 시각 (epoch 초, 모르면 0 - 다음 get()에서 바로 갱신)
+            **extra: 함께 저장할 필드 (refresh_token 등)
+
+        Returns:
+            dict: 파일의 최신 토큰 기록
+        """
+        with self._lock:
+            with _FileLock(self.path + ".lock"):
+                token = self._read()
+                if not token or not token.get('access_token'):
+                    if not access_token:
+                        return dict(token or {})
+                    token = dict(extra, access_token=access_token, expires_at=float(expires_at or 0), issued_at=0)
+                    self._write(token)
+                elif any(not token.get(key) and value for key, value in extra.items()):
+                    # 예전 형식 파일에 없던 필드(refresh_token 등)만 보충
+                    token = dict(token, **{key: value for key, value in extra.items() if not token.get(key) and value})
+                    self._write(token)
+                self._token = token
+                return dict(token)
+
+    def peek(self):
+        """발급 없이 현재 토큰 기록 반환 (없으면 None)"""
+        with self._lock:
+            token = self._token or self._read()
+        return dict(token) if token else None
+
+    def invalidate(self):
+        """프로세스 안의 토큰 사본 폐기 (다음 get에서 파일을 다시 읽음)"""
+        with self._lock:
+            self._token = None
+
+    def seconds_until_refresh(self):
+        """다음 갱신 시점까지 남은 시간 (초)"""
+        with self._lock:
+            token = self._token or self._read()
+        if not token:
+            return 0.0
+        return max(token.get('expires_at', 0) - self.refresh_margin - self._now(), 0.0)
+
+    def start_refresh(self):
+        """만료 전 백그라운드 갱신 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._stop_event.clear()
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, name="TokenRefresh", daemon=True)
+            self._refresh_thread.start()
+        return True
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            wait = self.seconds_until_refresh()
+            if wait > 0:
+                # 다른 프로세스가 먼저 갱신하면 파일에서 새 만료 시각을 읽도록 최대 10분 단위로 확인
+                self._stop_event.wait(min(wait, 600))
+                self.invalidate()
+                continue
+            try:
+                self.get()
+            except Exception as e:
+                logger.error(f"토큰 백그라운드 갱신 실패: {e}")
+            if self.seconds_until_refresh() <= 0:
+                # 발급 실패 또는 발급 제한으로 기존 토큰을 계속 쓰는 경우 제한 간격 뒤 재시도
+                self._stop_event.wait(self.min_issue_interval)
+
+    def stop_refresh(self):
+        """백그라운드 갱신 중지"""
+        self._stop_event.set()
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            self._refresh_thread.join(timeout=5)
+        self._refresh_thread = None
+
+
+# 경로별 공유 캐시 (같은 프로세스의 여러 KISAPI 인스턴스도 한 캐시 사용)
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_token_cache(path, issue, **kwargs):
+    """
+    경로별 공유 토큰 캐시 반환
+
+    Args:
+        path: 토큰 파일 경로
+        issue: 새 토큰 발급 함수 (처음 생성할 때만 사용)
+        **kwargs: TokenCache 추가 인자
+    """
+    path = os.path.abspath(path)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = TokenCache(path, issue, **kwargs)
+        return cache
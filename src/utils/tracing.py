@@ -0,0 +1,322 @@
+"""
+트레이싱 모듈
+
+매매 사이클이 느릴 때 증권사 API, LLM, pandas 지표 계산, DB 중 어디서 시간이 걸렸는지 보기 위해
+사이클/종목/외부 호출 단위로 중첩된 구간(span)을 기록합니다.
+
+- 구간은 끝날 때 (이름, 분류, 시작, 길이, 스레드, 깊이, 인자) 튜플 하나로 고정 크기 버퍼(deque)에 쌓이고,
+  오래된 구간부터 버려집니다.
+- dump_chrome_trace()는 버퍼를 Chrome 트레이스 JSON(chrome://tracing, Perfetto)으로 내보냅니다.
+  같은 스레드의 구간은 시간 포함 관계로 중첩되어 표시됩니다.
+- slow 인자를 준 구간(사이클)이 그 시간을 넘기면 바로 아래 구간들의 소요 시간 분해를 경고 로그로 남깁니다.
+- 스레드별 현재 구간 경로를 유지하므로 샘플링 프로파일러(profiler.py)가 스택 앞에 구간 이름을 붙입니다.
+
+사용 예:
+    with get_tracer().span("gpt_auto_trader.cycle", "cycle", slow=60):
+        with get_tracer().span("symbol", "symbol", symbol=symbol):
+            ...
+
+    @traced("kis.get_balance", "broker")
+    def get_balance(self, ...):
+        ...
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+# 로거 설정
+logger = logging.getLogger('Tracer')
+
+
+class _NoopSpan:
+    """트레이싱이 꺼져 있을 때 쓰는 빈 구간"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    """진행 중인 구간"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'slow', 'start', 'depth', 'stack')
+
+    def __init__(self, tracer, name, category, args, slow):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.slow = slow
+
+    def __enter__(self):
+        self.stack = self.tracer._thread_stack()
+        self.depth = len(self.stack)
+        self.stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.stack.pop()
+        if exc_type is not None:
+            self.set(error=exc_type.__name__)
+        self.tracer._record(self, duration)
+        return False
+
+    def set(self, **args):
+        """구간 인자 추가 (예: 결과 건수)"""
+        if self.args is None:
+            self.args = {}
+        self.args.update(args)
+
+
+class Tracer:
+    """고정 크기 버퍼에 구간을 기록하는 트레이서"""
+
+    def __init__(self, enabled=True, capacity=20000, process=None):
+        """
+        Args:
+            enabled: 기록 여부 (False면 span()이 빈 구간을 반환)
+            capacity: 버퍼에 보관할 최대 구간 수
+            process: Chrome 트레이스의 프로세스 이름 (기본값: 실행 스크립트 이름)
+        """
+        self.enabled = enabled
+        self.process = process
+        self._spans = deque(maxlen=capacity)
+        self._local = threading.local()
+        self._stacks = {}  # {스레드 ident: 현재 구간 이름 목록} - 프로파일러용
+        self._thread_names = {}  # {스레드 ident: 이름} - 덤프 시점에 종료된 스레드도 이름 표시
+        self._lock = threading.Lock()
+        self.stats = {'recorded': 0, 'slow': 0}
+
+    def configure(self, enabled=None, capacity=None):
+        """설정 변경 (버퍼 크기를 바꾸면 최근 구간을 유지한 채 새 버퍼로 교체)"""
+        if enabled is not None:
+            self.enabled = enabled
+        if capacity is not None and capacity != self._spans.maxlen:
+            self._spans = deque(self._spans, maxlen=capacity)
+
+    @property
+    def capacity(self):
+        return self._spans.maxlen
+
+    def span(self, name, category="internal", slow=None, **args):
+        """
+        구간 컨텍스트
+
+        Args:
+            name: 구간 이름
+            category: 분류 (cycle, symbol, broker, llm, pandas, db 등)
+            slow: 이 시간(초)을 넘기면 하위 구간 분해를 경고 로그로 기록
+            **args: Chrome 트레이스에 표시할 인자 (종목 코드 등)
+        """
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, category, args or None, slow)
+
+    def _thread_stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+            ident = threading.get_ident()
+            with self._lock:
+                self._stacks[ident] = stack
+                self._thread_names[ident] = threading.current_thread().name
+                # 종료된 스레드의 경로 정리 (이름은 버퍼에 구간이 남아 있을 수 있으므로 많이 쌓였을 때만)
+                alive = {thread.ident for thread in threading.enumerate()}
+                for ident in [ident for ident in self._stacks if ident not in alive]:
+                    del self._stacks[ident]
+                if len(self._thread_names) > 1024:
+                    self._thread_names = {ident: name for ident, name in self._thread_names.items()
+                                          if ident in alive}
+        return stack
+
+    def active_path(self, ident):
+        """스레드의 현재 구간 이름 경로 (프로파일러용, 없으면 빈 튜플)"""
+        stack = self._stacks.get(ident)
+        return tuple(stack) if stack else ()
+
+    def _record(self, span, duration):
+        self._spans.append((span.name, span.category, span.start, duration, threading.get_ident(), span.depth,
+                            span.args))
+        self.stats['recorded'] += 1
+        if span.slow is not None and duration >= span.slow:
+            self.stats['slow'] += 1
+            # 트레이싱 오류가 매매 사이클로 전파되지 않도록 분해 로그 실패는 무시
+            try:
+                logger.warning(f"느린 구간 {span.name}{_format_args(span.args)}: {duration:.1f}초 - "
+                               f"{self.format_breakdown(span.start, duration, span.depth)}")
+            except Exception as e:
+                logger.debug(f"느린 구간 분해 실패: {span.name} - {e}")
+
+    def spans(self, since=None):
+        """
+        기록된 구간 목록 (오래된 순)
+
+        Args:
+            since: 이 perf_counter 값 이후에 시작한 구간만
+
+        Returns:
+            list: [(이름, 분류, 시작, 길이, 스레드, 깊이, 인자), ...]
+        """
+        spans = list(self._spans)
+        if since is not None:
+            spans = [span for span in spans if span[2] >= since]
+        return spans
+
+    def breakdown(self, start, duration, depth, ident=None):
+        """
+        구간 바로 아래 하위 구간을 이름별로 합산
+
+        Returns:
+            list: [(이름, 합계 초, 횟수), ...] 소요 시간 큰 순
+        """
+        ident = ident or threading.get_ident()
+        end = start + duration
+        totals = {}
+        # 다른 스레드가 계속 기록하므로 공유 버퍼를 직접 순회하지 않고 복사본을 순회
+        for name, _, child_start, child_duration, child_ident, child_depth, _ in reversed(list(self._spans)):
+            if child_start < start:
+                # 버퍼는 끝난 순서이므로 더 앞쪽은 이 구간보다 먼저 시작한 구간뿐
+                if child_start + child_duration < start:
+                    break
+                continue
+            if child_ident != ident or child_depth != depth + 1 or child_start + child_duration > end:
+                continue
+            total, count = totals.get(name, (0.0, 0))
+            totals[name] = (total + child_duration, count + 1)
+        return sorted(((name, total, count) for name, (total, count) in totals.items()), key=lambda item: -item[1])
+
+    def format_breakdown(self, start, duration, depth, limit=6):
+        items = self.breakdown(start, duration, depth)
+        if not items:
+            return "하위 구간 없음"
+        covered = sum(total for _, total, _ in items)
+        parts = [f"{name} {total:.1f}초({count}회)" for name, total, count in items[:limit]]
+        parts.append(f"기타 {max(duration - covered, 0):.1f}초")
+        return ", ".join(parts)
+
+    def chrome_events(self, since=None):
+        """Chrome 트레이스 이벤트 목록 (ph=X 완료 이벤트 + 프로세스/스레드 이름)"""
+        pid = os.getpid()
+        process = self.process or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+        threads = dict(self._thread_names)
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': process}}]
+        seen = set()
+        for name, category, start, duration, ident, _, args in self.spans(since):
+            event = {'name': name, 'cat': category, 'ph': 'X', 'ts': round(start * 1e6, 1),
+                     'dur': round(duration * 1e6, 1), 'pid': pid, 'tid': ident}
+            if args:
+                event['args'] = {key: value if isinstance(value, (int, float, str, bool)) else str(value)
+                                 for key, value in args.items()}
+            events.append(event)
+            if ident not in seen:
+                seen.add(ident)
+                events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': ident,
+                               'args': {'name': threads.get(ident, f"thread-{ident}")}})
+        return events
+
+    def dump_chrome_trace(self, path=None, since=None):
+        """
+        Chrome 트레이스 JSON 생성
+
+        Args:
+            path: 기록할 파일 경로 (None이면 기록하지 않음, 임시 파일 교체로 원자적 기록)
+            since: 이 perf_counter 값 이후 구간만
+
+        Returns:
+            dict: {'traceEvents': [...], 'displayTimeUnit': 'ms', ...}
+        """
+        trace = {
+            'traceEvents': self.chrome_events(since),
+            'displayTimeUnit': 'ms',
+            'otherData': {'process': self.process, 'pid': os.getpid(), 'dumped_at': time.time(),
+                          'perf_counter': time.perf_counter(), 'dropped': max(self.stats['recorded'] - len(self._spans), 0)}
+        }
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".trace-", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(trace, f, separators=(",", ":"), ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return trace
+
+
+def merge_chrome_traces(traces):
+    """여러 프로세스의 Chrome 트레이스를 하나로 합침 (pid로 구분)"""
+    events = []
+    for trace in traces:
+        if trace:
+            events.extend(trace.get('traceEvents', []))
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def _format_args(args):
+    if not args:
+        return ""
+    return "(" + ", ".join(f"{key}={value}" for key, value in args.items()) + ")"
+
+
+def traced(name, category="internal"):
+    """
+    함수 호출을 구간으로 기록하는 데코레이터 (트레이싱이 꺼져 있으면 바로 호출)
+
+    Args:
+        name: 구간 이름 (예: 'kis.get_balance')
+        category: 분류 (broker, llm, pandas, db 등)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer or get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, category, None, None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# 프로세스 전역 트레이서
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer(config=None):
+    """
+    프로세스 전역 트레이서 반환
+
+    Args:
+        config: 설정 모듈 (TRACE_ENABLED, TRACE_BUFFER_SIZE를 적용, 이미 생성된 경우에도 적용)
+    """
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    if config is not None:
+        _tracer.configure(enabled=getattr(config, 'TRACE_ENABLED', True),
+                          capacity=getattr(config, 'TRACE_BUFFER_SIZE', 20000))
+    return _tracer
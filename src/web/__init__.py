@@ -0,0 +1,3 @@
+"""
+웹 API 서버 지원 모듈 패키지
+"""
\ No newline at end of file
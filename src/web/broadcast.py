@@ -0,0 +1,261 @@
+"""
+WebSocket 채널 브로드캐스트 모듈
+
+채널 메시지를 한 번만 직렬화한 뒤 클라이언트별 제한된 크기의 송신 큐에 넣고,
+클라이언트마다 독립된 송신 태스크가 타임아웃을 두고 전송합니다.
+느린 클라이언트가 다른 클라이언트의 전송을 지연시키지 않습니다.
+
+- 인코딩(json/compact/msgpack)별로 브로드캐스트당 한 번만 직렬화
+- 같은 병합 키(coalesce_key)를 가진 대기 메시지는 최신 메시지로 교체
+- 송신 큐가 가득 차거나 전송 타임아웃이 발생한 클라이언트는 연결 해제
+- 채널별 팬아웃 지연(큐 투입 ~ 전송 완료) 기록
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+
+from src.web.ws_codec import ENCODING_JSON, encode_message
+
+# 로깅 설정
+logger = logging.getLogger('Broadcaster')
+
+
+class _QueuedMessage:
+    __slots__ = ('payload', 'enqueued_at', 'coalesce_key')
+
+    def __init__(self, payload, enqueued_at, coalesce_key):
+        self.payload = payload
+        self.enqueued_at = enqueued_at
+        self.coalesce_key = coalesce_key
+
+
+class ChannelStats:
+    """채널별 팬아웃 통계"""
+
+    __slots__ = ('broadcasts', 'deliveries', 'coalesced', 'overflows', 'timeouts', 'errors',
+                 'last_enqueue_ms', 'avg_latency_ms', 'max_latency_ms', 'last_latency_ms')
+
+    def __init__(self):
+        self.broadcasts = 0
+        self.deliveries = 0
+        self.coalesced = 0
+        self.overflows = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.last_enqueue_ms = 0.0
+        self.avg_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.last_latency_ms = 0.0
+
+    def record_delivery(self, latency):
+        latency_ms = latency * 1000
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        # 지수 이동 평균
+        if self.deliveries == 0:
+            self.avg_latency_ms = latency_ms
+        else:
+            self.avg_latency_ms = self.avg_latency_ms * 0.95 + latency_ms * 0.05
+        self.deliveries += 1
+
+    def to_dict(self):
+        return {
+            "broadcasts": self.broadcasts,
+            "deliveries": self.deliveries,
+            "coalesced": self.coalesced,
+            "overflows": self.overflows,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "last_enqueue_ms": round(self.last_enqueue_ms, 3),
+            "avg_latency_ms": round(self.avg_latency_ms, 3),
+            "max_latency_ms": round(self.max_latency_ms, 3),
+            "last_latency_ms": round(self.last_latency_ms, 3)
+        }
+
+
+class ClientOutbox:
+    """클라이언트 하나의 제한된 송신 큐와 송신 태스크"""
+
+    def __init__(self, client_id, channel, send, max_queue, send_timeout, broadcaster, encoding=ENCODING_JSON):
+        self.client_id = client_id
+        self.channel = channel
+        self.send = send
+        self.encoding = encoding
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.broadcaster = broadcaster
+        self.queue = deque()
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.closed = False
+        self.messages_sent = 0
+
+    def offer(self, payload, enqueued_at, coalesce_key=None):
+        """
+        메시지를 송신 큐에 추가
+
+        Returns:
+            str: "queued", "coalesced" 또는 "overflow"
+        """
+        if self.closed:
+            return "overflow"
+        if coalesce_key is not None:
+            for item in self.queue:
+                if item.coalesce_key == coalesce_key:
+                    # 아직 보내지 못한 중간 업데이트는 최신 값으로 교체
+                    item.payload = payload
+                    item.enqueued_at = enqueued_at
+                    return "coalesced"
+        if len(self.queue) >= self.max_queue:
+            return "overflow"
+        self.queue.append(_QueuedMessage(payload, enqueued_at, coalesce_key))
+        self.wakeup.set()
+        return "queued"
+
+    async def run(self):
+        stats = self.broadcaster.channel_stats(self.channel)
+        while not self.closed:
+            if not self.queue:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            item = self.queue.popleft()
+            try:
+                await asyncio.wait_for(self.send(item.payload), timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                logger.warning(f"웹소켓 전송 타임아웃으로 연결 해제: 채널={self.channel}, 클라이언트ID={self.client_id}")
+                await self.broadcaster.drop(self.client_id, "send timeout")
+                return
+            except Exception as e:
+                stats.errors += 1
+                logger.debug(f"웹소켓 전송 실패로 연결 해제: 채널={self.channel}, 클라이언트ID={self.client_id}, 오류={e!r}")
+                await self.broadcaster.drop(self.client_id, "send error")
+                return
+            self.messages_sent += 1
+            stats.record_delivery(time.perf_counter() - item.enqueued_at)
+            if self.broadcaster.on_sent is not None:
+                self.broadcaster.on_sent(self.client_id)
+
+
+class Broadcaster:
+    """
+    채널 단위 동시 브로드캐스터
+    """
+
+    def __init__(self, max_queue=100, send_timeout=5.0, encoder=None, on_drop=None, on_sent=None):
+        """
+        초기화 함수
+
+        Args:
+            max_queue: 클라이언트별 송신 큐 최대 길이
+            send_timeout: 메시지 한 건 전송 타임아웃 (초)
+            encoder: 메시지 직렬화 함수 (message, encoding) -> str 또는 bytes
+            on_drop: 클라이언트를 끊어야 할 때 호출할 코루틴 함수 (client_id, reason)
+            on_sent: 메시지 전송 성공 시 호출할 함수 (client_id)
+        """
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.encoder = encoder or encode_message
+        self.on_drop = on_drop
+        self.on_sent = on_sent
+        self._outboxes = {}  # client_id -> ClientOutbox
+        self._channels = {}  # channel -> {client_id: ClientOutbox}
+        self._stats = {}  # channel -> ChannelStats
+
+    def channel_stats(self, channel):
+        stats = self._stats.get(channel)
+        if stats is None:
+            stats = ChannelStats()
+            self._stats[channel] = stats
+        return stats
+
+    def register(self, client_id, channel, send, encoding=ENCODING_JSON):
+        """
+        클라이언트 등록 및 송신 태스크 시작 (실행 중인 이벤트 루프 안에서 호출)
+
+        Args:
+            client_id: 클라이언트 식별자
+            channel: 채널 이름
+            send: 직렬화된 메시지를 보내는 코루틴 함수 (payload) -> None
+            encoding: 클라이언트가 협상한 메시지 인코딩
+        """
+        self.unregister(client_id)
+        outbox = ClientOutbox(client_id, channel, send, self.max_queue, self.send_timeout, self, encoding)
+        outbox.task = asyncio.get_running_loop().create_task(outbox.run())
+        self._outboxes[client_id] = outbox
+        self._channels.setdefault(channel, {})[client_id] = outbox
+        return outbox
+
+    def unregister(self, client_id):
+        """클라이언트 등록 해제 및 송신 태스크 중지"""
+        outbox = self._outboxes.pop(client_id, None)
+        if outbox is None:
+            return
+        outbox.closed = True
+        outbox.queue.clear()
+        members = self._channels.get(outbox.channel)
+        if members is not None:
+            members.pop(client_id, None)
+        if outbox.task is not None and outbox.task is not asyncio.current_task():
+            outbox.task.cancel()
+
+    async def drop(self, client_id, reason):
+        """느린/끊긴 클라이언트 제거"""
+        self.unregister(client_id)
+        if self.on_drop is not None:
+            try:
+                await self.on_drop(client_id, reason)
+            except Exception as e:
+                logger.debug(f"클라이언트 제거 콜백 오류: {e}")
+
+    def publish(self, channel, message, coalesce_key=None):
+        """
+        채널의 모든 클라이언트 송신 큐에 메시지 투입 (직렬화는 인코딩별로 한 번만 수행)
+
+        Args:
+            channel: 채널 이름
+            message: 전송할 메시지 (dict)
+            coalesce_key: 대기 중인 같은 키 메시지를 교체할 병합 키
+
+        Returns:
+            list: 송신 큐가 가득 차 제거해야 할 클라이언트 ID 목록
+        """
+        started_at = time.perf_counter()
+        stats = self.channel_stats(channel)
+        stats.broadcasts += 1
+
+        members = self._channels.get(channel)
+        if not members:
+            return []
+
+        payloads = {}  # encoding -> 직렬화된 메시지
+        overflowed = []
+        for client_id, outbox in list(members.items()):
+            payload = payloads.get(outbox.encoding)
+            if payload is None:
+                payload = self.encoder(message, outbox.encoding)
+                payloads[outbox.encoding] = payload
+            result = outbox.offer(payload, started_at, coalesce_key)
+            if result == "coalesced":
+                stats.coalesced += 1
+            elif result == "overflow":
+                stats.overflows += 1
+                overflowed.append(client_id)
+
+        stats.last_enqueue_ms = (time.perf_counter() - started_at) * 1000
+        return overflowed
+
+    def get_stats(self):
+        """채널별 팬아웃 통계 반환"""
+        result = {}
+        for channel, stats in self._stats.items():
+            data = stats.to_dict()
+            members = self._channels.get(channel, {})
+            data["clients"] = len(members)
+            data["max_queue_depth"] = max((len(o.queue) for o in members.values()), default=0)
+            result[channel] = data
+        return result
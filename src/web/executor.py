@@ -0,0 +1,190 @@
+"""
+블로킹 호출 실행기 모듈
+
+FastAPI 비동기 핸들러에서 증권사 API, StockData, DatabaseManager 등
+동기(블로킹) 메서드를 호출할 때 이벤트 루프가 멈추지 않도록
+전용 스레드 풀에서 실행합니다. 엔드포인트별 동시 실행 수 제한과
+이벤트 루프 지연(lag) 측정 기능을 함께 제공합니다.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 로깅 설정
+logger = logging.getLogger('BlockingExecutor')
+
+
+class BlockingCallExecutor:
+    """
+    엔드포인트별 동시성 제한이 있는 전용 스레드 풀 실행기
+    """
+
+    def __init__(self, max_workers=8, default_limit=4, thread_name_prefix="api-blocking"):
+        """
+        초기화 함수
+
+        Args:
+            max_workers: 스레드 풀 최대 스레드 수
+            default_limit: 별도 설정이 없는 작업 이름의 최대 동시 실행 수
+            thread_name_prefix: 스레드 이름 접두사
+        """
+        self.max_workers = max_workers
+        self.default_limit = default_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._limits = {}
+        # 세마포어는 실행 중인 이벤트 루프 안에서 지연 생성
+        self._semaphores = {}
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+
+    def set_limit(self, name, max_concurrency):
+        """
+        작업 이름(엔드포인트)별 최대 동시 실행 수 설정
+
+        Args:
+            name: 작업 이름
+            max_concurrency: 최대 동시 실행 수
+        """
+        self._limits[name] = max(1, int(max_concurrency))
+        self._semaphores.pop(name, None)
+
+    def _get_semaphore(self, name):
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._limits.get(name, self.default_limit))
+            self._semaphores[name] = semaphore
+        return semaphore
+
+    def _get_stat(self, name):
+        # _stats_lock 안에서만 호출
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = {"calls": 0, "errors": 0, "in_flight": 0,
+                    "total_wait_ms": 0.0, "total_run_ms": 0.0, "max_run_ms": 0.0}
+            self._stats[name] = stat
+        return stat
+
+    def _record(self, name, wait_time, run_time, error):
+        with self._stats_lock:
+            stat = self._get_stat(name)
+            stat["calls"] += 1
+            if error:
+                stat["errors"] += 1
+            stat["total_wait_ms"] += wait_time * 1000
+            stat["total_run_ms"] += run_time * 1000
+            stat["max_run_ms"] = max(stat["max_run_ms"], run_time * 1000)
+
+    def _adjust_in_flight(self, name, delta):
+        with self._stats_lock:
+            self._get_stat(name)["in_flight"] += delta
+
+    async def run(self, name, func, *args, **kwargs):
+        """
+        블로킹 함수를 전용 스레드 풀에서 실행
+
+        Args:
+            name: 작업 이름 (동시성 제한 및 통계 구분용)
+            func: 실행할 동기 함수
+            *args, **kwargs: 함수 인자
+
+        Returns:
+            함수 반환값
+        """
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        async with self._get_semaphore(name):
+            started_at = time.perf_counter()
+            self._adjust_in_flight(name, 1)
+            error = False
+            try:
+                return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            except Exception:
+                error = True
+                raise
+            finally:
+                self._adjust_in_flight(name, -1)
+                self._record(name, started_at - queued_at, time.perf_counter() - started_at, error)
+
+    def get_stats(self):
+        """작업 이름별 실행 통계 반환"""
+        with self._stats_lock:
+            stats = {}
+            for name, stat in self._stats.items():
+                calls = max(stat["calls"], 1)
+                stats[name] = {
+                    "calls": stat["calls"],
+                    "errors": stat["errors"],
+                    "in_flight": stat["in_flight"],
+                    "limit": self._limits.get(name, self.default_limit),
+                    "avg_wait_ms": round(stat["total_wait_ms"] / calls, 2),
+                    "avg_run_ms": round(stat["total_run_ms"] / calls, 2),
+                    "max_run_ms": round(stat["max_run_ms"], 2)
+                }
+        return {"max_workers": self.max_workers, "tasks": stats}
+
+    def shutdown(self, wait=False):
+        """스레드 풀 종료"""
+        self._executor.shutdown(wait=wait)
+
+
+class EventLoopLagMonitor:
+    """
+    이벤트 루프 지연 측정기
+
+    일정 간격으로 sleep 한 뒤 실제로 깨어난 시각과 예정 시각의 차이를
+    측정하여, 블로킹 호출로 인해 루프가 얼마나 멈췄는지 기록합니다.
+    """
+
+    def __init__(self, interval=0.5, warn_threshold=0.2):
+        """
+        초기화 함수
+
+        Args:
+            interval: 측정 간격 (초)
+            warn_threshold: 경고 로그를 남길 지연 시간 (초)
+        """
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+        self.samples = 0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            # 지수 이동 평균
+            self.avg_lag = lag if self.samples == 0 else self.avg_lag * 0.9 + lag * 0.1
+            self.samples += 1
+            if lag >= self.warn_threshold:
+                logger.warning(f"이벤트 루프 지연 감지: {lag * 1000:.1f}ms")
+
+    def start(self):
+        """측정 태스크 시작 (실행 중인 이벤트 루프 안에서 호출)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    def stop(self):
+        """측정 태스크 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get_stats(self):
+        """지연 통계 반환 (밀리초)"""
+        return {
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "avg_lag_ms": round(self.avg_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "samples": self.samples
+        }
@@ -0,0 +1,302 @@
+"""
+실시간 가격 팬아웃 허브 모듈
+
+WebSocket 클라이언트들이 구독한 종목을 모아 종목당 한 번만 시세를 조회하고,
+가격이 바뀐 종목만 해당 종목의 모든 구독자에게 전달합니다.
+
+- 생산자 태스크 하나가 구독 중인 고유 종목을 주기적으로 조회
+- 이전 값과 비교하여 변경된 종목만 전달 (diff)
+- 클라이언트별 대기 버퍼는 종목당 최신 값 하나만 유지 (coalescing)
+- 느린 클라이언트는 전송 타임아웃 시 구독 해제 (backpressure)
+"""
+import asyncio
+import logging
+import time
+
+# 로깅 설정
+logger = logging.getLogger('PriceHub')
+
+# 변경 여부 비교에서 제외할 필드
+VOLATILE_FIELDS = ('timestamp',)
+
+
+class PriceSubscriber:
+    """가격 허브 구독자 (WebSocket 클라이언트 하나)"""
+
+    __slots__ = ('client_id', 'send', 'codec', 'symbols', 'pending', 'wakeup', 'task',
+                 'messages_sent', 'updates_coalesced', 'last_send_at')
+
+    def __init__(self, client_id, send, codec=None):
+        self.client_id = client_id
+        self.send = send
+        self.codec = codec
+        self.symbols = set()
+        # 종목별 최신 업데이트 (전송 전 덮어쓰기로 병합)
+        self.pending = {}
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.messages_sent = 0
+        self.updates_coalesced = 0
+        self.last_send_at = None
+
+
+def _changed(previous, current):
+    """타임스탬프 등 변동 필드를 제외하고 값이 바뀌었는지 확인"""
+    if previous is None:
+        return True
+    for key, value in current.items():
+        if key in VOLATILE_FIELDS:
+            continue
+        if previous.get(key) != value:
+            return True
+    return False
+
+
+def default_price_message(updates, timestamp):
+    """기본 가격 업데이트 메시지 형식 (기존 /ws/prices 응답과 동일)"""
+    return {
+        "type": "price_update",
+        "data": updates,
+        "timestamp": timestamp
+    }
+
+
+class PriceHub:
+    """
+    종목 구독 기반 가격 팬아웃 허브
+    """
+
+    def __init__(self, fetch_price, poll_interval=1.0, fetch_concurrency=8, send_timeout=5.0,
+                 build_message=None, timestamp_func=None, on_drop=None):
+        """
+        초기화 함수
+
+        Args:
+            fetch_price: 시세 조회 코루틴 함수 (symbol, market) -> dict 또는 None
+            poll_interval: 시세 조회 주기 (초)
+            fetch_concurrency: 동시에 조회할 최대 종목 수
+            send_timeout: 클라이언트 전송 타임아웃 (초) - 초과 시 구독 해제
+            build_message: 업데이트 묶음을 메시지로 변환하는 함수 (updates, timestamp) -> message
+            timestamp_func: 메시지 타임스탬프 생성 함수
+            on_drop: 느린 클라이언트 구독 해제 시 호출할 코루틴 함수 (client_id)
+        """
+        self.fetch_price = fetch_price
+        self.poll_interval = poll_interval
+        self.fetch_concurrency = fetch_concurrency
+        self.send_timeout = send_timeout
+        self.build_message = build_message or default_price_message
+        self.timestamp_func = timestamp_func or (lambda: int(time.time() * 1000))
+        self.on_drop = on_drop
+
+        self._subscribers = {}  # client_id -> PriceSubscriber
+        self._symbol_subscribers = {}  # (symbol, market) -> set(client_id)
+        self._last = {}  # (symbol, market) -> 마지막으로 전송한 가격 정보
+        self._producer_task = None
+        self._producer_wakeup = None
+
+        self.stats = {
+            "ticks": 0,
+            "upstream_fetches": 0,
+            "upstream_errors": 0,
+            "updates_published": 0,
+            "updates_delivered": 0,
+            "updates_coalesced": 0,
+            "messages_sent": 0,
+            "clients_dropped": 0,
+            "last_tick_ms": 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # 구독 관리
+    # ------------------------------------------------------------------
+    async def subscribe(self, client_id, send, symbols, codec=None):
+        """
+        클라이언트의 구독 종목을 설정 (기존 구독을 대체)
+
+        Args:
+            client_id: 클라이언트 식별자
+            send: 메시지 전송 코루틴 함수 (message) -> None
+            symbols: (symbol, market) 튜플 목록
+            codec: 연결별 인코더 (encode_prices/forget_symbols 제공, None이면 build_message 결과를 그대로 전송)
+        """
+        subscriber = self._subscribers.get(client_id)
+        if subscriber is None:
+            subscriber = PriceSubscriber(client_id, send, codec)
+            subscriber.task = asyncio.get_running_loop().create_task(self._sender(subscriber))
+            self._subscribers[client_id] = subscriber
+
+        new_symbols = set(symbols)
+        removed = subscriber.symbols - new_symbols
+        for key in removed:
+            self._remove_symbol_subscriber(key, client_id)
+            subscriber.pending.pop(key[0], None)
+        if removed and subscriber.codec is not None:
+            subscriber.codec.forget_symbols(key[0] for key in removed)
+
+        has_unknown = False
+        for key in new_symbols - subscriber.symbols:
+            self._symbol_subscribers.setdefault(key, set()).add(client_id)
+            # 이미 조회된 종목은 즉시 스냅샷 전달, 처음 보는 종목은 생산자를 깨워 바로 조회
+            snapshot = self._last.get(key)
+            if snapshot is not None:
+                subscriber.pending[key[0]] = snapshot
+            else:
+                has_unknown = True
+
+        subscriber.symbols = new_symbols
+        if subscriber.pending:
+            subscriber.wakeup.set()
+        if has_unknown and self._producer_wakeup is not None:
+            self._producer_wakeup.set()
+
+    def unsubscribe(self, client_id):
+        """클라이언트 구독 해제"""
+        subscriber = self._subscribers.pop(client_id, None)
+        if subscriber is None:
+            return
+        for key in subscriber.symbols:
+            self._remove_symbol_subscriber(key, client_id)
+        subscriber.symbols = set()
+        subscriber.pending.clear()
+        if subscriber.task is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+
+    def _remove_symbol_subscriber(self, key, client_id):
+        clients = self._symbol_subscribers.get(key)
+        if clients is None:
+            return
+        clients.discard(client_id)
+        if not clients:
+            del self._symbol_subscribers[key]
+            # 구독자가 없는 종목은 다음에 다시 구독될 때 새로 조회
+            self._last.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # 생산자 (종목별 1회 조회)
+    # ------------------------------------------------------------------
+    def start(self):
+        """생산자 태스크 시작 (실행 중인 이벤트 루프 안에서 호출)"""
+        if self._producer_task is None or self._producer_task.done():
+            self._producer_wakeup = asyncio.Event()
+            self._producer_task = asyncio.get_running_loop().create_task(self._producer())
+        return self._producer_task
+
+    async def stop(self):
+        """생산자 및 모든 전송 태스크 중지"""
+        if self._producer_task is not None:
+            self._producer_task.cancel()
+            self._producer_task = None
+        for client_id in list(self._subscribers):
+            self.unsubscribe(client_id)
+
+    async def _producer(self):
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"가격 허브 시세 조회 중 오류: {e}")
+
+            try:
+                await asyncio.wait_for(self._producer_wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._producer_wakeup.clear()
+
+    async def poll_once(self):
+        """구독 중인 고유 종목을 한 번씩 조회하고 변경분을 구독자에게 전달"""
+        keys = list(self._symbol_subscribers)
+        if not keys:
+            return 0
+
+        started_at = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def fetch(key):
+            async with semaphore:
+                return await self.fetch_price(key[0], key[1])
+
+        results = await asyncio.gather(*(fetch(key) for key in keys), return_exceptions=True)
+        self.stats["upstream_fetches"] += len(keys)
+
+        timestamp = self.timestamp_func()
+        published = 0
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                self.stats["upstream_errors"] += 1
+                logger.warning(f"종목 {key[0]} 시세 조회 실패: {result}")
+                continue
+            if result is None or key not in self._symbol_subscribers:
+                continue
+            if not _changed(self._last.get(key), result):
+                continue
+
+            update = dict(result)
+            update["timestamp"] = timestamp
+            self._last[key] = update
+            self._publish(key, update)
+            published += 1
+
+        self.stats["ticks"] += 1
+        self.stats["updates_published"] += published
+        self.stats["last_tick_ms"] = round((time.perf_counter() - started_at) * 1000, 2)
+        return published
+
+    def _publish(self, key, update):
+        symbol = key[0]
+        for client_id in self._symbol_subscribers.get(key, ()):
+            subscriber = self._subscribers.get(client_id)
+            if subscriber is None:
+                continue
+            if symbol in subscriber.pending:
+                subscriber.updates_coalesced += 1
+                self.stats["updates_coalesced"] += 1
+            subscriber.pending[symbol] = update
+            subscriber.wakeup.set()
+
+    # ------------------------------------------------------------------
+    # 클라이언트별 전송
+    # ------------------------------------------------------------------
+    async def _sender(self, subscriber):
+        while True:
+            await subscriber.wakeup.wait()
+            subscriber.wakeup.clear()
+            if not subscriber.pending:
+                continue
+
+            updates = subscriber.pending
+            subscriber.pending = {}
+            if subscriber.codec is not None:
+                message = subscriber.codec.encode_prices(updates, self.timestamp_func())
+                if message is None:
+                    # 이 클라이언트에 이미 보낸 값과 같으면 전송 생략
+                    continue
+            else:
+                message = self.build_message(updates, self.timestamp_func())
+            try:
+                await asyncio.wait_for(subscriber.send(message), timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"가격 업데이트 전송 실패로 구독 해제: 클라이언트ID={subscriber.client_id}, 오류={e!r}")
+                self.stats["clients_dropped"] += 1
+                self.unsubscribe(subscriber.client_id)
+                if self.on_drop is not None:
+                    try:
+                        await self.on_drop(subscriber.client_id)
+                    except Exception as drop_err:
+                        logger.debug(f"구독 해제 콜백 오류: {drop_err}")
+                return
+
+            subscriber.messages_sent += 1
+            subscriber.last_send_at = time.time()
+            self.stats["messages_sent"] += 1
+            self.stats["updates_delivered"] += len(updates)
+
+    def get_stats(self):
+        """허브 통계 반환"""
+        stats = dict(self.stats)
+        stats["subscribers"] = len(self._subscribers)
+        stats["unique_symbols"] = len(self._symbol_subscribers)
+        return stats
@@ -0,0 +1,249 @@
+"""
+API 응답 캐시 모듈
+
+API 서버의 GET 엔드포인트 응답을 짧은 TTL 동안 메모리에 보관합니다.
+동일한 키에 대한 동시 요청은 하나의 계산으로 합쳐지며(single-flight),
+응답 본문으로부터 ETag를 생성하여 If-None-Match 조건부 요청을 지원합니다.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# 로깅 설정
+logger = logging.getLogger('ResponseCache')
+
+
+class CacheEntry:
+    """캐시된 응답 항목"""
+
+    __slots__ = ('value', 'etag', 'created_at', 'expires_at')
+
+    def __init__(self, value, etag, created_at, expires_at):
+        self.value = value
+        self.etag = etag
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    def is_fresh(self, now=None):
+        """만료되지 않은 항목인지 확인"""
+        if now is None:
+            now = time.monotonic()
+        return now < self.expires_at
+
+    def max_age(self, now=None):
+        """남은 유효 시간(초)"""
+        if now is None:
+            now = time.monotonic()
+        return max(0, int(self.expires_at - now))
+
+
+class _InFlight:
+    """진행 중인 계산 (single-flight 대기자 공유용)"""
+
+    __slots__ = ('event', 'entry', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+def compute_etag(value, exclude_keys=('timestamp',)):
+    """
+    응답 본문으로부터 ETag 생성
+
+    타임스탬프처럼 매 계산마다 바뀌는 필드는 제외하여
+    내용이 같으면 재계산 후에도 같은 ETag가 나오도록 합니다.
+
+    Args:
+        value: 응답 본문 (JSON 직렬화 가능한 객체)
+        exclude_keys: ETag 계산에서 제외할 최상위 키
+
+    Returns:
+        str: 따옴표로 감싼 ETag 문자열
+    """
+    if isinstance(value, dict) and exclude_keys:
+        value = {k: v for k, v in value.items() if k not in exclude_keys}
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    If-None-Match 헤더 값이 ETag와 일치하는지 확인
+
+    Args:
+        if_none_match: 요청의 If-None-Match 헤더 값
+        etag: 현재 응답의 ETag
+
+    Returns:
+        bool: 일치 여부
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    엔드포인트별 응답 캐시
+
+    - 키별 TTL 기반 만료
+    - 동일 키 동시 요청의 single-flight 처리
+    - 접두사 단위 명시적 무효화 (거래 이벤트 발생 시 사용)
+    """
+
+    def __init__(self, default_ttl=5.0, max_entries=256):
+        """
+        초기화 함수
+
+        Args:
+            default_ttl: 기본 캐시 유효 시간 (초)
+            max_entries: 최대 보관 항목 수 (초과 시 오래된 항목부터 제거)
+        """
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        # 무효화 세대 번호 - 계산 도중 무효화된 결과가 저장되지 않도록 사용
+        self._generation = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+            "errors": 0
+        }
+
+    def peek(self, key):
+        """
+        계산 없이 유효한 캐시 항목만 조회
+
+        비동기 핸들러가 스레드 풀로 넘기기 전에 캐시 적중 여부를 확인할 때 사용합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            CacheEntry: 유효한 캐시 항목 (없으면 None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.is_fresh():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+        return None
+
+    def get_or_compute(self, key, compute, ttl=None, cache_if=None):
+        """
+        캐시된 응답을 반환하거나, 없으면 계산하여 저장
+
+        같은 키를 동시에 요청한 스레드들은 하나의 계산 결과를 공유합니다.
+
+        Args:
+            key: 캐시 키
+            compute: 응답 본문을 생성하는 함수 (인자 없음)
+            ttl: 캐시 유효 시간 (초, None이면 기본값)
+            cache_if: 결과를 캐시할지 판단하는 함수 (None이면 항상 캐시)
+
+        Returns:
+            CacheEntry: 캐시 항목
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.is_fresh():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                leader = False
+                self.stats["coalesced"] += 1
+            else:
+                leader = True
+                flight = _InFlight()
+                self._inflight[key] = flight
+                self.stats["misses"] += 1
+            generation = self._generation
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry
+
+        try:
+            value = compute()
+            now = time.monotonic()
+            entry = CacheEntry(value, compute_etag(value), now, now + ttl)
+            flight.entry = entry
+
+            with self._lock:
+                should_store = ttl > 0 and generation == self._generation
+                if should_store and cache_if is not None:
+                    should_store = bool(cache_if(value))
+                if should_store:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return entry
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def invalidate(self, prefix=None):
+        """
+        캐시 무효화
+
+        Args:
+            prefix: 무효화할 키 접두사 (None이면 전체)
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        with self._lock:
+            if prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [k for k in self._entries if str(k).startswith(prefix)]
+                for k in keys:
+                    del self._entries[k]
+                removed = len(keys)
+            self._generation += 1
+            self.stats["invalidations"] += 1
+
+        logger.debug(f"응답 캐시 무효화: prefix={prefix}, 제거={removed}")
+        return removed
+
+    def get_stats(self):
+        """캐시 통계 반환"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+            stats["inflight"] = len(self._inflight)
+        return stats
@@ -0,0 +1,189 @@
+"""
+WebSocket 메시지 인코딩 모듈
+
+연결별로 협상되는 메시지 인코딩을 제공합니다.
+
+- json: 기존 형식 그대로의 JSON 텍스트 (기본값)
+- compact: 짧은 키와 epoch 밀리초 타임스탬프를 사용하는 JSON 텍스트,
+  가격 업데이트는 클라이언트에 마지막으로 보낸 값 대비 바뀐 필드만 전송
+- msgpack: compact 구조를 MessagePack 바이너리로 직렬화 (msgpack 패키지 필요)
+
+클라이언트는 WebSocket URL에 ?encoding=compact 처럼 요청하여 선택합니다.
+"""
+import json
+import logging
+import time
+
+try:
+    import msgpack
+except ImportError:  # 선택적 의존성
+    msgpack = None
+
+# 로깅 설정
+logger = logging.getLogger('WSCodec')
+
+ENCODING_JSON = "json"
+ENCODING_COMPACT = "compact"
+ENCODING_MSGPACK = "msgpack"
+SUPPORTED_ENCODINGS = (ENCODING_JSON, ENCODING_COMPACT, ENCODING_MSGPACK)
+
+# 메시지 봉투(envelope) 키 축약표
+COMPACT_KEYS = {
+    "type": "t",
+    "timestamp": "ts",
+    "data": "d",
+    "message": "m",
+    "update_type": "u",
+    "notification_type": "n",
+    "connection_id": "c",
+    "encoding": "e"
+}
+
+# 메시지 유형 축약표
+COMPACT_TYPES = {
+    "price_update": "p",
+    "notification": "n",
+    "trading_update": "tu",
+    "heartbeat": "hb",
+    "ping": "pi",
+    "connection_established": "ce",
+    "error": "er"
+}
+
+# 가격 필드 축약표 (종목별 변경 필드만 전송)
+COMPACT_PRICE_FIELDS = {
+    "market": "mk",
+    "price": "p",
+    "change": "ch",
+    "change_percent": "cp",
+    "volume": "v"
+}
+
+# 가격 배치 메시지 유형 (변경 필드만 포함)
+PRICE_DELTA_TYPE = "pd"
+
+
+def negotiate_encoding(requested):
+    """
+    클라이언트가 요청한 인코딩을 서버에서 지원하는 인코딩으로 결정
+
+    Args:
+        requested: 요청된 인코딩 이름 (None 가능)
+
+    Returns:
+        str: 사용할 인코딩
+    """
+    if not requested:
+        return ENCODING_JSON
+    requested = str(requested).strip().lower()
+    if requested == ENCODING_MSGPACK and msgpack is None:
+        logger.warning("msgpack 패키지가 설치되어 있지 않아 compact 인코딩으로 대체합니다.")
+        return ENCODING_COMPACT
+    if requested in SUPPORTED_ENCODINGS:
+        return requested
+    return ENCODING_JSON
+
+
+def is_binary(encoding):
+    """바이너리 프레임으로 보내야 하는 인코딩인지 확인"""
+    return encoding == ENCODING_MSGPACK
+
+
+def _epoch_ms(value):
+    """타임스탬프를 epoch 밀리초로 변환 (포맷된 문자열은 현재 시각으로 대체)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(time.time() * 1000)
+
+
+def to_compact(message):
+    """메시지 봉투를 축약 구조로 변환 (data 내부 내용은 유지)"""
+    compact = {}
+    for key, value in message.items():
+        if key == "type":
+            value = COMPACT_TYPES.get(value, value)
+        elif key == "timestamp":
+            value = _epoch_ms(value)
+        compact[COMPACT_KEYS.get(key, key)] = value
+    return compact
+
+
+def _serialize(obj, encoding):
+    if encoding == ENCODING_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True, default=str)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def encode_message(message, encoding=ENCODING_JSON):
+    """
+    메시지를 지정된 인코딩으로 직렬화 (브로드캐스트 시 인코딩별 1회 호출)
+
+    Args:
+        message: 메시지 (dict)
+        encoding: 인코딩 이름
+
+    Returns:
+        str 또는 bytes: 직렬화된 메시지
+    """
+    if encoding == ENCODING_JSON:
+        return json.dumps(message, ensure_ascii=False, default=str)
+    return _serialize(to_compact(message), encoding)
+
+
+class MessageCodec:
+    """
+    연결 하나에 대한 인코더
+
+    가격 업데이트의 경우 이 연결에 마지막으로 보낸 값을 기억하여
+    compact/msgpack 인코딩에서는 바뀐 필드만 전송합니다.
+    """
+
+    def __init__(self, encoding=ENCODING_JSON):
+        self.encoding = encoding
+        self.binary = is_binary(encoding)
+        self._last_prices = {}  # symbol -> 마지막으로 보낸 가격 필드
+
+    def encode(self, message):
+        """일반 메시지 직렬화"""
+        return encode_message(message, self.encoding)
+
+    def encode_prices(self, updates, timestamp):
+        """
+        가격 업데이트 묶음 직렬화
+
+        Args:
+            updates: {symbol: 가격 정보 dict}
+            timestamp: 메시지 타임스탬프
+
+        Returns:
+            str 또는 bytes: 직렬화된 메시지 (보낼 변경분이 없으면 None)
+        """
+        if self.encoding == ENCODING_JSON:
+            return json.dumps({
+                "type": "price_update",
+                "data": updates,
+                "timestamp": timestamp
+            }, ensure_ascii=False, default=str)
+
+        delta = {}
+        for symbol, update in updates.items():
+            last = self._last_prices.setdefault(symbol, {})
+            changed = {}
+            for field, short in COMPACT_PRICE_FIELDS.items():
+                if field not in update:
+                    continue
+                value = update[field]
+                if last.get(field) != value:
+                    changed[short] = value
+                    last[field] = value
+            if changed:
+                delta[symbol] = changed
+
+        if not delta:
+            return None
+        return _serialize({"t": PRICE_DELTA_TYPE, "ts": _epoch_ms(timestamp), "d": delta}, self.encoding)
+
+    def forget_symbols(self, symbols):
+        """구독 해제된 종목의 마지막 전송 값 삭제 (재구독 시 전체 필드 전송)"""
+        for symbol in symbols:
+            self._last_prices.pop(symbol, None)
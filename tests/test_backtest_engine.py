@@ -0,0 +1,166 @@
+"""
+벡터화 백테스트 엔진 테스트
+
+calculate_indicators + analyze_signals(종목/날짜별 반복 경로)와 신호가 같은지,
+종목별 반복 시뮬레이션과 거래 목록이 같은지, 현금 한도 안에서만 진입하는지 확인합니다.
+
+사용법:
+    python -m pytest tests/test_backtest_engine.py
+"""
+import os
+import sys
+import types
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis.technical import analyze_signals, calculate_indicators
+from src.backtest.data import PriceMatrix
+from src.backtest.engine import EXIT_REASONS, EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_TIMEOUT, \
+    EXIT_END, FILL_CLOSE, VectorizedBacktester, compute_signals, run_backtest
+
+CONFIG = types.SimpleNamespace(RSI_PERIOD=14, RSI_OVERSOLD=30, RSI_OVERBOUGHT=70, SHORT_TERM_MA=5, LONG_TERM_MA=20,
+                               MACD_FAST=10, MACD_SLOW=24, MACD_SIGNAL=8, BOLLINGER_PERIOD=15, BOLLINGER_STD=2.5,
+                               STOP_LOSS_PCT=3, TAKE_PROFIT_PCT=5, MAX_AMOUNT_PER_TRADE=1000000)
+
+
+def make_prices(num_symbols=6, num_dates=160, seed=7):
+    """변동성이 큰 가상 일봉 (첫 종목은 중간 상장)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=num_dates)
+    returns = rng.normal(0.0, 0.03, size=(num_dates, num_symbols))
+    close = 10000 * np.exp(np.cumsum(returns, axis=0))
+    open_ = close * np.exp(-returns + rng.normal(0, 0.005, size=close.shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, size=close.shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, size=close.shape)))
+    volume = rng.integers(10000, 100000, size=close.shape).astype(np.float64)
+    for field in (open_, high, low, close, volume):
+        field[:30, 0] = np.nan
+    symbols = [f"{i:06d}" for i in range(num_symbols)]
+    return PriceMatrix(dates, symbols, open_, high, low, close, volume, market="KR")
+
+
+def loop_backtest(prices, params, buy_ok, sell_ok):
+    """종목별 반복 참조 구현 (현금 제약이 걸리지 않을 만큼 자본이 충분한 경우)"""
+    trades = []
+    slippage = params["slippage_pct"] / 100
+    stop_loss, take_profit = params["stop_loss_pct"] / 100, params["take_profit_pct"] / 100
+    for col, symbol in enumerate(prices.symbols):
+        position = None  # (진입일, 진입가, 수량)
+        last_mark = np.nan
+
+        def exit_trade(t, price, reason):
+            trades.append((symbol, prices.dates[position[0]], prices.dates[t], position[1],
+                           price * (1 - slippage), position[2], EXIT_REASONS[reason]))
+
+        for t in range(len(prices.dates)):
+            o, h, l, c = (prices.open[t, col], prices.high[t, col], prices.low[t, col], prices.close[t, col])
+            if not np.isnan(c):
+                last_mark = c
+            if position is not None and position[0] < t:
+                stop_px = position[1] * (1 - stop_loss)
+                target_px = position[1] * (1 + take_profit)
+                if l <= stop_px:
+                    exit_trade(t, min(o, stop_px), EXIT_STOP_LOSS)
+                    position = None
+                elif h >= target_px:
+                    exit_trade(t, max(o, target_px), EXIT_TAKE_PROFIT)
+                    position = None
+            if position is not None and params["max_holding_days"] and t - position[0] >= params["max_holding_days"] \
+                    and not np.isnan(c):
+                exit_trade(t, c, EXIT_TIMEOUT)
+                position = None
+            if np.isnan(c):
+                continue
+            exited = False
+            if position is not None and sell_ok[t, col]:
+                exit_trade(t, c, EXIT_SIGNAL)
+                position, exited = None, True
+            if position is None and buy_ok[t, col] and not exited:
+                px = c * (1 + slippage)
+                quantity = np.floor(params["trade_amount"] / px)
+                if quantity > 0:
+                    position = (t, px, quantity)
+        if position is not None:
+            exit_trade(len(prices.dates) - 1, last_mark, EXIT_END)
+
+    frame = pd.DataFrame(trades, columns=["symbol", "entry_date", "exit_date", "entry_price", "exit_price",
+                                          "quantity", "exit_reason"])
+    return frame.sort_values(["exit_date", "symbol"], kind="stable").reset_index(drop=True)
+
+
+class SignalParityTest(unittest.TestCase):
+    """벡터화 신호가 calculate_indicators + analyze_signals 결과와 같은지 확인"""
+
+    def test_signal_counts_match_analyze_signals(self):
+        prices = make_prices(num_symbols=3, num_dates=120)
+        tester = VectorizedBacktester(prices, CONFIG)
+        buy, sell = compute_signals(prices.close, tester.params)
+
+        mismatches = []
+        for col, symbol in enumerate(prices.symbols):
+            frame = pd.DataFrame({"Open": prices.open[:, col], "High": prices.high[:, col],
+                                  "Low": prices.low[:, col], "Close": prices.close[:, col],
+                                  "Volume": prices.volume[:, col]}, index=prices.dates).dropna()
+            offset = len(prices.dates) - len(frame)
+            indicators = calculate_indicators(frame, CONFIG)
+            for t in range(1, len(frame)):
+                signals = analyze_signals(indicators.iloc[:t + 1], symbol, CONFIG)['signals']
+                expected = (sum(s['type'] == 'BUY' for s in signals), sum(s['type'] == 'SELL' for s in signals))
+                if expected != (buy[t + offset, col], sell[t + offset, col]):
+                    mismatches.append((symbol, t, expected, (buy[t + offset, col], sell[t + offset, col])))
+        self.assertEqual(mismatches, [])
+
+    def test_macd_and_bollinger_settings_reach_live_indicators(self):
+        # 최적화가 탐색하는 MACD/볼린저 설정은 calculate_indicators와 백테스트 기본값 모두에 반영되어야 함
+        prices = make_prices(num_symbols=1, num_dates=120)
+        frame = pd.DataFrame({"Open": prices.open[:, 0], "High": prices.high[:, 0], "Low": prices.low[:, 0],
+                              "Close": prices.close[:, 0], "Volume": prices.volume[:, 0]}, index=prices.dates).dropna()
+        other = types.SimpleNamespace(**dict(vars(CONFIG), MACD_FAST=8, MACD_SLOW=30, MACD_SIGNAL=5,
+                                             BOLLINGER_PERIOD=30, BOLLINGER_STD=1.5))
+        base, changed = calculate_indicators(frame, CONFIG), calculate_indicators(frame, other)
+        for column in ("MACD", "MACD_signal", "BB_high", "BB_low"):
+            self.assertFalse(np.allclose(base[column].fillna(0), changed[column].fillna(0)), column)
+
+        params = VectorizedBacktester(prices, other).params
+        self.assertEqual((params["macd_fast"], params["macd_slow"], params["macd_signal"], params["bb_period"],
+                          params["bb_std"]), (8, 30, 5, 30, 1.5))
+
+
+class SimulationTest(unittest.TestCase):
+    """손절/익절/신호/보유기간 청산 시뮬레이션 확인"""
+
+    def test_trades_match_loop_reference(self):
+        prices = make_prices()
+        tester = VectorizedBacktester(prices, CONFIG, fill=FILL_CLOSE, max_holding_days=7,
+                                      initial_capital=10 ** 12, slippage_pct=0.1)
+        result = tester.run()
+        buy, sell = compute_signals(prices.close, tester.params)
+        expected = loop_backtest(prices, tester.params, buy >= 1, sell >= 1)
+
+        self.assertGreater(len(expected), 10)
+        actual = result.trades[expected.columns].copy()
+        actual["quantity"] = actual["quantity"].astype(float)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_equity_never_below_zero_with_limited_cash(self):
+        prices = make_prices(num_symbols=40, num_dates=250, seed=3)
+        trade_amount = 1000000
+        result = run_backtest(prices, CONFIG, initial_capital=3 * trade_amount, trade_amount=trade_amount,
+                              stop_loss_pct=0, take_profit_pct=0, max_holding_days=20)
+
+        self.assertGreater(result.equity.min(), 0)
+        # 진입은 보유 현금 안에서만 하므로 동시 보유 종목은 최대 3개
+        dates = result.equity.index
+        held = np.zeros(len(dates), dtype=int)
+        for trade in result.trades.itertuples():
+            held[(dates >= trade.entry_date) & (dates < trade.exit_date)] += 1
+        self.assertLessEqual(held.max(), 3)
+        self.assertGreater(result.summary()['total_return_pct'], -100)
+
+
+if __name__ == "__main__":
+    unittest.main()
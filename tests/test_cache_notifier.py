@@ -0,0 +1,84 @@
+"""
+거래 이벤트 캐시 무효화 알림 테스트
+
+주문 추적기가 체결을 반영하면 API 서버의 캐시 무효화 주소로 요청이 가는지, 잇따른 체결이
+한 번의 요청으로 묶이는지 확인합니다.
+
+사용법:
+    python -m pytest tests/test_cache_notifier.py
+"""
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.trading.order_tracker import OrderTracker
+
+
+class FakeBroker:
+    def get_positions(self):
+        return []
+
+    def get_order_executions(self):
+        return []
+
+
+class CacheNotifierTest(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(handler):
+                self.requests.append(handler.path)
+                handler.send_response(200)
+                handler.end_headers()
+                handler.wfile.write(b'{"status": "ok"}')
+
+            def log_message(handler, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/api/cache/invalidate"
+        config = types.SimpleNamespace(API_CACHE_INVALIDATE_URL=url, API_CACHE_INVALIDATE_DEBOUNCE_SECONDS=0.1,
+                                       ORDER_POLL_SECONDS=60, POSITION_RECONCILE_SECONDS=60)
+        self.tracker = OrderTracker(FakeBroker(), config)
+        self.addCleanup(self.tracker.stop)
+        self.addCleanup(self.tracker.cache_notifier.configure, url="")
+
+    def wait_for_requests(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.requests) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_fills_invalidate_api_cache_once_per_burst(self):
+        self.tracker.track('0001', '005930', 'BUY', 10, 70000)
+        self.tracker.track('0002', '000660', 'BUY', 5, 120000)
+        # 접수만 된 주문은 잔고가 바뀌지 않으므로 알리지 않음
+        self.tracker.on_execution({'주문번호': '0001', '주문수량': 10, '체결수량': 0})
+        self.tracker.on_execution({'주문번호': '0001', '주문수량': 10, '체결수량': 4, '체결단가': 70000})
+        self.tracker.on_execution({'주문번호': '0001', '주문수량': 10, '체결수량': 10, '체결단가': 70000})
+        self.tracker.on_execution({'주문번호': '0002', '주문수량': 5, '체결수량': 5, '체결단가': 120000})
+
+        self.wait_for_requests(1)
+        time.sleep(0.3)
+        self.assertEqual(self.requests, ['/api/cache/invalidate'])
+
+        # 다음 체결은 새 요청
+        self.tracker.track('0003', '005930', 'SELL', 10, 71000)
+        self.tracker.on_execution({'주문번호': '0003', '주문수량': 10, '체결수량': 10, '체결단가': 71000})
+        self.wait_for_requests(2)
+        self.assertEqual(len(self.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
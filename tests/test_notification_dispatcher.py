@@ -0,0 +1,68 @@
+"""
+알림 발송기 분할 메시지 순서 테스트
+
+사용법:
+    python -m pytest tests/test_notification_dispatcher.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.notification.dispatcher import NotificationDispatcher, SIGNAL
+from src.notification.kakao_sender import KakaoSender
+
+
+class SplitMessageOrderTest(unittest.TestCase):
+    """분할된 카카오톡 메시지가 같은 우선순위로 순서대로 이어서 전송되는지 확인"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = types.SimpleNamespace(
+            NOTIFY_ASYNC=True, NOTIFY_DIGEST_SECONDS=0.2, NOTIFY_KAKAO_MIN_INTERVAL=0,
+            KAKAO_TOKEN_FILE=os.path.join(self.directory.name, "kakao_token.json"))
+        self.delivered = []
+        self.lock = threading.Lock()
+
+        self.dispatcher = NotificationDispatcher(self.config)
+        self.dispatcher.register("kakao", self._deliver, min_interval=0)
+        self.sender = KakaoSender(self.config)
+        self.sender.dispatcher = self.dispatcher
+
+    def tearDown(self):
+        self.dispatcher.stop()
+        self.directory.cleanup()
+
+    def _deliver(self, text):
+        with self.lock:
+            self.delivered.append(text)
+        return True
+
+    def test_split_parts_arrive_in_order(self):
+        # 첫 부분은 신호, 뒤 부분은 줄 첫머리가 손절/체결 키워드라 부분별로 추정하면 우선순위가 갈림
+        lines = ["🔔 급등 신호 감지"] + [f"종목 {i:03d} " + "x" * 80 for i in range(20)]
+        lines += [f"⚠️ 손절 검토 {i:03d} " + "y" * 80 for i in range(20)]
+        lines += [f"매수 주문 체결 {i:03d} " + "z" * 80 for i in range(20)]
+        message = "\n".join(lines)
+
+        self.assertTrue(self.sender.send_message(message))
+        # 다른 신호 메시지가 함께 들어와도 분할 메시지 사이에 끼거나 묶이지 않아야 함
+        self.dispatcher.submit("kakao", "📈 다른 종목 급등 신호", SIGNAL)
+        self.assertTrue(self.dispatcher.flush(10))
+
+        parts = [text for text in self.delivered if text.startswith("[")]
+        total = len(parts)
+        self.assertGreater(total, 2)
+        self.assertEqual([text.split("]")[0] + "]" for text in parts],
+                         [f"[{i + 1}/{total}]" for i in range(total)])
+        first = self.delivered.index(parts[0])
+        self.assertEqual(self.delivered[first:first + total], parts)
+        self.assertTrue(all("신호 2건 묶음" not in text for text in self.delivered))
+
+
+if __name__ == "__main__":
+    unittest.main()
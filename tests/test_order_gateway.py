@@ -0,0 +1,157 @@
+"""
+주문 게이트웨이 테스트
+
+사전 위험 점검 거부 사유, 주문가능금액 조회 실패 처리, 예약 해제 시점, 동기 호출 대기 시간 초과를 확인합니다.
+
+사용법:
+    python -m pytest tests/test_order_gateway.py
+"""
+import os
+import sys
+import threading
+import types
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.trading.order_gateway import OrderGateway, OrderRequest
+
+CONFIG = types.SimpleNamespace(MAX_AMOUNT_PER_TRADE=1000000, MAX_QUANTITY_PER_SYMBOL=10, ORDER_MAX_POSITIONS=2,
+                               FEE_RATE=0, ORDER_RATE_PER_SECOND=0, ORDER_GATEWAY_WORKERS=1,
+                               ORDER_POLL_SECONDS=0.02, POSITION_RECONCILE_SECONDS=60)
+
+
+class FakeBroker:
+    """증권사 흉내 (접수한 주문은 체결 조회에 미체결로 나타남)"""
+
+    def __init__(self, positions=None, cash=1000000):
+        self.positions = positions or []
+        self.cash = cash
+        self.balance_error = None
+        self.release = threading.Event()
+        self.release.set()
+        self.orders = {}
+
+    def get_positions(self):
+        return [dict(position) for position in self.positions]
+
+    def get_balance(self):
+        if self.balance_error is not None:
+            raise self.balance_error
+        return {'주문가능금액': self.cash}
+
+    def get_order_executions(self):
+        return [dict(order) for order in list(self.orders.values())]
+
+    def buy(self, symbol, quantity, price=None, order_type="MARKET", market="KR"):
+        self.release.wait()
+        order_no = f"{len(self.orders) + 1:04d}"
+        self.orders[order_no] = {'주문번호': order_no, '주문수량': quantity, '체결수량': 0}
+        self.cash -= quantity * (price or 0)
+        return {'success': True, 'order_no': order_no}
+
+    def sell(self, symbol, quantity, price=None, order_type="MARKET", market="KR"):
+        return self.buy(symbol, quantity, price, order_type, market)
+
+    def fill(self, order_no, price):
+        self.orders[order_no].update({'체결수량': self.orders[order_no]['주문수량'], '체결단가': price})
+
+
+class GatewayTestCase(unittest.TestCase):
+
+    def make_gateway(self, **kwargs):
+        self.broker = FakeBroker(**kwargs)
+        self.gateway = OrderGateway(self.broker, CONFIG)
+        self.addCleanup(self.gateway.order_tracker.stop)
+        self.addCleanup(self.gateway.shutdown)
+        return self.gateway
+
+
+class RiskCheckTest(GatewayTestCase):
+    """사전 위험 점검 거부"""
+
+    def assertRejected(self, result, message):
+        self.assertFalse(result['success'])
+        self.assertTrue(result['risk_rejected'])
+        self.assertEqual(result['error'], message)
+
+    def test_single_order_rejections(self):
+        gateway = self.make_gateway(positions=[{'symbol': '005930', 'quantity': 8, 'avg_price': 100}])
+        self.assertRejected(gateway.execute(OrderRequest('005930', 'BUY', 3, price=100)), "종목당 최대 보유 수량 초과")
+        self.assertRejected(gateway.execute(OrderRequest('000660', 'SELL', 1, price=100)), "매도 가능 수량 부족")
+        self.assertRejected(gateway.execute(OrderRequest('000660', 'BUY', 0, price=100)), "주문 수량 오류")
+        self.assertRejected(gateway.execute(OrderRequest('000660', 'BUY', 5, price=300000)), "1회 최대 주문 금액 초과")
+        self.assertEqual(gateway.stats['reject_reasons'],
+                         {'max_quantity': 1, 'sell_exceeds_holding': 1, 'invalid_quantity': 1, 'max_amount': 1})
+        self.assertEqual(self.broker.orders, {})
+
+    def test_batch_accumulates_earlier_orders(self):
+        gateway = self.make_gateway(positions=[{'symbol': '005930', 'quantity': 1, 'avg_price': 100}], cash=1000)
+        batch = [
+            OrderRequest('000660', 'BUY', 5, price=100),  # 500원 - 통과
+            OrderRequest('035720', 'BUY', 1, price=100),  # 세 번째 보유 종목
+            OrderRequest('000660', 'BUY', 4, price=150),  # 누적 1,100원 > 1,000원
+            OrderRequest('000660', 'BUY', 4, price=100),  # 누적 900원 - 통과
+            OrderRequest('000660', 'BUY', 2, price=10),  # 누적 11주 > 10주
+        ]
+        gateway.position_book.reconcile(force=True)
+        self.assertEqual(gateway.check(batch),
+                         [None, 'max_positions', 'insufficient_cash', None, 'max_quantity'])
+
+    def test_balance_failure_uses_last_known_cash(self):
+        gateway = self.make_gateway(cash=1000)
+        self.broker.balance_error = RuntimeError("잔고 조회 실패")
+        # 확인한 금액이 없으면 매수 거부
+        self.assertEqual(gateway.check([OrderRequest('000660', 'BUY', 1, price=100)]), ['insufficient_cash'])
+
+        self.broker.balance_error = None
+        self.assertEqual(gateway.check([OrderRequest('000660', 'BUY', 1, price=100)]), [None])
+        self.broker.balance_error = RuntimeError("잔고 조회 실패")
+        self.assertEqual(gateway.check([OrderRequest('000660', 'BUY', 10, price=100),
+                                        OrderRequest('035720', 'BUY', 1, price=100)]),
+                         [None, 'insufficient_cash'])
+
+
+class ReservationTest(GatewayTestCase):
+    """예약 해제 시점"""
+
+    def test_cash_released_on_acceptance_quantity_on_fill(self):
+        gateway = self.make_gateway(cash=1000)
+        result = gateway.execute(OrderRequest('000660', 'BUY', 8, price=100))
+        self.assertTrue(result['success'])
+        # 접수된 금액은 증권사 주문가능금액에서 차감되므로 게이트웨이는 다시 빼지 않음
+        self.assertEqual(gateway._reserved_cash, 0)
+        self.assertEqual(gateway.check([OrderRequest('000660', 'BUY', 2, price=100)]), [None])
+        self.assertEqual(gateway.check([OrderRequest('000660', 'BUY', 3, price=100)]), ['max_quantity'])
+
+        order = gateway.order_tracker.get(result['order_no'])
+        self.broker.fill(result['order_no'], 100)
+        order.future.result(timeout=5)
+        self.assertEqual(gateway.open_reservations(), {})
+        self.assertEqual(gateway._pending, {})
+        self.assertEqual(gateway.position_book.quantity('000660'), 8)
+
+
+class ExecuteTimeoutTest(GatewayTestCase):
+    """동기 호출 대기 시간 초과"""
+
+    def test_timeout_returns_failure_and_cancels_unsubmitted_order(self):
+        gateway = self.make_gateway()
+        self.broker.release.clear()
+        in_flight = gateway.execute(OrderRequest('000660', 'BUY', 1, price=100), timeout=0.2)
+        queued = gateway.execute(OrderRequest('035720', 'BUY', 1, price=100), timeout=0.2)
+        self.assertFalse(in_flight['success'])
+        self.assertEqual(in_flight['error'], "주문 결과 대기 시간 초과 (제출 중)")
+        self.assertFalse(queued['success'])
+        self.assertEqual(queued['error'], "주문 결과 대기 시간 초과 (미제출)")
+        self.assertEqual(gateway.stats['timeouts'], 2)
+
+        # 제출 중이던 주문만 증권사에 들어가고, 취소된 주문의 예약은 해제됨
+        self.broker.release.set()
+        gateway.shutdown()
+        self.assertEqual(len(self.broker.orders), 1)
+        self.assertNotIn('035720', gateway._pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+포지션 장부 테스트
+
+주문 추적기의 체결 반영과 증권사 대조 중 체결이 들어왔을 때 대조 결과를 버리는지 확인합니다.
+
+사용법:
+    python -m pytest tests/test_position_book.py
+"""
+import os
+import sys
+import types
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.trading.order_tracker import FILLED, PARTIAL, OrderTracker
+from src.trading.position_book import PositionBook, get_position_book
+
+CONFIG = types.SimpleNamespace(POSITION_RECONCILE_SECONDS=60, ORDER_POLL_SECONDS=60)
+
+
+class FakeBroker:
+    """증권사 잔고/체결 조회 흉내 (조회 중 콜백 실행 가능)"""
+
+    def __init__(self, positions=None):
+        self.positions = positions or []
+        self.during_fetch = None
+        self.fetches = 0
+
+    def get_positions(self):
+        self.fetches += 1
+        snapshot = [dict(position) for position in self.positions]
+        if self.during_fetch is not None:
+            self.during_fetch()
+        return snapshot
+
+    def get_order_executions(self):
+        return []
+
+
+class ReconcileTest(unittest.TestCase):
+    """증권사 대조"""
+
+    def test_reconcile_replaces_book_with_broker_snapshot(self):
+        broker = FakeBroker([{'symbol': '005930', 'quantity': 10, 'avg_price': 70000}])
+        book = PositionBook(broker, CONFIG)
+        book.apply_fill('000660', 'BUY', 5, 120000)
+
+        self.assertTrue(book.reconcile(force=True))
+        self.assertEqual(book.symbols(), ['005930'])
+        self.assertEqual(book.quantity('005930'), 10)
+        # 대조 간격 안에서는 증권사를 다시 조회하지 않음
+        self.assertFalse(book.reconcile())
+        self.assertEqual(broker.fetches, 1)
+
+    def test_snapshot_discarded_when_fill_applied_during_fetch(self):
+        broker = FakeBroker([{'symbol': '005930', 'quantity': 10, 'avg_price': 70000}])
+        book = PositionBook(broker, CONFIG)
+        version = book.version
+        # 증권사 응답이 만들어진 뒤 도착한 체결 (응답에는 빠져 있음)
+        broker.during_fetch = lambda: book.apply_fill('000660', 'BUY', 5, 120000)
+
+        self.assertFalse(book.reconcile(force=True))
+        self.assertEqual(book.stats['reconcile_discarded'], 1)
+        self.assertEqual(book.quantity('000660'), 5)
+        self.assertEqual(book.version, version + 1)
+
+        # 다음 호출은 간격과 관계없이 다시 대조
+        broker.during_fetch = None
+        broker.positions.append({'symbol': '000660', 'quantity': 5, 'avg_price': 120000})
+        self.assertTrue(book.reconcile())
+        self.assertEqual(sorted(book.symbols()), ['000660', '005930'])
+
+
+class TrackerFillTest(unittest.TestCase):
+    """주문 추적기 체결 반영"""
+
+    def setUp(self):
+        self.broker = FakeBroker()
+        self.tracker = OrderTracker(self.broker, CONFIG)
+        self.book = get_position_book(self.broker, CONFIG)
+
+    def tearDown(self):
+        self.tracker.stop()
+
+    def test_partial_and_final_fills_update_book(self):
+        self.tracker.track('0001', '005930', 'BUY', 10, 70000)
+        self.tracker.on_execution({'주문번호': '0001', '주문수량': 10, '체결수량': 4, '체결단가': 70000})
+        self.assertEqual(self.tracker.get('0001').state, PARTIAL)
+        self.assertEqual(self.book.quantity('005930'), 4)
+
+        # 조회 결과 체결가는 누적 평균 (4주 70,000 + 6주 71,000 = 평균 70,600)
+        self.tracker.on_execution({'주문번호': '0001', '주문수량': 10, '체결수량': 10, '체결단가': 70600})
+        self.assertEqual(self.tracker.get('0001').state, FILLED)
+        position = self.book.get('005930')
+        self.assertEqual(position.quantity, 10)
+        self.assertAlmostEqual(position.avg_price, 70600)
+        self.assertEqual(self.broker.fetches, 0)
+
+        # 같은 결과가 다시 들어와도 두 번 반영하지 않음
+        self.tracker.on_execution({'주문번호': '0001', '주문수량': 10, '체결수량': 10, '체결단가': 70600})
+        self.assertEqual(self.book.quantity('005930'), 10)
+
+    def test_fill_without_price_invalidates_book(self):
+        self.book.reconcile(force=True)
+        self.tracker.track('0002', '005930', 'BUY', 3, 0)
+        self.tracker.on_execution({'주문번호': '0002', '주문수량': 3, '체결수량': 3})
+        self.assertEqual(self.book.quantity('005930'), 0)
+        self.assertIsNone(self.book._last_reconcile)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+트레이서 느린 구간 분해 테스트
+
+사용법:
+    python -m pytest tests/test_tracing.py
+"""
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.tracing import Tracer
+
+
+class SlowSpanBreakdownTest(unittest.TestCase):
+    """다른 스레드가 구간을 기록하는 중에 느린 구간이 닫혀도 예외가 나지 않는지 확인"""
+
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_slow_span_closes_while_other_thread_records(self):
+        tracer = Tracer(capacity=20000)
+        stop = threading.Event()
+
+        def record():
+            while not stop.is_set():
+                with tracer.span("worker.call", "broker"):
+                    pass
+
+        worker = threading.Thread(target=record, daemon=True)
+        worker.start()
+        try:
+            for _ in range(100):
+                # slow=0이면 닫힐 때마다 분해 로그를 남기며, 사이클 동안 쌓인 다른 스레드 구간을 모두 훑음
+                with tracer.span("cycle", "cycle", slow=0):
+                    with tracer.span("cycle.step", "pandas"):
+                        time.sleep(0.01)
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertEqual(tracer.stats['slow'], 100)
+        start, duration = next((span[2], span[3]) for span in reversed(tracer.spans()) if span[0] == "cycle")
+        self.assertEqual([name for name, _, _ in tracer.breakdown(start, duration, 0)], ["cycle.step"])
+
+
+if __name__ == "__main__":
+    unittest.main()